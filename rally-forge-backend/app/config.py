@@ -64,7 +64,38 @@ class Settings(BaseSettings):
     poppler_path: str = r"C:\Dev\Rally Forge\App\poppler-25.12.0\Library\bin"  # Path to Poppler bin directory
     tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe"  # Path to Tesseract executable
     google_vision_enabled: bool = False  # Enable Google Cloud Vision fallback
-    ocr_timeout_seconds: int = 30  # Timeout for OCR operations
+    ocr_capability_refresh_seconds: int = 300  # Background re-probe of Poppler/Tesseract/Vision availability (0 = startup only)
+    ocr_timeout_seconds: int = 300  # Per-document OCR job timeout (0 = no limit)
+    ocr_executor_threads: int = 4  # Concurrent OCR jobs driven off the event loop
+    ocr_worker_pool_size: int = 0  # OCR worker processes per web worker (0 = CPU cores / web_concurrency, 1 = sequential)
+    web_concurrency: int = 1  # Web worker processes on this host, each with its own OCR pool (gunicorn reads WEB_CONCURRENCY too)
+    ocr_backend: str = "auto"  # Local OCR engine: auto (cheapest per page), tesserocr (warm engines) or pytesseract
+    ocr_engine_workers: int = 0  # Warm tesserocr engines per language per process (0 = ocr_executor_threads)
+    ocr_cloud_escalation_confidence: float = 60.0  # Re-OCR final attempts below this confidence on Google Vision (if enabled; 0 = never)
+    ocr_cloud_max_concurrency: int = 4  # Concurrent Google Vision calls per process
+    ocr_tesseract_threads: int = 1  # OpenMP threads per Tesseract call inside a pool worker
+    ocr_raster_memory_limit_mb: int = 256  # Max decoded page-image memory per OCR worker (pages render one at a time)
+    ocr_adaptive_dpi_enabled: bool = True  # OCR at low DPI first, re-render only low-confidence pages
+    ocr_dpi_tiers: List[int] = [150, 300]  # Escalation ladder, capped at each caller's max DPI
+    ocr_escalation_confidence: float = 80.0  # Mean word confidence (0-100) that stops escalation
+    ocr_preprocessing_enabled: bool = True  # OpenCV cleanup of page images before Tesseract
+    ocr_preprocessing_steps: List[str] = ["grayscale", "denoise", "binarize", "deskew", "crop_borders"]
+    str_chunk_pages: int = 100  # STR PDFs longer than this are processed as concurrent page-range chunks (0 = never)
+    str_partial_result_pages: int = 25  # Chunk size when a caller wants partial STR results while OCR runs (0 = final result only)
+    ocr_duplicate_pages_enabled: bool = True  # Reuse an earlier page's OCR text for exact or re-encoded copies of it
+    ocr_duplicate_page_tolerance: int = 12  # Max block gray-level difference (0-255) between a page and its copy
+    ocr_cache_enabled: bool = True  # Reuse OCR results for byte-identical re-uploads
+    ocr_cache_dir: str = "./Data/ocr_cache"  # Content-addressed OCR result cache
+    ocr_cache_max_mb: int = 512  # LRU eviction once the cache grows past this size
+    scanner_job_ttl_seconds: int = 3600  # Finished scan jobs stay in memory this long; results reload from Results/ after (0 = no TTL)
+    scanner_job_max_finished: int = 1000  # Finished scan jobs held in memory at most, oldest evicted first (0 = unlimited)
+    project_scan_concurrency: int = 0  # Documents parsed at once by a project scan (0 = ocr_executor_threads)
+    project_archive_max_mb: int = 2048  # Uncompressed size limit of an uploaded project .zip
+    document_classifier_enabled: bool = True  # Classify page one before full extraction (upload routing, early rejection)
+    document_classifier_dpi: int = 100  # Render DPI for page one when it has no text layer
+    document_classifier_timeout_seconds: int = 30  # Page-one classification time limit (unclassified after)
+    dd214_early_stop_enabled: bool = True  # Stop OCRing a multi-copy DD-214 once every required field is read
+    dd214_early_stop_confidence: float = 0.8  # Page OCR confidence (0-1) needed for its fields to count toward early stop
 
     # Logging
     log_level: str = "INFO"
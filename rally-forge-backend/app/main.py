@@ -48,6 +48,10 @@ from app.routes import entitlement
 from app.config import settings
 from app.core.sentry import init_sentry
 from app.middleware.rate_limit import rate_limit_middleware, cleanup_rate_limiter
+from app.services.ocr_executor import shutdown_ocr_executor
+from app.services.ocr_router import shutdown_ocr_router
+from app.services.ocr_worker_pool import shutdown_ocr_worker_pool
+from app.utils.ocr_capabilities import shutdown_ocr_capabilities, start_ocr_capabilities
 
 # Configure logging
 logging.basicConfig(level=settings.log_level)
@@ -117,6 +121,7 @@ app.include_router(crsc_enterprise.router)  # CRSC Enterprise API Gateway
 async def startup_event():
     """Initialize on startup"""
     logger.info("Starting Rally Forge backend v1.0.0")
+    start_ocr_capabilities()
     # init_db()  # Temporarily disabled - DB not required for DD-214 scanner testing
 
 
@@ -124,6 +129,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Rally Forge backend")
+    shutdown_ocr_executor()
+    shutdown_ocr_worker_pool()
+    shutdown_ocr_router()
+    shutdown_ocr_capabilities()
 
 
 @app.get("/health", tags=["Health"])
@@ -23,6 +23,10 @@ import re
 import os
 import shutil
 
+from app.services.field_normalization import normalize_date, normalize_pay_grade
+from app.services.keyword_automaton import KeywordAutomaton
+from app.services.ocr_executor import run_ocr_job
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -172,22 +176,40 @@ def extract_text_from_pdf(file_path: Path) -> tuple[str, bool]:
 def extract_text_with_ocr(file_path: Path) -> str:
     """
     Extract text using OCR (Tesseract via pytesseract)
+
+    A registered DD-214 yields labelled block text (e.g. "4b PAY GRADE: E-4")
+    from region OCR of page 1; anything else is OCR'd page by page in full.
     """
     try:
-        from PIL import Image
-        import pytesseract
-        from pdf2image import convert_from_path
+        from app.services.adaptive_ocr import adaptive_fingerprint_options, iter_adaptive_page_layouts
+        from app.services.dd214_template import TEMPLATE_VERSION, scan_dd214_pdf_template, template_cache_pages
+        from app.services.ocr_cache import get_ocr_cache, hash_file, ocr_fingerprint, layout_cache_pages
+
+        cache = get_ocr_cache()
+        file_hash = hash_file(file_path)
+        fingerprint = ocr_fingerprint(
+            'dd214_router', dpi=300, template=TEMPLATE_VERSION, **adaptive_fingerprint_options()
+        )
 
-        # Convert PDF to images
-        images = convert_from_path(str(file_path), dpi=300)
+        pages = cache.get(file_hash, fingerprint)
+        if pages is None:
+            # Read only the known DD-214 blocks when the form can be registered
+            template = scan_dd214_pdf_template(file_path)
+            if template:
+                pages = template_cache_pages(template)
+                cache.put(file_hash, fingerprint, pages)
 
-        text = ""
-        for i, image in enumerate(images):
-            logger.info(f"Running OCR on page {i+1}/{len(images)}")
-            page_text = pytesseract.image_to_string(image)
-            text += page_text + "\n"
+        if pages is None:
+            # Render, OCR and release one page at a time, escalating DPI only where needed
+            layouts = []
+            for layout in iter_adaptive_page_layouts(file_path, dpi=300):
+                logger.info(f"Page {layout.page_number} OCR confidence: {layout.mean_confidence:.1f} at {layout.dpi} DPI")
+                layouts.append(layout)
 
-        return text
+            pages = layout_cache_pages(layouts)
+            cache.put(file_hash, fingerprint, pages)
+
+        return ''.join(page['text'] + "\n" for page in pages)
 
     except ImportError as e:
         error_msg = f"OCR dependencies not installed: {e}. Install: pip install pytesseract pdf2image pillow"
@@ -209,11 +231,28 @@ def extract_text_from_image(file_path: Path) -> str:
     """Extract text from image file (JPG, PNG, TIFF, etc.)"""
     try:
         from PIL import Image
-        import pytesseract
-
-        image = Image.open(file_path)
-        text = pytesseract.image_to_string(image)
-        return text
+        from app.services.dd214_template import TEMPLATE_VERSION, scan_dd214_image_template, template_cache_pages
+        from app.services.image_preprocessing import active_steps
+        from app.services.ocr_cache import get_ocr_cache, hash_file, ocr_fingerprint, layout_cache_pages
+        from app.services.ocr_layout import ocr_page_layout
+
+        cache = get_ocr_cache()
+        file_hash = hash_file(file_path)
+        fingerprint = ocr_fingerprint('dd214_router', preprocessing=active_steps(), template=TEMPLATE_VERSION)
+
+        pages = cache.get(file_hash, fingerprint)
+        if pages is None:
+            template = scan_dd214_image_template(file_path)
+            if template:
+                pages = template_cache_pages(template)
+            else:
+                with Image.open(file_path) as image:
+                    layout = ocr_page_layout(image, preprocessing_steps=active_steps(), allow_remote=True)
+                logger.info(f"Image OCR confidence: {layout.mean_confidence:.1f}")
+                pages = layout_cache_pages([layout])
+            cache.put(file_hash, fingerprint, pages)
+
+        return pages[0]['text']
 
     except ImportError as e:
         error_msg = f"OCR dependencies not installed: {e}"
@@ -225,24 +264,19 @@ def extract_text_from_image(file_path: Path) -> str:
         raise HTTPException(status_code=500, detail=error_msg)
 
 
-def extract_branch(text: str) -> str:
-    """Extract branch of service from text"""
-    text_lower = text.lower()
-
-    patterns = {
-        'Army': ['army', 'usa', 'united states army'],
-        'Navy': ['navy', 'usn', 'united states navy'],
-        'Air Force': ['air force', 'usaf', 'united states air force'],
-        'Marine Corps': ['marine', 'usmc', 'united states marine corps'],
-        'Coast Guard': ['coast guard', 'uscg', 'united states coast guard'],
-        'Space Force': ['space force', 'ussf', 'united states space force']
-    }
+BRANCH_KEYWORDS = KeywordAutomaton({
+    'Army': ['army', 'usa', 'united states army'],
+    'Navy': ['navy', 'usn', 'united states navy'],
+    'Air Force': ['air force', 'usaf', 'united states air force'],
+    'Marine Corps': ['marine', 'marines', 'usmc', 'united states marine corps'],
+    'Coast Guard': ['coast guard', 'uscg', 'united states coast guard'],
+    'Space Force': ['space force', 'ussf', 'united states space force']
+})
 
-    for branch, keywords in patterns.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return branch
 
-    return ""
+def extract_branch(text: str) -> str:
+    """Extract branch of service from text"""
+    return BRANCH_KEYWORDS.first_label(text) or ""
 
 
 def extract_service_dates(text: str) -> Dict[str, str]:
@@ -296,7 +330,7 @@ def extract_rank_info(text: str) -> Dict[str, str]:
     # Look for pay grade patterns (E-1 through E-9, O-1 through O-10, W-1 through W-5)
     pay_grade_match = re.search(r'\b([EOW]-\d{1,2})\b', text, re.IGNORECASE)
     if pay_grade_match:
-        rank_info["payGrade"] = pay_grade_match.group(1).upper()
+        rank_info["payGrade"] = normalize_pay_grade(pay_grade_match.group(1)) or ""
 
     # Common ranks to look for
     ranks = [
@@ -315,24 +349,26 @@ def extract_rank_info(text: str) -> Dict[str, str]:
     return rank_info
 
 
+# Common awards to look for
+AWARD_KEYWORDS = KeywordAutomaton([
+    'Purple Heart', 'Bronze Star', 'Silver Star', 'Medal of Honor',
+    'Distinguished Service', 'Navy Cross', 'Air Force Cross',
+    'Combat Action', 'Meritorious Service', 'Commendation Medal',
+    'Achievement Medal', 'Good Conduct Medal', 'National Defense'
+])
+
+
 def extract_awards(text: str) -> List[str]:
     """Extract military awards and decorations"""
-    awards_found = []
-
-    # Common awards to look for
-    award_patterns = [
-        'Purple Heart', 'Bronze Star', 'Silver Star', 'Medal of Honor',
-        'Distinguished Service', 'Navy Cross', 'Air Force Cross',
-        'Combat Action', 'Meritorious Service', 'Commendation Medal',
-        'Achievement Medal', 'Good Conduct Medal', 'National Defense'
-    ]
+    return AWARD_KEYWORDS.matched_labels(text)
 
-    text_lower = text.lower()
-    for award in award_patterns:
-        if award.lower() in text_lower:
-            awards_found.append(award)
 
-    return awards_found
+# Substring matches on purpose: 'engineer' covers 'Combat Engineering', 'armor' covers 'Armored Crewman'
+SPECIALTY_KEYWORDS = KeywordAutomaton([
+    'infantry', 'intelligence', 'medical', 'logistics', 'aviation',
+    'combat', 'communications', 'cyber', 'maintenance', 'special forces',
+    'engineer', 'artillery', 'armor', 'reconnaissance', 'supply'
+], whole_words=False)
 
 
 def extract_mos_code(text: str, branch: str) -> Dict[str, Any]:
@@ -425,62 +461,47 @@ def extract_mos_code(text: str, branch: str) -> Dict[str, Any]:
         mos_data["skill_identifiers"].extend(matches)
 
     # Extract specialty keywords
-    specialty_keywords = [
-        'infantry', 'intelligence', 'medical', 'logistics', 'aviation',
-        'combat', 'communications', 'cyber', 'maintenance', 'special forces',
-        'engineer', 'artillery', 'armor', 'reconnaissance', 'supply'
-    ]
-
-    text_lower = text.lower()
-    for keyword in specialty_keywords:
-        if keyword in text_lower:
-            mos_data["specialties"].append(keyword.title())
+    for keyword in SPECIALTY_KEYWORDS.matched_labels(text):
+        mos_data["specialties"].append(keyword.title())
 
     return mos_data
 
 
+# Comprehensive list of deployment locations
+DEPLOYMENT_ZONE_KEYWORDS = KeywordAutomaton({
+    'Iraq': ['iraq', 'iraqi', 'operation iraqi freedom', 'oif', 'baghdad', 'mosul', 'fallujah'],
+    'Afghanistan': ['afghanistan', 'operation enduring freedom', 'oef', 'kabul', 'kandahar', 'bagram'],
+    'Kuwait': ['kuwait', 'operation desert storm', 'operation desert shield'],
+    'Vietnam': ['vietnam', 'saigon', 'da nang'],
+    'Korea': ['korea', 'korean', 'dmz', 'korean peninsula'],
+    'Kosovo': ['kosovo', 'operation allied force'],
+    'Somalia': ['somalia', 'mogadishu', 'operation restore hope'],
+    'Gulf War': ['persian gulf', 'operation desert storm', 'desert shield'],
+    'Balkans': ['balkans', 'bosnia', 'herzegovina'],
+    'Syria': ['syria', 'operation inherent resolve'],
+    'Libya': ['libya', 'operation odyssey dawn'],
+    'Philippines': ['philippines', 'operation enduring freedom - philippines'],
+    'Africa': ['horn of africa', 'djibouti', 'camp lemonnier'],
+    'Middle East': ['middle east', 'centcom', 'bahrain']
+})
+
+# Campaign ribbons (indicate deployment)
+CAMPAIGN_RIBBON_KEYWORDS = KeywordAutomaton([
+    'iraq campaign', 'afghanistan campaign', 'global war on terrorism',
+    'gwot', 'southwest asia service', 'kosovo campaign'
+])
+
+
 def extract_deployment_info(text: str) -> List[str]:
     """
     Extract deployment locations and combat zones
     Critical for benefits eligibility and job placement
     """
-    deployments = []
-
-    # Comprehensive list of deployment locations
-    deployment_zones = {
-        'Iraq': ['iraq', 'operation iraqi freedom', 'oif', 'baghdad', 'mosul', 'fallujah'],
-        'Afghanistan': ['afghanistan', 'operation enduring freedom', 'oef', 'kabul', 'kandahar', 'bagram'],
-        'Kuwait': ['kuwait', 'operation desert storm', 'operation desert shield'],
-        'Vietnam': ['vietnam', 'saigon', 'da nang'],
-        'Korea': ['korea', 'dmz', 'korean peninsula'],
-        'Kosovo': ['kosovo', 'operation allied force'],
-        'Somalia': ['somalia', 'mogadishu', 'operation restore hope'],
-        'Gulf War': ['persian gulf', 'operation desert storm', 'desert shield'],
-        'Balkans': ['balkans', 'bosnia', 'herzegovina'],
-        'Syria': ['syria', 'operation inherent resolve'],
-        'Libya': ['libya', 'operation odyssey dawn'],
-        'Philippines': ['philippines', 'operation enduring freedom - philippines'],
-        'Africa': ['horn of africa', 'djibouti', 'camp lemonnier'],
-        'Middle East': ['middle east', 'centcom', 'bahrain']
-    }
-
-    text_lower = text.lower()
-
-    for location, keywords in deployment_zones.items():
-        if any(keyword in text_lower for keyword in keywords):
-            if location not in deployments:
-                deployments.append(location)
+    deployments = DEPLOYMENT_ZONE_KEYWORDS.matched_labels(text)
 
     # Check for campaign ribbons (indicates deployment)
-    campaign_ribbons = [
-        'iraq campaign', 'afghanistan campaign', 'global war on terrorism',
-        'gwot', 'southwest asia service', 'kosovo campaign'
-    ]
-
-    for ribbon in campaign_ribbons:
-        if ribbon in text_lower and not deployments:
-            deployments.append('Deployed (campaign ribbon found)')
-            break
+    if not deployments and CAMPAIGN_RIBBON_KEYWORDS.contains_any(text):
+        deployments.append('Deployed (campaign ribbon found)')
 
     return deployments
 
@@ -564,21 +585,28 @@ def map_mos_to_civilian_jobs(mos_code: str, branch: str, specialties: List[str])
     return job_mapping
 
 
-def detect_combat_indicators(text: str, awards: List[str]) -> List[str]:
-    """Detect combat service indicators"""
-    indicators = []
+# Combat-related keywords, labelled with the indicator they report
+COMBAT_INDICATOR_KEYWORDS = KeywordAutomaton({
+    'Combat keyword found': ['combat'],
+    'Hostile fire reference': ['hostile', 'hostile fire'],
+    'Imminent danger pay': ['imminent danger'],
+})
 
-    text_lower = text.lower()
+# Deployment locations
+COMBAT_ZONE_KEYWORDS = KeywordAutomaton({
+    'iraq': ['iraq', 'iraqi'],
+    'afghanistan': ['afghanistan'],
+    'vietnam': ['vietnam'],
+    'korea': ['korea', 'korean'],
+    'kuwait': ['kuwait'],
+    'persian gulf': ['persian gulf'],
+})
 
-    # Combat-related keywords
-    if 'combat' in text_lower:
-        indicators.append('Combat keyword found')
-
-    if 'hostile' in text_lower or 'hostile fire' in text_lower:
-        indicators.append('Hostile fire reference')
 
-    if 'imminent danger' in text_lower:
-        indicators.append('Imminent danger pay')
+def detect_combat_indicators(text: str, awards: List[str]) -> List[str]:
+    """Detect combat service indicators"""
+    # Combat-related keywords
+    indicators = COMBAT_INDICATOR_KEYWORDS.matched_labels(text)
 
     # Combat awards
     combat_awards = ['Purple Heart', 'Bronze Star', 'Combat Action', 'Silver Star']
@@ -587,10 +615,8 @@ def detect_combat_indicators(text: str, awards: List[str]) -> List[str]:
             indicators.append(f'Combat award: {award}')
 
     # Deployment locations
-    combat_zones = ['iraq', 'afghanistan', 'vietnam', 'korea', 'kuwait', 'persian gulf']
-    for zone in combat_zones:
-        if zone in text_lower:
-            indicators.append(f'Combat zone: {zone.title()}')
+    for zone in COMBAT_ZONE_KEYWORDS.matched_labels(text):
+        indicators.append(f'Combat zone: {zone.title()}')
 
     return indicators
 
@@ -671,17 +697,17 @@ async def process_dd214_extraction(job_id: str, file_path: Path, file_metadata:
         extraction_jobs[job_id]["progress"] = 30
         extraction_jobs[job_id]["message"] = "Extracting text from document..."
 
-        # EXTRACT TEXT
+        # EXTRACT TEXT (blocking PDF/OCR work runs on the OCR executor, off the event loop)
         text = ""
         ocr_used = False
 
         if file_metadata["mime_type"] == "application/pdf":
             extraction_log.append("Detected PDF file")
-            text, ocr_used = extract_text_from_pdf(file_path)
+            text, ocr_used = await run_ocr_job(extract_text_from_pdf, file_path)
         else:
             # Image file (JPG, PNG, TIFF, etc.)
             extraction_log.append("Detected image file, using OCR")
-            text = extract_text_from_image(file_path)
+            text = await run_ocr_job(extract_text_from_image, file_path)
             ocr_used = True
 
         result.ocrAttempted = ocr_used
@@ -1048,12 +1074,10 @@ async def export_hr_summary(job_id: str):
     def calc_years(entry: str, sep: str) -> str:
         if not entry or not sep:
             return "Unknown"
-        try:
-            e_year = int(entry.split("/")[-1]) if "/" in entry else int(entry[:4])
-            s_year = int(sep.split("/")[-1]) if "/" in sep else int(sep[:4])
-            return f"{s_year - e_year} years (approximate)"
-        except:
+        entry_iso, sep_iso = normalize_date(entry), normalize_date(sep)
+        if not entry_iso or not sep_iso:
             return "Unable to calculate"
+        return f"{int(sep_iso[:4]) - int(entry_iso[:4])} years (approximate)"
 
     # Build HR-friendly summary
     hr_summary = {
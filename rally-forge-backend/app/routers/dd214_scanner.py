@@ -15,18 +15,13 @@ from datetime import datetime
 import json
 
 from app.services.dd214_ocr_scanner import DD214OCRScanner
-from app.utils.ocr_diagnostics import OCRDependencyManager
-from app.config import settings
+from app.utils.ocr_capabilities import get_ocr_capabilities
 
 router = APIRouter(prefix="/api/scanner", tags=["scanner"])
 logger = logging.getLogger(__name__)
 
 # Initialize scanner
 scanner = DD214OCRScanner()
-dep_manager = OCRDependencyManager(
-    poppler_path=settings.poppler_path,
-    tesseract_path=settings.tesseract_path
-)
 
 # Allowed file types
 ALLOWED_TYPES = {'application/pdf', 'image/jpeg', 'image/png', 'image/tiff', 'image/bmp'}
@@ -223,12 +218,17 @@ async def get_ocr_diagnostics() -> Dict:
     - Verifying Poppler and Tesseract installation
     - Checking Google Vision availability
     - Getting installation recommendations
+
+    Served from the capability registry's last probe (taken at startup and
+    refreshed every ocr_capability_refresh_seconds); no subprocess runs here.
     """
-    diagnostics = dep_manager.run_diagnostics()
+    capabilities = get_ocr_capabilities()
+    diagnostics = capabilities.snapshot()
 
     return {
         'status': 'healthy' if not diagnostics.errors else 'degraded' if diagnostics.warnings else 'critical',
         'timestamp': datetime.utcnow().isoformat(),
+        'checked_at': capabilities.checked_at.isoformat() if capabilities.checked_at else None,
         'dependencies': {
             'poppler': {
                 'detected': diagnostics.poppler_detected,
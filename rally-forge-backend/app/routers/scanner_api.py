@@ -7,6 +7,7 @@ Integrates with scanner orchestrator and all parsers.
 ENDPOINTS:
 - File Upload: POST /api/upload/{scanner_type}
 - Trigger Scan: POST /api/scan/{scanner_type}
+- Job List: GET /api/scan/jobs?veteran_id=&status=
 - Job Status: GET /api/scan/jobs/{job_id}/status
 - Job Results: GET /api/scan/jobs/{job_id}/results
 - Scanner Health: GET /api/scan/health
@@ -17,7 +18,8 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 import logging
 
-from app.services.scanner_orchestrator import get_orchestrator, ScannerType
+from app.services.document_classifier import classify_document, classify_filename
+from app.services.scanner_orchestrator import get_orchestrator, JobStatus, ScannerType
 
 logger = logging.getLogger(__name__)
 
@@ -175,17 +177,18 @@ async def upload_rating_decision(
 async def upload_generic(
     file: UploadFile = File(...),
     veteran_id: Optional[str] = None,
-    scanner_type: Optional[str] = Query(None, description="Scanner type: dd214, str, rating, or auto-detect")
+    scanner_type: Optional[str] = Query(None, description="Scanner type: dd214, str, rating, project (.zip), or auto-detect")
 ):
     """
     Generic upload endpoint that handles all scanner types.
 
-    If scanner_type is not specified, auto-detects based on file content/name.
+    If scanner_type is not specified, auto-detects from page one (text layer,
+    or a low-DPI OCR of that page only), falling back to the file name.
 
     Args:
         file: File to upload
         veteran_id: Optional veteran identifier
-        scanner_type: Optional scanner type (dd214, str, rating)
+        scanner_type: Optional scanner type (dd214, str, rating, project)
 
     Returns:
         {
@@ -194,7 +197,8 @@ async def upload_generic(
             'file_path': str,
             'size': int,
             'veteran_id': str,
-            'detected_scanner_type': str
+            'detected_scanner_type': str,
+            'classification': Optional[dict]  # Page-one scores when auto-detected
         }
     """
     orchestrator = get_orchestrator()
@@ -205,18 +209,17 @@ async def upload_generic(
 
         # Determine scanner type
         detected_type = scanner_type
+        classification = None
         if not detected_type:
-            # Auto-detect based on filename and content
-            filename_lower = filename.lower()
-            if 'dd214' in filename_lower or 'dd-214' in filename_lower:
-                detected_type = ScannerType.DD214.value
-            elif 'str' in filename_lower or 'treatment' in filename_lower:
-                detected_type = ScannerType.STR.value
-            elif 'rating' in filename_lower or 'decision' in filename_lower:
-                detected_type = ScannerType.RATING.value
+            # Auto-detect based on page one, then filename
+            if filename.lower().endswith('.zip'):
+                detected_type = ScannerType.PROJECT.value
             else:
+                classification = await classify_document(content, filename)
                 # Default to DD214 for common military documents
-                detected_type = ScannerType.DD214.value
+                detected_type = (
+                    classification.document_type or classify_filename(filename) or ScannerType.DD214.value
+                )
 
         # Validate scanner type
         try:
@@ -243,7 +246,8 @@ async def upload_generic(
             'file_path': result['file_path'],
             'size': result['size'],
             'veteran_id': result['veteran_id'],
-            'detected_scanner_type': detected_type
+            'detected_scanner_type': detected_type,
+            'classification': classification.to_dict() if classification else None
         })
 
     except ValueError as e:
@@ -393,8 +397,13 @@ async def scan_project(
     """
     Trigger project scan (scan all documents in a directory).
 
+    Documents are routed to the DD-214, STR and rating decision scanners and
+    parsed concurrently; the job's 'progress' counts documents as they
+    finish ({'documents_processed', 'document_count', 'documents_failed'}).
+
     Args:
-        directory_path: Path to directory containing documents
+        directory_path: Path to directory containing documents, or to a
+            .zip of them uploaded with scanner_type=project
         veteran_id: Optional veteran identifier
 
     Returns:
@@ -430,6 +439,25 @@ async def scan_project(
 
 # ==================== JOB STATUS & RESULTS ====================
 
+@router.get("/jobs")
+async def list_jobs(veteran_id: Optional[str] = None, status: Optional[JobStatus] = None):
+    """
+    List recent scan jobs, optionally for one veteran and/or with one status.
+
+    Finished jobs are listed while they are held in memory
+    (settings.scanner_job_ttl_seconds); their results stay available at
+    /jobs/{job_id}/results after that.
+
+    Returns:
+        {
+            'jobs': List[dict]  # Same shape as /jobs/{job_id}/status
+        }
+    """
+    orchestrator = get_orchestrator()
+
+    return JSONResponse(content={'jobs': orchestrator.list_jobs(veteran_id=veteran_id, status=status)})
+
+
 @router.get("/jobs/{job_id}/status")
 async def get_job_status(job_id: str):
     """
@@ -443,7 +471,9 @@ async def get_job_status(job_id: str):
             'started_at': Optional[str],
             'completed_at': Optional[str],
             'error': Optional[str],
-            'retry_count': int
+            'retry_count': int,
+            'progress': Optional[dict]  # {'pages_processed', 'page_count'} while a long scan runs,
+                                        # document counts for a project scan
         }
     """
     orchestrator = get_orchestrator()
@@ -469,6 +499,9 @@ async def get_job_results(job_id: str):
             'result': dict,  # Parsed document data
             'completed_at': Optional[str]
         }
+
+        While not ready (202), 'partial_result' carries the findings parsed
+        so far for long STR scans, with 'progress' in pages.
     """
     orchestrator = get_orchestrator()
 
@@ -686,7 +719,7 @@ async def get_supported_scanner_types():
             {
                 'type': 'project',
                 'name': 'Project Scan',
-                'description': 'Scan all documents in a directory'
+                'description': 'Scan all documents in a directory or .zip archive'
             }
         ]
     })
@@ -734,7 +767,7 @@ scanner_router = APIRouter(prefix="/api/scanner", tags=["scanners-legacy"])
 async def upload_legacy(
     file: UploadFile = File(...),
     veteran_id: Optional[str] = None,
-    scanner_type: Optional[str] = Query(None, description="Scanner type: dd214, str, rating, or auto-detect")
+    scanner_type: Optional[str] = Query(None, description="Scanner type: dd214, str, rating, project (.zip), or auto-detect")
 ):
     """
     Legacy upload endpoint at /api/scanner/upload (aliases to /api/scan/upload).
@@ -745,7 +778,7 @@ async def upload_legacy(
     Args:
         file: File to upload
         veteran_id: Optional veteran identifier
-        scanner_type: Optional scanner type (dd214, str, rating)
+        scanner_type: Optional scanner type (dd214, str, rating, project)
 
     Returns:
         {
@@ -754,7 +787,8 @@ async def upload_legacy(
             'file_path': str,
             'size': int,
             'veteran_id': str,
-            'detected_scanner_type': str
+            'detected_scanner_type': str,
+            'classification': Optional[dict]  # Page-one scores when auto-detected
         }
     """
     orchestrator = get_orchestrator()
@@ -765,17 +799,16 @@ async def upload_legacy(
 
         # Determine scanner type
         detected_type = scanner_type
+        classification = None
         if not detected_type:
-            # Auto-detect based on filename
-            filename_lower = filename.lower()
-            if 'dd214' in filename_lower or 'dd-214' in filename_lower:
-                detected_type = ScannerType.DD214.value
-            elif 'str' in filename_lower or 'treatment' in filename_lower:
-                detected_type = ScannerType.STR.value
-            elif 'rating' in filename_lower or 'decision' in filename_lower:
-                detected_type = ScannerType.RATING.value
+            # Auto-detect based on page one, then filename
+            if filename.lower().endswith('.zip'):
+                detected_type = ScannerType.PROJECT.value
             else:
-                detected_type = ScannerType.DD214.value
+                classification = await classify_document(content, filename)
+                detected_type = (
+                    classification.document_type or classify_filename(filename) or ScannerType.DD214.value
+                )
 
         # Validate scanner type
         try:
@@ -802,7 +835,8 @@ async def upload_legacy(
             'file_path': result['file_path'],
             'size': result['size'],
             'veteran_id': result['veteran_id'],
-            'detected_scanner_type': detected_type
+            'detected_scanner_type': detected_type,
+            'classification': classification.to_dict() if classification else None
         })
 
     except ValueError as e:
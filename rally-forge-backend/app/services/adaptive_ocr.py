@@ -0,0 +1,159 @@
+"""
+ADAPTIVE-RESOLUTION PAGE OCR
+
+Renders and OCRs each page at the lowest useful DPI, escalating only when
+Tesseract is unsure.
+
+Clean typed pages (most DD-214s, VA letters) read just as well at 150 DPI
+as at 300 DPI, at a quarter of the pixels. Faint or small-print scans do
+need the extra resolution, so the decision is made per page from the OCR
+result itself:
+
+WORKFLOW:
+1. Render the page at the lowest DPI tier and OCR it
+2. If the mean word confidence is at or above ocr_escalation_confidence,
+   keep it
+3. Otherwise release the image, re-render at the next tier and OCR again
+4. Return the most confident layout seen
+
+Blank pages (no words and almost no ink) are never escalated; a higher DPI
+cannot find text that is not there. Every render goes through the image
+preprocessing stage (see image_preprocessing) before Tesseract.
+
+Only the last tier may go on to the cloud backend (see ocr_router), so
+Google Vision is never paid for a page a higher DPI would have fixed.
+
+Tiers come from ocr_dpi_tiers and are capped at the page's render plan, so
+the per-worker memory ceiling still holds. With ocr_adaptive_dpi_enabled
+off, pages are OCR'd once at the plan's DPI.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from app.config import settings
+from app.services.image_preprocessing import active_steps
+from app.services.ocr_executor import raise_if_cancelled
+from app.services.ocr_layout import OCRPageLayout, ocr_page_layout
+from app.services.pdf_rasterizer import plan_pdf_render, render_pdf_page
+
+logger = logging.getLogger(__name__)
+
+# Share of dark pixels below which a page with no recognized words counts as blank
+BLANK_PAGE_INK_RATIO = 0.005
+
+# Grayscale level below which a pixel counts as ink
+INK_THRESHOLD = 128
+
+
+def resolve_dpi_tiers(max_dpi: int, tiers: Optional[List[int]] = None) -> List[int]:
+    """
+    DPI tiers to try for a page, ascending and capped at max_dpi.
+
+    max_dpi is the page's planned (memory-capped) resolution and is always
+    the last tier.
+    """
+    if tiers is None:
+        tiers = settings.ocr_dpi_tiers if settings.ocr_adaptive_dpi_enabled else []
+    return sorted({min(tier, max_dpi) for tier in tiers if tier > 0} | {max_dpi})
+
+
+def needs_escalation(layout: OCRPageLayout, image, min_confidence: float) -> bool:
+    """Whether a page's OCR is too unsure to keep at this resolution"""
+    if layout.words:
+        return layout.mean_confidence < min_confidence
+    return not is_blank_page(image)
+
+
+def is_blank_page(image) -> bool:
+    """A page with almost no dark pixels"""
+    histogram = image.convert('L').histogram()
+    total = sum(histogram)
+    if not total:
+        return True
+    return sum(histogram[:INK_THRESHOLD]) / total < BLANK_PAGE_INK_RATIO
+
+
+def ocr_pdf_page_adaptive(
+    file_path: Union[str, Path],
+    page_number: int,
+    max_dpi: int,
+    config: str = '',
+    lang: Optional[str] = None,
+    tiers: Optional[List[int]] = None,
+    min_confidence: Optional[float] = None
+) -> OCRPageLayout:
+    """
+    OCR one PDF page, escalating resolution only while confidence is low.
+
+    Args:
+        file_path: Path to the PDF
+        page_number: 1-based page number
+        max_dpi: Highest DPI allowed for this page (from its render plan)
+        config: Tesseract config string
+        lang: Tesseract language
+        tiers: DPI tiers (defaults to settings)
+        min_confidence: Mean word confidence (0-100) needed to stop escalating
+
+    Returns:
+        The most confident OCRPageLayout, with .dpi set to the resolution used
+    """
+    if min_confidence is None:
+        min_confidence = settings.ocr_escalation_confidence
+
+    dpi_tiers = resolve_dpi_tiers(max_dpi, tiers)
+    preprocessing_steps = active_steps()
+    best: Optional[OCRPageLayout] = None
+
+    for tier_index, dpi in enumerate(dpi_tiers):
+        is_last_tier = tier_index == len(dpi_tiers) - 1
+        image = render_pdf_page(file_path, page_number, dpi)
+        try:
+            # Only the last tier may escalate to the cloud backend
+            layout = ocr_page_layout(
+                image, config=config, lang=lang, page_number=page_number,
+                preprocessing_steps=preprocessing_steps, allow_remote=is_last_tier
+            )
+            layout.dpi = dpi
+
+            if best is None or layout.mean_confidence > best.mean_confidence:
+                best = layout
+
+            if is_last_tier or not needs_escalation(layout, image, min_confidence):
+                break
+        finally:
+            image.close()
+
+        logger.info(
+            f"Page {page_number}: confidence {layout.mean_confidence:.1f} at {dpi} DPI "
+            f"is below {min_confidence:.0f}, re-rendering at {dpi_tiers[tier_index + 1]} DPI"
+        )
+
+    return best
+
+
+def iter_adaptive_page_layouts(
+    file_path: Union[str, Path],
+    dpi: int = 300,
+    config: str = '',
+    lang: Optional[str] = None
+) -> Iterator[OCRPageLayout]:
+    """
+    Yield one adaptive-resolution OCRPageLayout per page, in page order.
+
+    dpi is the highest resolution any page may be rendered at. Checks the
+    calling OCR job's cancellation token between pages.
+    """
+    for plan in plan_pdf_render(file_path, dpi=dpi):
+        raise_if_cancelled()
+        yield ocr_pdf_page_adaptive(file_path, plan.page_number, plan.dpi, config=config, lang=lang)
+
+
+def adaptive_fingerprint_options() -> dict:
+    """Settings that change adaptive OCR output, for cache fingerprints"""
+    return {
+        'dpi_tiers': settings.ocr_dpi_tiers if settings.ocr_adaptive_dpi_enabled else None,
+        'escalation_confidence': settings.ocr_escalation_confidence,
+        'preprocessing': active_steps()
+    }
@@ -0,0 +1,123 @@
+"""
+INDEXED CONDITION MATCHING
+
+Fuzzy matching of condition names between the parts of a rating decision
+(listed conditions, rated conditions, bilateral conditions), without
+comparing every pair.
+
+MATCH RULE (unchanged from the pairwise check):
+Two names match when, lower-cased and stripped, they are equal, one
+contains the other, or their word sets overlap enough:
+    |words1 & words2| / min(|words1|, |words2|) >= 0.6
+(the overlap coefficient). Containment scores 1.0.
+
+WORKFLOW:
+1. ConditionIndex() normalizes each indexed name once and builds an
+   inverted word index (word -> names)
+2. match_all() normalizes the queries once and gathers candidates per query:
+   - names sharing a word with it (inverted index)
+   - names it contains and names containing it, found with one keyword
+     automaton pass each way instead of pairwise substring tests
+3. Only candidates are scored; a name with no shared word and no
+   containment cannot match, so nothing else is compared
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from app.services.keyword_automaton import KeywordAutomaton
+
+logger = logging.getLogger(__name__)
+
+# Minimum overlap coefficient of the two word sets
+MIN_WORD_OVERLAP = 0.6
+
+
+def normalize_condition(name: str) -> str:
+    """Lower-cased, stripped condition name (the form every comparison uses)"""
+    return name.lower().strip()
+
+
+def similarity(normalized1: str, normalized2: str, words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
+    """Overlap coefficient of the word sets; 1.0 when one name contains the other"""
+    if normalized1 in normalized2 or normalized2 in normalized1:
+        return 1.0
+    shortest = min(len(words1), len(words2))
+    return len(words1 & words2) / shortest if shortest else 1.0
+
+
+def conditions_match(cond1: str, cond2: str) -> bool:
+    """Check if two condition names match (fuzzy)"""
+    normalized1 = normalize_condition(cond1)
+    normalized2 = normalize_condition(cond2)
+    return similarity(
+        normalized1, normalized2, frozenset(normalized1.split()), frozenset(normalized2.split())
+    ) >= MIN_WORD_OVERLAP
+
+
+def _containment_automaton(names: List[str]) -> Optional[KeywordAutomaton]:
+    names = [name for name in dict.fromkeys(names) if name]
+    return KeywordAutomaton(names, whole_words=False) if names else None
+
+
+class ConditionIndex:
+    """Condition names normalized once, with an inverted word index"""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+        self._normalized = [normalize_condition(name) for name in self.names]
+        self._words = [frozenset(name.split()) for name in self._normalized]
+
+        self._by_word: Dict[str, List[int]] = defaultdict(list)
+        self._by_name: Dict[str, List[int]] = defaultdict(list)
+        self._empty: List[int] = []  # An empty name is contained in every name
+        for position, (normalized, words) in enumerate(zip(self._normalized, self._words)):
+            self._by_name[normalized].append(position)
+            for word in words:
+                self._by_word[word].append(position)
+            if not normalized:
+                self._empty.append(position)
+
+        self._automaton = _containment_automaton(self._normalized)
+
+    def match_all(self, queries: Iterable[str]) -> List[List[int]]:
+        """
+        For each query, the positions of the indexed names it matches, in
+        index order.
+        """
+        queries = [normalize_condition(query) for query in queries]
+
+        # Indexed names containing each query: one automaton pass per indexed name
+        containing: Dict[str, Set[int]] = defaultdict(set)
+        query_automaton = _containment_automaton(queries)
+        if query_automaton is not None:
+            for position, normalized in enumerate(self._normalized):
+                for query in query_automaton.matched_labels(normalized):
+                    containing[query].add(position)
+
+        results = []
+        for query in queries:
+            if not query:
+                # Contained in every name
+                results.append(list(range(len(self.names))))
+                continue
+
+            words = frozenset(query.split())
+            candidates = set(self._empty) | containing[query]
+            if self._automaton is not None:
+                for name in self._automaton.matched_labels(query):
+                    candidates.update(self._by_name[name])
+            for word in words:
+                candidates.update(self._by_word.get(word, ()))
+
+            results.append([
+                position for position in sorted(candidates)
+                if similarity(query, self._normalized[position], words, self._words[position]) >= MIN_WORD_OVERLAP
+            ])
+
+        return results
+
+    def first_matches(self, queries: Iterable[str]) -> List[Optional[int]]:
+        """For each query, the first indexed name it matches (None if none)"""
+        return [matches[0] if matches else None for matches in self.match_all(queries)]
@@ -6,6 +6,7 @@ Uses multiple OCR engines (Tesseract + Cloud Vision) with fallback logic.
 
 Features:
 - PDF and image processing with Poppler dependency checks
+- Page-by-page OCR that stops once every required field is read (multi-copy forms)
 - Service date extraction
 - Branch determination
 - Combat service indicators
@@ -14,11 +15,9 @@ Features:
 - Structured error handling with diagnostics
 """
 
-import io
 import re
 import logging
-import subprocess
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import os
 from pathlib import Path
@@ -34,18 +33,38 @@ try:
 except ImportError:
     HAS_PDF2IMAGE = False
 
-# Google Cloud Vision (optional - for high-accuracy backup)
-try:
-    from google.cloud import vision
-    HAS_GOOGLE_VISION = True
-except ImportError:
-    HAS_GOOGLE_VISION = False
-
-from app.utils.ocr_diagnostics import OCRDependencyManager, OCRDiagnosticResult
+from app.services.adaptive_ocr import adaptive_fingerprint_options, iter_adaptive_page_layouts
+from app.services.early_stop import RequiredFieldTracker
+from app.services.field_extraction import FieldMatches, compile_field_scanner
+from app.services.field_normalization import normalize_date, normalize_grade_rank, normalize_pay_grade
+from app.services.keyword_automaton import KeywordAutomaton
+from app.services.dd214_template import (
+    TEMPLATE_VERSION,
+    scan_dd214_image_template,
+    scan_dd214_pdf_template,
+    split_primary_specialty,
+    template_cache_pages,
+)
+from app.services.image_preprocessing import active_steps
+from app.services.ocr_cache import get_ocr_cache, hash_file, ocr_fingerprint, layout_cache_pages
+from app.services.ocr_executor import OCRJobTimeout, raise_if_cancelled, run_ocr_job
+from app.services.ocr_layout import ocr_page_layout
+from app.services.ocr_router import get_ocr_router
+from app.services.pdf_rasterizer import plan_pdf_render, render_pdf_page
+from app.utils.ocr_capabilities import get_ocr_capabilities
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Match date patterns: MM/DD/YYYY, MM-DD-YYYY, Month DD, YYYY, etc.
+DATE_PATTERNS = [
+    re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),
+    re.compile(r'\d{1,2}-\d{1,2}-\d{4}'),
+    re.compile(r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{4}'),
+]
+AWARD_SECTION_SPLIT = re.compile(r'(?:awards?|decorations?|citations?)[:\s]*', re.IGNORECASE)
+AWARD_BULLET = re.compile(r'^\s*[\-•*]\s*')
+
 
 class DD214OCRScanner:
     """Extract data from DD-214 documents using OCR"""
@@ -77,61 +96,61 @@ class DD214OCRScanner:
         'space force': ['ussf', 'us space force', 'space force'],
     }
 
-    def __init__(self):
-        """Initialize scanner with OCR engines and dependency checks"""
-        # Initialize dependency manager
-        self.dep_manager = OCRDependencyManager(
-            poppler_path=settings.poppler_path,
-            tesseract_path=settings.tesseract_path
-        )
+    # Explicit combat indicators
+    COMBAT_INDICATORS = ['combat zone', 'hostile fire', 'imminent danger', 'combat related']
+
+    # Keyword vocabularies, each matched in one pass
+    BRANCH_KEYWORDS = KeywordAutomaton(BRANCHES)
+    COMBAT_LOCATION_KEYWORDS = KeywordAutomaton(COMBAT_LOCATIONS)
+    COMBAT_KEYWORDS = KeywordAutomaton(COMBAT_LOCATIONS + COMBAT_AWARDS + COMBAT_INDICATORS)
+
+    # Keyword-parsed fields, matched in one pass over the OCR text
+    FIELD_PATTERNS = {
+        'entry_anchor': r'entry|begin service|entered active',
+        'separation_anchor': r'separation|released|discharged',
+        'years_of_service': r'years?\s+of\s+service[:\s]+(\d+)',
+        'total_service': r'total\s+service[:\s]+(\d+)\s+years?',
+        'active_service': r'(\d+)\s+years?\s+(?:active\s+)?service',
+        'rank_enlisted': r'e-?([1-9])',
+        'rank_officer': r'o-?([1-9])',
+        'rank_warrant': r'w-?([1-5])',
+        'pay_grade': r'pay\s+grade[:\s]+([A-Z0-9\-]+)',
+        'character_of_discharge': r'character\s+of\s+discharge[:\s]+([^\n\r]+)',
+        'discharge_type': r'(honorable|general|under\s+honorable|other\s+than\s+honorable|oth|bad\s+conduct|dishonorable)',
+        'separation_code': r'(?:separation\s+)?code[:\s]+([A-Z0-9]+)',
+        'mos_code': r'(?:mos|military occupational specialty)[:\s]*([0-9A-Z]{3,6})',
+        'duty_mos_code': r'(?:duty\s+mos|final\s+mos)[:\s]*([0-9A-Z]{3,6})',
+        'mos_title': r'(?:mos|occupational)[^:]*:[^\n]*(?:=)\s*([^\n]+)',
+        'specialty_title': r'specialty\s*:\s*([^\n]+)',
+        'skills': r'(?:skills?|specialties?)[:\s]*([A-Z\s,]+)',
+        'narrative_reason': r'(?:narrative\s+)?(?:reason|explanation)[:\s]*([^\n]+)',
+        'comments': r'(?:comments?)[:\s]*([^\n]+)',
+    }
+
+    # Fields every copy of the form carries; once read, further copies are not OCR'd (continuation sheets still are)
+    EARLY_STOP_FIELDS = ['branch', 'entry_date', 'separation_date', 'rank', 'character_of_service']
 
-        # Check dependencies
-        self.tesseract_available = self._check_tesseract()
-        self.google_vision_available = HAS_GOOGLE_VISION
-        self.poppler_available = self._check_poppler()
+    # Fields read with a single re.search
+    FIRST_ONLY_FIELDS = [
+        name for name in FIELD_PATTERNS if not name.startswith('rank_')
+    ]
 
-        # Log diagnostics on initialization
-        diagnostics = self.dep_manager.run_diagnostics()
-        self._log_diagnostics(diagnostics)
+    def __init__(self):
+        """Initialize scanner (dependency availability comes from the process-wide capability registry)"""
+        self.capabilities = get_ocr_capabilities()
+        self.scanner = compile_field_scanner(self.FIELD_PATTERNS, first_only=self.FIRST_ONLY_FIELDS)
 
-    def _check_tesseract(self) -> bool:
-        """Check if Tesseract OCR is available"""
-        try:
-            pytesseract.get_tesseract_version()
-            logger.info("Tesseract OCR is available")
-            return True
-        except Exception as e:
-            logger.warning(f"Tesseract not available: {e}")
-            return False
+    @property
+    def tesseract_available(self) -> bool:
+        return self.capabilities.tesseract_available
 
-    def _check_poppler(self) -> bool:
-        """Check if Poppler is available"""
-        try:
-            result = subprocess.run(['pdfinfo', '-v'], capture_output=True, timeout=5)
-            if result.returncode == 0:
-                logger.info("Poppler (pdfinfo) is available")
-                return True
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-        logger.warning("Poppler not available")
-        return False
-
-    def _log_diagnostics(self, diagnostics: OCRDiagnosticResult):
-        """Log OCR diagnostics"""
-        if diagnostics.errors:
-            for error in diagnostics.errors:
-                logger.error(f"OCR ERROR: {error}")
-
-        if diagnostics.warnings:
-            for warning in diagnostics.warnings:
-                logger.warning(f"OCR WARNING: {warning}")
-
-        if diagnostics.recommendations:
-            logger.info("OCR RECOMMENDATIONS:")
-            for rec in diagnostics.recommendations:
-                logger.info(f"  - {rec}")
-
-        logger.info(f"OCR Ready for PDF: {diagnostics.ready_for_pdf_ocr}")
+    @property
+    def poppler_available(self) -> bool:
+        return self.capabilities.poppler_available
+
+    @property
+    def google_vision_available(self) -> bool:
+        return get_ocr_router().has_backend('google_vision')
 
     async def scan_dd214(self, file_path: str) -> Dict:
         """
@@ -168,10 +187,10 @@ class DD214OCRScanner:
             # Extract text from file
             if file_ext == '.pdf':
                 logger.info(f"Processing PDF: {file_path}")
-                text = await self._extract_from_pdf(file_path)
+                text, pages = await self._extract_from_pdf(file_path)
             elif file_ext in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
                 logger.info(f"Processing image: {file_path}")
-                text = await self._extract_from_image(file_path)
+                text, pages = await self._extract_from_image(file_path)
             else:
                 raise ValueError({
                     'error_code': 'UNSUPPORTED_FILE_TYPE',
@@ -188,9 +207,13 @@ class DD214OCRScanner:
 
             # Parse extracted text
             extracted_data = self._parse_dd214_text(text)
+            template_fields = pages[0].get('fields') if pages else None
+            if template_fields:
+                self._apply_template_fields(extracted_data, template_fields)
             extracted_data['raw_text'] = text
-            extracted_data['extraction_method'] = 'OCR'
+            extracted_data['extraction_method'] = 'OCR_TEMPLATE' if template_fields else 'OCR'
             extracted_data['extraction_confidence'] = self._calculate_confidence(extracted_data)
+            extracted_data['ocr_confidence'] = self._ocr_confidence(pages)
 
             logger.info(f"DD-214 scan complete: Confidence={extracted_data['extraction_confidence']}")
             return extracted_data
@@ -207,64 +230,30 @@ class DD214OCRScanner:
                 'recommended_fix': 'Try uploading the document again or contact support'
             })
 
-    async def _extract_from_pdf(self, file_path: str) -> str:
-        """
-        Extract text from PDF using multiple methods
+    async def _run_tesseract_job(self, extract, file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Run a blocking Tesseract extraction on the OCR executor"""
+        try:
+            return await run_ocr_job(extract, file_path)
+        except OCRJobTimeout as e:
+            raise ValueError({
+                'error_code': 'OCR_TIMEOUT',
+                'message': f'OCR did not finish in time: {e}',
+                'recommended_fix': 'Upload a smaller or clearer scan, or try again later'
+            })
 
-        First attempts to verify PDF with Poppler (pdfinfo),
-        then uses Tesseract or Google Vision for OCR.
+    async def _extract_from_pdf(self, file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
         """
-        text = ""
-
-        # Step 1: Verify PDF with Poppler
-        logger.info("Verifying PDF with Poppler...")
-        can_process, verification_msg = self.dep_manager.verify_pdf_for_processing(file_path)
-
-        if not can_process:
-            error_msg = f"Poppler verification failed: {verification_msg}"
-            logger.error(error_msg)
-
-            if "pdfinfo" in verification_msg or "not found in PATH" in verification_msg:
-                raise ValueError({
-                    'error_code': 'MISSING_POPPLER',
-                    'message': 'Poppler is not installed or not in system PATH',
-                    'details': verification_msg,
-                    'recommended_fix': (
-                        'Install Poppler from https://github.com/oschwartz10612/poppler-windows/releases/ '
-                        'or run: apt-get install poppler-utils (Linux), '
-                        'or brew install poppler (macOS)'
-                    )
-                })
-            else:
-                raise ValueError({
-                    'error_code': 'INVALID_PDF',
-                    'message': f'PDF validation failed: {verification_msg}',
-                    'recommended_fix': 'Verify the PDF file is valid and not corrupted'
-                })
-
-        logger.info(f"PDF verification successful: {verification_msg}")
-
-        # Step 2: Try Tesseract OCR
-        if not HAS_PDF2IMAGE:
-            logger.warning("pdf2image not available, cannot process PDF with Tesseract")
-        elif self.tesseract_available:
-            try:
-                logger.info("Extracting text from PDF with Tesseract...")
-                images = pdf2image.convert_from_path(file_path)
-                logger.info(f"PDF converted to {len(images)} image(s)")
+        Extract text from PDF using multiple methods
 
-                for page_num, image in enumerate(images, 1):
-                    logger.info(f"Running OCR on page {page_num}/{len(images)}...")
-                    page_text = pytesseract.image_to_string(image, lang='eng')
-                    text += page_text
-                    text += "\n---PAGE BREAK---\n"
-                    logger.debug(f"Page {page_num} OCR complete: {len(page_text)} characters extracted")
+        Tesseract (with Poppler verification) runs on the OCR executor;
+        Google Vision is the fallback.
 
-                if text:
-                    logger.info(f"Tesseract extraction successful: {len(text)} total characters")
-                    return text
-            except Exception as e:
-                logger.warning(f"Tesseract PDF extraction failed: {e}")
+        Returns:
+            (text, per-page text/confidence; empty when Google Vision was used)
+        """
+        text, pages = await self._run_tesseract_job(self._extract_pdf_with_tesseract, file_path)
+        if text:
+            return text, pages
 
         # Step 3: Try Google Cloud Vision if Tesseract failed
         if self.google_vision_available:
@@ -272,7 +261,7 @@ class DD214OCRScanner:
                 logger.info("Falling back to Google Cloud Vision...")
                 text = await self._extract_with_google_vision(file_path)
                 logger.info("Google Vision extraction successful")
-                return text
+                return text, []
             except Exception as e:
                 logger.warning(f"Google Vision extraction failed: {e}")
 
@@ -289,17 +278,115 @@ class DD214OCRScanner:
             )
         })
 
-    async def _extract_from_image(self, file_path: str) -> str:
-        """Extract text from image"""
-        text = ""
+    def _extract_pdf_with_tesseract(self, file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Blocking Tesseract extraction of a PDF
 
-        # Try Tesseract
-        if self.tesseract_available:
+        Returns cached OCR output for previously scanned content; otherwise
+        first verifies the PDF (cached Poppler check, in-process page parse), then reads page 1 by
+        the DD-214 form template, falling back to OCRing page by page in full until the
+        required fields are read (see early_stop) or the pages run out.
+
+        Returns:
+            (text, per-page text/confidence), or ("", []) if Tesseract could not extract text
+        """
+        layouts = []
+        page_tracker = None
+        if settings.dd214_early_stop_enabled:
+            page_tracker = RequiredFieldTracker(self._early_stop_fields, self.EARLY_STOP_FIELDS)
+
+        cache = get_ocr_cache()
+        file_hash = hash_file(file_path)
+        fingerprint = ocr_fingerprint(
+            'dd214_scanner', lang='eng', dpi=200, template=TEMPLATE_VERSION,
+            early_stop=page_tracker.fingerprint_options() if page_tracker else None,
+            **adaptive_fingerprint_options()
+        )
+
+        cached_pages = cache.get(file_hash, fingerprint)
+        if cached_pages is not None:
+            return self._join_pdf_pages(cached_pages), cached_pages
+
+        # Step 1: Verify PDF (Poppler from the capability snapshot, validity from the in-process parse)
+        page_count = self._verify_pdf(file_path)
+        logger.info(f"PDF verification successful: PDF has {page_count} pages")
+
+        # Step 2: Try Tesseract OCR
+        if not HAS_PDF2IMAGE:
+            logger.warning("pdf2image not available, cannot process PDF with Tesseract")
+        elif self.tesseract_available:
             try:
-                image = Image.open(file_path)
-                text = pytesseract.image_to_string(image, lang='eng')
+                template = scan_dd214_pdf_template(file_path)
+                if template:
+                    pages = template_cache_pages(template)
+                    cache.put(file_hash, fingerprint, pages)
+                    return self._join_pdf_pages(pages), pages
+
+                logger.info("Extracting text from PDF with Tesseract...")
+                # Render and OCR one page at a time, escalating up to 200 DPI only where needed
+                for layout in iter_adaptive_page_layouts(file_path, dpi=200, lang='eng'):
+                    layouts.append(layout)
+                    logger.debug(
+                        f"Page {layout.page_number} OCR complete at {layout.dpi} DPI: "
+                        f"{len(layout.text)} characters extracted"
+                    )
+                    # Leaving the page loop early means the later pages are never rendered
+                    if page_tracker and page_tracker.add_page(
+                        layout.page_number, layout.text, layout.mean_confidence / 100
+                    ):
+                        if layout.page_number < page_count:
+                            logger.info(
+                                f"Required fields complete after page {layout.page_number} "
+                                f"of {page_count}, skipping the rest"
+                            )
+                        break
+
+                pages = layout_cache_pages(layouts)
+                text = self._join_pdf_pages(pages)
+
+                if text:
+                    logger.info(f"Tesseract extraction successful: {len(text)} total characters")
+                    cache.put(file_hash, fingerprint, pages)
+                    return text, pages
             except Exception as e:
-                logger.warning(f"Tesseract image extraction failed: {e}")
+                logger.warning(f"Tesseract PDF extraction failed: {e}")
+
+        return "", []
+
+    def _verify_pdf(self, file_path: str) -> int:
+        """Page count of a PDF that can be rendered, else a structured error"""
+        if not self.poppler_available:
+            raise ValueError({
+                'error_code': 'MISSING_POPPLER',
+                'message': 'Poppler is not installed or not in system PATH',
+                'details': '; '.join(self.capabilities.snapshot().errors),
+                'recommended_fix': (
+                    'Install Poppler from https://github.com/oschwartz10612/poppler-windows/releases/ '
+                    'or run: apt-get install poppler-utils (Linux), '
+                    'or brew install poppler (macOS)'
+                )
+            })
+
+        try:
+            page_count = len(plan_pdf_render(file_path, dpi=200))
+        except Exception as e:
+            page_count = 0
+            verification_msg = f"Could not parse PDF: {e}"
+        else:
+            verification_msg = "PDF has no pages"
+
+        if not page_count:
+            logger.error(f"PDF verification failed: {verification_msg}")
+            raise ValueError({
+                'error_code': 'INVALID_PDF',
+                'message': f'PDF validation failed: {verification_msg}',
+                'recommended_fix': 'Verify the PDF file is valid and not corrupted'
+            })
+        return page_count
+
+    async def _extract_from_image(self, file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Extract text from image"""
+        text, pages = await self._run_tesseract_job(self._extract_image_with_tesseract, file_path)
 
         # Try Google Vision if Tesseract failed
         if not text and self.google_vision_available:
@@ -311,88 +398,123 @@ class DD214OCRScanner:
         if not text:
             raise ValueError("Could not extract text from image using available OCR engines")
 
-        return text
+        return text, pages
 
-    async def _extract_with_google_vision(self, file_path: str) -> str:
-        """Extract text using Google Cloud Vision API"""
-        if not HAS_GOOGLE_VISION:
-            raise ValueError("Google Cloud Vision not available")
+    def _extract_image_with_tesseract(self, file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Blocking Tesseract extraction of an image (cached by content)"""
+        text = ""
+        pages: List[Dict[str, Any]] = []
+
+        cache = get_ocr_cache()
+        file_hash = hash_file(file_path)
+        fingerprint = ocr_fingerprint('dd214_scanner', lang='eng', preprocessing=active_steps(), template=TEMPLATE_VERSION)
 
-        client = vision.ImageAnnotatorClient()
+        cached_pages = cache.get(file_hash, fingerprint)
+        if cached_pages is not None:
+            return cached_pages[0]['text'], cached_pages
 
-        with io.open(file_path, 'rb') as image_file:
-            content = image_file.read()
+        # Try Tesseract
+        if self.tesseract_available:
+            try:
+                template = scan_dd214_image_template(file_path)
+                if template:
+                    pages = template_cache_pages(template)
+                else:
+                    with Image.open(file_path) as image:
+                        layout = ocr_page_layout(
+                            image, lang='eng', preprocessing_steps=active_steps(), allow_remote=True
+                        )
+                    pages = layout_cache_pages([layout])
+                text = pages[0]['text']
+                if text:
+                    cache.put(file_hash, fingerprint, pages)
+            except Exception as e:
+                logger.warning(f"Tesseract image extraction failed: {e}")
 
-        image = vision.Image(content=content)
-        response = client.document_text_detection(image=image)
+        return text, pages
 
-        if response.full_text_annotation:
-            return response.full_text_annotation.text
-        else:
+    async def _extract_with_google_vision(self, file_path: str) -> str:
+        """Extract text using Google Cloud Vision (via the shared OCR router)"""
+        text = await run_ocr_job(self._google_vision_text, file_path)
+        if not text:
             raise ValueError("No text found in image by Google Vision")
+        return text
+
+    def _google_vision_text(self, file_path: str) -> str:
+        """Blocking Google Vision OCR of an image, or of each page of a PDF"""
+        router = get_ocr_router()
+        if not router.has_backend('google_vision'):
+            raise ValueError("Google Cloud Vision not available")
+
+        if Path(file_path).suffix.lower() != '.pdf':
+            with Image.open(file_path) as image:
+                return router.recognize_on('google_vision', image).text
+
+        pages = []
+        for plan in plan_pdf_render(file_path, dpi=200):
+            raise_if_cancelled()
+            image = render_pdf_page(file_path, plan.page_number, plan.dpi)
+            try:
+                layout = router.recognize_on('google_vision', image, page_number=plan.page_number)
+            finally:
+                image.close()
+            pages.append({'page_number': plan.page_number, 'text': layout.text})
+        return self._join_pdf_pages(pages)
 
     def _parse_dd214_text(self, text: str) -> Dict:
         """Parse extracted DD-214 text and extract structured data"""
-        text_lower = text.lower()
+        matches = self.scanner.scan(text)
         data = {
-            'branch': self._extract_branch(text_lower),
-            'entry_date': self._extract_date(text, 'entry|begin service|entered active'),
-            'separation_date': self._extract_date(text, 'separation|released|discharged'),
-            'years_of_service': self._extract_years_of_service(text),
-            'rank': self._extract_rank(text),
-            'pay_grade': self._extract_pay_grade(text),
-            'character_of_service': self._extract_character_of_service(text),
-            'separation_code': self._extract_separation_code(text),
-            'combat_service': self._detect_combat_service(text_lower),
-            'combat_locations': self._extract_combat_locations(text_lower),
+            'branch': self._extract_branch(text),
+            'entry_date': self._extract_date(text, matches.first('entry_anchor')),
+            'separation_date': self._extract_date(text, matches.first('separation_anchor')),
+            'years_of_service': self._extract_years_of_service(matches),
+            'rank': self._extract_rank(matches),
+            'pay_grade': self._extract_pay_grade(matches),
+            'character_of_service': self._extract_character_of_service(matches),
+            'separation_code': self._extract_separation_code(matches),
+            'combat_service': self._detect_combat_service(text),
+            'combat_locations': self._extract_combat_locations(text),
             'awards': self._extract_awards(text),
-            'mos_code': self._extract_mos_code(text),
-            'mos_title': self._extract_mos_title(text),
-            'specialties': self._extract_specialties(text),
-            'narrative_reason': self._extract_narrative_reason(text)
+            'mos_code': self._extract_mos_code(matches),
+            'mos_title': self._extract_mos_title(matches),
+            'specialties': self._extract_specialties(matches),
+            'narrative_reason': self._extract_narrative_reason(matches)
         }
         return data
 
-    def _extract_branch(self, text_lower: str) -> str:
+    def _early_stop_fields(self, page_text: str) -> Dict:
+        """Fields as parsed from a single page, dates normalized so differently formatted copies agree"""
+        data = self._parse_dd214_text(page_text)
+        for key in ('entry_date', 'separation_date'):
+            data[key] = normalize_date(data[key]) or data[key]
+        return data
+
+    def _extract_branch(self, text: str) -> str:
         """Extract military branch"""
-        for branch, keywords in self.BRANCHES.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return branch.title()
-        return ""
+        branch = self.BRANCH_KEYWORDS.first_label(text)
+        return branch.title() if branch else ""
 
-    def _extract_date(self, text: str, pattern: str) -> Optional[str]:
-        """Extract date near pattern"""
-        # Match date patterns: MM/DD/YYYY, MM-DD-YYYY, Month DD, YYYY, etc.
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{1,2}-\d{1,2}-\d{4}',
-            r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{4}',
-        ]
+    def _extract_date(self, text: str, anchor: Optional[re.Match]) -> Optional[str]:
+        """Extract date near an anchor keyword match"""
+        if anchor is None:
+            return None
 
-        text_lower = text.lower()
-        # Find section near pattern
-        if re.search(pattern, text_lower):
-            idx = re.search(pattern, text_lower).start()
-            section = text[max(0, idx - 100):min(len(text), idx + 100)]
+        # Find section near the anchor
+        idx = anchor.start()
+        section = text[max(0, idx - 100):min(len(text), idx + 100)]
 
-            for date_pattern in date_patterns:
-                match = re.search(date_pattern, section)
-                if match:
-                    return match.group()
+        for date_pattern in DATE_PATTERNS:
+            match = date_pattern.search(section)
+            if match:
+                return match.group()
 
         return None
 
-    def _extract_years_of_service(self, text: str) -> Optional[int]:
+    def _extract_years_of_service(self, matches: FieldMatches) -> Optional[int]:
         """Extract years of service"""
-        patterns = [
-            r'years?\s+of\s+service[:\s]+(\d+)',
-            r'total\s+service[:\s]+(\d+)\s+years?',
-            r'(\d+)\s+years?\s+(?:active\s+)?service',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for field in ('years_of_service', 'total_service', 'active_service'):
+            match = matches.first(field)
             if match:
                 try:
                     return int(match.group(1))
@@ -401,73 +523,51 @@ class DD214OCRScanner:
 
         return None
 
-    def _extract_rank(self, text: str) -> str:
+    def _extract_rank(self, matches: FieldMatches) -> str:
         """Extract highest rank held"""
-        rank_patterns = {
-            'E': r'e-?([1-9])',  # Enlisted
-            'O': r'o-?([1-9])',  # Officer
-            'W': r'w-?([1-5])',  # Warrant officer
+        rank_fields = {
+            'E': 'rank_enlisted',  # Enlisted
+            'O': 'rank_officer',  # Officer
+            'W': 'rank_warrant',  # Warrant officer
         }
 
         ranks_found = []
-        for category, pattern in rank_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                ranks_found.append(f"{category}{match}")
+        for category, field in rank_fields.items():
+            for match in matches.findall(field):
+                rank = normalize_pay_grade(f"{category}{match}")
+                if rank not in ranks_found:
+                    ranks_found.append(rank)
 
         return ' / '.join(ranks_found) if ranks_found else ""
 
-    def _extract_pay_grade(self, text: str) -> str:
+    def _extract_pay_grade(self, matches: FieldMatches) -> str:
         """Extract pay grade"""
-        match = re.search(r'pay\s+grade[:\s]+([A-Z0-9\-]+)', text, re.IGNORECASE)
-        return match.group(1) if match else ""
+        match = matches.first('pay_grade')
+        if not match:
+            return ""
+        return normalize_pay_grade(match.group(1)) or match.group(1)
 
-    def _extract_character_of_service(self, text: str) -> str:
+    def _extract_character_of_service(self, matches: FieldMatches) -> str:
         """Extract character of discharge"""
-        patterns = [
-            r'character\s+of\s+discharge[:\s]+([^\n\r]+)',
-            r'(honorable|general|under\s+honorable|other\s+than\s+honorable|oth|bad\s+conduct|dishonorable)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for field in ('character_of_discharge', 'discharge_type'):
+            match = matches.first(field)
             if match:
                 return match.group(1).title()
 
         return ""
 
-    def _extract_separation_code(self, text: str) -> str:
+    def _extract_separation_code(self, matches: FieldMatches) -> str:
         """Extract separation code"""
-        match = re.search(r'(?:separation\s+)?code[:\s]+([A-Z0-9]+)', text, re.IGNORECASE)
+        match = matches.first('separation_code')
         return match.group(1) if match else ""
 
-    def _detect_combat_service(self, text_lower: str) -> bool:
-        """Detect if veteran has combat service"""
-        # Check for combat location mentions
-        for location in self.COMBAT_LOCATIONS:
-            if location in text_lower:
-                return True
-
-        # Check for combat awards
-        for award in self.COMBAT_AWARDS:
-            if award in text_lower:
-                return True
-
-        # Check for explicit combat indicators
-        combat_indicators = ['combat zone', 'hostile fire', 'imminent danger', 'combat related']
-        for indicator in combat_indicators:
-            if indicator in text_lower:
-                return True
-
-        return False
+    def _detect_combat_service(self, text: str) -> bool:
+        """Detect if veteran has combat service (combat locations, combat awards or explicit indicators)"""
+        return self.COMBAT_KEYWORDS.contains_any(text)
 
-    def _extract_combat_locations(self, text_lower: str) -> List[str]:
+    def _extract_combat_locations(self, text: str) -> List[str]:
         """Extract combat deployment locations"""
-        locations = []
-        for location in self.COMBAT_LOCATIONS:
-            if location in text_lower:
-                locations.append(location.title())
-        return locations
+        return [location.title() for location in self.COMBAT_LOCATION_KEYWORDS.matched_labels(text)]
 
     def _extract_awards(self, text: str) -> List[str]:
         """Extract awards and decorations"""
@@ -477,74 +577,110 @@ class DD214OCRScanner:
         ]
 
         # Split by common award delimiters
-        sections = re.split(r'(?:awards?|decorations?|citations?)[:\s]*', text, flags=re.IGNORECASE)
+        sections = AWARD_SECTION_SPLIT.split(text)
 
         for section in sections[1:]:  # Skip first section
             lines = section.split('\n')
             for line in lines[:10]:  # First 10 lines after "Awards" section
                 if any(keyword in line.lower() for keyword in award_keywords):
-                    clean_line = re.sub(r'^\s*[\-•*]\s*', '', line).strip()
+                    clean_line = AWARD_BULLET.sub('', line).strip()
                     if len(clean_line) > 5 and len(clean_line) < 100:
                         awards.append(clean_line)
 
         return list(set(awards))  # Remove duplicates
 
-    def _extract_mos_code(self, text: str) -> str:
+    def _extract_mos_code(self, matches: FieldMatches) -> str:
         """Extract Military Occupational Specialty code"""
         # MOS codes are typically 5 digit codes or similar formats
-        patterns = [
-            r'(?:mos|military occupational specialty)[:\s]*([0-9A-Z]{3,6})',
-            r'(?:duty\s+mos|final\s+mos)[:\s]*([0-9A-Z]{3,6})',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for field in ('mos_code', 'duty_mos_code'):
+            match = matches.first(field)
             if match:
                 return match.group(1)
 
         return ""
 
-    def _extract_mos_title(self, text: str) -> str:
+    def _extract_mos_title(self, matches: FieldMatches) -> str:
         """Extract MOS title/description"""
-        patterns = [
-            r'(?:mos|occupational)[^:]*:[^\n]*(?:=)\s*([^\n]+)',
-            r'specialty\s*:\s*([^\n]+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for field in ('mos_title', 'specialty_title'):
+            match = matches.first(field)
             if match:
                 return match.group(1).strip()
 
         return ""
 
-    def _extract_specialties(self, text: str) -> List[str]:
+    def _extract_specialties(self, matches: FieldMatches) -> List[str]:
         """Extract skill identifiers and specialties"""
         specialties = []
 
         # Look for skill identifier patterns (like "P" for Parachute, "S" for SCUBA, etc.)
-        skill_patterns = r'(?:skills?|specialties?)[:\s]*([A-Z\s,]+)'
-        match = re.search(skill_patterns, text, re.IGNORECASE)
+        match = matches.first('skills')
         if match:
             skills = match.group(1).split(',')
             specialties.extend([s.strip() for s in skills if s.strip()])
 
         return specialties
 
-    def _extract_narrative_reason(self, text: str) -> str:
+    def _extract_narrative_reason(self, matches: FieldMatches) -> str:
         """Extract narrative reason for separation"""
-        patterns = [
-            r'(?:narrative\s+)?(?:reason|explanation)[:\s]*([^\n]+)',
-            r'(?:comments?)[:\s]*([^\n]+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for field in ('narrative_reason', 'comments'):
+            match = matches.first(field)
             if match:
                 return match.group(1).strip()
 
         return ""
 
+    def _apply_template_fields(self, data: Dict, fields: Dict[str, Any]):
+        """Overlay fields read from known DD-214 blocks on the keyword-parsed data"""
+        branch_text = (fields.get('branch') or '').lower()
+        for branch in self.BRANCHES:
+            if branch in branch_text:
+                data['branch'] = branch.title()
+                break
+
+        for key, name in [('entry_date', 'date_entered'), ('separation_date', 'separation_date')]:
+            if fields.get(name):
+                year, month, day = fields[name].split('-')
+                data[key] = f"{month}/{day}/{year}"
+
+        service = [fields[name] for name in ('net_active_service', 'total_prior_active') if fields.get(name)]
+        if service:
+            data['years_of_service'] = sum(period['years'] for period in service)
+
+        for key, name in [
+            ('rank', 'grade_rank'),
+            ('pay_grade', 'pay_grade'),
+            ('character_of_service', 'character_of_service'),
+            ('separation_code', 'separation_code'),
+            ('narrative_reason', 'narrative_reason'),
+        ]:
+            if fields.get(name):
+                data[key] = fields[name]
+
+        if fields.get('grade_rank'):
+            data['rank'] = normalize_grade_rank(fields['grade_rank'])
+
+        if fields.get('character_of_service'):
+            data['character_of_service'] = fields['character_of_service'].title()
+
+        if fields.get('decorations'):
+            data['awards'] = fields['decorations']
+
+        mos_code, mos_title = split_primary_specialty(fields.get('primary_specialty'))
+        if mos_code:
+            data['mos_code'] = mos_code
+        if mos_title:
+            data['mos_title'] = mos_title
+
+    def _join_pdf_pages(self, pages: List[Dict[str, Any]]) -> str:
+        """Join per-page OCR text with the scanner's page break markers"""
+        return ''.join(page['text'] + "\n---PAGE BREAK---\n" for page in pages)
+
+    def _ocr_confidence(self, pages: List[Dict[str, Any]]) -> Optional[float]:
+        """Mean OCR word confidence (0-1) across pages, None if no Tesseract output"""
+        if not pages:
+            return None
+        return round(sum(page['confidence'] for page in pages) / len(pages), 4)
+
     def _calculate_confidence(self, data: Dict) -> str:
         """Calculate extraction confidence score"""
         score = 0
@@ -0,0 +1,389 @@
+"""
+DD-214 FORM TEMPLATE ENGINE
+
+Region OCR for the fixed-layout DD-214 (Certificate of Release or Discharge
+from Active Duty, August 2009 edition, Member-1 copy).
+
+The DD-214 is a fixed government form, so the blocks we care about are
+always in the same place relative to the form's printed anchors. Instead of
+OCRing the whole page and regex-hunting for "pay grade" or "separation
+code", the form is registered once and only the value area of each known
+block is OCR'd, with a Tesseract mode and character whitelist suited to the
+field.
+
+WORKFLOW:
+1. Registration: OCR two small strips for the anchor text (the form title
+   at the top, "DD FORM 214" in the footer) and solve scale + offset that
+   map template coordinates (PDF points on a Letter page) to image pixels
+2. Region OCR: crop each block's value area and OCR it alone
+   (--psm 7 single line, --psm 6 multi-line block, per-field whitelist)
+3. Normalization: pay grade -> "E-4", YYYY MM DD -> ISO date, durations ->
+   years/months/days, decorations split on "//"
+
+If no anchor is found, or too few fields come back, the caller falls back
+to full-page OCR; nothing here guesses at a layout it cannot see.
+
+BLOCKS: 2, 4a, 4b, 11, 12a-h, 13, 18, 24, 25, 26, 27, 28
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.services.field_normalization import normalize_form_date, normalize_pay_grade
+from app.services.ocr_layout import OCRPageLayout, ocr_page_layout
+
+logger = logging.getLogger(__name__)
+
+# Form edition the coordinates below describe (part of OCR cache fingerprints)
+TEMPLATE_VERSION = 'dd214-2009-08'
+
+# Template coordinate space: US Letter in PDF points, origin top-left
+TEMPLATE_WIDTH = 612.0
+TEMPLATE_HEIGHT = 792.0
+
+# Registration scale must stay within this factor of the nominal page scale
+MAX_SCALE_DEVIATION = 0.3
+
+# Fewer populated fields than this means the registration is not trustworthy
+MIN_TEMPLATE_FIELDS = 4
+
+UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+DIGITS = '0123456789'
+
+# Template fields are OCR'd without cropping margins/borders, which would move the form
+TEMPLATE_PREPROCESSING_STEPS = ['grayscale', 'denoise', 'deskew']
+
+
+@dataclass(frozen=True)
+class TemplateAnchor:
+    """Printed text used to register the form"""
+    name: str
+    pattern: str  # Regex matched against OCR'd lines
+    position: Tuple[float, float]  # Expected (left, top) of the matched line, in points
+    search_region: Tuple[float, float, float, float]  # (left, top, right, bottom) as page fractions
+
+
+@dataclass(frozen=True)
+class TemplateField:
+    """Value area of one DD-214 block"""
+    name: str
+    block: str
+    label: str
+    region: Tuple[float, float, float, float]  # (left, top, right, bottom) in points
+    multiline: bool = False
+    whitelist: Optional[str] = None
+
+    @property
+    def tesseract_config(self) -> str:
+        config = '--oem 1 --psm 6' if self.multiline else '--oem 1 --psm 7'
+        if self.whitelist:
+            config += f' -c tessedit_char_whitelist={self.whitelist}'
+        return config
+
+
+DD214_ANCHORS = [
+    TemplateAnchor(
+        name='title',
+        pattern=r'CERTIFICATE\s+OF\s+RELEASE',
+        position=(150.0, 36.0),
+        search_region=(0.15, 0.0, 0.85, 0.10)
+    ),
+    TemplateAnchor(
+        name='footer',
+        pattern=r'DD\s*FORM\s*214',
+        position=(22.0, 760.0),
+        search_region=(0.0, 0.93, 0.5, 1.0)
+    ),
+]
+
+DD214_FIELDS = [
+    TemplateField('branch', '2', 'DEPARTMENT, COMPONENT AND BRANCH', (230, 68, 470, 80)),
+    TemplateField('grade_rank', '4a', 'GRADE, RATE OR RANK', (22, 88, 200, 100), whitelist=UPPER + DIGITS + '-/'),
+    TemplateField('pay_grade', '4b', 'PAY GRADE', (200, 88, 262, 100), whitelist='EOW' + DIGITS + '-'),
+    TemplateField('primary_specialty', '11', 'PRIMARY SPECIALTY', (22, 180, 300, 280), multiline=True),
+    TemplateField('date_entered', '12a', 'DATE ENTERED AD THIS PERIOD', (480, 180, 590, 191), whitelist=DIGITS),
+    TemplateField('separation_date', '12b', 'SEPARATION DATE THIS PERIOD', (480, 192, 590, 203), whitelist=DIGITS),
+    TemplateField('net_active_service', '12c', 'NET ACTIVE SERVICE THIS PERIOD', (480, 204, 590, 215), whitelist=DIGITS),
+    TemplateField('total_prior_active', '12d', 'TOTAL PRIOR ACTIVE SERVICE', (480, 216, 590, 227), whitelist=DIGITS),
+    TemplateField('total_prior_inactive', '12e', 'TOTAL PRIOR INACTIVE SERVICE', (480, 228, 590, 239), whitelist=DIGITS),
+    TemplateField('foreign_service', '12f', 'FOREIGN SERVICE', (480, 240, 590, 251), whitelist=DIGITS),
+    TemplateField('sea_service', '12g', 'SEA SERVICE', (480, 252, 590, 263), whitelist=DIGITS),
+    TemplateField('initial_entry_training', '12h', 'INITIAL ENTRY TRAINING', (480, 264, 590, 275), whitelist=DIGITS),
+    TemplateField('decorations', '13', 'DECORATIONS, MEDALS, BADGES, CITATIONS AND CAMPAIGN RIBBONS', (22, 290, 300, 380), multiline=True),
+    TemplateField('remarks', '18', 'REMARKS', (22, 420, 590, 560), multiline=True),
+    TemplateField('character_of_service', '24', 'CHARACTER OF SERVICE', (300, 650, 590, 664), whitelist=UPPER + '()'),
+    TemplateField('separation_authority', '25', 'SEPARATION AUTHORITY', (22, 675, 300, 689), whitelist=UPPER + DIGITS + '-,.()'),
+    TemplateField('separation_code', '26', 'SEPARATION CODE', (300, 675, 420, 689), whitelist=UPPER + DIGITS),
+    TemplateField('reentry_code', '27', 'REENTRY CODE', (420, 675, 590, 689), whitelist=UPPER + DIGITS + '-'),
+    TemplateField('narrative_reason', '28', 'NARRATIVE REASON FOR SEPARATION', (22, 700, 590, 714), whitelist=UPPER + DIGITS + '-,.()'),
+]
+
+DATE_FIELDS = {'date_entered', 'separation_date'}
+DURATION_FIELDS = {
+    'net_active_service', 'total_prior_active', 'total_prior_inactive',
+    'foreign_service', 'sea_service', 'initial_entry_training'
+}
+
+
+@dataclass
+class FormRegistration:
+    """Mapping from template points to image pixels: pixel = offset + scale * point"""
+    scale: float
+    offset_x: float
+    offset_y: float
+    anchors_found: List[str] = field(default_factory=list)
+
+    def to_pixels(self, region: Tuple[float, float, float, float], image_size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        width, height = image_size
+        left, top, right, bottom = region
+        return (
+            max(0, int(self.offset_x + self.scale * left)),
+            max(0, int(self.offset_y + self.scale * top)),
+            min(width, int(self.offset_x + self.scale * right + 0.5)),
+            min(height, int(self.offset_y + self.scale * bottom + 0.5))
+        )
+
+
+@dataclass
+class DD214TemplateResult:
+    """Fields read from a registered DD-214"""
+    fields: Dict[str, Any]
+    raw_values: Dict[str, str]
+    confidences: Dict[str, float]
+    registration: FormRegistration
+    ocr_area_ratio: float  # OCR'd pixels (anchor strips + regions) / full page pixels
+
+    @property
+    def populated_fields(self) -> List[str]:
+        return [name for name, value in self.fields.items() if value]
+
+    @property
+    def mean_confidence(self) -> float:
+        """Mean confidence (0-100) over populated fields"""
+        values = [self.confidences[name] for name in self.populated_fields if name in self.confidences]
+        return sum(values) / len(values) if values else 0.0
+
+    def to_text(self) -> str:
+        """Labelled block text, one block per line (for keyword-based parsers)"""
+        lines = []
+        for template_field in DD214_FIELDS:
+            value = self.fields.get(template_field.name)
+            if not value:
+                continue
+            if template_field.name in DURATION_FIELDS:
+                value = f"{value['years']} years {value['months']} months {value['days']} days"
+            elif isinstance(value, list):
+                value = ' // '.join(value)
+            lines.append(f"{template_field.block} {template_field.label}: {value}")
+        return '\n'.join(lines)
+
+
+def locate_form(image, anchors: List[TemplateAnchor] = DD214_ANCHORS) -> Optional[FormRegistration]:
+    """
+    Register the form from its anchor text.
+
+    Returns:
+        FormRegistration, or None if no anchor was found or the implied scale
+        is implausible for this page
+    """
+    width, height = image.size
+    nominal_scale = width / TEMPLATE_WIDTH
+    found: Dict[str, Tuple[int, int]] = {}
+
+    for anchor in anchors:
+        position = _find_anchor(image, anchor)
+        if position:
+            found[anchor.name] = position
+
+    if not found:
+        logger.info("DD-214 template: no anchors found")
+        return None
+
+    by_name = {anchor.name: anchor for anchor in anchors}
+    names = list(found)
+
+    scale = nominal_scale
+    if len(names) >= 2:
+        first, second = by_name[names[0]], by_name[names[1]]
+        template_span = second.position[1] - first.position[1]
+        if template_span:
+            scale = (found[names[1]][1] - found[names[0]][1]) / template_span
+
+    if abs(scale / nominal_scale - 1) > MAX_SCALE_DEVIATION:
+        logger.info(f"DD-214 template: implausible scale {scale:.2f} (nominal {nominal_scale:.2f})")
+        return None
+
+    reference = by_name[names[0]]
+    pixel_x, pixel_y = found[names[0]]
+    return FormRegistration(
+        scale=scale,
+        offset_x=pixel_x - scale * reference.position[0],
+        offset_y=pixel_y - scale * reference.position[1],
+        anchors_found=names
+    )
+
+
+def ocr_dd214_template(image, preprocessing_steps: Optional[List[str]] = None) -> Optional[DD214TemplateResult]:
+    """
+    Read the DD-214 blocks from a page image by template.
+
+    Args:
+        image: PIL image of the DD-214 page
+        preprocessing_steps: Applied to the whole page before registration
+            (defaults to TEMPLATE_PREPROCESSING_STEPS)
+
+    Returns:
+        DD214TemplateResult, or None if the form could not be registered or
+        too few fields were read (caller should fall back to full-page OCR)
+    """
+    from app.services.image_preprocessing import preprocess_image
+
+    if preprocessing_steps is None:
+        preprocessing_steps = TEMPLATE_PREPROCESSING_STEPS
+    page = preprocess_image(image, preprocessing_steps).image
+
+    registration = locate_form(page)
+    if registration is None:
+        return None
+
+    page_area = page.size[0] * page.size[1]
+    ocr_area = sum(_strip_area(page.size, anchor.search_region) for anchor in DD214_ANCHORS)
+
+    raw_values: Dict[str, str] = {}
+    confidences: Dict[str, float] = {}
+
+    for template_field in DD214_FIELDS:
+        box = registration.to_pixels(template_field.region, page.size)
+        if box[2] - box[0] < 2 or box[3] - box[1] < 2:
+            continue
+
+        ocr_area += (box[2] - box[0]) * (box[3] - box[1])
+        layout = ocr_page_layout(page.crop(box), config=template_field.tesseract_config)
+        separator = '\n' if template_field.multiline else ' '
+        raw_values[template_field.name] = separator.join(line.text for line in layout.lines).strip()
+        confidences[template_field.name] = layout.mean_confidence
+
+    fields = {name: normalize_field(name, value) for name, value in raw_values.items()}
+    result = DD214TemplateResult(
+        fields=fields,
+        raw_values=raw_values,
+        confidences=confidences,
+        registration=registration,
+        ocr_area_ratio=ocr_area / page_area if page_area else 0.0
+    )
+
+    logger.info(
+        f"DD-214 template: {len(result.populated_fields)}/{len(DD214_FIELDS)} fields, "
+        f"anchors {registration.anchors_found}, OCR'd {result.ocr_area_ratio:.0%} of the page"
+    )
+
+    if len(result.populated_fields) < MIN_TEMPLATE_FIELDS:
+        return None
+    return result
+
+
+def scan_dd214_pdf_template(file_path: Union[str, Path], dpi: int = 300) -> Optional[DD214TemplateResult]:
+    """Template-read page 1 of a DD-214 PDF (None to fall back to full-page OCR)"""
+    from app.services.pdf_rasterizer import plan_pdf_render, render_pdf_page
+
+    plans = plan_pdf_render(file_path, dpi=dpi)
+    if not plans:
+        return None
+
+    image = render_pdf_page(file_path, 1, plans[0].dpi)
+    try:
+        return ocr_dd214_template(image)
+    finally:
+        image.close()
+
+
+def scan_dd214_image_template(file_path: Union[str, Path]) -> Optional[DD214TemplateResult]:
+    """Template-read a DD-214 image (None to fall back to full-page OCR)"""
+    from PIL import Image
+
+    with Image.open(file_path) as image:
+        return ocr_dd214_template(image)
+
+
+def template_cache_pages(template: DD214TemplateResult) -> List[Dict[str, Any]]:
+    """
+    OCR-cache page entry for a template-read DD-214 (see ocr_cache.layout_cache_pages).
+
+    The page text is the labelled block text; the parsed fields ride along
+    under 'fields'.
+    """
+    return [{
+        'page_number': 1,
+        'text': template.to_text(),
+        'confidence': round(template.mean_confidence / 100, 4),
+        'fields': template.fields
+    }]
+
+
+def normalize_field(name: str, value: str) -> Any:
+    """Turn a block's raw OCR text into its field value"""
+    value = re.sub(r'[ \t]+', ' ', value or '').strip()
+    if not value:
+        return None
+
+    if name == 'pay_grade':
+        return normalize_pay_grade(value)
+    if name in DATE_FIELDS:
+        return normalize_form_date(value)
+    if name in DURATION_FIELDS:
+        return normalize_duration(value)
+    if name == 'decorations':
+        return split_decorations(value)
+    return value
+
+
+def normalize_duration(value: str) -> Optional[Dict[str, int]]:
+    """Block 12 durations are printed YYYY MM DD (years, months, days)"""
+    digits = re.sub(r'\D', '', value)
+    if len(digits) != 8:
+        return None
+    return {'years': int(digits[:4]), 'months': int(digits[4:6]), 'days': int(digits[6:])}
+
+
+def split_decorations(value: str) -> List[str]:
+    """Block 13 entries are separated by '//' (and often wrap across lines)"""
+    joined = re.sub(r'\s*\n\s*', ' ', value)
+    return [item.strip(' ,.') for item in re.split(r'//', joined) if item.strip(' ,.')]
+
+
+def split_primary_specialty(value: Optional[str]) -> Tuple[str, str]:
+    """
+    Block 11 reads like '11B10 INFANTRYMAN -- 4 YRS 2 MOS'.
+
+    Returns:
+        (specialty code, title) for the first listed specialty
+    """
+    if not value:
+        return "", ""
+
+    first = value.split('\n')[0]
+    match = re.match(r'\s*([0-9][0-9A-Z]{2,5})\s+(.+?)(?:\s*-{1,2}\s*\d+\s*YRS?.*)?$', first, re.IGNORECASE)
+    if not match:
+        return "", first.strip()
+    return match.group(1).upper(), match.group(2).strip()
+
+
+def _find_anchor(image, anchor: TemplateAnchor) -> Optional[Tuple[int, int]]:
+    width, height = image.size
+    left, top, right, bottom = anchor.search_region
+    box = (int(left * width), int(top * height), int(right * width), int(bottom * height))
+
+    layout: OCRPageLayout = ocr_page_layout(image.crop(box), config='--oem 1 --psm 6')
+    for line in layout.lines_matching(anchor.pattern):
+        if line.bbox:
+            return box[0] + line.bbox.left, box[1] + line.bbox.top
+    return None
+
+
+def _strip_area(image_size: Tuple[int, int], region: Tuple[float, float, float, float]) -> int:
+    width, height = image_size
+    left, top, right, bottom = region
+    return int((right - left) * width) * int((bottom - top) * height)
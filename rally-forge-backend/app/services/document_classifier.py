@@ -0,0 +1,273 @@
+"""
+FIRST-PAGE DOCUMENT CLASSIFIER
+
+Cheap routing of an uploaded document to its scanner (DD-214, STR, VA
+rating decision) before any full extraction runs. Only page one is read:
+a misrouted 300-page STR costs one page of work instead of a full OCR run.
+
+WORKFLOW:
+1. Read page one: the PDF text layer if it has one; otherwise a low-DPI
+   render (settings.document_classifier_dpi) OCR'd once. Image uploads are
+   downscaled to the same resolution before OCR.
+2. Score the text against each document type's signature phrases (form
+   titles and numbers weigh most, section labels least), one keyword
+   automaton pass for all types
+3. A file name that names the type (e.g. "DD214_member.pdf") adds a hint
+   weight
+4. The best type wins if it reaches MIN_SCORE and beats the runner-up by
+   MIN_MARGIN; otherwise the document is unclassified ('other')
+
+Classification never raises: an unreadable page one is simply unclassified,
+and callers fall back to their previous behavior.
+"""
+
+import io
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.config import settings
+from app.services.keyword_automaton import KeywordAutomaton
+
+logger = logging.getLogger(__name__)
+
+DD214 = 'dd214'
+STR = 'str'
+RATING = 'rating'
+
+DOCUMENT_LABELS = {
+    DD214: 'DD-214',
+    STR: 'Service Treatment Record',
+    RATING: 'VA rating decision',
+}
+
+# Signature phrase -> weight, per document type
+DOCUMENT_SIGNATURES: Dict[str, Dict[str, int]] = {
+    DD214: {
+        'certificate of release or discharge from active duty': 5,
+        'dd form 214': 4,
+        'dd 214': 3,
+        'dd-214': 3,
+        'dd214': 3,
+        'record of service': 1,
+        'net active service this period': 2,
+        'character of service': 1,
+        'separation authority': 1,
+        'separation code': 1,
+        'narrative reason for separation': 2,
+        'reentry code': 1,
+        'primary specialty': 1,
+    },
+    STR: {
+        'chronological record of medical care': 5,
+        'service treatment record': 4,
+        'standard form 600': 4,
+        'sf 600': 3,
+        'report of medical history': 3,
+        'report of medical examination': 3,
+        'dd form 2807': 3,
+        'dd form 2808': 3,
+        'sick call': 2,
+        'chief complaint': 1,
+        'vital signs': 1,
+        'subjective': 1,
+        'assessment': 1,
+        'medical record': 1,
+        'clinic visit': 1,
+    },
+    RATING: {
+        'rating decision': 5,
+        'reasons for decision': 3,
+        'combined evaluation': 3,
+        'veterans benefits administration': 2,
+        'department of veterans affairs': 2,
+        'service connection': 2,
+        'evaluation of': 1,
+        'diagnostic code': 1,
+        'effective date': 1,
+        'is granted': 1,
+        'is denied': 1,
+        'decision review': 1,
+    },
+}
+
+SIGNATURE_AUTOMATON = KeywordAutomaton({
+    document_type: list(signature) for document_type, signature in DOCUMENT_SIGNATURES.items()
+})
+
+# Weight of a file name that names the type
+FILENAME_HINT_WEIGHT = 2
+
+# Best score needed to classify, and lead needed over the runner-up
+MIN_SCORE = 4
+MIN_MARGIN = 2
+# Lead over the runner-up at which a classification is certain (confidence 1.0)
+CONFIDENT_MARGIN = 8
+
+# Page-one text layer length that makes OCR unnecessary
+MIN_TEXT_LAYER_CHARACTERS = 100
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff'}
+
+# Source of a document: a path on disk, or uploaded bytes (with its file name)
+DocumentSource = Union[str, Path, bytes]
+
+
+@dataclass
+class DocumentClassification:
+    """Routing decision for one document"""
+    document_type: Optional[str]  # dd214 / str / rating, None if unclassified
+    confidence: float  # 0-1
+    scores: Dict[str, int] = field(default_factory=dict)
+    source: str = 'none'  # 'text_layer', 'ocr' or 'none' (page one unreadable)
+
+    @property
+    def label(self) -> str:
+        return DOCUMENT_LABELS.get(self.document_type, 'other document')
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'document_type': self.document_type or 'other',
+            'confidence': self.confidence,
+            'scores': self.scores,
+            'source': self.source
+        }
+
+
+def classify_filename(filename: str) -> Optional[str]:
+    """Scanner type suggested by a document's file name (None if it says nothing)"""
+    filename_lower = filename.lower()
+    if 'dd214' in filename_lower or 'dd-214' in filename_lower:
+        return DD214
+    if 'str' in filename_lower or 'treatment' in filename_lower:
+        return STR
+    if 'rating' in filename_lower or 'decision' in filename_lower:
+        return RATING
+    return None
+
+
+def score_text(text: str) -> Dict[str, int]:
+    """Signature score per document type (each phrase counts once)"""
+    scores = {document_type: 0 for document_type in DOCUMENT_SIGNATURES}
+    seen = set()
+    for hit in SIGNATURE_AUTOMATON.find_all(text):
+        if (hit.label, hit.keyword) not in seen:
+            seen.add((hit.label, hit.keyword))
+            scores[hit.label] += DOCUMENT_SIGNATURES[hit.label][hit.keyword]
+    return scores
+
+
+def classify_text(text: str, filename: Optional[str] = None, source: str = 'text_layer') -> DocumentClassification:
+    """Classify page-one text, with the file name as a tie-breaking hint"""
+    scores = score_text(text)
+    hint = classify_filename(filename) if filename else None
+    if hint:
+        scores[hint] += FILENAME_HINT_WEIGHT
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best_type, best), (_, runner_up) = ranked[0], ranked[1]
+    if best < MIN_SCORE or best - runner_up < MIN_MARGIN:
+        return DocumentClassification(None, 0.0, scores, source)
+
+    confidence = round(min(1.0, (best - runner_up) / CONFIDENT_MARGIN), 2)
+    return DocumentClassification(best_type, confidence, scores, source)
+
+
+def _is_pdf(document: DocumentSource, filename: str) -> bool:
+    if isinstance(document, bytes):
+        return document[:5] == b'%PDF-' or filename.lower().endswith('.pdf')
+    return Path(filename).suffix.lower() == '.pdf'
+
+
+def _ocr_first_page_image(image) -> str:
+    from app.services.ocr_layout import ocr_page_layout
+
+    # Scans come in at 200-600 DPI; a Letter page at the classifier DPI is enough
+    max_side = int(11 * settings.document_classifier_dpi)
+    if max(image.size) > max_side:
+        image = image.copy()
+        image.thumbnail((max_side, max_side))
+    return ocr_page_layout(image.convert('L'), config='--oem 1 --psm 3').text
+
+
+def read_first_page(document: DocumentSource, filename: str = '') -> Optional[Tuple[str, str]]:
+    """
+    (page-one text, source) for a document; blocking, run it off the event loop.
+
+    Args:
+        filename: The document's file name (its type comes from the extension)
+
+    Returns:
+        None if page one could not be read
+    """
+    from app.utils.ocr_capabilities import get_ocr_capabilities
+
+    if _is_pdf(document, filename):
+        import PyPDF2
+
+        stream = io.BytesIO(document) if isinstance(document, bytes) else open(document, 'rb')
+        with stream:
+            text = PyPDF2.PdfReader(stream).pages[0].extract_text() or ''
+        if len(text.strip()) >= MIN_TEXT_LAYER_CHARACTERS:
+            return text, 'text_layer'
+
+        capabilities = get_ocr_capabilities()
+        if not (capabilities.poppler_available and capabilities.tesseract_available):
+            return (text, 'text_layer') if text.strip() else None
+
+        from pdf2image import convert_from_bytes, convert_from_path
+
+        options = dict(dpi=settings.document_classifier_dpi, first_page=1, last_page=1, grayscale=True)
+        if isinstance(document, bytes):
+            images = convert_from_bytes(document, **options)
+        else:
+            images = convert_from_path(str(document), **options)
+        return _ocr_first_page_image(images[0]), 'ocr'
+
+    if Path(filename).suffix.lower() in IMAGE_EXTENSIONS and get_ocr_capabilities().tesseract_available:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(document) if isinstance(document, bytes) else document) as image:
+            return _ocr_first_page_image(image), 'ocr'
+
+    return None
+
+
+def classify_document_sync(document: DocumentSource, filename: Optional[str] = None) -> DocumentClassification:
+    """Classify a document from page one (blocking)"""
+    if filename is None:
+        filename = '' if isinstance(document, bytes) else Path(document).name
+
+    try:
+        page = read_first_page(document, filename)
+    except Exception as e:
+        logger.warning(f"Could not read page one of {filename or 'upload'} for classification: {e}")
+        page = None
+
+    if page is None:
+        return classify_text('', filename, source='none')
+
+    text, source = page
+    classification = classify_text(text, filename, source=source)
+    logger.info(
+        f"Classified {filename or 'upload'} as {classification.document_type or 'other'} "
+        f"(confidence {classification.confidence}, {source}, scores {classification.scores})"
+    )
+    return classification
+
+
+async def classify_document(document: DocumentSource, filename: Optional[str] = None) -> DocumentClassification:
+    """Classify a document from page one on the OCR executor"""
+    from app.services.ocr_executor import run_ocr_job
+
+    if not settings.document_classifier_enabled:
+        return DocumentClassification(None, 0.0)
+
+    try:
+        return await run_ocr_job(
+            classify_document_sync, document, filename, timeout=settings.document_classifier_timeout_seconds
+        )
+    except Exception as e:
+        logger.warning(f"Document classification failed: {e}")
+        return DocumentClassification(None, 0.0)
@@ -0,0 +1,147 @@
+"""
+PAGE-INCREMENTAL EARLY STOP
+
+Decides, page by page, when a multi-page scan has read everything it needs.
+
+Scanned DD-214s routinely hold several copies of the same form (member
+copy, service copy, ...), each a form page possibly followed by
+continuation sheets. Every copy carries the same blocks, so once one
+confidently read copy has produced every required field, rasterizing and
+OCRing the other copies only repeats work. Continuation sheets are not
+copies: they carry the overflow of blocks 13 and 18 (decorations,
+remarks), which are not required fields, so they are always read.
+
+WORKFLOW:
+1. The caller feeds each page (in page order) as soon as it is read
+2. The page is parsed on its own; a field value counts only if the page's
+   OCR confidence reaches the target (settings.dd214_early_stop_confidence)
+3. A field is satisfied once a confident page has read it and no other
+   confident page read a different value for it
+4. Once every required field is satisfied, the caller stops at the next
+   page that confidently reads as the start of another copy (form title or
+   copy label, no continuation heading; see starts_dd214_copy). That page
+   has been read, and agrees with the earlier copy; the pages after it are
+   not. A missing or conflicting field keeps the scan going to the last page
+
+The caller still parses the joined text of the pages it read, so early stop
+only changes how many pages are read, never how they are parsed.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = re.compile(r'\s+')
+
+# Start of a form page: its title, or the copy label printed on each copy ("MEMBER - 4", "SERVICE - 2")
+DD214_COPY_START = re.compile(
+    r'CERTIFICATE\s+OF\s+RELEASE\s+OR\s+DISCHARGE|\b(?:MEMBER|SERVICE)\s*-\s*\d\b',
+    re.IGNORECASE
+)
+# Continuation sheets (DD 214C, "continuation of block 18") repeat the form number, not the copy
+DD214_CONTINUATION = re.compile(r'\bCONTINUATION\b|\bDD\s*(?:FORM\s*)?214\s*C\b|\bCONT(?:INUE)?D\b', re.IGNORECASE)
+
+
+def _comparable(value: Any) -> Optional[str]:
+    """A field value in the form compared across pages (None if empty)"""
+    if value is None or value == '' or value == []:
+        return None
+    return WHITESPACE.sub(' ', str(value)).strip().lower() or None
+
+
+def starts_dd214_copy(page_text: str) -> bool:
+    """Whether a page is the form page of a DD-214 copy (not a continuation sheet)"""
+    return bool(DD214_COPY_START.search(page_text)) and not DD214_CONTINUATION.search(page_text)
+
+
+class RequiredFieldTracker:
+    """Tracks required fields across the pages of one document"""
+
+    def __init__(
+        self,
+        extract_fields: Callable[[str], Dict[str, Any]],
+        required_fields: Sequence[str],
+        min_confidence: Optional[float] = None,
+        starts_copy: Callable[[str], bool] = starts_dd214_copy
+    ):
+        """
+        Args:
+            extract_fields: Page text -> parsed fields (any superset of required_fields)
+            required_fields: Fields that must be read before the scan may stop
+            min_confidence: Page OCR confidence (0-1) needed for its fields to
+                count (defaults to settings.dd214_early_stop_confidence)
+            starts_copy: Page text -> whether the page starts another copy
+                of the document (the only pages the scan stops at)
+        """
+        self.extract_fields = extract_fields
+        self.required_fields = list(required_fields)
+        self.starts_copy = starts_copy
+        self.min_confidence = (
+            settings.dd214_early_stop_confidence if min_confidence is None else min_confidence
+        )
+        self.values: Dict[str, str] = {}
+        self.conflicts: Dict[str, List[str]] = {}
+        self.pages_read = 0
+
+    @property
+    def satisfied(self) -> bool:
+        """Every required field read, with no conflicting reading"""
+        return not self.missing and not self.conflicting
+
+    @property
+    def missing(self) -> List[str]:
+        return [name for name in self.required_fields if name not in self.values]
+
+    @property
+    def conflicting(self) -> List[str]:
+        return [name for name in self.required_fields if name in self.conflicts]
+
+    def add_page(self, page_number: int, text: str, confidence: float) -> bool:
+        """
+        Account for one more page.
+
+        Returns:
+            True once the scan can stop after this page
+        """
+        complete_before = self.pages_read > 0 and self.satisfied
+        self.pages_read += 1
+        if confidence < self.min_confidence or not text.strip():
+            # Too unsure to tell a copy from a continuation sheet
+            return False
+
+        fields = self.extract_fields(text)
+        for name in self.required_fields:
+            value = _comparable(fields.get(name))
+            if value is None:
+                continue
+            if name not in self.values:
+                self.values[name] = value
+            elif value != self.values[name] and value not in self.conflicts.get(name, []):
+                self.conflicts.setdefault(name, []).append(value)
+                logger.info(
+                    f"Page {page_number}: {name} reads '{value}', earlier pages read "
+                    f"'{self.values[name]}'; scanning the remaining pages"
+                )
+
+        # Everything up to here belongs to copies already read; this page starts another one
+        return complete_before and self.satisfied and self.starts_copy(text)
+
+    def fingerprint_options(self) -> Dict[str, Any]:
+        """Options that change which pages are read, for cache fingerprints"""
+        return {
+            'required_fields': self.required_fields,
+            'min_confidence': self.min_confidence,
+            'stop_at': 'copy_start'
+        }
+
+    def stop_warning(self, page_count: int) -> str:
+        """Result warning for a scan that stopped before its last page"""
+        return (
+            f"Stopped after page {self.pages_read} of {page_count}: "
+            f"required fields ({', '.join(self.required_fields)}) were complete "
+            f"and page {self.pages_read} starts another copy"
+        )
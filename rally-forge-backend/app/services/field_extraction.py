@@ -0,0 +1,116 @@
+"""
+COMPILED MULTI-PATTERN FIELD EXTRACTION
+
+Shared extraction engine for the document parsers. Each parser declares
+its field patterns once; they are compiled once per process and every scan
+hands each field its matches.
+
+WORKFLOW:
+1. compile_field_scanner() compiles every field pattern (cached per
+   process, so parsers constructed per request share them)
+2. scan() runs each field's own pattern over the text with re.finditer, or
+   re.search for first_only fields, which stops at the first match
+3. FieldMatches.all(name) is exactly list(re.finditer(...)), first(name)
+   is re.search(...) and findall(name) is re.findall(...)
+
+Each field gets its own pass on purpose: Python's regex engine scans for a
+single pattern far faster than for an alternation of lookaheads that is
+tried at every position (which then has to re-run the winning field to get
+an ordinary match). tests/benchmarks keeps scan() against separate
+re.finditer calls.
+"""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FieldSpec = Union[str, Tuple[str, int]]
+
+
+class FieldMatches:
+    """Matches of every field from one scan, with re.finditer/search/findall semantics"""
+
+    def __init__(self, matches: Dict[str, List[re.Match]]):
+        self._matches = matches
+
+    def all(self, name: str) -> List[re.Match]:
+        """Every non-overlapping match of the field (re.finditer)"""
+        return self._matches.get(name, [])
+
+    def first(self, name: str) -> Optional[re.Match]:
+        """Leftmost match of the field (re.search)"""
+        matches = self._matches.get(name)
+        return matches[0] if matches else None
+
+    def findall(self, name: str) -> List[Any]:
+        """Same shape as re.findall: whole match, group 1, or a tuple of groups"""
+        results = []
+        for match in self.all(name):
+            groups = match.groups()
+            if not groups:
+                results.append(match.group(0))
+            elif len(groups) == 1:
+                results.append(groups[0] if groups[0] is not None else '')
+            else:
+                results.append(tuple(group if group is not None else '' for group in groups))
+        return results
+
+    def count(self, name: str) -> int:
+        return len(self._matches.get(name, []))
+
+    def __contains__(self, name: str) -> bool:
+        return bool(self._matches.get(name))
+
+
+class FieldScanner:
+    """Compiled patterns for a fixed set of named fields"""
+
+    def __init__(self, patterns: Mapping[str, FieldSpec], flags: int = re.IGNORECASE, first_only: Iterable[str] = ()):
+        """
+        Args:
+            patterns: field name -> pattern, or (pattern, flags) to override flags
+            flags: Default flags for fields given as a plain pattern
+            first_only: Fields that only ever need their first match
+        """
+        self.names: List[str] = list(patterns)
+        self.first_only = frozenset(first_only)
+        self._compiled: Dict[str, re.Pattern] = {}
+
+        for name in self.names:
+            spec = patterns[name]
+            pattern, field_flags = spec if isinstance(spec, tuple) else (spec, flags)
+            self._compiled[name] = re.compile(pattern, field_flags)
+
+    def pattern(self, name: str) -> re.Pattern:
+        """The field's own compiled pattern"""
+        return self._compiled[name]
+
+    def scan(self, text: str) -> FieldMatches:
+        """Matches of every field in text"""
+        matches: Dict[str, List[re.Match]] = {}
+        for name, compiled in self._compiled.items():
+            if name in self.first_only:
+                match = compiled.search(text)
+                matches[name] = [match] if match else []
+            else:
+                matches[name] = list(compiled.finditer(text))
+        return FieldMatches(matches)
+
+
+@lru_cache(maxsize=64)
+def _cached_scanner(items: Tuple[Tuple[str, FieldSpec], ...], flags: int, first_only: frozenset) -> FieldScanner:
+    scanner = FieldScanner(dict(items), flags=flags, first_only=first_only)
+    logger.debug(f"Compiled field scanner for {len(items)} patterns")
+    return scanner
+
+
+def compile_field_scanner(
+    patterns: Mapping[str, FieldSpec],
+    flags: int = re.IGNORECASE,
+    first_only: Iterable[str] = ()
+) -> FieldScanner:
+    """FieldScanner for these patterns, compiled once per process and shared"""
+    return _cached_scanner(tuple(patterns.items()), flags, frozenset(first_only))
@@ -0,0 +1,191 @@
+"""
+FIELD NORMALIZATION
+
+Shared normalizers for the values the scanners and parsers pull out of
+documents: dates, pay grades, ranks and VA diagnostic codes. Every parser
+calls these instead of keeping its own copy, so the same string always
+normalizes the same way whichever document it came from.
+
+WORKFLOW:
+1. A date string is classified by one compiled pattern whose alternatives
+   are the supported formats (one named group set per format); the ISO date
+   is built straight from the matched groups, with no trial parse per format
+2. Pay grades, ranks and diagnostic codes are matched by one pattern each
+   and mapped to a canonical spelling
+3. Every normalizer is memoized in a bounded LRU cache: a document repeats
+   the same handful of dates, grades and codes many times
+
+FORMATS:
+- Dates: MM/DD/YYYY, MM/DD/YY, YYYY-MM-DD, DD MMM YYYY, Month DD, YYYY
+  ('/' or '-' separators) -> YYYY-MM-DD
+- DD-214 printed dates (YYYY MM DD) -> YYYY-MM-DD
+- Pay grades: 'E04' / 'e 4' / 'E-4' -> 'E-4'
+- Ranks: 'SSG' / 'PO2' / 'Capt' -> 'Staff Sergeant' / 'Petty Officer Second
+  Class' / 'Captain'
+- Diagnostic codes: 'DC 5260' / '5010 - 5260' -> '5260' / '5010-5260'
+"""
+
+import re
+import logging
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Entries kept per normalizer cache
+NORMALIZATION_CACHE_SIZE = 4096
+
+# Two-digit years below this are 20XX, the rest 19XX
+TWO_DIGIT_YEAR_PIVOT = 50
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH_NAME = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+
+# One alternative per format. YYYY-MM-DD comes first so its year is never
+# read as the tail of a month/day pair.
+DATE_CLASSIFIER = re.compile(
+    r'(?<!\d)(?:'
+    r'(?P<iso_year>\d{4})[/-](?P<iso_month>\d{1,2})[/-](?P<iso_day>\d{1,2})'
+    r'|(?P<us_month>\d{1,2})[/-](?P<us_day>\d{1,2})[/-](?P<us_year>\d{4}|\d{2})'
+    rf'|(?P<mil_day>\d{{1,2}})[ -](?P<mil_month>{_MONTH_NAME})[ -](?P<mil_year>\d{{4}})'
+    rf'|(?P<long_month>{_MONTH_NAME})\s+(?P<long_day>\d{{1,2}}),?\s+(?P<long_year>\d{{4}})'
+    r')(?!\d)',
+    re.IGNORECASE
+)
+
+PAY_GRADE_PATTERN = re.compile(r'(?<![A-Z])([EOW])\s*-?\s*0*(\d{1,2})(?!\d)')
+
+# Highest grade in each pay plan
+PAY_GRADE_LIMITS = {'E': 9, 'O': 10, 'W': 5}
+
+# Rank abbreviations as printed on DD-214s and in records (all branches)
+RANK_ABBREVIATIONS = {
+    # Army
+    'PVT': 'Private', 'PV1': 'Private', 'PV2': 'Private', 'PFC': 'Private First Class',
+    'SPC': 'Specialist', 'CPL': 'Corporal', 'SGT': 'Sergeant', 'SSG': 'Staff Sergeant',
+    'SFC': 'Sergeant First Class', 'MSG': 'Master Sergeant', '1SG': 'First Sergeant',
+    'SGM': 'Sergeant Major', 'CSM': 'Command Sergeant Major',
+    'WO1': 'Warrant Officer 1', 'CW2': 'Chief Warrant Officer 2', 'CW3': 'Chief Warrant Officer 3',
+    'CW4': 'Chief Warrant Officer 4', 'CW5': 'Chief Warrant Officer 5',
+    '2LT': 'Second Lieutenant', '1LT': 'First Lieutenant', 'CPT': 'Captain', 'MAJ': 'Major',
+    'LTC': 'Lieutenant Colonel', 'COL': 'Colonel', 'BG': 'Brigadier General',
+    'MG': 'Major General', 'LTG': 'Lieutenant General', 'GEN': 'General',
+    # Marine Corps
+    'LCPL': 'Lance Corporal', 'GYSGT': 'Gunnery Sergeant', 'MGYSGT': 'Master Gunnery Sergeant',
+    'CAPT': 'Captain', 'LTCOL': 'Lieutenant Colonel',
+    # Navy / Coast Guard
+    'SR': 'Seaman Recruit', 'SA': 'Seaman Apprentice', 'SN': 'Seaman',
+    'PO3': 'Petty Officer Third Class', 'PO2': 'Petty Officer Second Class',
+    'PO1': 'Petty Officer First Class', 'CPO': 'Chief Petty Officer',
+    'SCPO': 'Senior Chief Petty Officer', 'MCPO': 'Master Chief Petty Officer',
+    'ENS': 'Ensign', 'LTJG': 'Lieutenant Junior Grade', 'LT': 'Lieutenant',
+    'LCDR': 'Lieutenant Commander', 'CDR': 'Commander', 'ADM': 'Admiral',
+    # Air Force / Space Force
+    'AB': 'Airman Basic', 'AMN': 'Airman', 'A1C': 'Airman First Class', 'SRA': 'Senior Airman',
+    'SSGT': 'Staff Sergeant', 'TSGT': 'Technical Sergeant', 'MSGT': 'Master Sergeant',
+    'SMSGT': 'Senior Master Sergeant', 'CMSGT': 'Chief Master Sergeant',
+}
+
+# A diagnostic code, or a hyphenated analogous/underlying code pair
+DIAGNOSTIC_CODE_PATTERN = re.compile(r'(?<!\d)(\d{4})(?:\s*-\s*(\d{4}))?(?!\d)')
+
+# Codes in the VA Schedule for Rating Disabilities (38 CFR Part 4)
+RATING_SCHEDULE_CODES = range(5000, 10000)
+
+
+def _iso_date(year: str, month: int, day: str) -> Optional[str]:
+    if len(year) == 2:
+        year = f"20{year}" if int(year) < TWO_DIGIT_YEAR_PIVOT else f"19{year}"
+    try:
+        return date(int(year), month, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_date(date_str: Optional[str]) -> Optional[str]:
+    """
+    First date in date_str as YYYY-MM-DD.
+
+    Returns:
+        ISO date, or None if no supported date (or an impossible month/day)
+        is found
+    """
+    if not date_str:
+        return None
+
+    match = DATE_CLASSIFIER.search(date_str)
+    if not match:
+        return None
+
+    parts = match.groupdict()
+    if parts['iso_year']:
+        return _iso_date(parts['iso_year'], int(parts['iso_month']), parts['iso_day'])
+    if parts['us_year']:
+        return _iso_date(parts['us_year'], int(parts['us_month']), parts['us_day'])
+    if parts['mil_year']:
+        return _iso_date(parts['mil_year'], MONTHS[parts['mil_month'][:3].lower()], parts['mil_day'])
+    return _iso_date(parts['long_year'], MONTHS[parts['long_month'][:3].lower()], parts['long_day'])
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_form_date(value: str) -> Optional[str]:
+    """DD-214 dates are printed YYYY MM DD; return ISO format"""
+    digits = re.sub(r'\D', '', value)
+    if len(digits) != 8:
+        return None
+    return _iso_date(digits[:4], int(digits[4:6]), digits[6:])
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_pay_grade(value: Optional[str]) -> Optional[str]:
+    """'E04' / 'E 4' / 'E-4' -> 'E-4' (None if not a pay grade)"""
+    if not value:
+        return None
+
+    match = PAY_GRADE_PATTERN.search(value.upper())
+    if not match:
+        return None
+
+    plan, grade = match.group(1), int(match.group(2))
+    if not 1 <= grade <= PAY_GRADE_LIMITS[plan]:
+        return None
+    return f"{plan}-{grade}"
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_rank(value: Optional[str]) -> Optional[str]:
+    """Rank abbreviation -> full title; other rank text is title-cased"""
+    if not value:
+        return None
+
+    collapsed = ' '.join(value.replace('.', ' ').split())
+    if not collapsed:
+        return None
+    return RANK_ABBREVIATIONS.get(collapsed.upper().replace(' ', ''), collapsed.title())
+
+
+def normalize_grade_rank(value: Optional[str]) -> Optional[str]:
+    """DD-214 block 4a holds a pay grade or a rank; normalize whichever it is"""
+    return normalize_pay_grade(value) or normalize_rank(value)
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_diagnostic_code(value: Optional[str]) -> Optional[str]:
+    """'DC 5260' -> '5260', '5010 - 5260' -> '5010-5260' (None if no code)"""
+    if not value:
+        return None
+
+    match = DIAGNOSTIC_CODE_PATTERN.search(value)
+    if not match:
+        return None
+    return '-'.join(code for code in match.groups() if code)
+
+
+def in_rating_schedule(code: str) -> bool:
+    """Whether a normalized diagnostic code is in the rating schedule's range"""
+    return int(code.split('-')[-1]) in RATING_SCHEDULE_CODES
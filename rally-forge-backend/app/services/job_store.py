@@ -0,0 +1,173 @@
+"""
+SCANNER JOB STORE
+
+In-memory index of scanner jobs with bounded retention of finished ones.
+
+A long-running worker sees every upload; keeping each finished job (and its
+full result payload) forever is a leak. Results are already persisted to
+Results/<job_id>.json, so memory only needs to hold jobs that are running
+or were finished recently.
+
+FEATURES:
+- O(1) lookup by job id
+- Secondary indexes by veteran and by status, kept current as job status
+  changes (jobs report every status change to the store)
+- Finished jobs (completed or failed) are evicted once older than
+  settings.scanner_job_ttl_seconds, or oldest first once more than
+  settings.scanner_job_max_finished are held; pending and running jobs are
+  never evicted
+- Lookup of an evicted job falls back to the loader (the orchestrator reads
+  Results/<job_id>.json), and the reloaded job is held again as recently
+  finished
+
+Failed jobs have no result file, so they are gone once evicted.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a job no longer changes (a failed job that will be retried is RETRY)
+FINISHED_STATUSES = {'completed', 'failed'}
+
+JobLoader = Callable[[str], Optional[Any]]
+
+
+def _status_key(status: Any) -> str:
+    return getattr(status, 'value', status)
+
+
+class JobStore:
+    """
+    Scanner jobs by id, veteran and status.
+
+    Jobs are duck-typed: anything with job_id, veteran_id, status and a
+    status_listener attribute (see ScannerJob).
+    """
+
+    def __init__(
+        self,
+        loader: Optional[JobLoader] = None,
+        ttl_seconds: Optional[int] = None,
+        max_finished: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            loader: Job id -> finished job rebuilt from disk (None if unknown)
+            ttl_seconds: Finished jobs are evicted this long after finishing
+                (defaults to settings.scanner_job_ttl_seconds, 0 = never)
+            max_finished: Finished jobs held at most (defaults to
+                settings.scanner_job_max_finished, 0 = unlimited)
+        """
+        self.loader = loader
+        self.ttl_seconds = settings.scanner_job_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_finished = settings.scanner_job_max_finished if max_finished is None else max_finished
+        self.clock = clock
+
+        self._jobs: Dict[str, Any] = {}
+        self._by_veteran: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._finished: 'OrderedDict[str, float]' = OrderedDict()  # job id -> finish time, oldest first
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __setitem__(self, job_id: str, job: Any):
+        self.put(job)
+
+    def put(self, job: Any):
+        """Hold a job and index it"""
+        self.remove(job.job_id)
+
+        self._jobs[job.job_id] = job
+        self._by_veteran.setdefault(job.veteran_id, set()).add(job.job_id)
+        self._by_status.setdefault(_status_key(job.status), set()).add(job.job_id)
+        if _status_key(job.status) in FINISHED_STATUSES:
+            self._finished[job.job_id] = self.clock()
+        job.status_listener = self._status_changed
+
+        self._evict()
+
+    def remove(self, job_id: str) -> Optional[Any]:
+        """Drop a job from memory and every index"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return None
+
+        self._discard(self._by_veteran, job.veteran_id, job_id)
+        self._discard(self._by_status, _status_key(job.status), job_id)
+        self._finished.pop(job_id, None)
+        job.status_listener = None
+        return job
+
+    def get(self, job_id: str) -> Optional[Any]:
+        """A job by id, reloading it through the loader if it was evicted"""
+        self._evict()
+        job = self._jobs.get(job_id)
+        if job is not None or self.loader is None:
+            return job
+
+        job = self.loader(job_id)
+        if job is not None:
+            logger.info(f"Reloaded evicted job {job_id} from disk")
+            self.put(job)
+        return job
+
+    def values(self) -> Iterable[Any]:
+        return list(self._jobs.values())
+
+    def by_veteran(self, veteran_id: str) -> List[Any]:
+        """Jobs of a veteran held in memory"""
+        self._evict()
+        return [self._jobs[job_id] for job_id in self._by_veteran.get(veteran_id, ())]
+
+    def by_status(self, status: Any) -> List[Any]:
+        """Jobs held in memory with this status"""
+        self._evict()
+        return [self._jobs[job_id] for job_id in self._by_status.get(_status_key(status), ())]
+
+    def count(self, status: Any) -> int:
+        return len(self._by_status.get(_status_key(status), ()))
+
+    def _status_changed(self, job: Any, previous: Any):
+        """Re-index a job after its status changed"""
+        if self._jobs.get(job.job_id) is not job:
+            return
+
+        self._discard(self._by_status, _status_key(previous), job.job_id)
+        self._by_status.setdefault(_status_key(job.status), set()).add(job.job_id)
+
+        if _status_key(job.status) in FINISHED_STATUSES:
+            self._finished[job.job_id] = self.clock()
+            self._finished.move_to_end(job.job_id)
+            self._evict()
+        else:
+            self._finished.pop(job.job_id, None)
+
+    def _evict(self):
+        """Drop finished jobs past their TTL, then the oldest beyond the size limit"""
+        expired_before = self.clock() - self.ttl_seconds
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            over_size = self.max_finished and len(self._finished) > self.max_finished
+            if not over_size and not (self.ttl_seconds and finished_at <= expired_before):
+                break
+            self.remove(job_id)
+            logger.debug(f"Evicted finished job {job_id} from memory")
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, job_id: str):
+        job_ids = index.get(key)
+        if job_ids is not None:
+            job_ids.discard(job_id)
+            if not job_ids:
+                del index[key]
@@ -0,0 +1,163 @@
+"""
+KEYWORD AUTOMATON
+
+Prebuilt multi-keyword matcher for the fixed vocabularies the scanners and
+parsers look for (branches, combat locations, awards, deployment zones,
+condition categories). Replaces loops of `keyword in text_lower`, which
+rescan the whole text once per keyword.
+
+WORKFLOW:
+1. KeywordAutomaton() folds the vocabulary into a trie (the automaton's goto
+   function), once at import time.
+2. The trie is compiled into a single factored regex, so the search for
+   candidate start positions is one linear C-level pass over the text
+   whatever the vocabulary size.
+3. At each candidate position the trie is walked to report every keyword
+   that starts there (overlapping and nested keywords included).
+4. With whole_words, a keyword only counts when it is not glued to other
+   letters or digits on either side ('car' does not match 'career').
+
+FEATURES:
+- All hits with offsets (find_all)
+- Labels present, in vocabulary order (matched_labels, first_label)
+- Case-insensitive: the text is lower-cased once and matched against a
+  lower-case pattern (re.IGNORECASE disables sre's literal fast paths and
+  is several times slower)
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Trie node key holding the (keyword, label) pairs that end at the node
+_END = ''
+
+_WORD_CHAR = re.compile(r'\w')
+
+Vocabulary = Union[Mapping[str, Iterable[str]], Iterable[str]]
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """One keyword occurrence in the scanned text"""
+    keyword: str
+    label: str
+    start: int
+    end: int
+
+
+def _trie_regex(node: Dict[str, Any], whole_words: bool) -> str:
+    """Factored alternation for a trie node: shared prefixes are matched once"""
+    branches = [
+        re.escape(char) + _trie_regex(child, whole_words)
+        for char, child in sorted(node.items())
+        if char != _END
+    ]
+    if _END in node:
+        # A keyword ends here; longer keywords continue through the children
+        terminal = r'(?!\w)' if whole_words else ''
+        if not branches:
+            return terminal
+        return f"(?:{'|'.join(branches)}|{terminal})" if terminal else f"(?:{'|'.join(branches)})?"
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
+
+
+class KeywordAutomaton:
+    """Single-pass matcher for a fixed keyword vocabulary"""
+
+    def __init__(self, vocabulary: Vocabulary, whole_words: bool = True):
+        """
+        Args:
+            vocabulary: label -> keywords, or a plain list of keywords
+                (each keyword is then its own label)
+            whole_words: Only match keywords on word boundaries
+        """
+        if isinstance(vocabulary, Mapping):
+            entries = [(keyword, label) for label, keywords in vocabulary.items() for keyword in keywords]
+        else:
+            entries = [(keyword, keyword) for keyword in vocabulary]
+
+        self.labels: List[str] = list(dict.fromkeys(label for _, label in entries))
+        self.whole_words = whole_words
+        self._root: Dict[str, Any] = {}
+
+        for keyword, label in entries:
+            if not keyword:
+                raise ValueError(f"Empty keyword for label '{label}'")
+            node = self._root
+            for char in keyword.lower():
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append((keyword, label))
+
+        pattern = _trie_regex(self._root, whole_words)
+        self._pattern = re.compile(pattern) if entries else None
+        # Only for texts whose lower-casing changes length (offsets must stay valid)
+        self._casefree_pattern = re.compile(pattern, re.IGNORECASE) if entries else None
+        logger.debug(f"Built keyword automaton: {len(entries)} keywords, {len(self.labels)} labels")
+
+    def _walk(self, text: str, start: int, lowered: bool) -> List[Tuple[int, List[Tuple[str, str]]]]:
+        """(end, entries) for every keyword starting at start"""
+        if self.whole_words and start and _WORD_CHAR.match(text, start - 1):
+            return []
+
+        found = []
+        node = self._root
+        length = len(text)
+        position = start
+        while position < length:
+            char = text[position]
+            node = node.get(char if lowered else char.lower())
+            if node is None:
+                break
+            position += 1
+            if _END in node and not (self.whole_words and _WORD_CHAR.match(text, position)):
+                found.append((position, node[_END]))
+        return found
+
+    def _scan(self, text: str):
+        if self._pattern is None:
+            return
+        text_lower = text.lower()
+        lowered = len(text_lower) == len(text)
+        if lowered:
+            text, search = text_lower, self._pattern.search
+        else:
+            search = self._casefree_pattern.search
+
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            for end, entries in self._walk(text, start, lowered):
+                yield start, end, entries
+            match = search(text, start + 1)
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """Every keyword occurrence, ordered by start then end offset"""
+        return [
+            KeywordHit(keyword, label, start, end)
+            for start, end, entries in self._scan(text)
+            for keyword, label in entries
+        ]
+
+    def matched_labels(self, text: str) -> List[str]:
+        """Labels with at least one keyword in text, in vocabulary order"""
+        found = set()
+        for _, _, entries in self._scan(text):
+            found.update(label for _, label in entries)
+            if len(found) == len(self.labels):
+                break
+        return [label for label in self.labels if label in found]
+
+    def first_label(self, text: str) -> Optional[str]:
+        """First label in vocabulary order with a keyword in text"""
+        labels = self.matched_labels(text)
+        return labels[0] if labels else None
+
+    def contains_any(self, text: str) -> bool:
+        """Whether any keyword occurs in text"""
+        return next(self._scan(text), None) is not None
@@ -0,0 +1,365 @@
+"""
+OCR ENGINE BACKENDS
+
+Interchangeable engines behind ocr_page_layout() (routed by ocr_router).
+
+BACKENDS:
+- pytesseract: forks the tesseract binary for every call and round-trips
+  the image through a temp file. Always available when Tesseract is installed.
+- tesserocr (optional, requirements-ocr.txt): keeps warm Tesseract engines
+  (language model loaded) in this process and hands them images in memory.
+  No process spawn or model load per call, which dominates the cost on
+  small images such as DD-214 regions.
+- google_vision: Google Cloud Vision document text detection (remote,
+  billable; only when google_vision_enabled)
+
+Every backend returns an OCRPageLayout, so callers never see which one ran.
+Each also declares a capacity (calls it can run at once without queueing)
+and a cost hint (fixed ms per call + ms per megapixel) that seed the
+router's cost estimates.
+
+WARM ENGINES:
+Engines are keyed by (language, OCR engine mode), since both are fixed when
+a model is loaded. Page segmentation mode and -c variables are set per call
+and restored afterwards. At most ocr_engine_workers engines exist per key;
+a caller checks one out, and blocks if all are busy. Each OCR worker process
+(see ocr_worker_pool) holds its own engines for its lifetime.
+"""
+
+import io
+import os
+import shlex
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.services.ocr_layout import BoundingBox, OCRBlock, OCRLine, OCRPageLayout, OCRWord
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    from google.cloud import vision
+    GOOGLE_VISION_AVAILABLE = True
+except ImportError:
+    GOOGLE_VISION_AVAILABLE = False
+
+# Tesseract's defaults when a config string does not say otherwise
+DEFAULT_PSM = 3
+DEFAULT_OEM = 3
+DEFAULT_LANG = 'eng'
+
+TSV_COLUMNS = [
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text'
+]
+
+
+def parse_tesseract_config(config: str) -> Tuple[Optional[int], Optional[int], Dict[str, str]]:
+    """
+    Split a pytesseract config string into (psm, oem, variables).
+
+    '--psm 7 --oem 1 -c tessedit_char_whitelist=0123456789' ->
+    (7, 1, {'tessedit_char_whitelist': '0123456789'}). '--dpi N' becomes the
+    user_defined_dpi variable; other flags are ignored.
+    """
+    psm = oem = None
+    variables: Dict[str, str] = {}
+
+    tokens = shlex.split(config or '')
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+
+        if token == '--psm' and value is not None:
+            psm = int(value)
+            i += 1
+        elif token == '--oem' and value is not None:
+            oem = int(value)
+            i += 1
+        elif token == '--dpi' and value is not None:
+            variables['user_defined_dpi'] = value
+            i += 1
+        elif token == '-c' and value is not None and '=' in value:
+            name, _, setting = value.partition('=')
+            variables[name] = setting
+            i += 1
+        else:
+            logger.debug(f"Ignoring unsupported Tesseract config option: {token}")
+        i += 1
+
+    return psm, oem, variables
+
+
+def parse_tsv(tsv: str) -> Dict[str, List[Any]]:
+    """Tesseract TSV output as the column dict pytesseract.image_to_data returns"""
+    data: Dict[str, List[Any]] = {column: [] for column in TSV_COLUMNS}
+    for row in tsv.splitlines():
+        values = row.split('\t', len(TSV_COLUMNS) - 1)
+        if len(values) < len(TSV_COLUMNS) or values[0] == 'level':
+            continue
+        for column, value in zip(TSV_COLUMNS, values):
+            data[column].append(value)
+    return data
+
+
+class OCRBackend:
+    """One way of running OCR over a page image"""
+
+    name = 'base'
+    remote = False  # Sends page images off-host (and is billed per call)
+    fixed_cost_ms = 0.0  # Per-call overhead (process spawn, model load, round trip)
+    cost_ms_per_megapixel = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """Calls that can run at once without queueing"""
+        return 1
+
+    def available(self) -> bool:
+        """Whether the engine is installed and configured"""
+        return True
+
+    def recognize(self, image, config: str = '', lang: Optional[str] = None, page_number: int = 1) -> OCRPageLayout:
+        """OCR a PIL image and return its layout"""
+        raise NotImplementedError
+
+    def version(self) -> str:
+        """Engine version (part of OCR cache fingerprints)"""
+        return 'unknown'
+
+    def shutdown(self):
+        """Release any engines held by this backend"""
+
+
+class PytesseractBackend(OCRBackend):
+    """One tesseract process per call (the historical behaviour)"""
+
+    name = 'pytesseract'
+    fixed_cost_ms = 150.0
+    cost_ms_per_megapixel = 400.0
+
+    @property
+    def capacity(self) -> int:
+        return max(1, os.cpu_count() or 1)
+
+    def available(self) -> bool:
+        return self.version() != 'unknown'
+
+    def recognize(self, image, config: str = '', lang: Optional[str] = None, page_number: int = 1) -> OCRPageLayout:
+        import pytesseract
+
+        kwargs = {'config': config, 'output_type': pytesseract.Output.DICT}
+        if lang:
+            kwargs['lang'] = lang
+
+        data = pytesseract.image_to_data(image, **kwargs)
+        return OCRPageLayout.from_tesseract_data(data, page_number=page_number, image_size=image.size)
+
+    @lru_cache(maxsize=1)
+    def version(self) -> str:
+        try:
+            import pytesseract
+            return str(pytesseract.get_tesseract_version())
+        except Exception:
+            return 'unknown'
+
+
+class WarmEnginePool:
+    """
+    Bounded set of reusable engines.
+
+    Engines are created lazily by factory() up to max_engines; idle ones are
+    reused most-recently-used first. An engine whose call raised is closed
+    rather than returned, since its state is unknown.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_engines: int, close: Callable[[Any], None] = lambda engine: None):
+        self.factory = factory
+        self.max_engines = max(1, max_engines)
+        self.close = close
+        self.created = 0
+        self._idle: List[Any] = []
+        self._slots = threading.BoundedSemaphore(self.max_engines)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        with self._slots:
+            with self._lock:
+                engine = self._idle.pop() if self._idle else None
+            if engine is None:
+                engine = self.factory()
+                with self._lock:
+                    self.created += 1
+
+            try:
+                yield engine
+            except BaseException:
+                self._discard(engine)
+                raise
+
+            with self._lock:
+                self._idle.append(engine)
+
+    def _discard(self, engine):
+        with self._lock:
+            self.created -= 1
+        try:
+            self.close(engine)
+        except Exception as e:
+            logger.warning(f"Failed to close OCR engine: {e}")
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.created -= len(idle)
+        for engine in idle:
+            try:
+                self.close(engine)
+            except Exception as e:
+                logger.warning(f"Failed to close OCR engine: {e}")
+
+
+class TesserocrBackend(OCRBackend):
+    """Warm in-process Tesseract engines via tesserocr"""
+
+    name = 'tesserocr'
+    fixed_cost_ms = 5.0
+    cost_ms_per_megapixel = 400.0
+
+    def __init__(self, max_engines: int):
+        self.max_engines = max(1, max_engines)
+        self._pools: Dict[Tuple[str, int], WarmEnginePool] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, lang: str, oem: int) -> WarmEnginePool:
+        key = (lang, oem)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                logger.info(f"Starting warm OCR engines: lang={lang}, oem={oem}, up to {self.max_engines}")
+                pool = WarmEnginePool(
+                    factory=lambda: tesserocr.PyTessBaseAPI(lang=lang, oem=tesserocr.OEM(oem)),
+                    max_engines=self.max_engines,
+                    close=lambda api: api.End()
+                )
+                self._pools[key] = pool
+            return pool
+
+    @property
+    def capacity(self) -> int:
+        return self.max_engines
+
+    def available(self) -> bool:
+        return TESSEROCR_AVAILABLE
+
+    def recognize(self, image, config: str = '', lang: Optional[str] = None, page_number: int = 1) -> OCRPageLayout:
+        psm, oem, variables = parse_tesseract_config(config)
+
+        with self._pool(lang or DEFAULT_LANG, DEFAULT_OEM if oem is None else oem).checkout() as api:
+            defaults = {name: api.GetVariableAsString(name) for name in variables}
+            try:
+                api.SetPageSegMode(tesserocr.PSM(DEFAULT_PSM if psm is None else psm))
+                for name, value in variables.items():
+                    api.SetVariable(name, value)
+
+                api.SetImage(image)
+                api.Recognize()
+                data = parse_tsv(api.GetTSVText(page_number - 1))
+            finally:
+                for name, value in defaults.items():
+                    if value is not None:
+                        api.SetVariable(name, value)
+                api.Clear()
+
+        return OCRPageLayout.from_tesseract_data(data, page_number=page_number, image_size=image.size)
+
+    def version(self) -> str:
+        return str(tesserocr.tesseract_version()).splitlines()[0]
+
+    def shutdown(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close_all()
+
+
+class GoogleVisionBackend(OCRBackend):
+    """
+    Google Cloud Vision document text detection.
+
+    Vision has no line level, so each paragraph becomes one line. Word
+    confidences (0-1) are scaled to Tesseract's 0-100. Tesseract config
+    (page segmentation, whitelists) does not apply and is ignored.
+    """
+
+    name = 'google_vision'
+    remote = True
+    fixed_cost_ms = 600.0
+    cost_ms_per_megapixel = 50.0
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency
+
+    def available(self) -> bool:
+        return GOOGLE_VISION_AVAILABLE and settings.google_vision_enabled
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = vision.ImageAnnotatorClient()
+            return self._client
+
+    def recognize(self, image, config: str = '', lang: Optional[str] = None, page_number: int = 1) -> OCRPageLayout:
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+
+        response = self._get_client().document_text_detection(image=vision.Image(content=buffer.getvalue()))
+        if response.error.message:
+            raise RuntimeError(f"Google Vision error: {response.error.message}")
+
+        blocks = []
+        for page in response.full_text_annotation.pages:
+            for block in page.blocks:
+                lines = []
+                for paragraph in block.paragraphs:
+                    words = [
+                        OCRWord(
+                            text=''.join(symbol.text for symbol in word.symbols),
+                            confidence=word.confidence * 100,
+                            bbox=_vertices_box(word.bounding_box.vertices)
+                        )
+                        for word in paragraph.words
+                    ]
+                    if words:
+                        lines.append(OCRLine(words=words))
+                if lines:
+                    blocks.append(OCRBlock(lines=lines))
+
+        width, height = image.size
+        return OCRPageLayout(page_number=page_number, width=width, height=height, blocks=blocks)
+
+    def version(self) -> str:
+        return 'cloud-vision-v1'
+
+
+def _vertices_box(vertices) -> BoundingBox:
+    xs = [vertex.x for vertex in vertices] or [0]
+    ys = [vertex.y for vertex in vertices] or [0]
+    return BoundingBox(left=min(xs), top=min(ys), width=max(xs) - min(xs), height=max(ys) - min(ys))
@@ -0,0 +1,234 @@
+"""
+CONTENT-ADDRESSED OCR RESULT CACHE
+
+Persistent, size-bounded cache of per-page OCR output shared by every scanner.
+
+Veterans re-upload the same DD-214 and STR files through several endpoints;
+each upload used to re-OCR from scratch. Entries here are keyed by:
+
+- SHA-256 of the file content (file name and upload path do not matter)
+- An OCR fingerprint: engine name, Tesseract version and every option that
+  changes the output (config string, DPI, language, ...)
+
+Each entry stores per-page text and confidence (0-1) as JSON under
+{ocr_cache_dir}/{key[:2]}/{key}.json.
+
+EVICTION:
+Reads touch the entry's mtime, so mtime order is LRU order. When the total
+size goes over ocr_cache_max_mb, the least recently used entries are removed
+until the cache is back under 90% of the limit.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of the limit so every put does not trigger a scan
+EVICTION_TARGET_RATIO = 0.9
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: Union[str, Path]) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _tesseract_version() -> str:
+    try:
+        from app.services.ocr_router import get_ocr_router
+        return get_ocr_router().fingerprint()
+    except Exception:
+        return 'unknown'
+
+
+def ocr_fingerprint(engine: str, **options: Any) -> str:
+    """
+    Fingerprint of the OCR engine and every option that affects its output.
+
+    Args:
+        engine: Name of the extraction path (e.g. 'ocr_extraction')
+        **options: Output-affecting options (config, dpi, lang, ...)
+    """
+    payload = json.dumps(
+        {'engine': engine, 'tesseract': _tesseract_version(), 'options': options},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def layout_cache_pages(layouts) -> List[Dict[str, Any]]:
+    """Reduce OCRPageLayouts to the per-page text and confidence stored in the cache"""
+    return [
+        {
+            'page_number': layout.page_number,
+            'text': layout.text,
+            'confidence': round(layout.mean_confidence / 100, 4)
+        }
+        for layout in layouts
+    ]
+
+
+class OCRResultCache:
+    """
+    On-disk LRU cache of per-page OCR results.
+
+    Page entries are dicts: {'page_number': int, 'text': str, 'confidence': float}
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, file_hash: str, fingerprint: str) -> Path:
+        key = f"{file_hash}-{fingerprint}"
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, file_hash: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached pages, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(file_hash, fingerprint)
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+            os.utime(path)  # LRU touch
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable OCR cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info(f"OCR cache hit: {file_hash[:12]} ({len(entry['pages'])} pages)")
+        return entry['pages']
+
+    def put(self, file_hash: str, fingerprint: str, pages: List[Dict[str, Any]]):
+        """Store pages for a file; evicts least recently used entries if over the limit"""
+        if not self.enabled:
+            return
+
+        path = self._entry_path(file_hash, fingerprint)
+        payload = json.dumps({'pages': pages}).encode('utf-8')
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(payload)
+
+            with self._lock:
+                self._ensure_total_bytes()
+                previous_size = self._size(path)
+                os.replace(tmp_path, path)
+                self._total_bytes += len(payload) - previous_size
+
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+        except Exception as e:
+            logger.warning(f"Could not write OCR cache entry {path}: {e}")
+
+    def clear(self):
+        """Remove every cache entry"""
+        with self._lock:
+            for path in self._entries():
+                self._remove(path)
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._ensure_total_bytes()
+            return {
+                'enabled': self.enabled,
+                'cache_dir': str(self.cache_dir),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _entries(self) -> List[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob('*/*.json'))
+
+    def _ensure_total_bytes(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(self._size(path) for path in self._entries())
+
+    def _evict(self):
+        """Drop least recently used entries until under the eviction target (lock held)"""
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            evicted += 1
+
+        self._total_bytes = total
+        logger.info(f"OCR cache evicted {evicted} entries ({total} bytes remaining)")
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# Global cache instance
+_ocr_cache: Optional[OCRResultCache] = None
+
+
+def get_ocr_cache() -> OCRResultCache:
+    """Get the global OCR result cache (configured from settings)"""
+    global _ocr_cache
+    if _ocr_cache is None:
+        _ocr_cache = OCRResultCache(
+            cache_dir=settings.ocr_cache_dir,
+            max_bytes=settings.ocr_cache_max_mb * 1024 * 1024,
+            enabled=settings.ocr_cache_enabled
+        )
+    return _ocr_cache
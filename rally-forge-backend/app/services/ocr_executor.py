@@ -0,0 +1,147 @@
+"""
+OCR JOB EXECUTOR
+
+Runs blocking document extraction off the asyncio event loop.
+
+pytesseract, pdf2image and PyPDF2 are all synchronous. Called directly from
+an async endpoint they stall the event loop for the whole job, so every other
+request on that uvicorn worker (including /health) waits behind OCR.
+
+FEATURES:
+- Dedicated bounded thread pool (ocr_executor_threads), separate from the
+  default executor FastAPI uses for sync endpoints
+- Per-job timeout (ocr_timeout_seconds)
+- Cooperative cancellation: when a job times out or its caller is cancelled,
+  the job's token is cancelled and page loops stop at their next
+  raise_if_cancelled() check instead of OCRing the rest of the document
+
+The heavy lifting still happens in Tesseract subprocesses and the OCR worker
+pool; these threads only drive jobs, so a small pool is enough.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OCRJobCancelled(Exception):
+    """Raised inside a job once its cancellation token has been cancelled"""
+
+
+class OCRJobTimeout(TimeoutError):
+    """Raised to the caller when a job exceeds its timeout"""
+
+
+class CancellationToken:
+    """Cancellation flag shared between the awaiting caller and a running job"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise OCRJobCancelled("OCR job was cancelled")
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar('ocr_cancel_token', default=None)
+
+
+def current_cancel_token() -> Optional[CancellationToken]:
+    """Cancellation token of the job running in this thread (None outside a job)"""
+    return _current_token.get()
+
+
+def raise_if_cancelled():
+    """Stop the current OCR job if it has been cancelled (no-op outside a job)"""
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+# Global executor instance
+_ocr_executor: Optional[ThreadPoolExecutor] = None
+_ocr_executor_lock = threading.Lock()
+
+
+def get_ocr_executor() -> ThreadPoolExecutor:
+    """Get the dedicated OCR job executor (created on first use)"""
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is None:
+            logger.info(f"Starting OCR job executor: {settings.ocr_executor_threads} threads")
+            _ocr_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.ocr_executor_threads),
+                thread_name_prefix='ocr-job'
+            )
+        return _ocr_executor
+
+
+def shutdown_ocr_executor():
+    """Shut down the OCR job executor if it was started"""
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is not None:
+            logger.info("Shutting down OCR job executor")
+            _ocr_executor.shutdown(wait=False, cancel_futures=True)
+            _ocr_executor = None
+
+
+async def run_ocr_job(fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    Run a blocking extraction function on the OCR executor.
+
+    Args:
+        fn: Synchronous function to run
+        *args, **kwargs: Passed to fn
+        timeout: Seconds before the job is abandoned and cancelled
+                 (defaults to settings.ocr_timeout_seconds; 0 disables)
+
+    Returns:
+        fn's return value
+
+    Raises:
+        OCRJobTimeout: If the job did not finish in time
+    """
+    if timeout is None:
+        timeout = settings.ocr_timeout_seconds
+
+    token = CancellationToken()
+
+    def run_with_token():
+        reset_token = _current_token.set(token)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_token.reset(reset_token)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_ocr_executor(), run_with_token)
+
+    try:
+        if timeout and timeout > 0:
+            return await asyncio.wait_for(future, timeout)
+        return await future
+
+    except asyncio.TimeoutError:
+        token.cancel()
+        logger.error(f"OCR job {getattr(fn, '__name__', fn)} exceeded {timeout} seconds, cancelling")
+        raise OCRJobTimeout(f"OCR job exceeded {timeout} seconds")
+
+    except asyncio.CancelledError:
+        # Caller went away (e.g. client disconnected); stop the job at its next check
+        token.cancel()
+        raise
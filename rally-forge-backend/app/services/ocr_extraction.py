@@ -10,9 +10,18 @@ SUPPORTS:
 - JPG/PNG images (OCR)
 
 FEATURES:
-- Automatic text vs image detection
+- Per-page text layer vs OCR selection (mixed PDFs OCR only scanned pages)
 - Multiple extraction methods with fallback
 - Confidence scoring
+- Page-parallel OCR across a bounded worker pool
+- Page-at-a-time PDF rasterization with a per-worker memory ceiling
+- Page-range extraction straight from the original file (chunked large PDFs)
+- Adaptive DPI: low-resolution first, re-rendered only for low-confidence pages
+- OpenCV preprocessing (binarize, deskew, border crop, denoise) ahead of Tesseract
+- Content-addressed OCR result cache (re-uploads skip OCR)
+- Duplicate page elimination: copies of an earlier page reuse its OCR text
+- Optional early stop: pages are read in order until a caller's required fields are complete (multi-copy DD-214s)
+- Runs on the OCR job executor with a per-document timeout (never blocks the event loop)
 - Character count validation
 - Detailed logging
 
@@ -26,8 +35,9 @@ VALIDATION:
 import os
 import logging
 import re
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 import io
 
@@ -42,8 +52,44 @@ except ImportError as e:
     logging.warning(f"OCR dependencies not fully available: {e}")
     DEPENDENCIES_AVAILABLE = False
 
+from app.config import settings
+from app.services.adaptive_ocr import adaptive_fingerprint_options, ocr_pdf_page_adaptive
+from app.services.early_stop import RequiredFieldTracker
+from app.services.image_preprocessing import active_steps
+from app.services.ocr_cache import get_ocr_cache, hash_file, ocr_fingerprint, layout_cache_pages
+from app.services.ocr_executor import OCRJobCancelled, OCRJobTimeout, raise_if_cancelled, run_ocr_job
+from app.services.ocr_layout import OCRPageLayout, ocr_page_layout, join_page_texts
+from app.services.ocr_worker_pool import get_ocr_worker_pool
+from app.services.page_dedup import (
+    DuplicatePageFinder,
+    duplicate_fingerprint_options,
+    find_duplicate_pages,
+    pdf_page_signature,
+)
+from app.services.pdf_rasterizer import PageRenderPlan, plan_pdf_render, plan_page_renders
+
 logger = logging.getLogger(__name__)
 
+# Confidence reported for pages taken from the PDF's embedded text layer
+TEXT_LAYER_CONFIDENCE = 0.95
+
+
+def ocr_pdf_page(task: Tuple[str, int, int, str]) -> OCRPageLayout:
+    """
+    Render and OCR a single PDF page at adaptive resolution.
+
+    Module-level so it can be shipped to OCR worker processes; each worker
+    only ever holds the one page it is working on.
+
+    Args:
+        task: (pdf path, 1-based page number, max render DPI, tesseract config)
+
+    Returns:
+        OCRPageLayout (text and confidence are derived from it)
+    """
+    file_path, page_number, dpi, tesseract_config = task
+    return ocr_pdf_page_adaptive(file_path, page_number, dpi, config=tesseract_config)
+
 
 class ExtractionMethod(str, Enum):
     """Methods for text extraction"""
@@ -55,6 +101,7 @@ class ExtractionMethod(str, Enum):
 
 class DocumentType(str, Enum):
     """Supported document types"""
+    PDF = "pdf"  # Before extraction; resolved to PDF_TEXT or PDF_IMAGE
     PDF_TEXT = "pdf_text"
     PDF_IMAGE = "pdf_image"
     IMAGE = "image"
@@ -68,23 +115,28 @@ class OCRExtractionEngine:
 
     WORKFLOW:
     1. Detect document type
-    2. Attempt direct text extraction (PDFs)
-    3. Fall back to OCR if needed
+    2. Use the embedded text layer on PDF pages that have one
+    3. OCR the remaining pages
     4. Validate extraction quality
     5. Return structured result
     """
 
-    def __init__(self, min_characters: int = 200):
+    def __init__(self, min_characters: int = 200, min_page_characters: int = 100):
         self.min_characters = min_characters
+        self.min_page_characters = min_page_characters  # Text layer needed to skip OCR on a page
         self.tesseract_config = '--psm 1 --oem 3'  # Page segmentation mode 1, OCR Engine Mode 3
 
         if not DEPENDENCIES_AVAILABLE:
             logger.error("OCR dependencies not available. Install: pip install pytesseract pillow pdf2image PyPDF2")
 
-    async def extract_text(self, file_path: str) -> Dict[str, Any]:
+    async def extract_text(self, file_path: str, page_tracker: Optional[RequiredFieldTracker] = None) -> Dict[str, Any]:
         """
         Extract text from document using best available method.
 
+        Args:
+            page_tracker: PDFs only; pages are fed to it in order and
+                extraction stops once it is satisfied (see early_stop)
+
         Returns:
             {
                 'success': bool,
@@ -94,7 +146,11 @@ class OCRExtractionEngine:
                 'character_count': int,
                 'document_type': DocumentType,
                 'error': Optional[str],
-                'warnings': List[str]
+                'warnings': List[str],
+                'pages': List[OCRPageLayout],  # OCR'd pages only (empty on a cache hit)
+                'page_offsets': List[int],     # start of each page in 'text'
+                'page_methods': List[ExtractionMethod],  # PDFs only, one per page
+                'duplicate_pages': List[dict]  # PDFs only, {'page_number', 'duplicate_of'} per page not OCR'd as a copy
             }
         """
         file_path = Path(file_path)
@@ -117,25 +173,29 @@ class OCRExtractionEngine:
         logger.info(f"Detected document type: {document_type.value}")
 
         # Try extraction based on document type
-        if document_type == DocumentType.PDF_TEXT or document_type == DocumentType.PDF_IMAGE:
-            return await self._extract_from_pdf(file_path)
+        if document_type == DocumentType.PDF:
+            extract = partial(self._extract_from_pdf, page_tracker=page_tracker)
 
         elif document_type in [DocumentType.IMAGE, DocumentType.TIFF]:
-            return await self._extract_from_image(file_path)
+            extract = self._extract_from_image
 
         else:
             return self._error_result(f"Unsupported document type: {document_type.value}")
 
+        # Blocking PDF parsing and OCR run on the OCR executor, not the event loop
+        try:
+            return await run_ocr_job(extract, file_path)
+        except OCRJobTimeout as e:
+            logger.error(f"Extraction timed out for {file_path}: {e}")
+            return self._error_result(f"Extraction timed out: {e}")
+
     def _detect_document_type(self, file_path: Path) -> DocumentType:
-        """Detect document type from file extension and content"""
+        """Detect document type from file extension"""
         extension = file_path.suffix.lower()
 
         if extension == '.pdf':
-            # Check if PDF contains text or is image-only
-            if self._pdf_contains_text(file_path):
-                return DocumentType.PDF_TEXT
-            else:
-                return DocumentType.PDF_IMAGE
+            # Text layer vs image is decided per page during extraction
+            return DocumentType.PDF
 
         elif extension in ['.tiff', '.tif']:
             return DocumentType.TIFF
@@ -146,217 +206,349 @@ class OCRExtractionEngine:
         else:
             return DocumentType.UNKNOWN
 
-    def _pdf_contains_text(self, file_path: Path) -> bool:
-        """
-        Check if PDF contains extractable text.
+    def _has_text_layer(self, page_text: str) -> bool:
+        """A page with this much embedded text does not need OCR"""
+        return len(page_text.strip()) >= self.min_page_characters
 
-        Returns:
-            True if PDF has text, False if image-only
+    def _read_pdf_pages(
+        self,
+        file_path: Path,
+        page_range: Optional[Tuple[int, int]] = None
+    ) -> Tuple[List[str], List[Tuple[float, float]]]:
         """
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+        Read every page's embedded text layer and size with a single PDF parse.
 
-                # Check first few pages for text
-                pages_to_check = min(3, len(pdf_reader.pages))
+        Args:
+            page_range: (first, last) 1-based inclusive; only these pages are read
 
-                for page_num in range(pages_to_check):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
+        Returns:
+            (per-page text, per-page (width, height) in points)
+        """
+        page_texts = []
+        page_sizes = []
 
-                    # If we find significant text, it's a text PDF
-                    if text and len(text.strip()) > 100:
-                        return True
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            first_page, last_page = page_range or (1, len(pdf_reader.pages))
 
-                return False
+            for page_num in range(first_page, last_page + 1):
+                page = pdf_reader.pages[page_num - 1]
+                page_sizes.append((float(page.mediabox.width), float(page.mediabox.height)))
+                try:
+                    page_texts.append(page.extract_text() or '')
+                except Exception as e:
+                    logger.warning(f"Text layer extraction failed on page {page_num}: {e}")
+                    page_texts.append('')
 
-        except Exception as e:
-            logger.warning(f"Error checking PDF for text: {e}")
-            return False
+        return page_texts, page_sizes
 
-    async def _extract_from_pdf(self, file_path: Path) -> Dict[str, Any]:
+    def _extract_from_pdf(self, file_path: Path, page_tracker: Optional[RequiredFieldTracker] = None) -> Dict[str, Any]:
         """
-        Extract text from PDF.
+        Extract text from PDF, choosing the method page by page.
 
         STRATEGY:
-        1. Try direct text extraction
-        2. If insufficient text, use OCR
-        3. If both fail, return error
+        1. Read every page's text layer in one PDF parse
+        2. Keep the text layer on pages that have one
+        3. OCR only the image-only pages
+        4. Stop early once page_tracker (if any) has every field it needs
+        5. Validate the combined text
         """
         warnings = []
 
-        # Try direct text extraction first
-        text_extraction_result = self._extract_pdf_text(file_path)
-
-        if text_extraction_result['success'] and len(text_extraction_result['text']) >= self.min_characters:
-            logger.info(f"Successfully extracted text from PDF: {len(text_extraction_result['text'])} characters")
-            return text_extraction_result
-
-        else:
-            warnings.append(f"PDF text extraction yielded {len(text_extraction_result.get('text', ''))} characters (minimum {self.min_characters})")
-            logger.warning(f"PDF text extraction insufficient. Falling back to OCR.")
+        try:
+            cache = get_ocr_cache()
+            file_hash = hash_file(file_path)
+            # An early-stopped extraction only holds some pages, so it is cached on its own
+            early_stop = {'early_stop': page_tracker.fingerprint_options()} if page_tracker else {}
+            fingerprint = ocr_fingerprint(
+                'ocr_extraction',
+                config=self.tesseract_config,
+                dpi=300,
+                min_page_characters=self.min_page_characters,
+                **early_stop,
+                **duplicate_fingerprint_options(),
+                **adaptive_fingerprint_options()
+            )
+
+            pages = cache.get(file_hash, fingerprint)
+            layouts = []
+            if pages is None:
+                pages, layouts = self._extract_pdf_pages(file_path, warnings, page_tracker=page_tracker)
+                cache.put(file_hash, fingerprint, pages)
 
-            # Fall back to OCR
-            ocr_result = await self._extract_pdf_with_ocr(file_path)
+        except Exception as e:
+            logger.error(f"PDF extraction failed: {e}")
+            return self._error_result(f"PDF extraction failed: {e}", warnings=warnings)
+
+        return self._pdf_result(pages, layouts, warnings)
+
+    def _extract_pdf_pages(
+        self,
+        file_path: Path,
+        warnings: List[str],
+        page_range: Optional[Tuple[int, int]] = None,
+        page_tracker: Optional[RequiredFieldTracker] = None
+    ) -> Tuple[List[Dict[str, Any]], List[OCRPageLayout]]:
+        """
+        Extract every page with its own method.
 
-            if ocr_result['success']:
-                ocr_result['warnings'] = warnings + ocr_result.get('warnings', [])
-                return ocr_result
+        Args:
+            page_range: (first, last) 1-based inclusive; extract only these
+                pages, OCR'ing them in this process (the range itself is the
+                unit of parallelism, see pdf_chunking)
+            page_tracker: Fed each page in order; once it is satisfied the
+                remaining pages are neither rendered nor OCR'd
 
-            else:
-                # Both methods failed
-                return self._error_result(
-                    f"Both PDF text extraction and OCR failed. Text extraction: {text_extraction_result.get('error')}, OCR: {ocr_result.get('error')}",
-                    warnings=warnings
-                )
-
-    def _extract_pdf_text(self, file_path: Path) -> Dict[str, Any]:
-        """Extract text directly from PDF"""
+        Returns:
+            (per-page {'page_number', 'text', 'confidence', 'method'}, OCR layouts of OCR'd pages)
+        """
+        first_page = page_range[0] if page_range else 1
+        try:
+            page_texts, page_sizes = self._read_pdf_pages(file_path, page_range)
+            plans = plan_page_renders(page_sizes, dpi=300, first_page=first_page)
+        except Exception as e:
+            logger.warning(f"Could not read PDF text layer ({e}), running OCR on every page")
+            warnings.append(f"PDF text layer could not be read: {e}")
+            plans = plan_pdf_render(file_path, dpi=300)
+            if page_range:
+                plans = [plan for plan in plans if first_page <= plan.page_number <= page_range[1]]
+            page_texts = [''] * len(plans)
+
+        # Only image-only pages go through the renderer and Tesseract
+        ocr_plans = [plan for plan in plans if not self._has_text_layer(page_texts[plan.page_number - first_page])]
+        logger.info(
+            f"{len(plans) - len(ocr_plans)} of {len(plans)} pages have a text layer; "
+            f"running OCR on {len(ocr_plans)}"
+        )
+
+        if ocr_plans and len(ocr_plans) < len(plans):
+            warnings.append(f"OCR used for {len(ocr_plans)} of {len(plans)} pages without a text layer")
+
+        tasks = {plan.page_number: (str(file_path), plan.page_number, plan.dpi, self.tesseract_config) for plan in ocr_plans}
+        if page_range or page_tracker:
+            # One page at a time: a page range is already a unit of parallelism, and an
+            # early-stopping scan must not have the pool render or OCR pages it may never
+            # need. Copies of an earlier page are found as each page is reached.
+            duplicates = {}
+            duplicate_finder = DuplicatePageFinder() if self._dedup_pages(ocr_plans) else None
+            ocr_results = None
+        else:
+            # Copies of an earlier page reuse its text instead of going through OCR
+            duplicates = self._find_duplicate_pages(file_path, ocr_plans)
+            duplicate_finder = None
+            # Render + OCR pages across the worker pool; results come back in page order
+            ocr_results = get_ocr_worker_pool().imap_ordered(
+                ocr_pdf_page, [task for page_number, task in tasks.items() if page_number not in duplicates]
+            )
+
+        last_page = first_page + len(plans) - 1
+        pages = []
+        pages_by_number = {}
+        layouts = []
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            for page_number, page_text in enumerate(page_texts, first_page):
+                if page_number in tasks:
+                    raise_if_cancelled()
+                    if duplicate_finder is not None:
+                        try:
+                            signature = pdf_page_signature((str(file_path), page_number))
+                        except Exception as e:
+                            # Never fails extraction: the rest of the pages are OCR'd
+                            logger.warning(f"Duplicate page detection failed ({e}), running OCR on every page")
+                            duplicate_finder = None
+                        else:
+                            original = duplicate_finder.original_of(signature)
+                            if original is not None:
+                                duplicates[page_number] = original
+
+                if page_number in duplicates:
+                    original = pages_by_number[duplicates[page_number]]
+                    logger.info(f"Page {page_number} duplicates page {original['page_number']}, reusing its OCR text")
+                    page = {**original, 'page_number': page_number, 'duplicate_of': original['page_number']}
+                elif page_number in tasks:
+                    layout = next(ocr_results) if ocr_results is not None else ocr_pdf_page(tasks[page_number])
+                    layouts.append(layout)
+                    logger.info(f"OCR completed for page {layout.page_number}/{last_page}")
+                    page = {**layout_cache_pages([layout])[0], 'method': ExtractionMethod.OCR_TESSERACT.value}
+                else:
+                    page = {
+                        'page_number': page_number,
+                        'text': page_text,
+                        'confidence': TEXT_LAYER_CONFIDENCE,
+                        'method': ExtractionMethod.PDF_TEXT.value
+                    }
+                pages.append(page)
+                pages_by_number[page_number] = page
 
-                text_parts = []
+                if page_tracker and page_tracker.add_page(page_number, page['text'], page['confidence']):
+                    if page_number < last_page:
+                        logger.info(f"Required fields complete after page {page_number}/{last_page}, stopping")
+                        warnings.append(page_tracker.stop_warning(len(plans)))
+                    break
+        finally:
+            if ocr_results is not None:
+                # Drops pool pages not yet started
+                ocr_results.close()
 
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text()
+        if duplicates:
+            warnings.append(f"OCR skipped for {len(duplicates)} pages that duplicate an earlier page")
 
-                    if page_text:
-                        text_parts.append(page_text)
+        return pages, layouts
 
-                full_text = '\n\n'.join(text_parts)
-                character_count = len(full_text)
+    def _dedup_pages(self, ocr_plans: List[PageRenderPlan]) -> bool:
+        return settings.ocr_duplicate_pages_enabled and len(ocr_plans) >= 2
 
-                logger.info(f"Extracted {character_count} characters from {len(pdf_reader.pages)} pages")
+    def _find_duplicate_pages(self, file_path: Path, ocr_plans: List[PageRenderPlan]) -> Dict[int, int]:
+        """
+        Pages to be OCR'd that copy an earlier one (see page_dedup).
 
-                if character_count < self.min_characters:
-                    return {
-                        'success': False,
-                        'text': full_text,
-                        'method': ExtractionMethod.PDF_TEXT,
-                        'confidence': 0.5,
-                        'character_count': character_count,
-                        'document_type': DocumentType.PDF_TEXT,
-                        'error': f"Insufficient text extracted: {character_count} characters (minimum {self.min_characters})",
-                        'warnings': []
-                    }
+        Signatures are rendered across the worker pool. Never fails
+        extraction: if signing fails, every page is OCR'd.
 
-                return {
-                    'success': True,
-                    'text': full_text,
-                    'method': ExtractionMethod.PDF_TEXT,
-                    'confidence': 0.95,
-                    'character_count': character_count,
-                    'document_type': DocumentType.PDF_TEXT,
-                    'error': None,
-                    'warnings': []
-                }
+        Returns:
+            duplicate page number -> page number it copies
+        """
+        if not self._dedup_pages(ocr_plans):
+            return {}
 
+        tasks = [(str(file_path), plan.page_number) for plan in ocr_plans]
+        try:
+            signatures = get_ocr_worker_pool().map_ordered(pdf_page_signature, tasks)
+        except OCRJobCancelled:
+            raise
         except Exception as e:
-            logger.error(f"PDF text extraction failed: {e}")
-            return {
-                'success': False,
-                'text': '',
-                'method': ExtractionMethod.FAILED,
-                'confidence': 0.0,
-                'character_count': 0,
-                'document_type': DocumentType.PDF_TEXT,
-                'error': str(e),
-                'warnings': []
-            }
+            logger.warning(f"Duplicate page detection failed ({e}), running OCR on every page")
+            return {}
+
+        return find_duplicate_pages(signatures)
+
+    def extract_pdf_page_range(
+        self,
+        file_path: str,
+        first_page: int,
+        last_page: int,
+        file_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract one page range of a PDF without copying it (blocking).
+
+        Used by chunked processing of very large PDFs: each range is read
+        straight from the original file and cached on its own. page_offsets
+        in the result are relative to the range's text; its pages are
+        first_page..last_page. A sparse range still succeeds: the minimum
+        character count applies to the whole document, which the caller
+        checks after merging.
+
+        Args:
+            file_hash: Content hash of the whole file, if the caller already
+                has it (saves re-hashing a large file once per range)
+        """
+        file_path = Path(file_path)
+        warnings = []
 
-    async def _extract_pdf_with_ocr(self, file_path: Path) -> Dict[str, Any]:
-        """Extract text from PDF using OCR"""
         try:
-            logger.info(f"Converting PDF to images for OCR: {file_path}")
-
-            # Convert PDF pages to images
-            images = convert_from_path(str(file_path), dpi=300)
-
-            logger.info(f"Converted {len(images)} pages to images")
-
-            text_parts = []
-            total_confidence = 0.0
-
-            for page_num, image in enumerate(images):
-                # Run OCR on each page
-                page_text = pytesseract.image_to_string(image, config=self.tesseract_config)
-
-                if page_text:
-                    text_parts.append(page_text)
-
-                # Get confidence (if available)
-                try:
-                    page_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-                    confidences = [int(conf) for conf in page_data['conf'] if conf != '-1']
-                    if confidences:
-                        total_confidence += sum(confidences) / len(confidences)
-                except:
-                    total_confidence += 70  # Default confidence
+            cache = get_ocr_cache()
+            file_hash = file_hash or hash_file(file_path)
+            fingerprint = ocr_fingerprint(
+                'ocr_extraction',
+                config=self.tesseract_config,
+                dpi=300,
+                min_page_characters=self.min_page_characters,
+                page_range=[first_page, last_page],
+                **duplicate_fingerprint_options(),
+                **adaptive_fingerprint_options()
+            )
+
+            pages = cache.get(file_hash, fingerprint)
+            if pages is None:
+                pages, _ = self._extract_pdf_pages(file_path, warnings, (first_page, last_page))
+                cache.put(file_hash, fingerprint, pages)
 
-                logger.info(f"OCR completed for page {page_num + 1}/{len(images)}")
+        except Exception as e:
+            logger.error(f"PDF extraction failed for pages {first_page}-{last_page}: {e}")
+            return self._error_result(f"PDF extraction failed for pages {first_page}-{last_page}: {e}", warnings=warnings)
+
+        return self._pdf_result(pages, [], warnings, min_characters=0)
+
+    def _pdf_result(
+        self,
+        pages: List[Dict[str, Any]],
+        layouts: List[OCRPageLayout],
+        warnings: List[str],
+        min_characters: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Combine per-page results into the standard extraction result"""
+        if min_characters is None:
+            min_characters = self.min_characters
+        page_methods = [ExtractionMethod(page['method']) for page in pages]
+        duplicate_pages = [
+            {'page_number': page['page_number'], 'duplicate_of': page['duplicate_of']}
+            for page in pages if page.get('duplicate_of')
+        ]
+        full_text, page_offsets = join_page_texts([page['text'] for page in pages])
+        character_count = len(full_text)
+        confidence = sum(page['confidence'] for page in pages) / len(pages) if pages else 0.0
+
+        if not page_methods:
+            method = ExtractionMethod.FAILED
+        elif all(page_method == ExtractionMethod.PDF_TEXT for page_method in page_methods):
+            method = ExtractionMethod.PDF_TEXT
+        elif all(page_method == ExtractionMethod.OCR_TESSERACT for page_method in page_methods):
+            method = ExtractionMethod.OCR_TESSERACT
+        else:
+            method = ExtractionMethod.HYBRID
 
-            full_text = '\n\n'.join(text_parts)
-            character_count = len(full_text)
-            avg_confidence = (total_confidence / len(images)) / 100 if images else 0
+        document_type = DocumentType.PDF_IMAGE if ExtractionMethod.OCR_TESSERACT in page_methods else DocumentType.PDF_TEXT
 
-            logger.info(f"OCR extracted {character_count} characters with {avg_confidence:.2f} confidence")
+        logger.info(
+            f"Extracted {character_count} characters from {len(pages)} pages "
+            f"via {method.value} with {confidence:.2f} confidence"
+        )
 
-            if character_count < self.min_characters:
-                return {
-                    'success': False,
-                    'text': full_text,
-                    'method': ExtractionMethod.OCR_TESSERACT,
-                    'confidence': avg_confidence,
-                    'character_count': character_count,
-                    'document_type': DocumentType.PDF_IMAGE,
-                    'error': f"Insufficient text extracted via OCR: {character_count} characters (minimum {self.min_characters})",
-                    'warnings': []
-                }
+        error = None
+        if character_count < min_characters:
+            error = f"Insufficient text extracted: {character_count} characters (minimum {min_characters})"
 
-            return {
-                'success': True,
-                'text': full_text,
-                'method': ExtractionMethod.OCR_TESSERACT,
-                'confidence': avg_confidence,
-                'character_count': character_count,
-                'document_type': DocumentType.PDF_IMAGE,
-                'error': None,
-                'warnings': []
-            }
-
-        except Exception as e:
-            logger.error(f"PDF OCR extraction failed: {e}")
-            return {
-                'success': False,
-                'text': '',
-                'method': ExtractionMethod.FAILED,
-                'confidence': 0.0,
-                'character_count': 0,
-                'document_type': DocumentType.PDF_IMAGE,
-                'error': str(e),
-                'warnings': []
-            }
+        return {
+            'success': error is None,
+            'text': full_text,
+            'method': method,
+            'confidence': confidence,
+            'character_count': character_count,
+            'document_type': document_type,
+            'error': error,
+            'warnings': warnings,
+            'pages': layouts,
+            'page_offsets': page_offsets,
+            'page_methods': page_methods,
+            'duplicate_pages': duplicate_pages
+        }
 
-    async def _extract_from_image(self, file_path: Path) -> Dict[str, Any]:
+    def _extract_from_image(self, file_path: Path) -> Dict[str, Any]:
         """Extract text from image file using OCR"""
         try:
             logger.info(f"Running OCR on image: {file_path}")
 
-            # Open image
-            image = Image.open(file_path)
+            cache = get_ocr_cache()
+            file_hash = hash_file(file_path)
+            fingerprint = ocr_fingerprint('ocr_extraction', config=self.tesseract_config, preprocessing=active_steps())
 
-            # Run OCR
-            text = pytesseract.image_to_string(image, config=self.tesseract_config)
+            cached_pages = cache.get(file_hash, fingerprint)
+            if cached_pages is not None:
+                layouts = []
+                text = cached_pages[0]['text']
+                avg_confidence = cached_pages[0]['confidence']
 
-            # Get confidence
-            try:
-                data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-                confidences = [int(conf) for conf in data['conf'] if conf != '-1']
-                avg_confidence = (sum(confidences) / len(confidences)) / 100 if confidences else 0
-            except:
-                avg_confidence = 0.7  # Default confidence
+            else:
+                # Run OCR (single pass: text and confidence come from the layout)
+                with Image.open(file_path) as image:
+                    layout = ocr_page_layout(
+                        image, config=self.tesseract_config, preprocessing_steps=active_steps(), allow_remote=True
+                    )
+                layouts = [layout]
+                text = layout.text
+                avg_confidence = layout.mean_confidence / 100
+                cache.put(file_hash, fingerprint, layout_cache_pages(layouts))
 
             character_count = len(text)
 
@@ -371,7 +563,9 @@ class OCRExtractionEngine:
                     'character_count': character_count,
                     'document_type': DocumentType.IMAGE,
                     'error': f"Insufficient text extracted: {character_count} characters (minimum {self.min_characters})",
-                    'warnings': []
+                    'warnings': [],
+                    'pages': layouts,
+                    'page_offsets': [0]
                 }
 
             return {
@@ -382,7 +576,9 @@ class OCRExtractionEngine:
                 'character_count': character_count,
                 'document_type': DocumentType.IMAGE,
                 'error': None,
-                'warnings': []
+                'warnings': [],
+                'pages': layouts,
+                'page_offsets': [0]
             }
 
         except Exception as e:
@@ -0,0 +1,314 @@
+"""
+OCR PAGE LAYOUT MODEL
+
+Structured result of a single Tesseract pass over one page image.
+
+One OCR pass (Tesseract image_to_data, or whichever backend ocr_router
+picks for the page) gives every recognized word with its bounding box, confidence and
+block/paragraph/line membership. Plain text and
+page confidence are both derived from that, so a page is never OCR'd twice.
+
+STRUCTURE:
+- OCRPageLayout: page number, image size, blocks
+- OCRBlock: lines, bounding box
+- OCRLine: words, bounding box
+- OCRWord: text, confidence (0-100), bounding box
+
+Parsers can use the positional data directly (lines_matching, words_in_region)
+or map a character offset in the document text back to its page
+(page_number_at).
+"""
+
+import re
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tesseract image_to_data level for word rows
+WORD_LEVEL = 5
+
+
+@dataclass
+class BoundingBox:
+    """Pixel rectangle in page image coordinates"""
+    left: int
+    top: int
+    width: int
+    height: int
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.top + self.height
+
+    def union(self, other: 'BoundingBox') -> 'BoundingBox':
+        left = min(self.left, other.left)
+        top = min(self.top, other.top)
+        return BoundingBox(
+            left=left,
+            top=top,
+            width=max(self.right, other.right) - left,
+            height=max(self.bottom, other.bottom) - top
+        )
+
+    def contains(self, other: 'BoundingBox') -> bool:
+        return (
+            self.left <= other.left and self.top <= other.top and
+            self.right >= other.right and self.bottom >= other.bottom
+        )
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'left': self.left, 'top': self.top, 'width': self.width, 'height': self.height}
+
+
+@dataclass
+class OCRWord:
+    """A single recognized word"""
+    text: str
+    confidence: float
+    bbox: BoundingBox
+
+
+@dataclass
+class OCRLine:
+    """A line of words in reading order"""
+    words: List[OCRWord] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return ' '.join(word.text for word in self.words)
+
+    @property
+    def bbox(self) -> Optional[BoundingBox]:
+        return _union_boxes(word.bbox for word in self.words)
+
+
+@dataclass
+class OCRBlock:
+    """A block of text (Tesseract block)"""
+    lines: List[OCRLine] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(line.text for line in self.lines)
+
+    @property
+    def bbox(self) -> Optional[BoundingBox]:
+        return _union_boxes(line.bbox for line in self.lines if line.bbox)
+
+
+@dataclass
+class OCRPageLayout:
+    """Layout of one OCR'd page"""
+    page_number: int
+    width: int
+    height: int
+    blocks: List[OCRBlock] = field(default_factory=list)
+    dpi: Optional[int] = None  # Render resolution, when rasterized from a PDF
+
+    @property
+    def words(self) -> List[OCRWord]:
+        return [word for block in self.blocks for line in block.lines for word in line.words]
+
+    @property
+    def lines(self) -> List[OCRLine]:
+        return [line for block in self.blocks for line in block.lines]
+
+    @property
+    def text(self) -> str:
+        return '\n\n'.join(block.text for block in self.blocks if block.lines)
+
+    @property
+    def mean_confidence(self) -> float:
+        """Mean word confidence on a 0-100 scale (0 if no words)"""
+        confidences = [word.confidence for word in self.words]
+        return sum(confidences) / len(confidences) if confidences else 0.0
+
+    def lines_matching(self, pattern: str, flags: int = re.IGNORECASE) -> List[OCRLine]:
+        """Return lines whose text matches a regex"""
+        regex = re.compile(pattern, flags)
+        return [line for line in self.lines if regex.search(line.text)]
+
+    def words_in_region(self, region: BoundingBox) -> List[OCRWord]:
+        """Return words fully inside a pixel region"""
+        return [word for word in self.words if region.contains(word.bbox)]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-page stats for API results (to_dict() has every word and box)"""
+        return {
+            'page_number': self.page_number,
+            'width': self.width,
+            'height': self.height,
+            'dpi': self.dpi,
+            'confidence': round(self.mean_confidence / 100, 4),
+            'lines': len(self.lines),
+            'words': len(self.words)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'page_number': self.page_number,
+            'width': self.width,
+            'height': self.height,
+            'dpi': self.dpi,
+            'confidence': round(self.mean_confidence / 100, 4),
+            'blocks': [
+                {
+                    'bbox': block.bbox.to_dict() if block.bbox else None,
+                    'lines': [
+                        {
+                            'text': line.text,
+                            'bbox': line.bbox.to_dict() if line.bbox else None,
+                            'words': [
+                                {
+                                    'text': word.text,
+                                    'confidence': word.confidence,
+                                    'bbox': word.bbox.to_dict()
+                                }
+                                for word in line.words
+                            ]
+                        }
+                        for line in block.lines
+                    ]
+                }
+                for block in self.blocks
+            ]
+        }
+
+    @classmethod
+    def from_tesseract_data(
+        cls,
+        data: Dict[str, List[Any]],
+        page_number: int = 1,
+        image_size: Tuple[int, int] = (0, 0)
+    ) -> 'OCRPageLayout':
+        """
+        Build a layout from pytesseract.image_to_data(output_type=Output.DICT).
+
+        Rows without text or with a negative confidence are structural
+        (page/block/paragraph/line) rows and are skipped.
+        """
+        blocks: Dict[int, OCRBlock] = {}
+        lines: Dict[Tuple[int, int, int], OCRLine] = {}
+
+        for i, text in enumerate(data.get('text', [])):
+            if int(data['level'][i]) != WORD_LEVEL:
+                continue
+
+            text = (text or '').strip()
+            confidence = _parse_confidence(data['conf'][i])
+            if not text or confidence < 0:
+                continue
+
+            block_num = int(data['block_num'][i])
+            line_key = (block_num, int(data['par_num'][i]), int(data['line_num'][i]))
+
+            block = blocks.setdefault(block_num, OCRBlock())
+            line = lines.get(line_key)
+            if line is None:
+                line = OCRLine()
+                lines[line_key] = line
+                block.lines.append(line)
+
+            line.words.append(OCRWord(
+                text=text,
+                confidence=confidence,
+                bbox=BoundingBox(
+                    left=int(data['left'][i]),
+                    top=int(data['top'][i]),
+                    width=int(data['width'][i]),
+                    height=int(data['height'][i])
+                )
+            ))
+
+        width, height = image_size
+        return cls(
+            page_number=page_number,
+            width=width,
+            height=height,
+            blocks=[blocks[key] for key in sorted(blocks)]
+        )
+
+
+def ocr_page_layout(
+    image,
+    config: str = '',
+    lang: Optional[str] = None,
+    page_number: int = 1,
+    preprocessing_steps: Optional[List[str]] = None,
+    allow_remote: bool = False
+) -> OCRPageLayout:
+    """
+    Run one Tesseract pass over a page image and return its layout.
+
+    Args:
+        image: PIL image
+        config: Tesseract config string (e.g. '--psm 1 --oem 3')
+        lang: Tesseract language (defaults to Tesseract's own default)
+        page_number: 1-based page number recorded on the layout
+        preprocessing_steps: Image preprocessing to run first (see
+            image_preprocessing); None or empty OCRs the image as given.
+            Layout coordinates are relative to the preprocessed image.
+        allow_remote: Let the OCR router escalate a low-confidence result to
+            the remote (cloud) backend; only for a caller's final attempt
+    """
+    from app.services.ocr_router import get_ocr_router
+
+    if preprocessing_steps:
+        from app.services.image_preprocessing import preprocess_image
+        image = preprocess_image(image, preprocessing_steps).image
+
+    return get_ocr_router().recognize(
+        image, config=config, lang=lang, page_number=page_number, allow_remote=allow_remote
+    )
+
+
+def join_page_texts(page_texts: List[str], separator: str = '\n\n') -> Tuple[str, List[int]]:
+    """
+    Join per-page text into document text, keeping each page's start offset.
+
+    Empty pages contribute no text (matching the historical join), but still
+    get an offset entry so offsets[i] always belongs to page i + 1.
+    """
+    parts: List[str] = []
+    offsets: List[int] = []
+    position = 0
+
+    for page_text in page_texts:
+        if parts and page_text:
+            position += len(separator)
+        offsets.append(position)
+        if page_text:
+            parts.append(page_text)
+            position += len(page_text)
+
+    return separator.join(parts), offsets
+
+
+def page_number_at(page_offsets: Optional[List[int]], offset: int) -> Optional[int]:
+    """Map a character offset in document text to its 1-based page number"""
+    if not page_offsets:
+        return None
+
+    page_number = bisect_right(page_offsets, offset)
+    return page_number or None
+
+
+def _parse_confidence(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1.0
+
+
+def _union_boxes(boxes) -> Optional[BoundingBox]:
+    result = None
+    for box in boxes:
+        result = box if result is None else result.union(box)
+    return result
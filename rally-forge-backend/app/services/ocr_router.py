@@ -0,0 +1,263 @@
+"""
+OCR BACKEND REGISTRY AND ROUTER
+
+Single entry point for every OCR call in the backend: OCRExtractionEngine,
+DD214OCRScanner (including its Google Vision fallback) and the DD-214
+router all reach an engine through ocr_page_layout(), which asks the
+router for a backend per page.
+
+REGISTRY:
+Backends from ocr_backends register here once per process: pytesseract,
+tesserocr (when installed) and google_vision (when enabled). Only
+available ones are routed to.
+
+ROUTING (per page):
+1. Candidates: local backends, or only the one named in ocr_backend
+   (the remote backend is the candidate only when no local one exists)
+2. Expected cost = (fixed ms + ms/megapixel x page megapixels)
+                   x (1 + calls queued beyond capacity / capacity)
+   ms/megapixel starts at the backend's hint and tracks observed latency
+3. Run the cheapest; if the caller allows it and confidence is still below
+   ocr_cloud_escalation_confidence on a page that is not blank, re-run
+   on the remote backend and keep the more confident layout
+
+Per-backend call counts, in-flight depth, latency and escalations are
+available from stats() for capacity planning.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.ocr_backends import (
+    GoogleVisionBackend,
+    OCRBackend,
+    PytesseractBackend,
+    TesserocrBackend,
+)
+from app.services.ocr_layout import OCRPageLayout
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the latency moving average
+LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class BackendStats:
+    """Live load and latency of one backend in this process"""
+    in_flight: int = 0
+    calls: int = 0
+    failures: int = 0
+    escalations: int = 0
+    ms_per_megapixel: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'in_flight': self.in_flight,
+            'calls': self.calls,
+            'failures': self.failures,
+            'escalations': self.escalations,
+            'ms_per_megapixel': round(self.ms_per_megapixel, 1)
+        }
+
+
+class OCRRouter:
+    """Registry of OCR backends plus per-page, cost-aware backend selection"""
+
+    def __init__(self, preferred_backend: str = 'auto', escalation_confidence: float = 0.0):
+        self.preferred_backend = preferred_backend
+        self.escalation_confidence = escalation_confidence
+        self._backends: Dict[str, OCRBackend] = {}
+        self._stats: Dict[str, BackendStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, backend: OCRBackend):
+        """Add a backend (replaces one registered under the same name)"""
+        with self._lock:
+            self._backends[backend.name] = backend
+            self._stats[backend.name] = BackendStats(ms_per_megapixel=backend.cost_ms_per_megapixel)
+
+    def get(self, name: str) -> Optional[OCRBackend]:
+        """A registered, available backend by name"""
+        backend = self._backends.get(name)
+        return backend if backend is not None and backend.available() else None
+
+    def available_backends(self) -> List[OCRBackend]:
+        return [backend for backend in self._backends.values() if backend.available()]
+
+    def has_backend(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def local_candidates(self) -> List[OCRBackend]:
+        """Local backends eligible for a page (honours ocr_backend)"""
+        local = [backend for backend in self.available_backends() if not backend.remote]
+        if self.preferred_backend != 'auto':
+            pinned = [backend for backend in local if backend.name == self.preferred_backend]
+            if pinned:
+                return pinned
+            logger.debug(f"OCR backend '{self.preferred_backend}' not available, routing among {[b.name for b in local]}")
+        return local
+
+    def remote_backend(self) -> Optional[OCRBackend]:
+        return next((backend for backend in self.available_backends() if backend.remote), None)
+
+    def expected_cost_ms(self, backend: OCRBackend, megapixels: float) -> float:
+        """Estimated wall time for one more call, including queueing behind in-flight calls"""
+        stats = self._stats[backend.name]
+        service_ms = backend.fixed_cost_ms + stats.ms_per_megapixel * megapixels
+        queued = max(0, stats.in_flight + 1 - backend.capacity)
+        return service_ms * (1 + queued / backend.capacity)
+
+    def choose(self, megapixels: float, allow_remote: bool = False) -> OCRBackend:
+        """Cheapest backend for a page of this size right now"""
+        candidates = self.local_candidates()
+        if not candidates and allow_remote:
+            remote = self.remote_backend()
+            candidates = [remote] if remote else []
+        if not candidates:
+            raise RuntimeError("No OCR backend available (install Tesseract or enable Google Vision)")
+
+        with self._lock:
+            return min(candidates, key=lambda backend: self.expected_cost_ms(backend, megapixels))
+
+    def recognize(
+        self,
+        image,
+        config: str = '',
+        lang: Optional[str] = None,
+        page_number: int = 1,
+        allow_remote: bool = False
+    ) -> OCRPageLayout:
+        """
+        OCR one image on the best backend.
+
+        Args:
+            allow_remote: Let a low-confidence result escalate to the remote
+                backend (callers pass this only for their final attempt at a page)
+        """
+        megapixels = image.size[0] * image.size[1] / 1_000_000
+        backend = self.choose(megapixels, allow_remote=allow_remote)
+        layout = self._run(backend, image, config, lang, page_number, megapixels)
+
+        remote = self.remote_backend() if allow_remote and not backend.remote else None
+        if remote and self._should_escalate(layout, image):
+            logger.info(
+                f"Page {page_number}: {backend.name} confidence {layout.mean_confidence:.1f} "
+                f"is below {self.escalation_confidence:.0f}, escalating to {remote.name}"
+            )
+            with self._lock:
+                self._stats[backend.name].escalations += 1
+            try:
+                remote_layout = self._run(remote, image, config, lang, page_number, megapixels)
+                if remote_layout.mean_confidence > layout.mean_confidence:
+                    layout = remote_layout
+            except Exception as e:
+                logger.warning(f"{remote.name} escalation failed, keeping {backend.name} result: {e}")
+
+        return layout
+
+    def recognize_on(self, name: str, image, config: str = '', lang: Optional[str] = None, page_number: int = 1) -> OCRPageLayout:
+        """OCR one image on a specific backend (still counted in its load and latency)"""
+        backend = self.get(name)
+        if backend is None:
+            raise RuntimeError(f"OCR backend '{name}' is not available")
+        megapixels = image.size[0] * image.size[1] / 1_000_000
+        return self._run(backend, image, config, lang, page_number, megapixels)
+
+    def _should_escalate(self, layout: OCRPageLayout, image) -> bool:
+        if not self.escalation_confidence:
+            return False
+        if layout.words:
+            return layout.mean_confidence < self.escalation_confidence
+
+        from app.services.adaptive_ocr import is_blank_page
+        return not is_blank_page(image)
+
+    def _run(self, backend: OCRBackend, image, config: str, lang: Optional[str], page_number: int, megapixels: float) -> OCRPageLayout:
+        stats = self._stats[backend.name]
+        with self._lock:
+            stats.in_flight += 1
+            stats.calls += 1
+
+        started = time.perf_counter()
+        try:
+            return backend.recognize(image, config=config, lang=lang, page_number=page_number)
+        except Exception:
+            with self._lock:
+                stats.failures += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                stats.in_flight -= 1
+                if megapixels > 0:
+                    observed = max(0.0, elapsed_ms - backend.fixed_cost_ms) / megapixels
+                    stats.ms_per_megapixel += LATENCY_SMOOTHING * (observed - stats.ms_per_megapixel)
+
+    def fingerprint(self) -> str:
+        """Engines whose output can appear in results (part of OCR cache fingerprints)"""
+        names = [backend.name for backend in self.local_candidates()]
+        remote = self.remote_backend()
+        if remote and self.escalation_confidence:
+            names.append(remote.name)
+        return ','.join(f"{self._backends[name].name} {self._backends[name].version()}" for name in sorted(names))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-backend load and latency, for capacity planning"""
+        with self._lock:
+            return {
+                name: {**stats.to_dict(), 'capacity': self._backends[name].capacity, 'available': self._backends[name].available()}
+                for name, stats in self._stats.items()
+            }
+
+    def shutdown(self):
+        """Release engines held by every backend"""
+        for backend in list(self._backends.values()):
+            backend.shutdown()
+
+
+def resolve_engine_count(configured: int) -> int:
+    """0 (the default) means one warm engine per OCR executor thread"""
+    if configured and configured > 0:
+        return configured
+    return max(1, settings.ocr_executor_threads)
+
+
+def create_ocr_router() -> OCRRouter:
+    """Router with every built-in backend registered, configured from settings"""
+    router = OCRRouter(
+        preferred_backend=settings.ocr_backend,
+        escalation_confidence=settings.ocr_cloud_escalation_confidence
+    )
+    router.register(PytesseractBackend())
+    router.register(TesserocrBackend(max_engines=resolve_engine_count(settings.ocr_engine_workers)))
+    router.register(GoogleVisionBackend(max_concurrency=settings.ocr_cloud_max_concurrency))
+    return router
+
+
+# Global router instance (one per process)
+_ocr_router: Optional[OCRRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_ocr_router() -> OCRRouter:
+    """Get the process-wide OCR router"""
+    global _ocr_router
+    with _router_lock:
+        if _ocr_router is None:
+            _ocr_router = create_ocr_router()
+            logger.info(f"OCR backends available: {[backend.name for backend in _ocr_router.available_backends()]}")
+        return _ocr_router
+
+
+def shutdown_ocr_router():
+    """Release warm engines held by the global router's backends"""
+    global _ocr_router
+    with _router_lock:
+        if _ocr_router is not None:
+            _ocr_router.shutdown()
+            _ocr_router = None
@@ -0,0 +1,160 @@
+"""
+OCR WORKER POOL
+
+Bounded process pool that fans OCR page work out across CPU cores.
+
+WHY A PROCESS POOL:
+- pytesseract shells out to the tesseract binary and blocks on it
+- Page OCR is CPU-bound, so threads inside one worker do not scale
+- One page per task keeps the pool busy on long STR volumes
+
+OVERSUBSCRIPTION:
+Tesseract uses OpenMP internally and will start one thread per core on its
+own. With N pool workers that would mean N x cores threads fighting for the
+same CPUs, so every worker caps Tesseract via OMP_THREAD_LIMIT before any
+OCR runs. Likewise every web worker process (gunicorn -w) starts its own
+pool, so the default size splits the cores between them
+(settings.web_concurrency, i.e. WEB_CONCURRENCY).
+
+ORDERING:
+map_ordered() returns results in submission order regardless of which
+worker finishes first, so page text is always reassembled 1..N.
+imap_ordered() yields the same results one at a time, as soon as every
+earlier item has finished, for callers that report progress.
+
+CANCELLATION:
+When called from an OCR job (see ocr_executor), map_ordered() checks the
+job's cancellation token between pages and drops the pages not yet started.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from app.config import settings
+from app.services.ocr_executor import raise_if_cancelled
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_pool_size(configured_size: int, web_workers: Optional[int] = None) -> int:
+    """
+    Resolve the configured pool size to a worker count.
+
+    0 (the default) means this process's share of the CPU cores: cores
+    divided by the web worker processes on the host (defaults to
+    settings.web_concurrency), at least one. Anything else is used as-is.
+    """
+    if configured_size and configured_size > 0:
+        return configured_size
+    if web_workers is None:
+        web_workers = settings.web_concurrency
+    return max(1, (os.cpu_count() or 1) // max(1, web_workers))
+
+
+def _init_worker(tesseract_threads: int):
+    """Process initializer: cap Tesseract's OpenMP threads for this worker"""
+    os.environ['OMP_THREAD_LIMIT'] = str(max(1, tesseract_threads))
+
+
+class OCRWorkerPool:
+    """
+    Lazily-started process pool for page-level OCR tasks.
+
+    The underlying executor is created on first use so that importing the
+    OCR engine (and running the API without OCR traffic) never forks.
+    """
+
+    def __init__(self, max_workers: int, tesseract_threads: int = 1):
+        self.max_workers = max(1, max_workers)
+        self.tesseract_threads = max(1, tesseract_threads)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """A pool of one worker is just sequential OCR with extra overhead"""
+        return self.max_workers > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(
+                    f"Starting OCR worker pool: {self.max_workers} workers, "
+                    f"{self.tesseract_threads} Tesseract thread(s) per worker"
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.tesseract_threads,)
+                )
+            return self._executor
+
+    def map_ordered(self, fn: Callable[..., Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Run fn over items in the pool and return results in input order.
+
+        fn must be a module-level (picklable) callable. Stops early if the
+        calling OCR job is cancelled.
+        """
+        return list(self.imap_ordered(fn, items))
+
+    def imap_ordered(self, fn: Callable[..., Any], items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Run fn over items in the pool, yielding results in input order.
+
+        Every item is submitted up front; result i is yielded as soon as
+        items 0..i have finished. Closing the generator early drops the
+        items not yet started.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        if not self.enabled or len(items) == 1:
+            for item in items:
+                raise_if_cancelled()
+                yield fn(item)
+            return
+
+        executor = self._get_executor()
+        futures = [executor.submit(fn, item) for item in items]
+        try:
+            for future in futures:
+                raise_if_cancelled()
+                yield future.result()
+        finally:
+            # No-op for finished futures; drops queued pages after a failure, cancellation or early close
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """Stop all worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                logger.info("Shutting down OCR worker pool")
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+# Global worker pool instance
+_ocr_worker_pool: Optional[OCRWorkerPool] = None
+
+
+def get_ocr_worker_pool() -> OCRWorkerPool:
+    """Get the global OCR worker pool (sized from settings)"""
+    global _ocr_worker_pool
+    if _ocr_worker_pool is None:
+        _ocr_worker_pool = OCRWorkerPool(
+            max_workers=resolve_pool_size(settings.ocr_worker_pool_size),
+            tesseract_threads=settings.ocr_tesseract_threads
+        )
+    return _ocr_worker_pool
+
+
+def shutdown_ocr_worker_pool():
+    """Shut down the global worker pool if it was started"""
+    if _ocr_worker_pool is not None:
+        _ocr_worker_pool.shutdown()
@@ -0,0 +1,156 @@
+"""
+DUPLICATE PAGE ELIMINATION
+
+Skips OCR for pages that repeat an earlier page of the same document.
+
+STR volumes and rating packets are assembled from several sources and often
+carry the same page more than once (the same scan inserted twice, re-saved
+or re-compressed copies). OCRing a copy only reproduces text we already have.
+
+WORKFLOW:
+1. Render each page that needs OCR at PAGE_SIGNATURE_DPI (about 1/36 of the
+   pixels of a 300 DPI render) and reduce it to a signature: a 64-bit
+   average hash plus a grid of BLOCK_PIXELS-square block means
+2. A page whose hash is within HASH_DISTANCE bits of an earlier page's is a
+   candidate duplicate
+3. The candidate is a duplicate only if no block differs from the earlier
+   page by more than settings.ocr_duplicate_page_tolerance gray levels
+4. Duplicates are not OCR'd; they reuse the earlier page's text and
+   confidence
+
+Pool extraction signs every page up front; sequential extraction (page
+ranges, early-stopping scans) signs each page as it is reached
+(DuplicatePageFinder), so pages after an early stop are never rendered.
+
+The hash alone cannot be trusted: pages of the same printed form (SF 600s)
+hash alike whatever is written on them. The block check is deliberately
+strict: a single changed date moves its block by well over the default
+tolerance, while re-encoding or a small brightness change stays under it.
+A fresh scan of the same paper (new skew and sensor noise) is generally not
+matched and is OCR'd as usual; a missed duplicate costs one page of OCR, a
+false one would lose a page of the record.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageChops
+
+from app.config import settings
+from app.services.pdf_rasterizer import render_pdf_page
+
+logger = logging.getLogger(__name__)
+
+# Render resolution for signatures; a Letter page is 425 x 550 pixels
+PAGE_SIGNATURE_DPI = 50
+
+# Block edge (pixels at PAGE_SIGNATURE_DPI, about 2 mm) compared between candidate pages
+BLOCK_PIXELS = 4
+
+# Average-hash grid edge (HASH_SIZE * HASH_SIZE bits) and the distance that makes a candidate
+HASH_SIZE = 8
+HASH_DISTANCE = 6
+
+
+@dataclass
+class PageSignature:
+    """Compact picture of a page for duplicate detection"""
+    page_number: int
+    average_hash: int
+    block_size: Tuple[int, int]  # (columns, rows) of the block grid
+    blocks: bytes  # Block means, row-major, one byte per block
+
+
+def page_signature(image: Image.Image, page_number: int) -> PageSignature:
+    """Signature of a page image rendered at PAGE_SIGNATURE_DPI"""
+    gray = image.convert('L')
+    block_size = (max(1, gray.width // BLOCK_PIXELS), max(1, gray.height // BLOCK_PIXELS))
+    blocks = gray.resize(block_size, Image.BOX)
+
+    pixels = list(blocks.resize((HASH_SIZE, HASH_SIZE), Image.BOX).getdata())
+    mean = sum(pixels) / len(pixels)
+    average_hash = 0
+    for pixel in pixels:
+        average_hash = (average_hash << 1) | (pixel > mean)
+
+    return PageSignature(page_number, average_hash, block_size, blocks.tobytes())
+
+
+def pdf_page_signature(task: Tuple[str, int]) -> PageSignature:
+    """
+    Render one PDF page at PAGE_SIGNATURE_DPI and sign it.
+
+    Module-level so it can be shipped to OCR worker processes.
+
+    Args:
+        task: (pdf path, 1-based page number)
+    """
+    file_path, page_number = task
+    image = render_pdf_page(file_path, page_number, PAGE_SIGNATURE_DPI)
+    try:
+        return page_signature(image, page_number)
+    finally:
+        image.close()
+
+
+def is_duplicate(page: PageSignature, original: PageSignature, tolerance: Optional[int] = None) -> bool:
+    """Whether page is a copy of original"""
+    if tolerance is None:
+        tolerance = settings.ocr_duplicate_page_tolerance
+    if page.block_size != original.block_size:
+        return False
+    if (page.average_hash ^ original.average_hash).bit_count() > HASH_DISTANCE:
+        return False
+
+    difference = ImageChops.difference(
+        Image.frombytes('L', page.block_size, page.blocks),
+        Image.frombytes('L', original.block_size, original.blocks)
+    )
+    return difference.getextrema()[1] <= tolerance
+
+
+class DuplicatePageFinder:
+    """
+    Incremental duplicate check for pages signed one at a time, in page order.
+
+    Sequential extraction signs each page only when it reaches it, so a scan
+    that stops early never renders the pages after the stop.
+    """
+
+    def __init__(self, tolerance: Optional[int] = None):
+        self.tolerance = tolerance
+        self.originals: List[PageSignature] = []
+
+    def original_of(self, signature: PageSignature) -> Optional[int]:
+        """Page number the page copies, or None (it then counts as an original)"""
+        original = next((earlier for earlier in self.originals if is_duplicate(signature, earlier, self.tolerance)), None)
+        if original is None:
+            self.originals.append(signature)
+            return None
+        return original.page_number
+
+
+def find_duplicate_pages(signatures: List[PageSignature], tolerance: Optional[int] = None) -> Dict[int, int]:
+    """
+    Map each duplicate page to the earlier page it copies.
+
+    Pages are matched against earlier non-duplicate pages only, so every
+    duplicate points at a page that is OCR'd.
+    """
+    finder = DuplicatePageFinder(tolerance)
+    duplicates: Dict[int, int] = {}
+    for signature in sorted(signatures, key=lambda signature: signature.page_number):
+        original = finder.original_of(signature)
+        if original is not None:
+            duplicates[signature.page_number] = original
+    return duplicates
+
+
+def duplicate_fingerprint_options() -> dict:
+    """Settings that change which pages are OCR'd, for cache fingerprints"""
+    return {
+        'duplicate_page_tolerance': (
+            settings.ocr_duplicate_page_tolerance if settings.ocr_duplicate_pages_enabled else None
+        )
+    }
@@ -25,14 +25,38 @@ import logging
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from app.config import settings
+from app.services.document_classifier import DD214, DocumentClassification, classify_document
+from app.services.early_stop import RequiredFieldTracker
+from app.services.field_extraction import FieldMatches, compile_field_scanner
+from app.services.field_normalization import normalize_date, normalize_grade_rank
+from app.services.keyword_automaton import KeywordAutomaton
 from app.services.ocr_extraction import get_ocr_engine
 
 logger = logging.getLogger(__name__)
 
+DATE_PATTERN = re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}')
+AWARD_SEPARATORS = re.compile(r'[,;]\s*|\s+and\s+|\n')
+
+# Known decorations/awards
+KNOWN_AWARDS = [
+    'Purple Heart', 'Bronze Star', 'Silver Star', 'Medal of Honor',
+    'Distinguished Service Cross', 'Navy Cross', 'Air Force Cross',
+    'Combat Action Badge', 'Combat Action Ribbon', 'Combat Infantryman Badge',
+    'Army Commendation Medal', 'Navy Achievement Medal', 'Air Medal',
+    'Good Conduct Medal', 'National Defense Service Medal',
+    'Iraq Campaign Medal', 'Afghanistan Campaign Medal',
+    'Global War on Terrorism Service Medal', 'Armed Forces Service Medal'
+]
+AWARD_KEYWORDS = KeywordAutomaton(KNOWN_AWARDS)
+
 
 class DD214Parser:
     """Parser for DD-214 forms"""
 
+    # Fields every copy of the form carries; once read, further copies are not OCR'd (continuation sheets still are)
+    EARLY_STOP_FIELDS = ['branch', 'grade_rank', 'date_entered', 'date_separated', 'character_of_service']
+
     def __init__(self):
         self.ocr_engine = get_ocr_engine()
 
@@ -69,21 +93,41 @@ class DD214Parser:
             'type_separation': r'(?:Type of Separation)[:\s]+(Honorable|General|Medical|Retirement|ETS|Convenience of Government|Hardship)',
         }
 
-        # Known decorations/awards
-        self.known_awards = [
-            'Purple Heart', 'Bronze Star', 'Silver Star', 'Medal of Honor',
-            'Distinguished Service Cross', 'Navy Cross', 'Air Force Cross',
-            'Combat Action Badge', 'Combat Action Ribbon', 'Combat Infantryman Badge',
-            'Army Commendation Medal', 'Navy Achievement Medal', 'Air Medal',
-            'Good Conduct Medal', 'National Defense Service Medal',
-            'Iraq Campaign Medal', 'Afghanistan Campaign Medal',
-            'Global War on Terrorism Service Medal', 'Armed Forces Service Medal'
+        self.known_awards = KNOWN_AWARDS
+
+        # DD-214 indicators (at least two must be present)
+        self.indicators = [
+            r'DD\s*214',
+            r'Certificate of Release',
+            r'Discharge from Active Duty',
+            r'Department of Defense',
+            r'DD Form 214'
         ]
 
-    async def parse_file(self, file_path: str) -> Dict[str, Any]:
+        # Fields and indicators share one compiled single-pass scanner
+        scanner_patterns = dict(self.patterns)
+        scanner_patterns.update({f'indicator:{index}': pattern for index, pattern in enumerate(self.indicators)})
+        self.scanner = compile_field_scanner(
+            scanner_patterns,
+            first_only=[name for name in scanner_patterns if name != 'deployment']
+        )
+
+    async def parse_file(
+        self,
+        file_path: str,
+        classification: Optional[DocumentClassification] = None,
+        check_document_type: bool = True
+    ) -> Dict[str, Any]:
         """
         Parse a DD-214 document.
 
+        Args:
+            classification: Page-one classification the caller already has
+                (classified here when None)
+            check_document_type: Reject documents whose page one reads as
+                another type before OCRing all of them; off when the caller
+                already chose DD-214 as the document type
+
         Returns:
             {
                 'success': bool,
@@ -111,46 +155,61 @@ class DD214Parser:
         logger.info(f"Parsing DD-214: {file_path}")
 
         try:
-            # Extract text using OCR engine
-            extraction_result = await self.ocr_engine.extract_text(file_path)
+            # Page one only: reject another document type before OCRing all of it
+            if check_document_type:
+                if classification is None:
+                    classification = await classify_document(file_path)
+                if classification.document_type not in (None, DD214):
+                    return self._error_result(
+                        f"Document does not appear to be a DD-214 (page one reads as a {classification.label})"
+                    )
+
+            # Extract text using OCR engine, page by page until the required fields are read
+            page_tracker = None
+            if settings.dd214_early_stop_enabled:
+                page_tracker = RequiredFieldTracker(self._early_stop_fields, self.EARLY_STOP_FIELDS)
+            extraction_result = await self.ocr_engine.extract_text(file_path, page_tracker=page_tracker)
 
             if not extraction_result['success']:
                 return self._error_result(f"Text extraction failed: {extraction_result['error']}")
 
             text = extraction_result['text']
+            matches = self.scanner.scan(text)
 
             # Validate it looks like a DD-214
-            if not self._validate_dd214(text):
+            if not self._validate_dd214(matches):
                 return self._error_result("Document does not appear to be a DD-214")
 
             # Extract all fields
             result = {
                 'success': True,
-                'name': self._extract_field('name', text),
-                'ssn': self._extract_field('ssn', text),
-                'branch': self._extract_field('branch', text),
-                'grade_rank': self._extract_field('grade_rank', text),
-                'mos': self._extract_field('mos', text),
-                'date_entered': self._normalize_date(self._extract_field('date_entered', text)),
-                'date_separated': self._normalize_date(self._extract_field('date_separated', text)),
-                'net_active_service': self._extract_field('net_active_service', text),
-                'character_of_service': self._extract_field('character_of_service', text),
-                'decorations': self._extract_decorations(text),
-                'deployment_history': self._extract_deployment_history(text),
-                'separation_code': self._extract_field('separation_code', text),
-                'narrative_reason': self._extract_field('narrative_reason', text),
-                'reentry_code': self._extract_field('reentry_code', text),
-                'type_separation': self._extract_field('type_separation', text),
-                'authority': self._extract_field('authority', text),
+                'name': self._extract_field('name', matches),
+                'ssn': self._extract_field('ssn', matches),
+                'branch': self._extract_field('branch', matches),
+                'grade_rank': normalize_grade_rank(self._extract_field('grade_rank', matches)),
+                'mos': self._extract_field('mos', matches),
+                'date_entered': self._normalize_date(self._extract_field('date_entered', matches)),
+                'date_separated': self._normalize_date(self._extract_field('date_separated', matches)),
+                'net_active_service': self._extract_field('net_active_service', matches),
+                'character_of_service': self._extract_field('character_of_service', matches),
+                'decorations': self._extract_decorations(text, matches),
+                'deployment_history': self._extract_deployment_history(text, matches),
+                'separation_code': self._extract_field('separation_code', matches),
+                'narrative_reason': self._extract_field('narrative_reason', matches),
+                'reentry_code': self._extract_field('reentry_code', matches),
+                'type_separation': self._extract_field('type_separation', matches),
+                'authority': self._extract_field('authority', matches),
                 'raw_text_sample': text[:500],
                 'extraction_method': extraction_result['method'],
                 'character_count': extraction_result['character_count'],
+                # Per-page OCR stats only; word layouts stay internal (their size grows with every page)
+                'ocr_pages': [layout.summary() for layout in extraction_result.get('pages', [])],
                 'error': None
             }
 
             # Count fields extracted
             fields_extracted = sum(1 for k, v in result.items()
-                                  if k not in ['success', 'raw_text_sample', 'extraction_method', 'character_count', 'error', 'fields_extracted', 'confidence']
+                                  if k not in ['success', 'raw_text_sample', 'extraction_method', 'character_count', 'ocr_pages', 'error', 'fields_extracted', 'confidence']
                                   and v)
 
             result['fields_extracted'] = fields_extracted
@@ -177,45 +236,46 @@ class DD214Parser:
             logger.error(f"DD-214 parsing failed: {e}")
             return self._error_result(str(e))
 
-    def _validate_dd214(self, text: str) -> bool:
-        """Validate that document appears to be a DD-214"""
-        # Check for DD-214 indicators
-        indicators = [
-            r'DD\s*214',
-            r'Certificate of Release',
-            r'Discharge from Active Duty',
-            r'Department of Defense',
-            r'DD Form 214'
-        ]
+    def _early_stop_fields(self, page_text: str) -> Dict[str, Optional[str]]:
+        """Required fields as read from a single page"""
+        matches = self.scanner.scan(page_text)
+        fields = {name: self._extract_field(name, matches) for name in self.EARLY_STOP_FIELDS}
 
-        matches = sum(1 for pattern in indicators if re.search(pattern, text, re.IGNORECASE))
+        # Normalized as in the result, so copies that format a value differently agree
+        fields['grade_rank'] = normalize_grade_rank(fields['grade_rank'])
+        for name in ('date_entered', 'date_separated'):
+            fields[name] = self._normalize_date(fields[name])
+        return fields
 
-        return matches >= 2
+    def _validate_dd214(self, matches: FieldMatches) -> bool:
+        """Validate that document appears to be a DD-214"""
+        found = sum(1 for index in range(len(self.indicators)) if f'indicator:{index}' in matches)
+
+        return found >= 2
 
-    def _extract_field(self, field_name: str, text: str) -> Optional[str]:
-        """Extract a specific field using its pattern"""
-        pattern = self.patterns.get(field_name)
-        if not pattern:
+    def _extract_field(self, field_name: str, matches: FieldMatches) -> Optional[str]:
+        """Extract a specific field from its first match"""
+        if field_name not in self.patterns:
             return None
 
-        match = re.search(pattern, text, re.IGNORECASE)
+        match = matches.first(field_name)
         if match:
             # Return the first capture group
             return match.group(1).strip()
 
         return None
 
-    def _extract_decorations(self, text: str) -> List[str]:
+    def _extract_decorations(self, text: str, matches: FieldMatches) -> List[str]:
         """Extract all decorations, medals, and awards"""
         decorations = []
 
         # Try pattern-based extraction first
-        match = re.search(self.patterns['decorations'], text, re.IGNORECASE)
+        match = matches.first('decorations')
         if match:
             decoration_text = match.group(1)
 
             # Split by common separators
-            potential_awards = re.split(r'[,;]\s*|\s+and\s+|\n', decoration_text)
+            potential_awards = AWARD_SEPARATORS.split(decoration_text)
 
             for award in potential_awards:
                 award = award.strip()
@@ -223,26 +283,25 @@ class DD214Parser:
                     decorations.append(award)
 
         # Also search for known awards throughout the document
-        for known_award in self.known_awards:
-            if re.search(re.escape(known_award), text, re.IGNORECASE):
-                if known_award not in decorations:
-                    decorations.append(known_award)
+        for known_award in AWARD_KEYWORDS.matched_labels(text):
+            if known_award not in decorations:
+                decorations.append(known_award)
 
         return decorations
 
-    def _extract_deployment_history(self, text: str) -> List[str]:
+    def _extract_deployment_history(self, text: str, matches: FieldMatches) -> List[str]:
         """Extract deployment/foreign service history"""
         deployments = []
 
         # Find deployment-related text
-        for match in re.finditer(self.patterns['deployment'], text, re.IGNORECASE):
+        for match in matches.all('deployment'):
             # Get context around the match
             start = max(0, match.start() - 100)
             end = min(len(text), match.end() + 100)
             context = text[start:end].strip()
 
             # Look for dates in context
-            date_matches = re.findall(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', context)
+            date_matches = DATE_PATTERN.findall(context)
 
             deployment_entry = match.group(0)
             if date_matches:
@@ -255,32 +314,7 @@ class DD214Parser:
 
     def _normalize_date(self, date_str: Optional[str]) -> Optional[str]:
         """Normalize date to YYYY-MM-DD format"""
-        if not date_str:
-            return None
-
-        # Try multiple date formats
-        formats = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # MM/DD/YYYY
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})',  # MM/DD/YY
-            r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # YYYY/MM/DD
-        ]
-
-        for fmt in formats:
-            match = re.search(fmt, date_str)
-            if match:
-                parts = match.groups()
-
-                if len(parts[0]) == 4:  # YYYY-MM-DD format
-                    year, month, day = parts
-                    return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                else:  # MM-DD-YYYY or MM-DD-YY
-                    month, day, year = parts
-                    if len(year) == 2:
-                        # Assume 20XX for years < 50, 19XX for years >= 50
-                        year = f"20{year}" if int(year) < 50 else f"19{year}"
-                    return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-        return date_str  # Return as-is if can't parse
+        return normalize_date(date_str) or date_str  # Return as-is if can't parse
 
     def _calculate_confidence(
         self,
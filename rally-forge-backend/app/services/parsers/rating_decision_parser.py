@@ -25,10 +25,20 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from app.services.condition_matching import ConditionIndex
+from app.services.field_extraction import FieldMatches, compile_field_scanner
+from app.services.field_normalization import in_rating_schedule, normalize_date, normalize_diagnostic_code
+from app.services.ocr_executor import run_ocr_job
 from app.services.ocr_extraction import get_ocr_engine
+from app.services.ocr_layout import page_number_at
 
 logger = logging.getLogger(__name__)
 
+# Context checks around individual matches
+COMBINED_CONTEXT = re.compile(r'combined|total', re.IGNORECASE)
+NOT_A_CONDITION = re.compile(r'combined|total|rating', re.IGNORECASE)
+BILATERAL_CONDITION = re.compile(r'([A-Za-z\s,\-\(\)]+?)\s+bilateral', re.IGNORECASE)
+
 
 class RatingDecisionParser:
     """Parser for VA Rating Decision documents"""
@@ -49,6 +59,23 @@ class RatingDecisionParser:
             'unfavorable': r'(?:denied|not service[- ]connected|unfavorable)[:\s]+([^\n.]+)'
         }
 
+        # Every pattern in one compiled single-pass scanner; percentages and
+        # bare codes are case-sensitive, as they always were
+        self.scanner = compile_field_scanner({
+            'condition': self.patterns['condition'],
+            'condition_percentage': (r'([A-Za-z\s,\-\(\)]+?)\s+(\d+)%', 0),
+            'percentage': (self.patterns['percentage'], 0),
+            'effective_date': self.patterns['effective_date'],
+            'diagnostic_code': self.patterns['diagnostic_code'],
+            'standalone_code': (r'\b(\d{4})\b', 0),
+            'bilateral': self.patterns['bilateral'],
+            'combined_rating': self.patterns['combined_rating'],
+            'total_rating': r'Total(?:\s+Disability)?\s+Rating[:\s]+(\d+)%',
+            'evidence': self.patterns['evidence'],
+            'favorable': self.patterns['favorable'],
+            'unfavorable': self.patterns['unfavorable'],
+        }, first_only=['combined_rating', 'total_rating'])
+
     async def parse_file(self, file_path: str) -> Dict[str, Any]:
         """
         Parse a VA Rating Decision document.
@@ -92,53 +119,8 @@ class RatingDecisionParser:
                     'unfavorable_findings': []
                 }
 
-            text = extraction_result['text']
-
-            # Parse all components
-            conditions = self._extract_conditions(text)
-            ratings = self._extract_ratings(text)
-            effective_dates = self._extract_effective_dates(text)
-            diagnostic_codes = self._extract_diagnostic_codes(text)
-            bilateral_conditions = self._extract_bilateral_conditions(text)
-            combined_rating = self._extract_combined_rating(text)
-            evidence = self._extract_evidence(text)
-            favorable_findings = self._extract_favorable_findings(text)
-            unfavorable_findings = self._extract_unfavorable_findings(text)
-
-            # Match conditions with ratings and codes
-            structured_conditions = self._match_conditions_with_details(
-                conditions, ratings, diagnostic_codes, effective_dates, bilateral_conditions
-            )
-
-            # Calculate confidence
-            confidence = self._calculate_confidence(
-                extraction_result['confidence'],
-                len(structured_conditions),
-                len(ratings),
-                combined_rating is not None
-            )
-
-            result = {
-                'success': True,
-                'conditions': structured_conditions,
-                'ratings': ratings,
-                'effective_dates': effective_dates,
-                'diagnostic_codes': diagnostic_codes,
-                'bilateral_conditions': bilateral_conditions,
-                'combined_rating': combined_rating,
-                'evidence': evidence,
-                'favorable_findings': favorable_findings,
-                'unfavorable_findings': unfavorable_findings,
-                'raw_text': text[:1000],  # First 1000 chars for reference
-                'confidence': confidence,
-                'extraction_method': extraction_result['method'],
-                'character_count': extraction_result['character_count'],
-                'error': None
-            }
-
-            logger.info(f"Rating Decision parsed: {len(structured_conditions)} conditions, {combined_rating}% combined rating")
-
-            return result
+            # Text analysis is CPU-bound on long documents; keep it off the event loop
+            return await run_ocr_job(self._parse_text, extraction_result)
 
         except Exception as e:
             logger.error(f"Rating Decision parsing failed: {e}")
@@ -156,36 +138,85 @@ class RatingDecisionParser:
                 'unfavorable_findings': []
             }
 
-    def _extract_conditions(self, text: str) -> List[str]:
+    def _parse_text(self, extraction_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse extracted Rating Decision text (blocking; runs on the OCR executor)"""
+        text = extraction_result['text']
+        page_offsets = extraction_result.get('page_offsets')
+        matches = self.scanner.scan(text)
+
+        # Parse all components
+        conditions = self._extract_conditions(matches)
+        ratings = self._extract_ratings(text, matches, page_offsets)
+        effective_dates = self._extract_effective_dates(matches)
+        diagnostic_codes = self._extract_diagnostic_codes(matches)
+        bilateral_conditions = self._extract_bilateral_conditions(text, matches)
+        combined_rating = self._extract_combined_rating(matches)
+        evidence = self._extract_evidence(matches)
+        favorable_findings = self._extract_favorable_findings(matches)
+        unfavorable_findings = self._extract_unfavorable_findings(matches)
+
+        # Match conditions with ratings and codes
+        structured_conditions = self._match_conditions_with_details(
+            conditions, ratings, diagnostic_codes, effective_dates, bilateral_conditions
+        )
+
+        # Calculate confidence
+        confidence = self._calculate_confidence(
+            extraction_result['confidence'],
+            len(structured_conditions),
+            len(ratings),
+            combined_rating is not None
+        )
+
+        result = {
+            'success': True,
+            'conditions': structured_conditions,
+            'ratings': ratings,
+            'effective_dates': effective_dates,
+            'diagnostic_codes': diagnostic_codes,
+            'bilateral_conditions': bilateral_conditions,
+            'combined_rating': combined_rating,
+            'evidence': evidence,
+            'favorable_findings': favorable_findings,
+            'unfavorable_findings': unfavorable_findings,
+            'raw_text': text[:1000],  # First 1000 chars for reference
+            'confidence': confidence,
+            'extraction_method': extraction_result['method'],
+            'character_count': extraction_result['character_count'],
+            'page_count': len(page_offsets) if page_offsets else None,
+            'error': None
+        }
+
+        logger.info(f"Rating Decision parsed: {len(structured_conditions)} conditions, {combined_rating}% combined rating")
+
+        return result
+
+    def _extract_conditions(self, matches: FieldMatches) -> List[str]:
         """Extract all service-connected conditions"""
         conditions = []
 
         # Pattern 1: "Service Connected: Condition Name"
-        matches = re.finditer(self.patterns['condition'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('condition'):
             condition = match.group(1).strip()
             if condition and len(condition) > 3:
                 conditions.append(self._clean_condition_name(condition))
 
         # Pattern 2: Look for condition names followed by percentage
-        percentage_pattern = r'([A-Za-z\s,\-\(\)]+?)\s+(\d+)%'
-        matches = re.finditer(percentage_pattern, text)
-        for match in matches:
+        for match in matches.all('condition_percentage'):
             condition = match.group(1).strip()
-            if condition and len(condition) > 5 and not re.search(r'combined|total|rating', condition, re.IGNORECASE):
+            if condition and len(condition) > 5 and not NOT_A_CONDITION.search(condition):
                 cleaned = self._clean_condition_name(condition)
                 if cleaned not in conditions:
                     conditions.append(cleaned)
 
         return list(set(conditions))
 
-    def _extract_ratings(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_ratings(self, text: str, matches: FieldMatches, page_offsets: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract all percentage ratings"""
         ratings = []
 
         # Find all percentage values
-        matches = re.finditer(self.patterns['percentage'], text)
-        for match in matches:
+        for match in matches.all('percentage'):
             percentage = int(match.group(1))
 
             # Get context around the percentage
@@ -194,7 +225,7 @@ class RatingDecisionParser:
             context = text[start:end]
 
             # Skip combined ratings
-            if re.search(r'combined|total', context, re.IGNORECASE):
+            if COMBINED_CONTEXT.search(context):
                 continue
 
             # Try to find condition name
@@ -204,58 +235,55 @@ class RatingDecisionParser:
             ratings.append({
                 'percentage': percentage,
                 'condition': self._clean_condition_name(condition) if condition else None,
-                'context': context.strip()
+                'context': context.strip(),
+                'page': page_number_at(page_offsets, match.start())
             })
 
         return ratings
 
-    def _extract_effective_dates(self, text: str) -> List[str]:
+    def _extract_effective_dates(self, matches: FieldMatches) -> List[str]:
         """Extract all effective dates"""
         dates = []
 
-        matches = re.finditer(self.patterns['effective_date'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('effective_date'):
             date_str = match.group(1)
             # Normalize date format
-            normalized = self._normalize_date(date_str)
+            normalized = normalize_date(date_str)
             if normalized and normalized not in dates:
                 dates.append(normalized)
 
         return dates
 
-    def _extract_diagnostic_codes(self, text: str) -> List[str]:
+    def _extract_diagnostic_codes(self, matches: FieldMatches) -> List[str]:
         """Extract all VA diagnostic codes"""
         codes = []
 
-        matches = re.finditer(self.patterns['diagnostic_code'], text, re.IGNORECASE)
-        for match in matches:
-            code = match.group(1)
-            if code not in codes:
+        for match in matches.all('diagnostic_code'):
+            code = normalize_diagnostic_code(match.group(1))
+            if code and code not in codes:
                 codes.append(code)
 
         # Also look for standalone 4-digit codes that might be diagnostic codes
-        standalone_pattern = r'\b(\d{4})\b'
-        matches = re.finditer(standalone_pattern, text)
-        for match in matches:
-            code = match.group(1)
+        for match in matches.all('standalone_code'):
+            code = normalize_diagnostic_code(match.group(1))
             # Only include if in reasonable range for diagnostic codes (5000-9999)
-            if 5000 <= int(code) <= 9999 and code not in codes:
+            if code and in_rating_schedule(code) and code not in codes:
                 codes.append(code)
 
         return codes
 
-    def _extract_bilateral_conditions(self, text: str) -> List[str]:
+    def _extract_bilateral_conditions(self, text: str, matches: FieldMatches) -> List[str]:
         """Extract conditions marked as bilateral"""
         bilateral = []
 
         # Find instances of "bilateral" and get context
-        for match in re.finditer(self.patterns['bilateral'], text, re.IGNORECASE):
+        for match in matches.all('bilateral'):
             start = max(0, match.start() - 100)
             end = min(len(text), match.end() + 100)
             context = text[start:end]
 
             # Try to find condition name near "bilateral"
-            condition_match = re.search(r'([A-Za-z\s,\-\(\)]+?)\s+bilateral', context, re.IGNORECASE)
+            condition_match = BILATERAL_CONDITION.search(context)
             if condition_match:
                 condition = self._clean_condition_name(condition_match.group(1))
                 if condition not in bilateral:
@@ -263,50 +291,46 @@ class RatingDecisionParser:
 
         return bilateral
 
-    def _extract_combined_rating(self, text: str) -> Optional[int]:
+    def _extract_combined_rating(self, matches: FieldMatches) -> Optional[int]:
         """Extract the combined disability rating"""
-        match = re.search(self.patterns['combined_rating'], text, re.IGNORECASE)
+        match = matches.first('combined_rating')
         if match:
             return int(match.group(1))
 
         # Alternative pattern
-        alt_pattern = r'Total(?:\s+Disability)?\s+Rating[:\s]+(\d+)%'
-        match = re.search(alt_pattern, text, re.IGNORECASE)
+        match = matches.first('total_rating')
         if match:
             return int(match.group(1))
 
         return None
 
-    def _extract_evidence(self, text: str) -> List[str]:
+    def _extract_evidence(self, matches: FieldMatches) -> List[str]:
         """Extract evidence references"""
         evidence = []
 
-        matches = re.finditer(self.patterns['evidence'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('evidence'):
             evidence_text = match.group(1).strip()
             if evidence_text and len(evidence_text) > 10:
                 evidence.append(evidence_text)
 
         return evidence[:20]  # Limit to 20 most relevant
 
-    def _extract_favorable_findings(self, text: str) -> List[str]:
+    def _extract_favorable_findings(self, matches: FieldMatches) -> List[str]:
         """Extract favorable findings"""
         findings = []
 
-        matches = re.finditer(self.patterns['favorable'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('favorable'):
             finding = match.group(1).strip()
             if finding and len(finding) > 10:
                 findings.append(finding)
 
         return findings[:20]
 
-    def _extract_unfavorable_findings(self, text: str) -> List[str]:
+    def _extract_unfavorable_findings(self, matches: FieldMatches) -> List[str]:
         """Extract unfavorable findings"""
         findings = []
 
-        matches = re.finditer(self.patterns['unfavorable'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('unfavorable'):
             finding = match.group(1).strip()
             if finding and len(finding) > 10:
                 findings.append(finding)
@@ -329,17 +353,19 @@ class RatingDecisionParser:
         for rating in ratings:
             if rating['condition']:
                 rating_map[rating['condition']] = rating['percentage']
+        percentages = list(rating_map.values())
+
+        # Each name is normalized and indexed once; only candidates sharing a word
+        # (or containing one another) are compared
+        rating_matches = ConditionIndex(rating_map).first_matches(conditions)
+        bilateral_matches = ConditionIndex(bilateral_conditions).first_matches(conditions)
 
-        for condition in conditions:
-            # Try to find matching rating
-            percentage = None
-            for cond_name, pct in rating_map.items():
-                if self._conditions_match(condition, cond_name):
-                    percentage = pct
-                    break
+        for condition, rating_match, bilateral_match in zip(conditions, rating_matches, bilateral_matches):
+            # First matching rating, in document order
+            percentage = percentages[rating_match] if rating_match is not None else None
 
             # Check if bilateral
-            is_bilateral = any(self._conditions_match(condition, bc) for bc in bilateral_conditions)
+            is_bilateral = bilateral_match is not None
 
             structured.append({
                 'condition': condition,
@@ -370,51 +396,6 @@ class RatingDecisionParser:
 
         return cleaned
 
-    def _normalize_date(self, date_str: str) -> Optional[str]:
-        """Normalize date to YYYY-MM-DD format"""
-        # Try multiple date formats
-        formats = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})',
-            r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})'
-        ]
-
-        for fmt in formats:
-            match = re.search(fmt, date_str)
-            if match:
-                parts = match.groups()
-                if len(parts[0]) == 4:  # YYYY-MM-DD
-                    return f"{parts[0]}-{parts[1]:0>2}-{parts[2]:0>2}"
-                else:  # MM-DD-YYYY or MM-DD-YY
-                    year = parts[2] if len(parts[2]) == 4 else f"20{parts[2]}"
-                    return f"{year}-{parts[0]:0>2}-{parts[1]:0>2}"
-
-        return None
-
-    def _conditions_match(self, cond1: str, cond2: str) -> bool:
-        """Check if two condition names match (fuzzy)"""
-        cond1_lower = cond1.lower().strip()
-        cond2_lower = cond2.lower().strip()
-
-        # Exact match
-        if cond1_lower == cond2_lower:
-            return True
-
-        # One contains the other
-        if cond1_lower in cond2_lower or cond2_lower in cond1_lower:
-            return True
-
-        # Similar (simple word matching)
-        words1 = set(cond1_lower.split())
-        words2 = set(cond2_lower.split())
-        common = words1 & words2
-
-        # If at least 60% of words match
-        if len(common) >= 0.6 * min(len(words1), len(words2)):
-            return True
-
-        return False
-
     def _calculate_confidence(
         self,
         ocr_confidence: float,
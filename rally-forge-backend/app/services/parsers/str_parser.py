@@ -14,19 +14,55 @@ OUTPUT:
 - Condition clusters
 - Service connection indicators
 - Symptom progression analysis
+
+LARGE DOCUMENTS:
+PDFs longer than str_chunk_pages are processed as page-range chunks of the
+original file (see pdf_chunking), extracted and analyzed concurrently in
+the OCR worker pool, and merged in page order. Text-local extraction runs
+per chunk; timeline ordering, recurrence and summary indicators run once
+on the merged result, so the output matches a single pass except that date
+context does not look back across a chunk boundary.
 """
 
 import re
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from collections import defaultdict
 from pathlib import Path
 
-from app.services.ocr_extraction import get_ocr_engine
+from app.config import settings
+from app.services.field_extraction import FieldMatches, compile_field_scanner
+from app.services.field_normalization import normalize_date
+from app.services.keyword_automaton import KeywordAutomaton
+from app.services.ocr_cache import hash_file
+from app.services.ocr_executor import raise_if_cancelled, run_ocr_job
+from app.services.ocr_extraction import ExtractionMethod, get_ocr_engine
+from app.services.ocr_layout import page_number_at
+from app.services.parsers.str_timeline import DATE_PATTERN, ENCOUNTER_TYPE_PATTERN, build_events, continue_event
+from app.services.pdf_chunking import PageRange, iter_page_ranges, large_pdf_ranges
 
 logger = logging.getLogger(__name__)
 
+# Patterns matched over the whole text (everything but line-level dates and encounter types)
+TEXT_FIELDS = (
+    'symptoms', 'diagnosis', 'treatment', 'injury', 'surgery', 'medication',
+    'deployment', 'mos', 'exposure', 'chronic', 'service_related'
+)
+
+# Common conditions by body system, in categorization priority order
+COMMON_CONDITIONS = {
+    'musculoskeletal': ['back pain', 'knee pain', 'shoulder pain', 'neck pain', 'arthritis', 'joint pain'],
+    'mental_health': ['ptsd', 'depression', 'anxiety', 'sleep disorder', 'insomnia'],
+    'hearing': ['tinnitus', 'hearing loss', 'acoustic trauma'],
+    'respiratory': ['asthma', 'copd', 'bronchitis', 'sinusitis'],
+    'neurological': ['headache', 'migraine', 'tbi', 'traumatic brain injury', 'seizure'],
+    'cardiovascular': ['hypertension', 'heart disease', 'coronary'],
+    'dermatological': ['skin condition', 'rash', 'psoriasis', 'eczema']
+}
+# Substring matches on purpose: 'arthritis' covers 'osteoarthritis', 'headache' covers 'headaches'
+CONDITION_KEYWORDS = KeywordAutomaton(COMMON_CONDITIONS, whole_words=False)
+
 
 class STRParser:
     """Parser for Service Treatment Records (STR)"""
@@ -36,8 +72,8 @@ class STRParser:
 
         # Medical terminology patterns
         self.patterns = {
-            'date': r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            'encounter_type': r'(?:Sick Call|Clinic Visit|Emergency|Hospitalization|Physical Exam)',
+            'date': DATE_PATTERN,
+            'encounter_type': ENCOUNTER_TYPE_PATTERN,
             'chief_complaint': r'(?:Chief Complaint|CC|C/C)[:\s]+([^\n.]+)',
             'diagnosis': r'(?:Diagnosis|Dx|Assessment)[:\s]+([^\n.]+)',
             'symptoms': r'(?:Symptoms?|Complaints?|Reports?)[:\s]+([^\n.]+)',
@@ -53,20 +89,31 @@ class STRParser:
         }
 
         # Common service-connected conditions
-        self.common_conditions = {
-            'musculoskeletal': ['back pain', 'knee pain', 'shoulder pain', 'neck pain', 'arthritis', 'joint pain'],
-            'mental_health': ['ptsd', 'depression', 'anxiety', 'sleep disorder', 'insomnia'],
-            'hearing': ['tinnitus', 'hearing loss', 'acoustic trauma'],
-            'respiratory': ['asthma', 'copd', 'bronchitis', 'sinusitis'],
-            'neurological': ['headache', 'migraine', 'tbi', 'traumatic brain injury', 'seizure'],
-            'cardiovascular': ['hypertension', 'heart disease', 'coronary'],
-            'dermatological': ['skin condition', 'rash', 'psoriasis', 'eczema']
-        }
-
-    async def parse_file(self, file_path: str) -> Dict[str, Any]:
+        self.common_conditions = COMMON_CONDITIONS
+
+        # Full-text fields share one compiled single-pass scanner; dates are
+        # only searched within contexts, and timeline lines are classified
+        # by str_timeline
+        self.scanner = compile_field_scanner({
+            name: self.patterns[name]
+            for name in TEXT_FIELDS
+        })
+        self.date_pattern = re.compile(self.patterns['date'])
+
+    async def parse_file(
+        self,
+        file_path: str,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Parse Service Treatment Records.
 
+        Args:
+            on_partial: Called with a partial result (same shape, plus
+                'partial', 'pages_processed' and 'page_count') each time
+                another page range is extracted and analyzed, while later
+                ranges are still in OCR. Runs on the OCR executor thread.
+
         Returns:
             {
                 'success': bool,
@@ -91,127 +138,273 @@ class STRParser:
         logger.info(f"Parsing STR: {file_path}")
 
         try:
+            # Thousand-page volumes: page ranges of the file, extracted and analyzed concurrently.
+            # Callers that show partial results get smaller ranges, so findings arrive early.
+            chunk_pages = settings.str_chunk_pages
+            if on_partial is not None and chunk_pages > 0 and settings.str_partial_result_pages > 0:
+                chunk_pages = min(chunk_pages, settings.str_partial_result_pages)
+
+            page_ranges = await run_ocr_job(large_pdf_ranges, file_path, chunk_pages)
+            if page_ranges:
+                # ocr_timeout_seconds is a per-document budget; a volume gets one per chunk
+                return await run_ocr_job(
+                    self._parse_chunked, file_path, page_ranges, on_partial,
+                    timeout=settings.ocr_timeout_seconds * len(page_ranges)
+                )
+
             # Extract text using OCR engine
             extraction_result = await self.ocr_engine.extract_text(file_path)
 
             if not extraction_result['success']:
                 return self._error_result(f"Text extraction failed: {extraction_result['error']}")
 
-            text = extraction_result['text']
-
-            # Parse all components
-            timeline = self._build_timeline(text)
-            symptoms = self._extract_symptoms(text)
-            diagnoses = self._extract_diagnoses(text)
-            treatments = self._extract_treatments(text)
-            injuries = self._extract_injuries(text)
-            surgeries = self._extract_surgeries(text)
-            medications = self._extract_medications(text)
-            deployment_related = self._extract_deployment_related(text)
-            mos_patterns = self._extract_mos_patterns(text)
-            exposures = self._extract_exposures(text)
-            chronic_conditions = self._identify_chronic_conditions(text, timeline)
-
-            # Advanced analysis
-            condition_clusters = self._cluster_conditions(diagnoses, symptoms)
-            service_connection_indicators = self._identify_service_connection(
-                text, timeline, deployment_related, mos_patterns, exposures, injuries
-            )
-            symptom_progression = self._analyze_symptom_progression(timeline, symptoms)
-
-            # Calculate confidence
-            confidence = self._calculate_confidence(
-                extraction_result['confidence'],
-                len(timeline),
-                len(diagnoses),
-                len(symptoms)
+            # Text analysis is CPU-bound on long documents; keep it off the event loop
+            return await run_ocr_job(self._parse_text, extraction_result)
+
+        except Exception as e:
+            logger.error(f"STR parsing failed: {e}")
+            return self._error_result(str(e))
+
+    def _parse_text(self, extraction_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse extracted STR text (blocking; runs on the OCR executor)"""
+        page_offsets = extraction_result.get('page_offsets')
+        analysis = self._analyze_text(extraction_result['text'], page_offsets)
+
+        return self._build_result(
+            [analysis],
+            ocr_confidence=extraction_result['confidence'],
+            extraction_method=extraction_result['method'],
+            character_count=extraction_result['character_count'],
+            page_count=len(page_offsets) if page_offsets else None
+        )
+
+    def _parse_chunked(
+        self,
+        file_path: str,
+        page_ranges: List[PageRange],
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse a large STR PDF as page-range chunks (blocking).
+
+        Each chunk is extracted and analyzed in an OCR worker; the partial
+        results are merged in page order. With on_partial, the merge of the
+        chunks finished so far is reported after each one.
+        """
+        chunks = []
+        for chunk in iter_page_ranges(parse_str_chunk, file_path, page_ranges, hash_file(file_path)):
+            if not chunk['success']:
+                return self._error_result(f"Text extraction failed: {chunk['error']}")
+            chunks.append(chunk)
+
+            if on_partial is not None and len(chunks) < len(page_ranges):
+                self._report_partial(on_partial, chunks, page_ranges[-1].last_page)
+
+        character_count = self._chunked_character_count(chunks)
+        if character_count < self.ocr_engine.min_characters:
+            return self._error_result(
+                f"Text extraction failed: Insufficient text extracted: {character_count} characters "
+                f"(minimum {self.ocr_engine.min_characters})"
             )
 
-            result = {
-                'success': True,
-                'timeline': timeline,
-                'condition_clusters': condition_clusters,
-                'symptoms': symptoms,
-                'diagnoses': diagnoses,
-                'treatments': treatments,
-                'injuries': injuries,
-                'surgeries': surgeries,
-                'medications': medications,
-                'deployment_related': deployment_related,
-                'mos_patterns': mos_patterns,
-                'exposures': exposures,
-                'chronic_conditions': chronic_conditions,
-                'service_connection_indicators': service_connection_indicators,
-                'symptom_progression': symptom_progression,
-                'raw_text_sample': text[:1000],
-                'confidence': confidence,
-                'extraction_method': extraction_result['method'],
-                'character_count': extraction_result['character_count'],
-                'error': None
-            }
+        return self._merge_chunks(chunks)
+
+    def _chunked_character_count(self, chunks: List[Dict[str, Any]]) -> int:
+        """Chunk texts are joined like pages are, with a blank-line separator"""
+        text_chunks = sum(1 for chunk in chunks if chunk['character_count'])
+        return sum(chunk['character_count'] for chunk in chunks) + len('\n\n') * max(0, text_chunks - 1)
 
-            logger.info(f"STR parsed: {len(timeline)} events, {len(diagnoses)} diagnoses, {len(service_connection_indicators)} SC indicators")
+    def _merge_chunks(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Result for the text of these consecutive chunks"""
+        page_count = sum(chunk['page_count'] for chunk in chunks)
+        methods = {chunk['method'] for chunk in chunks}
 
-            return result
+        return self._build_result(
+            [chunk['analysis'] for chunk in chunks],
+            ocr_confidence=sum(chunk['confidence'] * chunk['page_count'] for chunk in chunks) / page_count,
+            extraction_method=methods.pop() if len(methods) == 1 else ExtractionMethod.HYBRID,
+            character_count=self._chunked_character_count(chunks),
+            page_count=page_count
+        )
+
+    def _report_partial(
+        self,
+        on_partial: Callable[[Dict[str, Any]], None],
+        chunks: List[Dict[str, Any]],
+        total_pages: int
+    ):
+        """
+        Hand the result for the pages done so far to the caller.
 
+        Never fails the parse, but a job that has timed out or been
+        cancelled stops here instead of reporting findings its caller has
+        already given up on.
+        """
+        raise_if_cancelled()
+        try:
+            partial = self._merge_chunks(chunks)
+            partial.update({
+                'partial': True,
+                'pages_processed': partial['page_count'],
+                'page_count': total_pages
+            })
         except Exception as e:
-            logger.error(f"STR parsing failed: {e}")
-            return self._error_result(str(e))
+            logger.warning(f"Partial STR result not delivered: {e}")
+            return
+
+        raise_if_cancelled()
+        try:
+            on_partial(partial)
+        except Exception as e:
+            logger.warning(f"Partial STR result not delivered: {e}")
+
+    def _analyze_text(self, text: str, page_offsets: Optional[List[int]] = None, first_page: int = 1) -> Dict[str, Any]:
+        """
+        Text-local analysis of one document or one page-range chunk.
+
+        Everything here depends only on this text; whatever needs the whole
+        document (timeline order, recurrence, summaries) is done when the
+        analyses are merged in _build_result.
+
+        Args:
+            first_page: Document page number of the text's first page
+        """
+        leading_lines, events = self._timeline_events(text)
+        matches = self.scanner.scan(text)
+        page_shift = first_page - 1
+
+        return {
+            'has_text': bool(text),
+            'text_sample': text[:1000],
+            'leading_lines': leading_lines,
+            'events': events,
+            'symptoms': self._shift_pages(self._extract_symptoms(text, matches, page_offsets), page_shift),
+            'diagnoses': self._shift_pages(self._extract_diagnoses(text, matches, page_offsets), page_shift),
+            'treatments': self._shift_pages(self._extract_treatments(text, matches, page_offsets), page_shift),
+            'injuries': self._extract_injuries(matches),
+            'surgeries': self._extract_surgeries(matches),
+            'medications': self._extract_medications(matches),
+            'deployment_related': self._extract_deployment_related(text, matches),
+            'mos_patterns': self._extract_mos_patterns(text, matches),
+            'exposures': self._extract_exposures(text, matches),
+            'chronic_mentions': self._chronic_mentions(text, matches),
+            'direct_service_references': self._direct_service_references(text, matches)
+        }
+
+    def _build_result(
+        self,
+        analyses: List[Dict[str, Any]],
+        ocr_confidence: float,
+        extraction_method: Any,
+        character_count: int,
+        page_count: Optional[int]
+    ) -> Dict[str, Any]:
+        """Merge text analyses (in page order) and run the whole-document analysis"""
+        def merged(key: str) -> List[Any]:
+            return [item for analysis in analyses for item in analysis[key]]
+
+        timeline = self._merge_timelines(analyses)
+        symptoms = merged('symptoms')
+        diagnoses = merged('diagnoses')
+        treatments = merged('treatments')
+        injuries = merged('injuries')
+        deployment_related = merged('deployment_related')
+        mos_patterns = merged('mos_patterns')
+        exposures = merged('exposures')
+        chronic_conditions = self._identify_chronic_conditions(merged('chronic_mentions'), timeline)
+
+        # Advanced analysis
+        condition_clusters = self._cluster_conditions(diagnoses, symptoms)
+        service_connection_indicators = self._identify_service_connection(
+            merged('direct_service_references'), timeline, deployment_related, mos_patterns, exposures, injuries
+        )
+        symptom_progression = self._analyze_symptom_progression(timeline, symptoms)
+
+        # Calculate confidence
+        confidence = self._calculate_confidence(
+            ocr_confidence,
+            len(timeline),
+            len(diagnoses),
+            len(symptoms)
+        )
+
+        result = {
+            'success': True,
+            'timeline': timeline,
+            'condition_clusters': condition_clusters,
+            'symptoms': symptoms,
+            'diagnoses': diagnoses,
+            'treatments': treatments,
+            'injuries': injuries,
+            'surgeries': merged('surgeries'),
+            'medications': merged('medications'),
+            'deployment_related': deployment_related,
+            'mos_patterns': mos_patterns,
+            'exposures': exposures,
+            'chronic_conditions': chronic_conditions,
+            'service_connection_indicators': service_connection_indicators,
+            'symptom_progression': symptom_progression,
+            'raw_text_sample': '\n\n'.join(analysis['text_sample'] for analysis in analyses if analysis['has_text'])[:1000],
+            'confidence': confidence,
+            'extraction_method': extraction_method,
+            'character_count': character_count,
+            'page_count': page_count,
+            'error': None
+        }
+
+        logger.info(f"STR parsed: {len(timeline)} events, {len(diagnoses)} diagnoses, {len(service_connection_indicators)} SC indicators")
+
+        return result
 
     def _build_timeline(self, text: str) -> List[Dict[str, Any]]:
         """Build chronological timeline of medical events"""
-        events = []
-
-        # Split text into sections (by date or encounter)
-        lines = text.split('\n')
-        current_date = None
-        current_event = None
-
-        for line in lines:
-            # Look for dates
-            date_match = re.search(self.patterns['date'], line)
-            if date_match:
-                # Save previous event
-                if current_event:
-                    events.append(current_event)
-
-                # Start new event
-                current_date = self._normalize_date(date_match.group(1))
-                current_event = {
-                    'date': current_date,
-                    'type': self._identify_encounter_type(line),
-                    'content': line,
-                    'symptoms': [],
-                    'diagnoses': [],
-                    'treatments': []
-                }
-            elif current_event:
-                # Add to current event
-                current_event['content'] += ' ' + line
-
-                # Extract components
-                if re.search(r'symptom|complaint|reports?', line, re.IGNORECASE):
-                    current_event['symptoms'].append(line.strip())
-                if re.search(r'diagnos|assessment', line, re.IGNORECASE):
-                    current_event['diagnoses'].append(line.strip())
-                if re.search(r'treatment|plan|rx', line, re.IGNORECASE):
-                    current_event['treatments'].append(line.strip())
-
-        # Add last event
-        if current_event:
-            events.append(current_event)
-
-        # Sort by date
-        events.sort(key=lambda x: x['date'] if x['date'] else '9999-12-31')
+        _, events = self._timeline_events(text)
+        return self._sort_timeline(events)
 
+    def _timeline_events(self, text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Medical events in text order.
+
+        Returns:
+            (lines before the first dated line, events); in a chunk the
+            leading lines continue the previous chunk's last event
+        """
+        return build_events(text, self._normalize_date)
+
+    def _merge_timelines(self, analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Join per-chunk events as if the text had been parsed in one pass.
+
+        A chunk's leading lines belong to the last event before it; the blank
+        line stands in for the page separator between the chunks' texts.
+        """
+        events: List[Dict[str, Any]] = []
+
+        for analysis in analyses:
+            if events and analysis['has_text']:
+                continue_event(events[-1], [''] + analysis['leading_lines'])
+            events.extend(analysis['events'])
+
+        return self._sort_timeline(events)
+
+    def _sort_timeline(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort by date (stable, so same-day events keep text order)"""
+        events.sort(key=lambda x: x['date'] if x['date'] else '9999-12-31')
         return events
 
-    def _extract_symptoms(self, text: str) -> List[Dict[str, Any]]:
+    def _shift_pages(self, items: List[Dict[str, Any]], page_shift: int) -> List[Dict[str, Any]]:
+        """Convert chunk-relative page numbers to document page numbers"""
+        if page_shift:
+            for item in items:
+                if item.get('page') is not None:
+                    item['page'] += page_shift
+        return items
+
+    def _extract_symptoms(self, text: str, matches: FieldMatches, page_offsets: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract all symptoms mentioned"""
         symptoms = []
 
-        matches = re.finditer(self.patterns['symptoms'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('symptoms'):
             symptom_text = match.group(1).strip()
 
             # Get date context
@@ -222,17 +415,17 @@ class STRParser:
             symptoms.append({
                 'symptom': symptom_text,
                 'date': date,
-                'context': symptom_text
+                'context': symptom_text,
+                'page': page_number_at(page_offsets, match.start())
             })
 
         return symptoms
 
-    def _extract_diagnoses(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_diagnoses(self, text: str, matches: FieldMatches, page_offsets: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract all diagnoses"""
         diagnoses = []
 
-        matches = re.finditer(self.patterns['diagnosis'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('diagnosis'):
             diagnosis_text = match.group(1).strip()
 
             # Get date context
@@ -243,17 +436,17 @@ class STRParser:
             diagnoses.append({
                 'diagnosis': diagnosis_text,
                 'date': date,
-                'category': self._categorize_condition(diagnosis_text)
+                'category': self._categorize_condition(diagnosis_text),
+                'page': page_number_at(page_offsets, match.start())
             })
 
         return diagnoses
 
-    def _extract_treatments(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_treatments(self, text: str, matches: FieldMatches, page_offsets: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """Extract all treatments"""
         treatments = []
 
-        matches = re.finditer(self.patterns['treatment'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('treatment'):
             treatment_text = match.group(1).strip()
 
             context_start = max(0, match.start() - 200)
@@ -262,52 +455,50 @@ class STRParser:
 
             treatments.append({
                 'treatment': treatment_text,
-                'date': date
+                'date': date,
+                'page': page_number_at(page_offsets, match.start())
             })
 
         return treatments
 
-    def _extract_injuries(self, text: str) -> List[str]:
+    def _extract_injuries(self, matches: FieldMatches) -> List[str]:
         """Extract injury references"""
         injuries = []
 
-        matches = re.finditer(self.patterns['injury'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('injury'):
             injury = match.group(1).strip()
             if injury and len(injury) > 5:
                 injuries.append(injury)
 
         return injuries
 
-    def _extract_surgeries(self, text: str) -> List[str]:
+    def _extract_surgeries(self, matches: FieldMatches) -> List[str]:
         """Extract surgical procedures"""
         surgeries = []
 
-        matches = re.finditer(self.patterns['surgery'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('surgery'):
             surgery = match.group(1).strip()
             if surgery and len(surgery) > 5:
                 surgeries.append(surgery)
 
         return surgeries
 
-    def _extract_medications(self, text: str) -> List[str]:
+    def _extract_medications(self, matches: FieldMatches) -> List[str]:
         """Extract medications"""
         medications = []
 
-        matches = re.finditer(self.patterns['medication'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('medication'):
             med = match.group(1).strip()
             if med and len(med) > 3:
                 medications.append(med)
 
         return medications
 
-    def _extract_deployment_related(self, text: str) -> List[str]:
+    def _extract_deployment_related(self, text: str, matches: FieldMatches) -> List[str]:
         """Extract deployment-related references"""
         deployment_refs = []
 
-        for match in re.finditer(self.patterns['deployment'], text, re.IGNORECASE):
+        for match in matches.all('deployment'):
             start = max(0, match.start() - 100)
             end = min(len(text), match.end() + 100)
             context = text[start:end].strip()
@@ -315,12 +506,11 @@ class STRParser:
 
         return deployment_refs
 
-    def _extract_mos_patterns(self, text: str) -> List[str]:
+    def _extract_mos_patterns(self, text: str, matches: FieldMatches) -> List[str]:
         """Extract MOS references and related injuries"""
         mos_refs = []
 
-        matches = re.finditer(self.patterns['mos'], text, re.IGNORECASE)
-        for match in matches:
+        for match in matches.all('mos'):
             mos_code = match.group(1)
             start = max(0, match.start() - 100)
             end = min(len(text), match.end() + 100)
@@ -329,11 +519,11 @@ class STRParser:
 
         return mos_refs
 
-    def _extract_exposures(self, text: str) -> List[str]:
+    def _extract_exposures(self, text: str, matches: FieldMatches) -> List[str]:
         """Extract exposure references (Agent Orange, burn pits, etc.)"""
         exposures = []
 
-        for match in re.finditer(self.patterns['exposure'], text, re.IGNORECASE):
+        for match in matches.all('exposure'):
             start = max(0, match.start() - 50)
             end = min(len(text), match.end() + 100)
             context = text[start:end].strip()
@@ -341,16 +531,20 @@ class STRParser:
 
         return exposures
 
-    def _identify_chronic_conditions(self, text: str, timeline: List[Dict]) -> List[str]:
-        """Identify chronic/recurring conditions"""
+    def _chronic_mentions(self, text: str, matches: FieldMatches) -> List[str]:
+        """Explicit "chronic" mentions with context"""
         chronic = []
-
-        # Pattern 1: Explicit "chronic" mentions
-        for match in re.finditer(self.patterns['chronic'], text, re.IGNORECASE):
+        for match in matches.all('chronic'):
             start = max(0, match.start() - 50)
             end = min(len(text), match.end() + 50)
             context = text[start:end].strip()
             chronic.append(context)
+        return chronic
+
+    def _identify_chronic_conditions(self, chronic_mentions: List[str], timeline: List[Dict]) -> List[str]:
+        """Identify chronic/recurring conditions"""
+        # Pattern 1: Explicit "chronic" mentions
+        chronic = list(chronic_mentions)
 
         # Pattern 2: Conditions appearing multiple times in timeline
         condition_counts = defaultdict(int)
@@ -374,9 +568,23 @@ class STRParser:
 
         return dict(clusters)
 
+    def _direct_service_references(self, text: str, matches: FieldMatches) -> List[Dict[str, Any]]:
+        """Direct service-related mentions"""
+        indicators = []
+        for match in matches.all('service_related'):
+            start = max(0, match.start() - 100)
+            end = min(len(text), match.end() + 100)
+            context = text[start:end].strip()
+            indicators.append({
+                'type': 'Direct Service Reference',
+                'indicator': context,
+                'strength': 'high'
+            })
+        return indicators
+
     def _identify_service_connection(
         self,
-        text: str,
+        direct_references: List[Dict[str, Any]],
         timeline: List[Dict],
         deployment_refs: List[str],
         mos_refs: List[str],
@@ -384,18 +592,8 @@ class STRParser:
         injuries: List[str]
     ) -> List[Dict[str, Any]]:
         """Identify indicators of service connection"""
-        indicators = []
-
         # Direct service-related mentions
-        for match in re.finditer(self.patterns['service_related'], text, re.IGNORECASE):
-            start = max(0, match.start() - 100)
-            end = min(len(text), match.end() + 100)
-            context = text[start:end].strip()
-            indicators.append({
-                'type': 'Direct Service Reference',
-                'indicator': context,
-                'strength': 'high'
-            })
+        indicators = list(direct_references)
 
         # Deployment-related injuries
         if deployment_refs:
@@ -476,44 +674,18 @@ class STRParser:
 
     def _categorize_condition(self, condition: str) -> str:
         """Categorize a condition by body system"""
-        condition_lower = condition.lower()
-
-        for category, keywords in self.common_conditions.items():
-            for keyword in keywords:
-                if keyword in condition_lower:
-                    return category
-
-        return 'other'
-
-    def _identify_encounter_type(self, text: str) -> str:
-        """Identify type of medical encounter"""
-        match = re.search(self.patterns['encounter_type'], text, re.IGNORECASE)
-        return match.group(0) if match else 'Unknown'
+        return CONDITION_KEYWORDS.first_label(condition) or 'other'
 
     def _find_nearest_date(self, context: str) -> Optional[str]:
         """Find the nearest date in context"""
-        matches = list(re.finditer(self.patterns['date'], context))
+        matches = list(self.date_pattern.finditer(context))
         if matches:
             return self._normalize_date(matches[-1].group(1))
         return None
 
     def _normalize_date(self, date_str: str) -> str:
         """Normalize date to YYYY-MM-DD"""
-        # Try multiple formats
-        formats = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})',
-        ]
-
-        for fmt in formats:
-            match = re.search(fmt, date_str)
-            if match:
-                month, day, year = match.groups()
-                if len(year) == 2:
-                    year = f"20{year}"
-                return f"{year}-{month:0>2}-{day:0>2}"
-
-        return date_str
+        return normalize_date(date_str) or date_str
 
     def _extract_key_words(self, text: str) -> List[str]:
         """Extract key medical words from text"""
@@ -562,3 +734,31 @@ class STRParser:
             'service_connection_indicators': [],
             'symptom_progression': []
         }
+
+
+def parse_str_chunk(task: Tuple[str, int, int, str]) -> Dict[str, Any]:
+    """
+    Extract and analyze one page range of an STR PDF.
+
+    Module-level so it can run in an OCR worker process.
+
+    Args:
+        task: (pdf path, first page, last page, content hash of the whole file)
+    """
+    file_path, first_page, last_page, file_hash = task
+    parser = STRParser()
+    extraction = parser.ocr_engine.extract_pdf_page_range(file_path, first_page, last_page, file_hash=file_hash)
+
+    # Sparse chunks succeed (the document total is checked after merging); a failed read does not
+    if not extraction['success']:
+        return {'success': False, 'error': extraction['error']}
+
+    return {
+        'success': True,
+        'error': None,
+        'analysis': parser._analyze_text(extraction['text'], extraction['page_offsets'], first_page),
+        'confidence': extraction['confidence'],
+        'method': extraction['method'],
+        'character_count': extraction['character_count'],
+        'page_count': last_page - first_page + 1
+    }
@@ -0,0 +1,163 @@
+"""
+STR TIMELINE BUILDER
+
+Streaming construction of the Service Treatment Record encounter timeline.
+
+WORKFLOW:
+1. Lines are fed in text order: feed() for lines, feed_text() for a block
+   of text, feed_pages() for per-page text as it comes off extraction
+2. Each line is classified by one compiled pattern run over its lower-cased
+   text (first date, encounter type, symptom / diagnosis / treatment
+   mentions)
+3. A dated line closes the open encounter and starts a new one; the closed
+   encounter is yielded immediately
+4. Undated lines are collected and joined into the encounter's content once,
+   when it closes (no repeated string concatenation)
+5. close() yields the last open encounter
+
+Lines before the first dated line are kept in leading_lines; in a
+page-range chunk they continue the previous chunk's last event
+(continue_event).
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATE_PATTERN = r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'
+ENCOUNTER_TYPE_PATTERN = r'(?:Sick Call|Clinic Visit|Emergency|Hospitalization|Physical Exam)'
+
+# One pass per line: the first date, the first encounter type, and which
+# event components the line mentions. None of the keywords contains another
+# one, so a single non-overlapping scan sees them all. The pattern is
+# lower-case and case-sensitive: re.IGNORECASE turns off sre's literal
+# prefix scanning and makes this pass slower than separate searches.
+_LINE_CLASSES = (
+    rf'(?P<date>{DATE_PATTERN})'
+    rf'|(?P<encounter>{ENCOUNTER_TYPE_PATTERN.lower()})'
+    r'|(?P<symptoms>symptom|complaint|reports?)'
+    r'|(?P<diagnoses>diagnos|assessment)'
+    r'|(?P<treatments>treatment|plan|rx)'
+)
+LINE_CLASSIFIER = re.compile(_LINE_CLASSES)
+# Only for lines whose lower-casing changes length
+CASEFREE_LINE_CLASSIFIER = re.compile(_LINE_CLASSES, re.IGNORECASE)
+
+EVENT_COMPONENTS = ('symptoms', 'diagnoses', 'treatments')
+
+
+def classify_line(line: str) -> Tuple[Optional[str], Optional[str], List[str]]:
+    """(first date, first encounter type, components mentioned) for one line"""
+    date = None
+    encounter = None
+    components = set()
+
+    line_lower = line.lower()
+    if len(line_lower) == len(line):
+        matches = LINE_CLASSIFIER.finditer(line_lower)
+    else:
+        matches = CASEFREE_LINE_CLASSIFIER.finditer(line)
+
+    for match in matches:
+        kind = match.lastgroup
+        if kind == 'date':
+            if date is None:
+                date = match.group('date')
+        elif kind == 'encounter':
+            if encounter is None:
+                # As written in the record, not lower-cased
+                encounter = line[match.start():match.end()]
+        else:
+            components.add(kind)
+
+    return date, encounter, [component for component in EVENT_COMPONENTS if component in components]
+
+
+def continue_event(event: Dict[str, Any], lines: List[str]):
+    """Add undated lines to an event that has already been closed"""
+    for line in lines:
+        _, _, components = classify_line(line)
+        for component in components:
+            event[component].append(line.strip())
+    event['content'] = ' '.join([event['content']] + lines)
+
+
+class TimelineBuilder:
+    """Incremental encounter timeline, yielding events as they close"""
+
+    def __init__(self, normalize_date: Callable[[str], str]):
+        """
+        Args:
+            normalize_date: Turns a matched date string into YYYY-MM-DD
+        """
+        self.normalize_date = normalize_date
+        self.leading_lines: List[str] = []
+        self._event: Optional[Dict[str, Any]] = None
+        self._content: List[str] = []
+        self._pages_seen = False
+
+    def feed(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Consume lines; yields each encounter closed by a later dated line"""
+        for line in lines:
+            date, encounter, components = classify_line(line)
+
+            if date is not None:
+                # Save previous event, start new event
+                finished = self._finish()
+                if finished is not None:
+                    yield finished
+
+                self._event = {
+                    'date': self.normalize_date(date),
+                    'type': encounter or 'Unknown',
+                    'content': line,
+                    'symptoms': [],
+                    'diagnoses': [],
+                    'treatments': []
+                }
+                self._content = [line]
+            elif self._event is not None:
+                self._content.append(line)
+                for component in components:
+                    self._event[component].append(line.strip())
+            else:
+                self.leading_lines.append(line)
+
+    def feed_text(self, text: str) -> Iterator[Dict[str, Any]]:
+        """Consume a block of text"""
+        return self.feed(text.split('\n'))
+
+    def feed_pages(self, pages: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Consume per-page text, separated as join_page_texts joins pages"""
+        for page_text in pages:
+            if not page_text:
+                continue
+            if self._pages_seen:
+                # The blank line between '\n\n'-joined pages
+                yield from self.feed([''])
+            self._pages_seen = True
+            yield from self.feed_text(page_text)
+
+    def close(self) -> Iterator[Dict[str, Any]]:
+        """Yield the last open encounter"""
+        finished = self._finish()
+        if finished is not None:
+            yield finished
+
+    def _finish(self) -> Optional[Dict[str, Any]]:
+        event = self._event
+        if event is not None:
+            event['content'] = ' '.join(self._content)
+            self._event = None
+            self._content = []
+        return event
+
+
+def build_events(text: str, normalize_date: Callable[[str], str]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """(leading lines, events in text order) for a whole text"""
+    builder = TimelineBuilder(normalize_date)
+    events = list(builder.feed_text(text))
+    events.extend(builder.close())
+    return builder.leading_lines, events
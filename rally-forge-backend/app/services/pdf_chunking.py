@@ -0,0 +1,113 @@
+"""
+VIRTUAL PAGE-RANGE CHUNKING FOR LARGE PDFS
+
+Splits a very large PDF (thousand-page STR volumes) into page ranges of the
+original file. Nothing is copied: every chunk task opens the same file and
+reads only its own pages (PyPDF2 resolves page objects lazily, Poppler
+renders single pages).
+
+WORKFLOW:
+1. Count pages (PDF trailer only, no page content)
+2. Plan contiguous ranges of at most chunk_pages pages
+3. Run one task per range across the OCR worker pool; each task holds only
+   its own range's text and one rendered page at a time
+4. Results come back in range order, so merging them is deterministic;
+   iter_page_ranges() hands each one over as soon as it and every earlier
+   range are done (partial results while later ranges are still running)
+
+Wall time scales with the number of pool workers; memory per worker is
+bounded by the chunk size, not the document size.
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+from app.services.ocr_worker_pool import get_ocr_worker_pool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PageRange:
+    """Contiguous 1-based, inclusive page range of a PDF"""
+    first_page: int
+    last_page: int
+
+    @property
+    def page_count(self) -> int:
+        return self.last_page - self.first_page + 1
+
+
+def count_pdf_pages(file_path: Union[str, Path]) -> int:
+    """Page count from the PDF's page tree (no page is parsed or rendered)"""
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except Exception as e:
+        logger.warning(f"Could not count pages with PyPDF2 ({e}), using pdfinfo")
+        from pdf2image import pdfinfo_from_path
+        return int(pdfinfo_from_path(str(file_path))['Pages'])
+
+
+def plan_page_ranges(total_pages: int, chunk_pages: int) -> List[PageRange]:
+    """Split 1..total_pages into contiguous ranges of at most chunk_pages"""
+    if total_pages <= 0:
+        return []
+    chunk_pages = max(1, chunk_pages)
+    return [
+        PageRange(first_page=start, last_page=min(start + chunk_pages - 1, total_pages))
+        for start in range(1, total_pages + 1, chunk_pages)
+    ]
+
+
+def map_page_ranges(
+    fn: Callable[..., Any],
+    file_path: Union[str, Path],
+    ranges: List[PageRange],
+    *extra_args: Any
+) -> List[Any]:
+    """
+    Run fn((file_path, first_page, last_page, *extra_args)) for every range.
+
+    fn must be module-level (picklable). Ranges run concurrently across the
+    OCR worker pool; results are returned in range order.
+    """
+    return list(iter_page_ranges(fn, file_path, ranges, *extra_args))
+
+
+def iter_page_ranges(
+    fn: Callable[..., Any],
+    file_path: Union[str, Path],
+    ranges: List[PageRange],
+    *extra_args: Any
+) -> Iterator[Any]:
+    """Like map_page_ranges, but yields each range's result in order as soon as it is ready"""
+    logger.info(f"Processing {Path(file_path).name} as {len(ranges)} page-range chunks")
+    return get_ocr_worker_pool().imap_ordered(
+        fn,
+        [(str(file_path), page_range.first_page, page_range.last_page, *extra_args) for page_range in ranges]
+    )
+
+
+def large_pdf_ranges(file_path: Union[str, Path], chunk_pages: int) -> Optional[List[PageRange]]:
+    """
+    Page ranges for a PDF that is worth chunking, else None.
+
+    None when chunking is off (chunk_pages <= 0), the page count cannot be
+    read, or the document fits in one chunk.
+    """
+    if chunk_pages <= 0 or Path(file_path).suffix.lower() != '.pdf':
+        return None
+
+    try:
+        total_pages = count_pdf_pages(file_path)
+    except Exception as e:
+        logger.warning(f"Could not count pages of {file_path}: {e}")
+        return None
+
+    if total_pages <= chunk_pages:
+        return None
+    return plan_page_ranges(total_pages, chunk_pages)
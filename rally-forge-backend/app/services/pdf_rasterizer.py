@@ -0,0 +1,186 @@
+"""
+BOUNDED-MEMORY PDF RASTERIZATION
+
+Renders PDF pages one at a time instead of materializing the whole document.
+
+convert_from_path(file, dpi=300) decodes every page into a full-resolution
+PIL image before OCR starts; a several-hundred-page STR pins gigabytes. Here
+each page is rendered only when it is about to be OCR'd and released right
+after, so peak image memory per worker is a single page.
+
+MEMORY CEILING:
+plan_pdf_render() reads every page size from the PDF once (no rendering)
+and estimates the decoded image size at the requested DPI. Pages that would
+exceed the per-worker ceiling (ocr_raster_memory_limit_mb) are planned at
+the highest DPI that fits, so no single render can go over the limit.
+
+Pages are rendered in grayscale (1 byte per pixel). Tesseract binarizes
+internally, so color adds memory without adding accuracy.
+"""
+
+import math
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# PDF user space is 72 points per inch
+POINTS_PER_INCH = 72.0
+
+# Grayscale rendering
+BYTES_PER_PIXEL = 1
+
+# US Letter, used when page sizes cannot be read
+DEFAULT_PAGE_SIZE_POINTS = (612.0, 792.0)
+
+
+@dataclass
+class PageRenderPlan:
+    """How a single PDF page will be rasterized"""
+    page_number: int
+    dpi: int
+    estimated_bytes: int
+
+
+def estimate_page_bytes(width_points: float, height_points: float, dpi: int) -> int:
+    """Decoded grayscale image size for a page rendered at dpi"""
+    width_px = math.ceil(width_points / POINTS_PER_INCH * dpi)
+    height_px = math.ceil(height_points / POINTS_PER_INCH * dpi)
+    return width_px * height_px * BYTES_PER_PIXEL
+
+
+def dpi_within_limit(width_points: float, height_points: float, dpi: int, memory_limit_bytes: int) -> int:
+    """Highest DPI <= dpi whose rendered page fits in memory_limit_bytes"""
+    if memory_limit_bytes <= 0:
+        return dpi
+
+    estimated = estimate_page_bytes(width_points, height_points, dpi)
+    if estimated <= memory_limit_bytes:
+        return dpi
+
+    # Pixel count scales with dpi^2
+    scaled = int(dpi * math.sqrt(memory_limit_bytes / estimated))
+    while scaled > 1 and estimate_page_bytes(width_points, height_points, scaled) > memory_limit_bytes:
+        scaled -= 1
+    return max(1, scaled)
+
+
+def read_page_sizes(file_path: Union[str, Path]) -> List[Tuple[float, float]]:
+    """Read (width, height) in points for every page with a single PDF parse"""
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [
+            (float(page.mediabox.width), float(page.mediabox.height))
+            for page in reader.pages
+        ]
+
+
+def plan_page_renders(
+    page_sizes: List[Tuple[float, float]],
+    dpi: int = 300,
+    memory_limit_mb: Optional[int] = None,
+    first_page: int = 1
+) -> List[PageRenderPlan]:
+    """
+    Plan page-at-a-time rendering from already-known page sizes.
+
+    Callers that have parsed the PDF themselves pass the sizes in, so the
+    document is not parsed a second time just to plan rendering.
+
+    Args:
+        page_sizes: (width, height) in points for every page, in page order
+        dpi: Requested render resolution
+        memory_limit_mb: Ceiling for one decoded page (defaults to settings)
+        first_page: Page number of page_sizes[0] (for a page range of a larger PDF)
+
+    Returns:
+        One PageRenderPlan per page, in page order
+    """
+    if memory_limit_mb is None:
+        memory_limit_mb = settings.ocr_raster_memory_limit_mb
+    memory_limit_bytes = memory_limit_mb * 1024 * 1024
+
+    plans = []
+    for page_number, (width, height) in enumerate(page_sizes, first_page):
+        page_dpi = dpi_within_limit(width, height, dpi, memory_limit_bytes)
+        if page_dpi < dpi:
+            logger.warning(
+                f"Page {page_number} exceeds the {memory_limit_mb} MB raster limit at {dpi} DPI; "
+                f"rendering at {page_dpi} DPI"
+            )
+        plans.append(PageRenderPlan(
+            page_number=page_number,
+            dpi=page_dpi,
+            estimated_bytes=estimate_page_bytes(width, height, page_dpi)
+        ))
+
+    return plans
+
+
+def plan_pdf_render(
+    file_path: Union[str, Path],
+    dpi: int = 300,
+    memory_limit_mb: Optional[int] = None
+) -> List[PageRenderPlan]:
+    """
+    Plan page-at-a-time rendering of a PDF under a per-page memory ceiling.
+
+    Args:
+        file_path: Path to the PDF
+        dpi: Requested render resolution
+        memory_limit_mb: Ceiling for one decoded page (defaults to settings)
+
+    Returns:
+        One PageRenderPlan per page, in page order
+    """
+    try:
+        page_sizes = read_page_sizes(file_path)
+    except Exception as e:
+        # Fall back to Poppler for the page count; assume Letter-sized pages
+        logger.warning(f"Could not read page sizes with PyPDF2 ({e}), using pdfinfo page count")
+        from pdf2image import pdfinfo_from_path
+        page_count = int(pdfinfo_from_path(str(file_path))['Pages'])
+        page_sizes = [DEFAULT_PAGE_SIZE_POINTS] * page_count
+
+    return plan_page_renders(page_sizes, dpi=dpi, memory_limit_mb=memory_limit_mb)
+
+
+def render_pdf_page(file_path: Union[str, Path], page_number: int, dpi: int):
+    """Rasterize a single PDF page (1-based) to a grayscale PIL image"""
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(
+        str(file_path),
+        dpi=dpi,
+        first_page=page_number,
+        last_page=page_number,
+        grayscale=True
+    )
+    if not images:
+        raise ValueError(f"Page {page_number} could not be rendered from {file_path}")
+    return images[0]
+
+
+def iter_pdf_pages(
+    file_path: Union[str, Path],
+    dpi: int = 300,
+    memory_limit_mb: Optional[int] = None
+) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (page_number, image) one page at a time.
+
+    Each image is closed once the consumer advances, so only one decoded page
+    is alive at any point.
+    """
+    for plan in plan_pdf_render(file_path, dpi=dpi, memory_limit_mb=memory_limit_mb):
+        image = render_pdf_page(file_path, plan.page_number, plan.dpi)
+        try:
+            yield plan.page_number, image
+        finally:
+            image.close()
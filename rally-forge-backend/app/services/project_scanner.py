@@ -0,0 +1,289 @@
+"""
+PROJECT SCANNER
+
+Bulk ingestion of a veteran's case file: a folder (or uploaded .zip) of the
+50-200 documents a VSO hands over, scanned as one job.
+
+WORKFLOW:
+1. Collect: a directory is walked recursively; a .zip archive is first
+   unpacked next to itself into <name>_files/ (members that would land
+   outside that directory, or an archive over
+   settings.project_archive_max_mb, are refused). Only file types the OCR
+   engine reads are kept.
+2. Classify: each document is routed to a scanner (DD-214, STR, rating
+   decision) from page one (document_classifier), or from its file name
+   when page one is inconclusive; unrecognized documents are reported, not
+   parsed
+3. Dispatch: documents are parsed concurrently, at most
+   settings.project_scan_concurrency at a time. The parsers' OCR runs on the
+   process-wide OCR executor and worker pool, so a 200-document project
+   shares capacity with single-document jobs instead of flooding it.
+4. Progress: counters are reported as each document finishes
+5. Aggregate: per-document results (in path order) and a project summary
+   (service periods, combined rating, rated conditions, STR diagnoses)
+
+A document that fails to parse is recorded with its error; it never fails
+the project.
+"""
+
+import asyncio
+import logging
+import zipfile
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from app.config import settings
+from app.services.condition_matching import normalize_condition
+from app.services.document_classifier import (
+    DD214,
+    RATING,
+    STR,
+    DocumentClassification,
+    classify_document,
+    classify_filename,
+)
+from app.services.ocr_executor import run_ocr_job
+
+logger = logging.getLogger(__name__)
+
+# What the OCR extraction engine can read
+SUPPORTED_EXTENSIONS = {'.pdf', '.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff'}
+
+DocumentParser = Callable[[str], Awaitable[Dict[str, Any]]]
+ProgressCallback = Callable[[Dict[str, int]], None]
+
+
+def extract_archive(archive_path: Path, target_dir: Path) -> Path:
+    """
+    Unpack a project .zip into target_dir.
+
+    Raises:
+        ValueError: If a member would be written outside target_dir, or the
+            archive is larger than settings.project_archive_max_mb unpacked
+    """
+    target_dir = target_dir.resolve()
+    limit = settings.project_archive_max_mb * 1024 * 1024
+
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [member for member in archive.infolist() if not member.is_dir()]
+
+        unpacked_size = sum(member.file_size for member in members)
+        if limit and unpacked_size > limit:
+            raise ValueError(
+                f"Archive unpacks to {unpacked_size // (1024 * 1024)} MB "
+                f"(limit {settings.project_archive_max_mb} MB): {archive_path}"
+            )
+
+        for member in members:
+            destination = (target_dir / member.filename).resolve()
+            if not destination.is_relative_to(target_dir):
+                raise ValueError(f"Archive member escapes the project directory: {member.filename}")
+
+        archive.extractall(target_dir, members)
+
+    logger.info(f"Unpacked {len(members)} files from {archive_path} to {target_dir}")
+    return target_dir
+
+
+def collect_documents(root: Union[str, Path]) -> Tuple[Path, List[Path]]:
+    """
+    Documents of a project, sorted by path.
+
+    Args:
+        root: Project directory, or a .zip archive of one
+
+    Returns:
+        (directory the documents were found in, document paths)
+    """
+    root = Path(root)
+    if root.is_file():
+        if not zipfile.is_zipfile(root):
+            raise ValueError(f"Project path is neither a directory nor a .zip archive: {root}")
+        root = extract_archive(root, root.with_name(f"{root.stem}_files"))
+    elif not root.is_dir():
+        raise FileNotFoundError(f"Project directory not found: {root}")
+
+    documents = [
+        path for path in root.rglob('*')
+        if path.is_file()
+        and path.suffix.lower() in SUPPORTED_EXTENSIONS
+        and not any(part.startswith('.') or part == '__MACOSX' for part in path.relative_to(root).parts)
+    ]
+    return root, sorted(documents)
+
+
+class ProjectScanner:
+    """Parses every document of a project with bounded concurrency"""
+
+    def __init__(self, parsers: Dict[str, DocumentParser], concurrency: Optional[int] = None):
+        """
+        Args:
+            parsers: Document type -> async parse function (file path -> result)
+            concurrency: Documents parsed at once (defaults to
+                settings.project_scan_concurrency, 0 = ocr_executor_threads)
+        """
+        self.parsers = parsers
+        self.concurrency = max(1, concurrency or settings.project_scan_concurrency or settings.ocr_executor_threads)
+
+    async def scan(self, project_path: Union[str, Path], on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Scan a project directory or archive.
+
+        Args:
+            on_progress: Called with {'documents_processed', 'document_count',
+                'documents_failed'} once up front and after every document
+
+        Returns:
+            {
+                'success': bool,
+                'status': str,
+                'project_path': str,
+                'document_count': int,  # Classified documents
+                'documents_scanned': int,
+                'documents_failed': int,
+                'documents': List[dict],  # {'path', 'scanner_type', 'classification', 'success', 'error', 'result'}
+                'unclassified': List[str],
+                'summary': dict,
+                'error': Optional[str]
+            }
+        """
+        # Unpacking a large archive and walking the tree are blocking; keep them off the event loop
+        root, paths = await run_ocr_job(collect_documents, project_path)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def route(path: Path) -> DocumentClassification:
+            async with semaphore:
+                return await classify_document(path)
+
+        classifications = await asyncio.gather(*(route(path) for path in paths))
+
+        routed = []
+        unclassified = []
+        for path, classification in zip(paths, classifications):
+            # Page one decides; the file name only when page one says nothing
+            document_type = classification.document_type or classify_filename(path.name)
+            if document_type in self.parsers:
+                routed.append((path, document_type, classification))
+            else:
+                unclassified.append(str(path.relative_to(root)))
+
+        logger.info(
+            f"Project scan of {root}: {len(routed)} documents to parse, "
+            f"{len(unclassified)} unclassified, concurrency {self.concurrency}"
+        )
+
+        progress = {'documents_processed': 0, 'document_count': len(routed), 'documents_failed': 0}
+        if on_progress:
+            on_progress(dict(progress))
+
+        async def parse(
+            index: int, path: Path, document_type: str, classification: DocumentClassification
+        ) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                entry = {
+                    'path': str(path.relative_to(root)),
+                    'scanner_type': document_type,
+                    'classification': classification.to_dict(),
+                    'success': False,
+                    'error': None,
+                    'result': None
+                }
+                try:
+                    result = await self.parsers[document_type](str(path))
+                    entry['result'] = result
+                    entry['success'] = bool(result.get('success'))
+                    entry['error'] = result.get('error')
+                except Exception as e:
+                    logger.error(f"Project document failed: {path} - {e}")
+                    entry['error'] = str(e)
+                return index, entry
+
+        documents: List[Optional[Dict[str, Any]]] = [None] * len(routed)
+        tasks = [parse(index, *document) for index, document in enumerate(routed)]
+        for finished in asyncio.as_completed(tasks):
+            index, entry = await finished
+            documents[index] = entry
+
+            progress['documents_processed'] += 1
+            if not entry['success']:
+                progress['documents_failed'] += 1
+            if on_progress:
+                on_progress(dict(progress))
+
+        scanned = sum(1 for entry in documents if entry['success'])
+        return {
+            'success': True,
+            'status': 'success',
+            'project_path': str(root),
+            'document_count': len(routed),
+            'documents_scanned': scanned,
+            'documents_failed': len(routed) - scanned,
+            'documents': documents,
+            'unclassified': unclassified,
+            'summary': build_project_summary(documents),
+            'error': None
+        }
+
+
+def build_project_summary(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Roll successful per-document results up into one view of the veteran.
+
+    The combined rating is taken from the most recent rating decision (latest
+    effective date); conditions rated in several decisions are listed once,
+    as rated in the most recent one.
+    """
+    parsed = [entry for entry in documents if entry['success']]
+
+    documents_by_type: Dict[str, int] = {}
+    for entry in documents:
+        documents_by_type[entry['scanner_type']] = documents_by_type.get(entry['scanner_type'], 0) + 1
+
+    service_periods = sorted(
+        (
+            {
+                'branch': entry['result'].get('branch'),
+                'date_entered': entry['result'].get('date_entered'),
+                'date_separated': entry['result'].get('date_separated'),
+                'character_of_service': entry['result'].get('character_of_service'),
+                'source': entry['path']
+            }
+            for entry in parsed if entry['scanner_type'] == DD214
+        ),
+        key=lambda period: period['date_entered'] or ''
+    )
+
+    # Oldest decision first, so later decisions overwrite earlier ratings
+    decisions = sorted(
+        (entry for entry in parsed if entry['scanner_type'] == RATING),
+        key=lambda entry: max(entry['result'].get('effective_dates') or [''])
+    )
+    combined_rating = None
+    rated_conditions: Dict[str, Dict[str, Any]] = {}
+    for entry in decisions:
+        result = entry['result']
+        if result.get('combined_rating') is not None:
+            combined_rating = result['combined_rating']
+        for condition in result.get('conditions') or []:
+            rated_conditions[normalize_condition(condition['condition'])] = dict(condition, source=entry['path'])
+
+    str_diagnoses: List[str] = []
+    chronic_conditions: List[str] = []
+    for entry in parsed:
+        if entry['scanner_type'] != STR:
+            continue
+        for diagnosis in entry['result'].get('diagnoses') or []:
+            if diagnosis['diagnosis'] not in str_diagnoses:
+                str_diagnoses.append(diagnosis['diagnosis'])
+        for condition in entry['result'].get('chronic_conditions') or []:
+            if condition not in chronic_conditions:
+                chronic_conditions.append(condition)
+
+    return {
+        'documents_by_type': documents_by_type,
+        'service_periods': service_periods,
+        'combined_rating': combined_rating,
+        'rated_conditions': list(rated_conditions.values()),
+        'str_diagnoses': str_diagnoses,
+        'chronic_conditions': chronic_conditions
+    }
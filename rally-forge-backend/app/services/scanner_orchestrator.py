@@ -10,6 +10,11 @@ ARCHITECTURE:
 - Execute appropriate scanner in background
 - Capture all output (stdout, stderr, exit codes)
 - Return structured results to UI
+- Persist partial results of long scans (STR) so the UI can render
+  findings while OCR is still running
+- Report document-level progress of project scans (one job per case file)
+- Hold jobs in an indexed store that evicts finished jobs (TTL and size
+  limits) and reloads their results from Results/ on demand
 - Self-healing capabilities
 
 SCANNERS:
@@ -24,12 +29,15 @@ import json
 import uuid
 import asyncio
 import subprocess
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from enum import Enum
 from pathlib import Path
 import logging
 
+from app.services.job_store import JobStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -67,10 +75,13 @@ class ScannerJob:
         self.file_path = file_path
         self.veteran_id = veteran_id or "anonymous"
         self.metadata = metadata or {}
-        self.status = JobStatus.PENDING
+        self._status = JobStatus.PENDING
+        self.status_listener: Optional[Callable[['ScannerJob', JobStatus], None]] = None  # Set by the JobStore holding the job
         self.started_at: Optional[datetime] = None
         self.completed_at: Optional[datetime] = None
         self.result: Optional[Dict[str, Any]] = None
+        self.partial_result: Optional[Dict[str, Any]] = None  # Latest increment while running
+        self.progress: Optional[Dict[str, int]] = None  # STR: {'pages_processed', 'page_count'}; project: documents
         self.error: Optional[str] = None
         self.stdout: Optional[str] = None
         self.stderr: Optional[str] = None
@@ -78,6 +89,16 @@ class ScannerJob:
         self.retry_count = 0
         self.max_retries = 3
 
+    @property
+    def status(self) -> JobStatus:
+        return self._status
+
+    @status.setter
+    def status(self, status: JobStatus):
+        previous, self._status = self._status, status
+        if self.status_listener is not None and previous != status:
+            self.status_listener(self, previous)
+
 
 class ScannerOrchestrator:
     """
@@ -93,9 +114,9 @@ class ScannerOrchestrator:
 
     def __init__(self, base_data_dir: str = "./Data"):
         self.base_data_dir = Path(base_data_dir)
-        self.jobs: Dict[str, ScannerJob] = {}
-        self.job_history: List[ScannerJob] = []
-        self.max_history = 1000
+        self.jobs = JobStore(loader=self._load_finished_job)
+        # Serializes partial-result writes (OCR executor threads) with job failure cleanup
+        self._partial_result_lock = threading.Lock()
 
         # Create base directories
         self._ensure_directories()
@@ -261,6 +282,8 @@ class ScannerOrchestrator:
         """
         job.status = JobStatus.RUNNING
         job.started_at = datetime.utcnow()
+        job.partial_result = None
+        job.progress = None
 
         logger.info(f"Executing job: {job.job_id} ({job.scanner_type.value})")
 
@@ -270,22 +293,23 @@ class ScannerOrchestrator:
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {job.file_path}")
 
-            if not file_path.is_file():
+            # A project is a directory (or an archive of one)
+            if job.scanner_type == ScannerType.PROJECT and file_path.is_dir():
+                pass
+            elif not file_path.is_file():
                 raise ValueError(f"Path is not a file: {job.file_path}")
-
-            file_size = file_path.stat().st_size
-            if file_size == 0:
+            elif file_path.stat().st_size == 0:
                 raise ValueError(f"File is empty: {job.file_path}")
 
             # Execute appropriate scanner
             if job.scanner_type == ScannerType.DD214:
                 result = await self._execute_dd214_scanner(job.file_path)
             elif job.scanner_type == ScannerType.STR:
-                result = await self._execute_str_scanner(job.file_path)
+                result = await self._execute_str_scanner(job.file_path, job)
             elif job.scanner_type == ScannerType.RATING:
                 result = await self._execute_rating_scanner(job.file_path)
             elif job.scanner_type == ScannerType.PROJECT:
-                result = await self._execute_project_scanner(job.file_path)
+                result = await self._execute_project_scanner(job.file_path, job)
             else:
                 raise ValueError(f"Unknown scanner type: {job.scanner_type}")
 
@@ -293,9 +317,10 @@ class ScannerOrchestrator:
             job.result = result
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
+            job.partial_result = None
 
             # Save result to disk
-            result_path = self.base_data_dir / "Results" / f"{job.job_id}.json"
+            result_path = self._result_path(job.job_id)
             result_path.write_text(json.dumps({
                 "job_id": job.job_id,
                 "scanner_type": job.scanner_type.value,
@@ -304,6 +329,7 @@ class ScannerOrchestrator:
                 "result": result,
                 "completed_at": job.completed_at.isoformat()
             }, indent=2))
+            self._partial_result_path(job.job_id).unlink(missing_ok=True)
 
             logger.info(f"Job completed successfully: {job.job_id}")
 
@@ -311,9 +337,16 @@ class ScannerOrchestrator:
             logger.error(f"Job failed: {job.job_id} - {str(e)}")
 
             job.error = str(e)
-            job.status = JobStatus.FAILED
             job.completed_at = datetime.utcnow()
 
+            # Findings of a failed attempt are stale; a retry reports its own. A timed-out
+            # scan may still be reporting from its executor thread, which checks the status
+            # under the same lock.
+            with self._partial_result_lock:
+                job.status = JobStatus.FAILED
+                job.partial_result = None
+                self._partial_result_path(job.job_id).unlink(missing_ok=True)
+
             # Retry logic
             if job.retry_count < job.max_retries:
                 job.retry_count += 1
@@ -324,13 +357,6 @@ class ScannerOrchestrator:
                 await asyncio.sleep(5 * job.retry_count)
                 await self._execute_job(job)
 
-        finally:
-            # Move to history if completed or failed permanently
-            if job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-                self.job_history.append(job)
-                if len(self.job_history) > self.max_history:
-                    self.job_history.pop(0)
-
     async def _execute_dd214_scanner(self, file_path: str) -> Dict[str, Any]:
         """
         Execute DD-214 scanner on file.
@@ -341,24 +367,100 @@ class ScannerOrchestrator:
         from app.services.parsers.dd214_parser import DD214Parser
 
         parser = DD214Parser()
-        result = await parser.parse_file(file_path)
+        # The job's type was chosen by the caller, or from page one at upload
+        # (project scans route by page one too); don't classify again
+        result = await parser.parse_file(file_path, check_document_type=False)
 
         return result
 
-    async def _execute_str_scanner(self, file_path: str) -> Dict[str, Any]:
+    async def _execute_str_scanner(self, file_path: str, job: Optional[ScannerJob] = None) -> Dict[str, Any]:
         """
         Execute STR scanner on file.
 
-        This will call the actual STR parser service.
+        This will call the actual STR parser service. Long records report
+        partial results as page ranges finish; they are kept on the job.
         """
         # Import STR parser
         from app.services.parsers.str_parser import STRParser
 
         parser = STRParser()
-        result = await parser.parse_file(file_path)
+        on_partial = (lambda partial: self._record_partial_result(job, partial)) if job else None
+        result = await parser.parse_file(file_path, on_partial=on_partial)
 
         return result
 
+    def _result_path(self, job_id: str) -> Path:
+        return self.base_data_dir / "Results" / f"{job_id}.json"
+
+    def _load_finished_job(self, job_id: str) -> Optional[ScannerJob]:
+        """Rebuild a completed job from its result file (None if there is none)"""
+        # Job ids come from request paths; never read outside Results/ or a partial result file
+        if Path(job_id).name != job_id or job_id.endswith(".partial"):
+            return None
+
+        result_path = self._result_path(job_id)
+        try:
+            saved = json.loads(result_path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not reload result of job {job_id}: {e}")
+            return None
+
+        job = ScannerJob(
+            job_id=saved["job_id"],
+            scanner_type=ScannerType(saved["scanner_type"]),
+            file_path=saved["file_path"],
+            veteran_id=saved.get("veteran_id")
+        )
+        job.status = JobStatus.COMPLETED
+        job.result = saved["result"]
+        job.completed_at = datetime.fromisoformat(saved["completed_at"])
+        return job
+
+    def _partial_result_path(self, job_id: str) -> Path:
+        return self.base_data_dir / "Results" / f"{job_id}.partial.json"
+
+    def _record_partial_result(self, job: ScannerJob, partial: Dict[str, Any]):
+        """
+        Keep the latest partial result on the job and on disk.
+
+        Called from the OCR executor thread while the scan is still running.
+        The file is replaced atomically, so readers never see a half-written
+        increment. Increments that arrive after the job stopped running
+        (a timed-out scan still finishing its current chunk) are dropped.
+        """
+        with self._partial_result_lock:
+            if job.status != JobStatus.RUNNING:
+                logger.info(f"Dropping partial result for job {job.job_id} ({job.status.value})")
+                return
+            self._write_partial_result(job, partial)
+
+    def _write_partial_result(self, job: ScannerJob, partial: Dict[str, Any]):
+        job.partial_result = partial
+        job.progress = {
+            "pages_processed": partial.get("pages_processed", 0),
+            "page_count": partial.get("page_count", 0)
+        }
+
+        result_path = self._partial_result_path(job.job_id)
+        temp_path = result_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({
+            "job_id": job.job_id,
+            "scanner_type": job.scanner_type.value,
+            "file_path": job.file_path,
+            "veteran_id": job.veteran_id,
+            "progress": job.progress,
+            "result": partial,
+            "updated_at": datetime.utcnow().isoformat()
+        }, indent=2))
+        os.replace(temp_path, result_path)
+
+        logger.info(
+            f"Partial result for job {job.job_id}: "
+            f"{job.progress['pages_processed']}/{job.progress['page_count']} pages"
+        )
+
     async def _execute_rating_scanner(self, file_path: str) -> Dict[str, Any]:
         """
         Execute VA Rating Decision scanner on file.
@@ -373,28 +475,39 @@ class ScannerOrchestrator:
 
         return result
 
-    async def _execute_project_scanner(self, file_path: str) -> Dict[str, Any]:
+    async def _execute_project_scanner(self, file_path: str, job: Optional[ScannerJob] = None) -> Dict[str, Any]:
         """
-        Execute project scanner (scans all documents in a directory).
+        Execute project scanner (scans all documents in a directory or .zip).
+
+        Each document goes through the same scanner a single upload of it
+        would; document counts are kept on the job as they finish.
         """
-        # TODO: Implement project scanner
-        return {
-            "status": "success",
-            "documents_scanned": 0,
-            "message": "Project scanner not yet implemented"
-        }
+        from app.services.project_scanner import ProjectScanner
+
+        scanner = ProjectScanner({
+            ScannerType.DD214.value: self._execute_dd214_scanner,
+            ScannerType.STR.value: self._execute_str_scanner,
+            ScannerType.RATING.value: self._execute_rating_scanner
+        })
+        on_progress = (lambda progress: self._record_progress(job, progress)) if job else None
+        result = await scanner.scan(file_path, on_progress=on_progress)
+
+        return result
+
+    def _record_progress(self, job: ScannerJob, progress: Dict[str, int]):
+        """Keep a project scan's document counts on the job"""
+        job.progress = progress
+
+        logger.info(
+            f"Project job {job.job_id}: {progress['documents_processed']}/{progress['document_count']} documents"
+            f" ({progress['documents_failed']} failed)"
+        )
 
     def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get the status of a scanner job"""
+        # Finished jobs evicted from memory are reloaded from Results/
         job = self.jobs.get(job_id)
 
-        if not job:
-            # Check history
-            for historical_job in self.job_history:
-                if historical_job.job_id == job_id:
-                    job = historical_job
-                    break
-
         if not job:
             return None
 
@@ -407,20 +520,15 @@ class ScannerOrchestrator:
             "started_at": job.started_at.isoformat() if job.started_at else None,
             "completed_at": job.completed_at.isoformat() if job.completed_at else None,
             "error": job.error,
-            "retry_count": job.retry_count
+            "retry_count": job.retry_count,
+            "progress": job.progress
         }
 
     def get_job_result(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get the result of a completed scanner job"""
+        # Finished jobs evicted from memory are reloaded from Results/
         job = self.jobs.get(job_id)
 
-        if not job:
-            # Check history
-            for historical_job in self.job_history:
-                if historical_job.job_id == job_id:
-                    job = historical_job
-                    break
-
         if not job:
             return None
 
@@ -428,7 +536,9 @@ class ScannerOrchestrator:
             return {
                 "status": "not_ready",
                 "job_status": job.status.value,
-                "error": job.error
+                "error": job.error,
+                "progress": job.progress,
+                "partial_result": job.partial_result  # Findings so far (long STR scans), else None
             }
 
         return {
@@ -439,17 +549,36 @@ class ScannerOrchestrator:
             "completed_at": job.completed_at.isoformat() if job.completed_at else None
         }
 
+    def list_jobs(self, veteran_id: Optional[str] = None, status: Optional[JobStatus] = None) -> List[Dict[str, Any]]:
+        """
+        Status of the jobs held in memory for a veteran and/or with a status.
+
+        Finished jobs are listed until they are evicted (see JobStore).
+        """
+        if veteran_id is not None:
+            jobs = self.jobs.by_veteran(veteran_id)
+            if status is not None:
+                jobs = [job for job in jobs if job.status == status]
+        elif status is not None:
+            jobs = self.jobs.by_status(status)
+        else:
+            jobs = list(self.jobs.values())
+
+        jobs.sort(key=lambda job: job.started_at or datetime.min)
+        return [self.get_job_status(job.job_id) for job in jobs]
+
     def get_scanner_health(self) -> Dict[str, Any]:
         """
         Get health metrics for all scanners.
 
         Returns statistics about scanner performance.
         """
-        total_jobs = len(self.jobs) + len(self.job_history)
-        completed_jobs = sum(1 for job in self.job_history if job.status == JobStatus.COMPLETED)
-        failed_jobs = sum(1 for job in self.job_history if job.status == JobStatus.FAILED)
-        running_jobs = sum(1 for job in self.jobs.values() if job.status == JobStatus.RUNNING)
-        pending_jobs = sum(1 for job in self.jobs.values() if job.status == JobStatus.PENDING)
+        total_jobs = len(self.jobs)
+        completed_jobs = self.jobs.count(JobStatus.COMPLETED)
+        failed_jobs = self.jobs.count(JobStatus.FAILED)
+        running_jobs = self.jobs.count(JobStatus.RUNNING)
+        pending_jobs = self.jobs.count(JobStatus.PENDING)
+        finished_jobs = self.jobs.by_status(JobStatus.COMPLETED) + self.jobs.by_status(JobStatus.FAILED)
 
         # Calculate success rate
         success_rate = (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
@@ -458,7 +587,7 @@ class ScannerOrchestrator:
         last_scans = {}
         for scanner_type in ScannerType:
             matching_jobs = [
-                job for job in self.job_history
+                job for job in finished_jobs
                 if job.scanner_type == scanner_type and job.completed_at
             ]
             if matching_jobs:
@@ -330,7 +330,10 @@ class SelfHealingEngine:
 
     def split_large_pdf(self, file_path: str, max_pages: int = 100) -> Dict:
         """
-        Split large PDF into smaller chunks for processing.
+        Plan a large PDF as page-range chunks for processing.
+
+        Chunks are virtual: page ranges of the original file (see
+        pdf_chunking), so nothing is copied or written to disk.
 
         Args:
             file_path: Path to large PDF
@@ -339,56 +342,40 @@ class SelfHealingEngine:
         Returns:
             {
                 'success': bool,
-                'chunks': List[str],
+                'chunks': List[dict],  # {'file_path', 'first_page', 'last_page'}
                 'total_pages': int
             }
         """
-        import PyPDF2
+        from app.services.pdf_chunking import count_pdf_pages, plan_page_ranges
 
         try:
-            with open(file_path, 'rb') as f:
-                pdf = PyPDF2.PdfReader(f)
-                total_pages = len(pdf.pages)
-
-                if total_pages <= max_pages:
-                    return {
-                        'success': True,
-                        'chunks': [file_path],
-                        'total_pages': total_pages,
-                        'message': 'File is small enough, no split needed'
-                    }
-
-                # Create chunks
-                chunks = []
-                base_name = os.path.splitext(file_path)[0]
-
-                for start_page in range(0, total_pages, max_pages):
-                    end_page = min(start_page + max_pages, total_pages)
-
-                    chunk_writer = PyPDF2.PdfWriter()
-                    for page_num in range(start_page, end_page):
-                        chunk_writer.add_page(pdf.pages[page_num])
-
-                    chunk_path = f"{base_name}_chunk_{start_page+1}-{end_page}.pdf"
-                    with open(chunk_path, 'wb') as chunk_file:
-                        chunk_writer.write(chunk_file)
-
-                    chunks.append(chunk_path)
-                    logger.info(f"Created chunk: {chunk_path}")
-
-                self._log_repair(
-                    'pdf_split',
-                    f"Split {total_pages}-page PDF into {len(chunks)} chunks",
-                    'success',
-                    {'file': file_path, 'chunks': len(chunks)}
-                )
+            total_pages = count_pdf_pages(file_path)
+            chunks = [
+                {'file_path': file_path, 'first_page': page_range.first_page, 'last_page': page_range.last_page}
+                for page_range in plan_page_ranges(total_pages, max_pages)
+            ]
 
+            if total_pages <= max_pages:
                 return {
                     'success': True,
                     'chunks': chunks,
-                    'total_pages': total_pages
+                    'total_pages': total_pages,
+                    'message': 'File is small enough, no split needed'
                 }
 
+            self._log_repair(
+                'pdf_split',
+                f"Planned {total_pages}-page PDF as {len(chunks)} page-range chunks",
+                'success',
+                {'file': file_path, 'chunks': len(chunks)}
+            )
+
+            return {
+                'success': True,
+                'chunks': chunks,
+                'total_pages': total_pages
+            }
+
         except Exception as e:
             logger.error(f"PDF split failed: {e}")
             return {
@@ -0,0 +1,158 @@
+"""
+OCR Capability Registry
+
+Process-wide, cached view of which OCR dependencies (Poppler, Tesseract,
+Google Vision) are installed.
+
+Probing spawns subprocesses (pdfinfo -v, pdftoppm -v, tesseract --version),
+so it runs once at startup and then periodically on a background thread;
+scanners, upload handlers and the diagnostics endpoint read the last
+snapshot from memory instead of probing per instance or per request.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.config import settings
+from app.utils.ocr_diagnostics import OCRDependencyManager, OCRDiagnosticResult
+
+logger = logging.getLogger(__name__)
+
+
+class OCRCapabilityRegistry:
+    """Cached OCR dependency diagnostics with background refresh"""
+
+    def __init__(self, probe: Callable[[], OCRDiagnosticResult], refresh_interval: float = 0):
+        """
+        Args:
+            probe: Runs a full dependency check (OCRDependencyManager.run_diagnostics)
+            refresh_interval: Seconds between background re-probes (0 = never)
+        """
+        self.probe = probe
+        self.refresh_interval = refresh_interval
+        self.checked_at: Optional[datetime] = None
+        self._diagnostics: Optional[OCRDiagnosticResult] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> OCRDiagnosticResult:
+        """Last probe result (probes synchronously only if nothing has been probed yet)"""
+        diagnostics = self._diagnostics
+        if diagnostics is None:
+            with self._lock:
+                if self._diagnostics is None:
+                    self._store(self.probe())
+                diagnostics = self._diagnostics
+        return diagnostics
+
+    def refresh(self) -> OCRDiagnosticResult:
+        """Probe now and replace the snapshot"""
+        diagnostics = self.probe()
+        with self._lock:
+            self._store(diagnostics)
+        return diagnostics
+
+    def _store(self, diagnostics: OCRDiagnosticResult):
+        changed = self._diagnostics is None or self._summary(diagnostics) != self._summary(self._diagnostics)
+        self._diagnostics = diagnostics
+        self.checked_at = datetime.utcnow()
+        if changed:
+            log_diagnostics(diagnostics)
+
+    @staticmethod
+    def _summary(diagnostics: OCRDiagnosticResult):
+        return (
+            diagnostics.poppler_detected,
+            diagnostics.tesseract_detected,
+            diagnostics.tesseract_version,
+            diagnostics.google_vision_available,
+        )
+
+    @property
+    def poppler_available(self) -> bool:
+        return self.snapshot().poppler_detected
+
+    @property
+    def tesseract_available(self) -> bool:
+        return self.snapshot().tesseract_detected
+
+    def start(self):
+        """Probe once, then keep refreshing in the background every refresh_interval seconds"""
+        self.refresh()
+        if self.refresh_interval <= 0 or self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name='ocr-capability-probe', daemon=True)
+        self._thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            started = time.perf_counter()
+            try:
+                self.refresh()
+                logger.debug(f"OCR capabilities refreshed in {(time.perf_counter() - started) * 1000:.0f} ms")
+            except Exception as e:
+                logger.warning(f"OCR capability refresh failed, keeping previous snapshot: {e}")
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def log_diagnostics(diagnostics: OCRDiagnosticResult):
+    """Log OCR diagnostics"""
+    for error in diagnostics.errors:
+        logger.error(f"OCR ERROR: {error}")
+
+    for warning in diagnostics.warnings:
+        logger.warning(f"OCR WARNING: {warning}")
+
+    if diagnostics.recommendations:
+        logger.info("OCR RECOMMENDATIONS:")
+        for rec in diagnostics.recommendations:
+            logger.info(f"  - {rec}")
+
+    logger.info(f"OCR Ready for PDF: {diagnostics.ready_for_pdf_ocr}")
+
+
+# Global registry instance (one per process)
+_ocr_capabilities: Optional[OCRCapabilityRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_ocr_capabilities() -> OCRCapabilityRegistry:
+    """Get the process-wide OCR capability registry"""
+    global _ocr_capabilities
+    with _registry_lock:
+        if _ocr_capabilities is None:
+            dep_manager = OCRDependencyManager(
+                poppler_path=settings.poppler_path,
+                tesseract_path=settings.tesseract_path
+            )
+            _ocr_capabilities = OCRCapabilityRegistry(
+                probe=dep_manager.run_diagnostics,
+                refresh_interval=settings.ocr_capability_refresh_seconds
+            )
+        return _ocr_capabilities
+
+
+def start_ocr_capabilities():
+    """Probe OCR dependencies at startup and start the background refresh"""
+    get_ocr_capabilities().start()
+
+
+def shutdown_ocr_capabilities():
+    """Stop the global registry's background refresh"""
+    global _ocr_capabilities
+    with _registry_lock:
+        if _ocr_capabilities is not None:
+            _ocr_capabilities.stop()
+            _ocr_capabilities = None
@@ -6,7 +6,7 @@ and structured error handling for OCR pipeline failures.
 """
 
 import os
-import sys
+import shutil
 import subprocess
 import logging
 from typing import Dict, Tuple, List, Optional
@@ -197,6 +197,9 @@ class OCRDependencyManager:
         """
         Verify that a PDF file can be processed
 
+        Parses the PDF in-process (PyPDF2) rather than spawning pdfinfo per
+        upload; Poppler availability comes from run_diagnostics().
+
         Args:
             file_path: Path to PDF file
 
@@ -210,37 +213,16 @@ class OCRDependencyManager:
         if not os.access(file_path, os.R_OK):
             return False, "File is not readable"
 
-        # Try pdfinfo to get page count
         try:
-            result = subprocess.run(
-                ['pdfinfo', file_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode != 0:
-                return False, f"pdfinfo failed: {result.stderr}"
-
-            # Extract page count
-            for line in result.stdout.split('\n'):
-                if line.startswith('Pages:'):
-                    try:
-                        pages = int(line.split(':')[1].strip())
-                        if pages == 0:
-                            return False, "PDF has no pages"
-                        return True, f"PDF has {pages} pages"
-                    except (ValueError, IndexError):
-                        return False, "Could not parse page count from pdfinfo"
-
-            return False, "Could not find page count in pdfinfo output"
-
-        except FileNotFoundError:
-            return False, "pdfinfo not found in PATH - Poppler may not be installed"
-        except subprocess.TimeoutExpired:
-            return False, "pdfinfo command timed out"
+            import PyPDF2
+            with open(file_path, 'rb') as file:
+                pages = len(PyPDF2.PdfReader(file).pages)
         except Exception as e:
-            return False, f"Error checking PDF: {str(e)}"
+            return False, f"Could not parse PDF: {str(e)}"
+
+        if pages == 0:
+            return False, "PDF has no pages"
+        return True, f"PDF has {pages} pages"
 
     def run_diagnostics(self) -> OCRDiagnosticResult:
         """Run comprehensive OCR diagnostics"""
@@ -320,14 +302,4 @@ class OCRDependencyManager:
     @staticmethod
     def _get_command_path(command: str) -> Optional[str]:
         """Get full path to a command"""
-        try:
-            if sys.platform == 'win32':
-                result = subprocess.run(['where', command], capture_output=True, text=True)
-            else:
-                result = subprocess.run(['which', command], capture_output=True, text=True)
-
-            if result.returncode == 0:
-                return result.stdout.strip().split('\n')[0]
-        except Exception:
-            pass
-        return None
+        return shutil.which(command)
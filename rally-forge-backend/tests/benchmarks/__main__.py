@@ -0,0 +1,84 @@
+"""
+Run the scanner benchmark suite
+
+    python -m tests.benchmarks --output results.json
+    python -m tests.benchmarks --output results.json --compare baseline.json
+
+Generates the synthetic corpus into a temporary directory (or --corpus-dir),
+benchmarks every parser, prints a summary table and writes the results as
+JSON. With --compare, exits 1 if any run regressed against the baseline.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from tests.benchmarks.corpus import VARIANTS, build_corpus
+from tests.benchmarks.harness import (
+    MAX_ACCURACY_DROP,
+    MAX_THROUGHPUT_DROP,
+    compare_results,
+    format_summary,
+    run_benchmarks,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='OCR throughput and field-accuracy benchmarks')
+    parser.add_argument('--output', type=Path, help='Write results JSON here')
+    parser.add_argument('--compare', type=Path, help='Baseline results JSON to diff against')
+    parser.add_argument('--corpus-dir', type=Path, help='Keep the generated corpus here')
+    parser.add_argument('--seed', type=int, default=214)
+    parser.add_argument('--documents', type=int, default=3, help='Documents per type and variant')
+    parser.add_argument('--str-pages', type=int, default=6, help='Pages per STR document')
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument('--max-throughput-drop', type=float, default=MAX_THROUGHPUT_DROP)
+    parser.add_argument('--max-accuracy-drop', type=float, default=MAX_ACCURACY_DROP)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix='ocr-benchmark-') as temp_dir:
+        corpus_dir = args.corpus_dir or Path(temp_dir)
+        corpus = build_corpus(
+            corpus_dir,
+            seed=args.seed,
+            documents_per_type=args.documents,
+            str_pages_per_document=args.str_pages,
+            variants=args.variants
+        )
+        results = run_benchmarks(corpus, corpus_info={
+            'seed': args.seed,
+            'documents_per_type': args.documents,
+            'str_pages_per_document': args.str_pages,
+            'variants': args.variants,
+            'documents': len(corpus),
+            'pages': sum(document.page_count for document in corpus),
+        })
+
+    print(format_summary(results))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True, default=str))
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        regressions = compare_results(
+            json.loads(args.compare.read_text()),
+            results,
+            max_throughput_drop=args.max_throughput_drop,
+            max_accuracy_drop=args.max_accuracy_drop
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,401 @@
+"""
+SYNTHETIC DOCUMENT CORPUS
+
+Generates DD-214, STR and VA rating-decision documents locally, with the
+ground-truth field values each one was rendered from. Nothing here is a
+real veteran record; every value comes from a seeded random generator, so
+the same seed always produces the same corpus.
+
+VARIANTS:
+- digital: PDF with a text layer (the PDF_TEXT path, no OCR needed)
+- scan:    image-only PDF, every page rasterized at 200 DPI with skew,
+           blur, speckle and sensor noise (the OCR path)
+- photo:   single-page PNG of a noisy scan (DD-214 only; uploads from phones)
+
+GROUND TRUTH:
+Scalar fields are strings (dates ISO YYYY-MM-DD); multi-valued fields are
+sorted lists. Values are canonical, not formatted the way the parsers
+print them; harness adapters map each parser's output onto these names.
+"""
+
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+DOC_TYPES = ('dd214', 'str', 'rating_decision')
+VARIANTS = ('digital', 'scan', 'photo')
+
+# Scan rendering
+SCAN_DPI = 200
+PAGE_WIDTH_IN = 8.5
+PAGE_HEIGHT_IN = 11.0
+FONT_SIZE_PX = 30
+LINE_HEIGHT_PX = 44
+MARGIN_PX = 120
+
+# Text-layer PDF layout (points)
+PDF_FONT_SIZE = 11
+PDF_LEADING = 15
+PDF_MARGIN = 54
+
+FIRST_NAMES = ['James', 'Maria', 'Robert', 'Linda', 'Michael', 'Angela', 'David', 'Keisha', 'Daniel', 'Rosa']
+LAST_NAMES = ['Johnson', 'Garcia', 'Williams', 'Nguyen', 'Brown', 'Martinez', 'Davis', 'Thompson', 'Walker', 'Lopez']
+
+BRANCHES = {
+    'Army': ('US Army', ['11B', '68W', '88M', '25U', '92Y']),
+    'Navy': ('US Navy', ['HM', 'MM', 'ET', 'BM', 'IT']),
+    'Air Force': ('US Air Force', ['3P0X1', '2A6X1', '1N0X1', '4N0X1']),
+    'Marine Corps': ('US Marine Corps', ['0311', '0331', '3531', '0621']),
+}
+
+PAY_GRADES = ['E-3', 'E-4', 'E-5', 'E-6', 'E-7', 'O-2', 'O-3']
+
+CHARACTERS = ['Honorable', 'General']
+
+AWARDS = [
+    'Bronze Star', 'Purple Heart', 'Army Commendation Medal', 'Good Conduct Medal',
+    'National Defense Service Medal', 'Iraq Campaign Medal', 'Afghanistan Campaign Medal',
+    'Global War on Terrorism Service Medal', 'Combat Action Badge', 'Air Medal',
+]
+
+SEPARATIONS = [
+    ('JBK', '1', 'Completion of Required Active Service'),
+    ('MBK', '1', 'Completion of Required Active Service'),
+    ('JFF', '3', 'Secretarial Authority'),
+    ('SFJ', '2', 'Disability, Severance Pay'),
+]
+
+ENCOUNTER_TYPES = ['Sick Call', 'Clinic Visit', 'Emergency', 'Physical Exam']
+
+# (complaint, symptom, assessment, medication)
+STR_PROBLEMS = [
+    ('low back pain after ruck march', 'back pain radiating to left leg', 'Lumbar strain', 'Ibuprofen 800mg TID'),
+    ('ringing in both ears after range', 'constant ringing, worse at night', 'Tinnitus', 'Hearing protection issued'),
+    ('right knee pain on stairs', 'swelling and clicking right knee', 'Patellofemoral syndrome', 'Naproxen 500mg BID'),
+    ('trouble sleeping since deployment', 'nightmares and hypervigilance', 'Insomnia', 'Trazodone 50mg QHS'),
+    ('headaches after blast exposure', 'daily headaches with light sensitivity', 'Post-traumatic headache', 'Sumatriptan 50mg PRN'),
+    ('cough and wheezing', 'shortness of breath on exertion', 'Reactive airway disease', 'Albuterol inhaler PRN'),
+    ('left shoulder pain lifting', 'reduced range of motion left shoulder', 'Rotator cuff tendinitis', 'Meloxicam 15mg daily'),
+    ('rash on forearms', 'itching, dry scaly patches', 'Contact dermatitis', 'Triamcinolone cream BID'),
+]
+
+EXPOSURES = [
+    'Deployed to Iraq, exposed to burn pit smoke',
+    'Deployed to Afghanistan, exposed to diesel exhaust',
+    'Exposed to loud noise on the firing line',
+]
+
+# (condition, diagnostic code, possible percentages)
+RATED_CONDITIONS = [
+    ('Tinnitus', '6260', [10]),
+    ('Lumbosacral strain', '5237', [10, 20, 40]),
+    ('Post traumatic stress disorder', '9411', [30, 50, 70]),
+    ('Right knee patellofemoral syndrome', '5260', [10, 20]),
+    ('Migraine headaches', '8100', [0, 30, 50]),
+    ('Sleep apnea', '6847', [30, 50]),
+    ('Asthma', '6602', [10, 30]),
+]
+
+
+@dataclass
+class SyntheticDocument:
+    """One generated document and the field values it was rendered from"""
+    doc_id: str
+    doc_type: str
+    variant: str
+    path: Path
+    page_count: int
+    truth: Dict[str, Any] = field(default_factory=dict)
+
+
+def _date(rng: random.Random, start_year: int, end_year: int) -> str:
+    return f"{rng.randint(start_year, end_year):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _us_date(iso_date: str) -> str:
+    year, month, day = iso_date.split('-')
+    return f"{month}/{day}/{year}"
+
+
+def combined_rating(percentages: Sequence[int]) -> int:
+    """VA combined rating: 'whole person' efficiency method, rounded to the nearest 10"""
+    remaining = 100.0
+    for percentage in sorted(percentages, reverse=True):
+        remaining -= remaining * percentage / 100
+    return int((100 - remaining + 5) // 10 * 10)
+
+
+def dd214_pages(rng: random.Random) -> Tuple[List[List[str]], Dict[str, Any]]:
+    """DD-214 text (form page + continuation page) and its ground truth"""
+    branch = rng.choice(sorted(BRANCHES))
+    component, specialties = BRANCHES[branch]
+    entry = _date(rng, 1995, 2012)
+    separation = f"{int(entry[:4]) + rng.randint(3, 8):04d}{entry[4:]}"
+    separation_code, reentry_code, narrative = rng.choice(SEPARATIONS)
+    awards = sorted(rng.sample(AWARDS, rng.randint(2, 5)))
+
+    truth = {
+        'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        'branch': branch,
+        'pay_grade': rng.choice(PAY_GRADES),
+        'mos': rng.choice(specialties),
+        'entry_date': entry,
+        'separation_date': separation,
+        'character_of_service': rng.choice(CHARACTERS),
+        'separation_code': separation_code,
+        'reentry_code': reentry_code,
+        'narrative_reason': narrative,
+        'decorations': awards,
+    }
+
+    form = [
+        'DEPARTMENT OF DEFENSE',
+        'CERTIFICATE OF RELEASE OR DISCHARGE FROM ACTIVE DUTY',
+        'DD FORM 214, AUG 2009',
+        '',
+        f"1. Name: {truth['name']}",
+        f"3. SSN: XXX-XX-{rng.randint(1000, 9999)}",
+        f"2. Component: {component}",
+        f"Branch: {branch}",
+        f"4b. Pay Grade: {truth['pay_grade']}",
+        f"11. Primary Specialty: {truth['mos']}",
+        f"12a. Date Entered: {_us_date(entry)}",
+        f"12b. Separation Date: {_us_date(separation)}",
+        f"13. Decorations: {', '.join(awards)}",
+        f"24. Character of Service: {truth['character_of_service']}",
+        f"26. Separation Code: {separation_code}",
+        f"27. Reentry Code: {reentry_code}",
+        f"28. Narrative Reason: {narrative}",
+    ]
+    continuation = [
+        'DD FORM 214 CONTINUATION SHEET',
+        '18. Remarks:',
+        'Member has completed first full term of service.',
+        f"Service in {rng.choice(['Iraq', 'Afghanistan', 'Kuwait'])} {entry[:4]} - {separation[:4]}.",
+        'Nothing follows.',
+    ]
+    return [form, continuation], truth
+
+
+def str_pages(rng: random.Random, page_count: int) -> Tuple[List[List[str]], Dict[str, Any]]:
+    """Service Treatment Record pages (two encounters each) and ground truth"""
+    pages = []
+    dates = set()
+    diagnoses = set()
+    medications = set()
+
+    for _ in range(page_count):
+        lines = ['CHRONOLOGICAL RECORD OF MEDICAL CARE', 'STANDARD FORM 600', '']
+        for _ in range(2):
+            encounter_date = _date(rng, 2003, 2014)
+            while encounter_date in dates:
+                encounter_date = _date(rng, 2003, 2014)
+            complaint, symptom, assessment, medication = rng.choice(STR_PROBLEMS)
+            dates.add(encounter_date)
+            diagnoses.add(assessment)
+            medications.add(medication)
+
+            lines += [
+                f"{_us_date(encounter_date)} {rng.choice(ENCOUNTER_TYPES)}",
+                f"Chief Complaint: {complaint}",
+                f"Symptoms: {symptom}",
+                f"Assessment: {assessment}",
+                f"Medication: {medication}",
+            ]
+            if rng.random() < 0.4:
+                lines.append(rng.choice(EXPOSURES))
+            lines += ['Vitals within normal limits, patient alert and oriented', '']
+        pages.append(lines)
+
+    truth = {
+        'encounter_dates': sorted(dates),
+        'diagnoses': sorted(diagnoses),
+        'medications': sorted(medications),
+    }
+    return pages, truth
+
+
+def rating_decision_pages(rng: random.Random) -> Tuple[List[List[str]], Dict[str, Any]]:
+    """VA rating decision (decision page + reasons page) and ground truth"""
+    rated = rng.sample(RATED_CONDITIONS, rng.randint(2, 5))
+    effective = _date(rng, 2010, 2023)
+    percentages = {}
+    decision = [
+        'DEPARTMENT OF VETERANS AFFAIRS',
+        'RATING DECISION',
+        '',
+        'DECISION',
+    ]
+    for condition, code, options in rated:
+        percentage = rng.choice(options)
+        percentages[condition] = percentage
+        decision += [
+            f"Service Connected: {condition} {percentage}%",
+            f"Diagnostic Code: {code}",
+            f"Effective Date: {_us_date(effective)}",
+            '',
+        ]
+    combined = combined_rating(list(percentages.values()))
+    decision.append(f"Combined Rating: {combined}%")
+
+    reasons = [
+        'REASONS FOR DECISION',
+        f"Evidence of in-service treatment for {rated[0][0].lower()} in the service treatment records.",
+        'Medical evidence shows a current diagnosis and a nexus to military service.',
+    ]
+
+    truth = {
+        'conditions': sorted(condition for condition, _, _ in rated),
+        'ratings': sorted(f"{condition}: {percentage}%" for condition, percentage in percentages.items()),
+        'diagnostic_codes': sorted(code for _, code, _ in rated),
+        'effective_date': effective,
+        'combined_rating': str(combined),
+    }
+    return [decision, reasons], truth
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_text_pdf(path: Path, pages: List[List[str]]):
+    """Minimal PDF with a real text layer (Helvetica, one Tj per line)"""
+    width, height = PAGE_WIDTH_IN * 72, PAGE_HEIGHT_IN * 72
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b'')  # filled in once the page tree exists
+    pages_id = add(b'')
+    font_id = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    page_ids = []
+    for lines in pages:
+        commands = [f"BT /F1 {PDF_FONT_SIZE} Tf {PDF_LEADING} TL {PDF_MARGIN} {height - PDF_MARGIN:.0f} Td"]
+        commands += [f"({_pdf_string(line)}) Tj T*" for line in lines]
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('latin-1')
+        content_id = add(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {width:.0f} {height:.0f}] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode('latin-1')
+        ))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode('latin-1')
+    kids = ' '.join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode('latin-1')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, catalog, xref)
+    Path(path).write_bytes(bytes(output))
+
+
+def render_page(lines: List[str]) -> Image.Image:
+    """Clean grayscale page image at SCAN_DPI"""
+    image = Image.new('L', (int(PAGE_WIDTH_IN * SCAN_DPI), int(PAGE_HEIGHT_IN * SCAN_DPI)), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=FONT_SIZE_PX)
+    for index, line in enumerate(lines):
+        draw.text((MARGIN_PX, MARGIN_PX + index * LINE_HEIGHT_PX), line, fill=0, font=font)
+    return image
+
+
+def degrade_scan(image: Image.Image, rng: random.Random, skew_degrees: float = 1.5) -> Image.Image:
+    """Photocopier/scanner artifacts: skew, blur, speckle and sensor noise"""
+    image = image.rotate(
+        rng.uniform(-skew_degrees, skew_degrees), resample=Image.BICUBIC, fillcolor=255
+    )
+    image = image.filter(ImageFilter.GaussianBlur(radius=rng.uniform(0.3, 0.8)))
+
+    noise_rng = np.random.default_rng(rng.randrange(2 ** 32))
+    pixels = np.asarray(image, dtype=np.float32)
+    pixels += noise_rng.normal(0, 12, pixels.shape)
+    speckle = noise_rng.random(pixels.shape)
+    pixels[speckle < 0.0015] = 0
+    pixels[speckle > 0.9985] = 255
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), mode='L')
+
+
+def write_scan_pdf(path: Path, pages: List[List[str]], rng: random.Random):
+    images = [degrade_scan(render_page(lines), rng) for lines in pages]
+    images[0].save(path, 'PDF', save_all=True, append_images=images[1:], resolution=SCAN_DPI)
+
+
+def write_photo(path: Path, lines: List[str], rng: random.Random):
+    degrade_scan(render_page(lines), rng, skew_degrees=3.0).save(path, 'PNG', dpi=(SCAN_DPI, SCAN_DPI))
+
+
+def build_corpus(
+    output_dir: Path,
+    seed: int = 214,
+    documents_per_type: int = 2,
+    str_pages_per_document: int = 4,
+    variants: Optional[Sequence[str]] = None
+) -> List[SyntheticDocument]:
+    """
+    Generate the corpus into output_dir.
+
+    Args:
+        seed: Same seed, same documents and ground truth
+        documents_per_type: Documents of each type per variant
+        str_pages_per_document: STR length (two encounters per page)
+        variants: Subset of VARIANTS to render (default: all)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    variants = tuple(variants or VARIANTS)
+    rng = random.Random(seed)
+    corpus = []
+
+    for doc_type in DOC_TYPES:
+        for index in range(documents_per_type):
+            if doc_type == 'dd214':
+                pages, truth = dd214_pages(rng)
+            elif doc_type == 'str':
+                pages, truth = str_pages(rng, str_pages_per_document)
+            else:
+                pages, truth = rating_decision_pages(rng)
+
+            for variant in variants:
+                doc_id = f"{doc_type}-{index:03d}-{variant}"
+                # Scan artifacts get their own stream so content never depends on the variants chosen
+                noise = random.Random(f"{seed}-{doc_id}")
+                if variant == 'digital':
+                    path = output_dir / f"{doc_id}.pdf"
+                    write_text_pdf(path, pages)
+                    page_count = len(pages)
+                elif variant == 'scan':
+                    path = output_dir / f"{doc_id}.pdf"
+                    write_scan_pdf(path, pages, noise)
+                    page_count = len(pages)
+                elif doc_type == 'dd214':
+                    path = output_dir / f"{doc_id}.png"
+                    write_photo(path, pages[0], noise)
+                    page_count = 1
+                else:
+                    continue
+
+                corpus.append(SyntheticDocument(
+                    doc_id=doc_id,
+                    doc_type=doc_type,
+                    variant=variant,
+                    path=path,
+                    page_count=page_count,
+                    truth=truth
+                ))
+
+    return corpus
@@ -0,0 +1,514 @@
+"""
+SCANNER BENCHMARK HARNESS
+
+Runs the synthetic corpus (corpus.py) through DD214Parser, STRParser,
+RatingDecisionParser and DD214OCRScanner and measures:
+
+- Throughput: documents, pages and pages/sec per parser, document type and variant
+- Peak RSS: process high-water mark after each run (monotonic across runs)
+- Per-stage latency: render, preprocess, ocr and extract are timed at the
+  pipeline's own seams; parse is the rest of each document's wall time
+- Accuracy: per-field true/false positives and negatives against the
+  corpus ground truth, reported as precision and recall
+
+The pipeline runs in-process (one OCR worker, OCR cache off) so stage
+timings see every call and repeat runs measure real work.
+
+Results are plain JSON with a fixed schema; compare_results() diffs two
+result files and lists throughput and accuracy regressions.
+"""
+
+import asyncio
+import functools
+import os
+import platform
+import re
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tests.benchmarks.corpus import SyntheticDocument
+
+RESULTS_SCHEMA = 1
+
+# compare_results() defaults
+MAX_THROUGHPUT_DROP = 0.10
+MAX_ACCURACY_DROP = 0.02
+
+
+# ---------------------------------------------------------------------------
+# Accuracy
+# ---------------------------------------------------------------------------
+
+def normalize_value(value: Any) -> str:
+    """Case-, punctuation- and whitespace-insensitive form used for matching"""
+    text = re.sub(r'[^a-z0-9%\s]', '', str(value).casefold())
+    return ' '.join(text.split())
+
+
+@dataclass
+class FieldScore:
+    """Match counts for one field across a run"""
+    true_positives: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+
+    @property
+    def precision(self) -> Optional[float]:
+        predicted = self.true_positives + self.false_positives
+        return self.true_positives / predicted if predicted else None
+
+    @property
+    def recall(self) -> Optional[float]:
+        expected = self.true_positives + self.false_negatives
+        return self.true_positives / expected if expected else None
+
+    def add(self, other: 'FieldScore'):
+        self.true_positives += other.true_positives
+        self.false_positives += other.false_positives
+        self.false_negatives += other.false_negatives
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'tp': self.true_positives,
+            'fp': self.false_positives,
+            'fn': self.false_negatives,
+            'precision': None if self.precision is None else round(self.precision, 4),
+            'recall': None if self.recall is None else round(self.recall, 4),
+        }
+
+
+def score_field(expected: Any, predicted: Any) -> FieldScore:
+    """
+    Score one field of one document.
+
+    Lists are compared as sets of normalized values. A wrong scalar counts
+    as both a false positive and a false negative; a missing one only as a
+    false negative.
+    """
+    if isinstance(expected, (list, tuple, set)):
+        expected_set = {normalize_value(value) for value in expected}
+        predicted_set = {normalize_value(value) for value in (predicted or []) if value}
+        return FieldScore(
+            true_positives=len(expected_set & predicted_set),
+            false_positives=len(predicted_set - expected_set),
+            false_negatives=len(expected_set - predicted_set)
+        )
+
+    if predicted in (None, ''):
+        return FieldScore(false_negatives=1)
+    if normalize_value(predicted) == normalize_value(expected):
+        return FieldScore(true_positives=1)
+    return FieldScore(false_positives=1, false_negatives=1)
+
+
+# ---------------------------------------------------------------------------
+# Stage timing
+# ---------------------------------------------------------------------------
+
+class StageTimer:
+    """Collects wall-time samples (ms) per pipeline stage"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, elapsed_ms: float):
+        self.samples.setdefault(stage, []).append(elapsed_ms)
+
+    def total(self, stage: str) -> float:
+        return sum(self.samples.get(stage, []))
+
+    def wrap(self, stage: str, fn: Callable) -> Callable:
+        """fn timed under stage (sync or async)"""
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed_async(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.record(stage, (time.perf_counter() - started) * 1000)
+            return timed_async
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, (time.perf_counter() - started) * 1000)
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {stage: latency_summary(samples) for stage, samples in sorted(self.samples.items())}
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {'calls': 0, 'total_ms': 0.0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0}
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    return {
+        'calls': len(ordered),
+        'total_ms': round(sum(ordered), 2),
+        'mean_ms': round(sum(ordered) / len(ordered), 2),
+        'p50_ms': round(percentile(0.5), 2),
+        'p95_ms': round(percentile(0.95), 2),
+    }
+
+
+# Pipeline seams timed as stages: (module, attribute path, stage)
+STAGE_HOOKS = [
+    ('app.services.pdf_rasterizer', 'render_pdf_page', 'render'),
+    ('app.services.adaptive_ocr', 'render_pdf_page', 'render'),
+    ('app.services.dd214_ocr_scanner', 'render_pdf_page', 'render'),
+    ('app.services.image_preprocessing', 'preprocess_image', 'preprocess'),
+    ('app.services.ocr_router', 'OCRRouter._run', 'ocr'),
+    ('app.services.ocr_extraction', 'OCRExtractionEngine.extract_text', 'extract'),
+    ('app.services.dd214_ocr_scanner', 'DD214OCRScanner._extract_from_pdf', 'extract'),
+    ('app.services.dd214_ocr_scanner', 'DD214OCRScanner._extract_from_image', 'extract'),
+]
+
+
+@contextmanager
+def instrument_pipeline(timer: StageTimer) -> Iterator[StageTimer]:
+    """Time STAGE_HOOKS for the duration of the block, then restore them"""
+    import importlib
+
+    originals: List[Tuple[Any, str, Any]] = []
+    try:
+        for module_name, attribute_path, stage in STAGE_HOOKS:
+            owner = importlib.import_module(module_name)
+            *parents, attribute = attribute_path.split('.')
+            for parent in parents:
+                owner = getattr(owner, parent)
+            original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+            originals.append((owner, attribute, original))
+            setattr(owner, attribute, timer.wrap(stage, original))
+        yield timer
+    finally:
+        for owner, attribute, original in reversed(originals):
+            setattr(owner, attribute, original)
+
+
+# ---------------------------------------------------------------------------
+# Parser adapters
+# ---------------------------------------------------------------------------
+
+def _us_to_iso(value: Optional[str]) -> Optional[str]:
+    match = re.match(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})', value or '')
+    if not match:
+        return value
+    month, day, year = match.groups()
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+def _predict_dd214_parser(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'name': result.get('name'),
+        'branch': result.get('branch'),
+        'pay_grade': result.get('grade_rank'),
+        'mos': result.get('mos'),
+        'entry_date': result.get('date_entered'),
+        'separation_date': result.get('date_separated'),
+        'character_of_service': result.get('character_of_service'),
+        'separation_code': result.get('separation_code'),
+        'reentry_code': result.get('reentry_code'),
+        'narrative_reason': result.get('narrative_reason'),
+        'decorations': result.get('decorations'),
+    }
+
+
+def _predict_dd214_scanner(result: Dict[str, Any]) -> Dict[str, Any]:
+    awards = [award.strip() for line in result.get('awards') or [] for award in line.split(',')]
+    return {
+        'branch': result.get('branch'),
+        'pay_grade': result.get('pay_grade'),
+        'mos': result.get('mos_code'),
+        'entry_date': _us_to_iso(result.get('entry_date')),
+        'separation_date': _us_to_iso(result.get('separation_date')),
+        'character_of_service': result.get('character_of_service'),
+        'separation_code': result.get('separation_code'),
+        'narrative_reason': result.get('narrative_reason'),
+        'decorations': awards,
+    }
+
+
+def _predict_str_parser(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'encounter_dates': [event.get('date') for event in result.get('timeline', [])],
+        'diagnoses': [diagnosis.get('diagnosis') for diagnosis in result.get('diagnoses', [])],
+        'medications': result.get('medications'),
+    }
+
+
+def _predict_rating_decision(result: Dict[str, Any]) -> Dict[str, Any]:
+    conditions = result.get('conditions', [])
+    combined = result.get('combined_rating')
+    return {
+        'conditions': [condition['condition'] for condition in conditions],
+        'ratings': [
+            f"{condition['condition']}: {condition['percentage']}%"
+            for condition in conditions if condition.get('percentage') is not None
+        ],
+        'diagnostic_codes': result.get('diagnostic_codes'),
+        'effective_date': (result.get('effective_dates') or [None])[0],
+        'combined_rating': None if combined is None else str(combined),
+    }
+
+
+async def _run_parser(parser, path: str) -> Dict[str, Any]:
+    return await parser.parse_file(path)
+
+
+async def _run_scanner(scanner, path: str) -> Dict[str, Any]:
+    try:
+        result = await scanner.scan_dd214(path)
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    return {'success': True, **result}
+
+
+@dataclass
+class ParserBenchmark:
+    """How to construct, run and score one parser"""
+    name: str
+    doc_type: str
+    factory: Callable[[], Any]
+    run: Callable[[Any, str], Any]
+    predict: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ocr_only: bool = False  # Never reads a PDF text layer
+
+
+def default_benchmarks() -> List[ParserBenchmark]:
+    from app.services.dd214_ocr_scanner import DD214OCRScanner
+    from app.services.parsers.dd214_parser import DD214Parser
+    from app.services.parsers.rating_decision_parser import RatingDecisionParser
+    from app.services.parsers.str_parser import STRParser
+
+    return [
+        ParserBenchmark('DD214Parser', 'dd214', DD214Parser, _run_parser, _predict_dd214_parser),
+        ParserBenchmark('DD214OCRScanner', 'dd214', DD214OCRScanner, _run_scanner, _predict_dd214_scanner, ocr_only=True),
+        ParserBenchmark('STRParser', 'str', STRParser, _run_parser, _predict_str_parser),
+        ParserBenchmark('RatingDecisionParser', 'rating_decision', RatingDecisionParser, _run_parser, _predict_rating_decision),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+def peak_rss_mb() -> Optional[float]:
+    """Process peak resident set size so far, if the platform reports it"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def ocr_unavailable_reason() -> Optional[str]:
+    """Why OCR variants cannot run here, or None if they can"""
+    from app.utils.ocr_capabilities import get_ocr_capabilities
+
+    capabilities = get_ocr_capabilities()
+    if not capabilities.tesseract_available:
+        return 'Tesseract not available'
+    if not capabilities.poppler_available:
+        return 'Poppler not available'
+    return None
+
+
+@contextmanager
+def benchmark_pipeline() -> Iterator[None]:
+    """In-process, uncached OCR so every stage is timed and measured fresh (restored afterwards)"""
+    from app.config import settings
+    from app.services.ocr_cache import get_ocr_cache
+    from app.services.ocr_worker_pool import shutdown_ocr_worker_pool
+
+    cache = get_ocr_cache()
+    saved = settings.ocr_worker_pool_size, cache.enabled
+    settings.ocr_worker_pool_size = 1
+    cache.enabled = False
+    shutdown_ocr_worker_pool()
+    try:
+        yield
+    finally:
+        settings.ocr_worker_pool_size, cache.enabled = saved
+        shutdown_ocr_worker_pool()
+
+
+def run_benchmark(benchmark: ParserBenchmark, documents: List[SyntheticDocument]) -> Dict[str, Any]:
+    """Run one parser over documents of a single variant and summarize"""
+    parser = benchmark.factory()
+    timer = StageTimer()
+    scores: Dict[str, FieldScore] = {}
+    document_ms: List[float] = []
+    failures = []
+    scored_fields = set(benchmark.predict({}))
+
+    async def run_all():
+        for document in documents:
+            extract_before = timer.total('extract')
+            started = time.perf_counter()
+            result = await benchmark.run(parser, str(document.path))
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            document_ms.append(elapsed_ms)
+            timer.record('parse', max(0.0, elapsed_ms - (timer.total('extract') - extract_before)))
+            if not result.get('success'):
+                failures.append({'doc_id': document.doc_id, 'error': str(result.get('error'))})
+
+            predicted = benchmark.predict(result) if result.get('success') else {}
+            for field_name, expected in document.truth.items():
+                if field_name in scored_fields:
+                    scores.setdefault(field_name, FieldScore()).add(score_field(expected, predicted.get(field_name)))
+
+    started = time.perf_counter()
+    with instrument_pipeline(timer):
+        asyncio.run(run_all())
+    seconds = time.perf_counter() - started
+    pages = sum(document.page_count for document in documents)
+
+    return {
+        'parser': benchmark.name,
+        'doc_type': benchmark.doc_type,
+        'variant': documents[0].variant,
+        'documents': len(documents),
+        'pages': pages,
+        'seconds': round(seconds, 3),
+        'pages_per_sec': round(pages / seconds, 3) if seconds > 0 else None,
+        'document_latency': latency_summary(document_ms),
+        'stages': timer.summary(),
+        'peak_rss_mb': peak_rss_mb(),
+        'failures': failures,
+        'fields': {name: score.to_dict() for name, score in sorted(scores.items())},
+    }
+
+
+def run_benchmarks(
+    corpus: List[SyntheticDocument],
+    benchmarks: Optional[List[ParserBenchmark]] = None,
+    corpus_info: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Benchmark every parser on every variant of its document type"""
+    benchmarks = benchmarks if benchmarks is not None else default_benchmarks()
+    ocr_skip_reason = ocr_unavailable_reason()
+    runs = []
+
+    with benchmark_pipeline():
+        for benchmark in benchmarks:
+            variants = sorted({document.variant for document in corpus if document.doc_type == benchmark.doc_type})
+            for variant in variants:
+                documents = [d for d in corpus if d.doc_type == benchmark.doc_type and d.variant == variant]
+                needs_ocr = benchmark.ocr_only or variant != 'digital'
+                if needs_ocr and ocr_skip_reason:
+                    runs.append({
+                        'parser': benchmark.name,
+                        'doc_type': benchmark.doc_type,
+                        'variant': variant,
+                        'skipped': ocr_skip_reason,
+                    })
+                    continue
+                runs.append(run_benchmark(benchmark, documents))
+
+    return {
+        'schema': RESULTS_SCHEMA,
+        'created_at': datetime.utcnow().isoformat(),
+        'environment': environment_info(),
+        'corpus': corpus_info or {},
+        'runs': runs,
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    from app.services.ocr_router import get_ocr_router
+    from app.utils.ocr_capabilities import get_ocr_capabilities
+
+    diagnostics = get_ocr_capabilities().snapshot()
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'tesseract': diagnostics.tesseract_version,
+        'poppler': diagnostics.pdftoppm_version,
+        'ocr_backends': [backend.name for backend in get_ocr_router().available_backends()],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def _run_key(run: Dict[str, Any]) -> Tuple[str, str, str]:
+    return run['parser'], run['doc_type'], run['variant']
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    max_throughput_drop: float = MAX_THROUGHPUT_DROP,
+    max_accuracy_drop: float = MAX_ACCURACY_DROP
+) -> List[str]:
+    """
+    Regressions of current against baseline.
+
+    A run regresses when pages/sec falls by more than max_throughput_drop
+    (a fraction), or any field's precision or recall falls by more than
+    max_accuracy_drop (absolute). Runs skipped on either side are ignored.
+    """
+    baseline_runs = {_run_key(run): run for run in baseline.get('runs', []) if 'skipped' not in run}
+    regressions = []
+
+    for run in current.get('runs', []):
+        before = baseline_runs.get(_run_key(run))
+        if before is None or 'skipped' in run:
+            continue
+        label = '/'.join(_run_key(run))
+
+        old_rate, new_rate = before.get('pages_per_sec'), run.get('pages_per_sec')
+        if old_rate and new_rate is not None and new_rate < old_rate * (1 - max_throughput_drop):
+            regressions.append(f"{label}: pages/sec {old_rate} -> {new_rate}")
+
+        for field_name, old_score in before.get('fields', {}).items():
+            new_score = run.get('fields', {}).get(field_name, {})
+            for metric in ('precision', 'recall'):
+                old_value, new_value = old_score.get(metric), new_score.get(metric)
+                if old_value is None:
+                    continue
+                if new_value is None or new_value < old_value - max_accuracy_drop:
+                    regressions.append(f"{label}: {field_name} {metric} {old_value} -> {new_value}")
+
+    return regressions
+
+
+def format_summary(results: Dict[str, Any]) -> str:
+    """Human-readable table of a results document"""
+    lines = [f"{'parser':<22}{'type':<17}{'variant':<9}{'pages/s':>9}{'p95 ms':>9}{'RSS MB':>8}  fields (P/R)"]
+    for run in results['runs']:
+        prefix = f"{run['parser']:<22}{run['doc_type']:<17}{run['variant']:<9}"
+        if 'skipped' in run:
+            lines.append(f"{prefix}skipped: {run['skipped']}")
+            continue
+        fields = ', '.join(
+            f"{name} {score['precision'] if score['precision'] is not None else '-'}/{score['recall']}"
+            for name, score in run['fields'].items()
+        )
+        lines.append(
+            f"{prefix}{run['pages_per_sec'] or 0:>9.2f}{run['document_latency']['p95_ms']:>9.0f}"
+            f"{run['peak_rss_mb'] or 0:>8.0f}  {fields}"
+        )
+    return '\n'.join(lines)
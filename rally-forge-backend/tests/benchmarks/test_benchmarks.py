@@ -0,0 +1,102 @@
+"""
+Tests for the synthetic corpus and the benchmark harness
+
+The digital variant needs no OCR engine, so it runs end to end here; the
+scan and photo variants are benchmarked only where Tesseract is installed.
+"""
+
+import random
+import re
+import time
+
+import PyPDF2
+
+from app.services.parsers.str_parser import TEXT_FIELDS, STRParser
+from tests.benchmarks.corpus import build_corpus, combined_rating, str_pages
+from tests.benchmarks.harness import FieldScore, compare_results, run_benchmarks, score_field
+
+# Timing noise allowed before the field scanner counts as a regression
+MAX_SCAN_SLOWDOWN = 0.25
+
+
+def test_corpus_is_deterministic_and_renders_its_ground_truth(tmp_path):
+    first = build_corpus(tmp_path / 'a', seed=7, documents_per_type=1, variants=['digital'])
+    second = build_corpus(tmp_path / 'b', seed=7, documents_per_type=1, variants=['digital', 'scan'])
+
+    assert [doc.truth for doc in first] == [doc.truth for doc in second if doc.variant == 'digital']
+
+    dd214 = next(doc for doc in first if doc.doc_type == 'dd214')
+    with open(dd214.path, 'rb') as file:
+        text = '\n'.join(page.extract_text() for page in PyPDF2.PdfReader(file).pages)
+    assert dd214.truth['name'] in text
+    assert dd214.page_count == 2
+
+
+def test_combined_rating_uses_whole_person_math():
+    assert combined_rating([50, 30]) == 70  # 65 rounds up
+    assert combined_rating([10, 10]) == 20  # 19 rounds up
+    assert combined_rating([40, 20, 10]) == 60  # 56.8
+
+
+def test_field_scoring():
+    assert score_field('2008-05-21', '2008-05-21') == FieldScore(true_positives=1)
+    assert score_field('E-4', 'e4') == FieldScore(true_positives=1)
+    assert score_field('E-4', 'E-5') == FieldScore(false_positives=1, false_negatives=1)
+    assert score_field('E-4', None) == FieldScore(false_negatives=1)
+    assert score_field(['Tinnitus', 'Asthma'], ['tinnitus', 'Migraine']) == FieldScore(1, 1, 1)
+
+
+def test_compare_flags_throughput_and_accuracy_regressions():
+    def results(rate, recall):
+        return {'runs': [{
+            'parser': 'STRParser', 'doc_type': 'str', 'variant': 'digital',
+            'pages_per_sec': rate, 'fields': {'diagnoses': {'precision': 1.0, 'recall': recall}}
+        }]}
+
+    assert compare_results(results(100, 1.0), results(95, 0.99)) == []
+    assert compare_results(results(100, 1.0), results(80, 0.9)) == [
+        'STRParser/str/digital: pages/sec 100 -> 80',
+        'STRParser/str/digital: diagnoses recall 1.0 -> 0.9',
+    ]
+
+
+def test_digital_corpus_benchmark_end_to_end(tmp_path):
+    corpus = build_corpus(tmp_path, documents_per_type=1, str_pages_per_document=2, variants=['digital'])
+
+    results = run_benchmarks(corpus)
+    runs = {(run['parser'], run['variant']): run for run in results['runs']}
+
+    dd214 = runs[('DD214Parser', 'digital')]
+    assert dd214['pages'] == 2
+    assert dd214['pages_per_sec'] > 0
+    assert 'extract' in dd214['stages'] and 'parse' in dd214['stages']
+    assert all(score['recall'] == 1.0 for score in dd214['fields'].values())
+
+    assert runs[('STRParser', 'digital')]['fields']['encounter_dates']['recall'] == 1.0
+    assert 'RatingDecisionParser' in {parser for parser, _ in runs}
+
+
+def _best_of(runs, fn):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_field_scan_is_no_slower_than_separate_regex_calls():
+    pages, _ = str_pages(random.Random(15), 200)
+    text = '\n\n'.join('\n'.join(lines) for lines in pages) * 5
+    scanner = STRParser().scanner
+    baseline = [re.compile(STRParser().patterns[name], re.IGNORECASE) for name in TEXT_FIELDS]
+
+    def separate_calls():
+        return [list(pattern.finditer(text)) for pattern in baseline]
+
+    scan_seconds = _best_of(3, lambda: scanner.scan(text))
+    baseline_seconds = _best_of(3, separate_calls)
+
+    assert scan_seconds <= baseline_seconds * (1 + MAX_SCAN_SLOWDOWN), (
+        f"field scan {scan_seconds:.3f}s vs separate re.finditer {baseline_seconds:.3f}s"
+    )
@@ -0,0 +1,80 @@
+"""
+Tests for adaptive-resolution page OCR
+"""
+
+from PIL import Image, ImageDraw
+
+from app.services import adaptive_ocr
+from app.services.adaptive_ocr import ocr_pdf_page_adaptive, resolve_dpi_tiers
+from app.services.ocr_layout import BoundingBox, OCRBlock, OCRLine, OCRPageLayout, OCRWord
+
+
+def _layout(page_number, confidences):
+    words = [OCRWord(text='WORD', confidence=conf, bbox=BoundingBox(0, 0, 10, 10)) for conf in confidences]
+    blocks = [OCRBlock(lines=[OCRLine(words=words)])] if words else []
+    return OCRPageLayout(page_number=page_number, width=100, height=100, blocks=blocks)
+
+
+def _inked_image():
+    image = Image.new('L', (100, 100), 255)
+    ImageDraw.Draw(image).rectangle([10, 10, 60, 40], fill=0)
+    return image
+
+
+def _patch(monkeypatch, confidence_by_dpi, image_factory=_inked_image):
+    rendered = []
+
+    def fake_render(file_path, page_number, dpi):
+        rendered.append(dpi)
+        image = image_factory()
+        image.info['dpi_under_test'] = dpi
+        return image
+
+    def fake_ocr(image, config='', lang=None, page_number=1, preprocessing_steps=None, allow_remote=False):
+        return _layout(page_number, confidence_by_dpi[image.info['dpi_under_test']])
+
+    monkeypatch.setattr(adaptive_ocr, 'render_pdf_page', fake_render)
+    monkeypatch.setattr(adaptive_ocr, 'ocr_page_layout', fake_ocr)
+    return rendered
+
+
+def test_tiers_are_capped_at_max_dpi():
+    assert resolve_dpi_tiers(300, [150, 300]) == [150, 300]
+    assert resolve_dpi_tiers(200, [150, 300]) == [150, 200]
+    assert resolve_dpi_tiers(120, [150, 300]) == [120]
+    assert resolve_dpi_tiers(300, []) == [300]
+
+
+def test_confident_page_stays_at_low_dpi(monkeypatch):
+    rendered = _patch(monkeypatch, {150: [95, 92], 300: [96, 96]})
+
+    layout = ocr_pdf_page_adaptive('doc.pdf', 1, 300, tiers=[150, 300], min_confidence=80)
+
+    assert rendered == [150]
+    assert layout.dpi == 150
+
+
+def test_low_confidence_page_escalates(monkeypatch):
+    rendered = _patch(monkeypatch, {150: [40, 55], 300: [90, 88]})
+
+    layout = ocr_pdf_page_adaptive('doc.pdf', 2, 300, tiers=[150, 300], min_confidence=80)
+
+    assert rendered == [150, 300]
+    assert layout.dpi == 300
+    assert layout.page_number == 2
+
+
+def test_keeps_best_layout_when_escalation_does_not_help(monkeypatch):
+    _patch(monkeypatch, {150: [70], 300: [60]})
+
+    layout = ocr_pdf_page_adaptive('doc.pdf', 1, 300, tiers=[150, 300], min_confidence=80)
+
+    assert layout.dpi == 150
+
+
+def test_blank_page_is_not_escalated(monkeypatch):
+    rendered = _patch(monkeypatch, {150: [], 300: []}, image_factory=lambda: Image.new('L', (100, 100), 255))
+
+    ocr_pdf_page_adaptive('doc.pdf', 1, 300, tiers=[150, 300], min_confidence=80)
+
+    assert rendered == [150]
@@ -0,0 +1,56 @@
+"""
+Tests for indexed condition matching in rating decisions
+"""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from app.services.condition_matching import ConditionIndex, conditions_match
+from app.services.parsers.rating_decision_parser import RatingDecisionParser
+
+# Structured conditions produced by the pairwise matcher, before indexing
+REGRESSION_CASES = json.loads((Path(__file__).parent / 'data' / 'condition_matching.json').read_text())['cases']
+
+
+def _pairwise_match(cond1, cond2):
+    """The original all-pairs rule, as the reference"""
+    cond1_lower = cond1.lower().strip()
+    cond2_lower = cond2.lower().strip()
+    if cond1_lower == cond2_lower or cond1_lower in cond2_lower or cond2_lower in cond1_lower:
+        return True
+    words1 = set(cond1_lower.split())
+    words2 = set(cond2_lower.split())
+    return len(words1 & words2) >= 0.6 * min(len(words1), len(words2))
+
+
+@pytest.mark.parametrize('case', REGRESSION_CASES, ids=[f"case-{index}" for index in range(len(REGRESSION_CASES))])
+def test_structured_conditions_unchanged(case):
+    structured = RatingDecisionParser()._match_conditions_with_details(
+        case['conditions'], case['ratings'], [], case['effective_dates'], case['bilateral_conditions']
+    )
+    assert structured == case['expected']
+
+
+def test_index_matches_all_pairs():
+    words = ['left', 'right', 'knee', 'kneecap', 'strain', 'ptsd', 'ptsd,', 'hearing', 'loss', 'tinnitus', 'of', 'the']
+    rng = random.Random(19)
+
+    def name():
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(0, 4))) or rng.choice(['', ' ', 'nee', 'ee pa'])
+
+    for _ in range(30):
+        names = [name() for _ in range(rng.randint(0, 15))]
+        queries = [name() for _ in range(rng.randint(1, 15))]
+
+        expected = [[i for i, indexed in enumerate(names) if _pairwise_match(query, indexed)] for query in queries]
+        assert ConditionIndex(names).match_all(queries) == expected
+
+
+def test_conditions_match():
+    assert conditions_match('Post-Traumatic Stress Disorder', '  post-traumatic stress disorder ')
+    assert conditions_match('Knee', 'Left kneecap instability')
+    assert conditions_match('Lumbar strain with arthritis', 'Arthritis, lumbar strain')
+    assert not conditions_match('Right knee strain', 'Left ankle sprain')
@@ -0,0 +1,136 @@
+"""
+Tests for template-driven DD-214 region OCR
+
+The synthetic page paints every block's value area (and the anchor text) a
+distinct gray level; the fake OCR reads the level back, so registration and
+region mapping are exercised for real without Tesseract.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+import app.services.dd214_template as dd214_template
+from app.routers.dd214 import extract_rank_info, extract_service_dates
+from app.services.dd214_template import (
+    DD214_ANCHORS,
+    DD214_FIELDS,
+    normalize_field,
+    ocr_dd214_template,
+    split_primary_specialty,
+)
+from app.services.ocr_layout import BoundingBox, OCRBlock, OCRLine, OCRPageLayout, OCRWord
+
+SCALE = 2.0
+OFFSET = (30, 20)
+
+ANCHOR_LEVELS = {5: 'CERTIFICATE OF RELEASE OR DISCHARGE', 8: 'DD FORM 214, AUG 2009'}
+
+FIELD_VALUES = {
+    'branch': 'ARMY/RA',
+    'grade_rank': 'SGT',
+    'pay_grade': 'E04',
+    'primary_specialty': '11B10 INFANTRYMAN -- 4 YRS 1 MOS',
+    'date_entered': '2005 01 15',
+    'separation_date': '2009 03 02',
+    'net_active_service': '0004 01 18',
+    'decorations': 'ARMY COMMENDATION MEDAL // NATIONAL DEFENSE SERVICE MEDAL',
+    'character_of_service': 'HONORABLE',
+    'separation_code': 'MBK',
+    'narrative_reason': 'COMPLETION OF REQUIRED ACTIVE SERVICE',
+}
+
+FIELD_LEVELS = {name: 20 + 10 * index for index, name in enumerate(FIELD_VALUES)}
+LEVEL_TEXT = {level: FIELD_VALUES[name] for name, level in FIELD_LEVELS.items()}
+
+
+def _to_pixels(x, y):
+    return OFFSET[0] + SCALE * x, OFFSET[1] + SCALE * y
+
+
+def _synthetic_dd214():
+    image = Image.new('L', (1300, int(792 * SCALE) + 40), 255)
+    draw = ImageDraw.Draw(image)
+
+    for template_field in DD214_FIELDS:
+        if template_field.name in FIELD_LEVELS:
+            left, top, right, bottom = template_field.region
+            draw.rectangle(
+                [*_to_pixels(left, top), *_to_pixels(right, bottom)],
+                fill=FIELD_LEVELS[template_field.name]
+            )
+
+    for anchor, level in zip(DD214_ANCHORS, ANCHOR_LEVELS):
+        x, y = _to_pixels(*anchor.position)
+        draw.rectangle([x, y, x + 40, y + 10], fill=level)
+
+    return image
+
+
+def _layout(text, box):
+    words = [OCRWord(text=word, confidence=91.0, bbox=box) for word in text.split()]
+    return OCRPageLayout(page_number=1, width=box.width, height=box.height,
+                         blocks=[OCRBlock(lines=[OCRLine(words=words)])] if words else [])
+
+
+def fake_ocr_page_layout(image, config='', **kwargs):
+    pixels = np.asarray(image.convert('L'))
+
+    for level, text in ANCHOR_LEVELS.items():
+        ys, xs = np.nonzero(pixels == level)
+        if len(xs):
+            return _layout(text, BoundingBox(int(xs.min()), int(ys.min()), 40, 10))
+
+    center = int(pixels[pixels.shape[0] // 2, pixels.shape[1] // 2])
+    return _layout(LEVEL_TEXT.get(center, ''), BoundingBox(0, 0, image.width, image.height))
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    monkeypatch.setattr(dd214_template, 'ocr_page_layout', fake_ocr_page_layout)
+
+
+def test_template_registers_form_and_reads_blocks(fake_ocr):
+    result = ocr_dd214_template(_synthetic_dd214(), preprocessing_steps=[])
+
+    assert result is not None
+    assert result.registration.anchors_found == ['title', 'footer']
+    assert result.registration.scale == pytest.approx(SCALE, abs=0.01)
+    assert result.registration.offset_x == pytest.approx(OFFSET[0], abs=2)
+    assert result.registration.offset_y == pytest.approx(OFFSET[1], abs=2)
+
+    fields = result.fields
+    assert fields['pay_grade'] == 'E-4'
+    assert fields['grade_rank'] == 'SGT'
+    assert fields['date_entered'] == '2005-01-15'
+    assert fields['separation_date'] == '2009-03-02'
+    assert fields['net_active_service'] == {'years': 4, 'months': 1, 'days': 18}
+    assert fields['decorations'] == ['ARMY COMMENDATION MEDAL', 'NATIONAL DEFENSE SERVICE MEDAL']
+    assert fields['separation_code'] == 'MBK'
+    assert fields['reentry_code'] is None
+
+    # Only the known blocks (and the anchor strips) were OCR'd
+    assert result.ocr_area_ratio < 0.6
+
+
+def test_unregistered_page_falls_back(fake_ocr):
+    blank = Image.new('L', (1224, 1584), 255)
+    assert ocr_dd214_template(blank, preprocessing_steps=[]) is None
+
+
+def test_labelled_text_feeds_keyword_extractors(fake_ocr):
+    text = ocr_dd214_template(_synthetic_dd214(), preprocessing_steps=[]).to_text()
+
+    assert '4b PAY GRADE: E-4' in text
+    assert extract_rank_info(text)['payGrade'] == 'E-4'
+    assert extract_service_dates(text) == {'entry': '2005-01-15', 'separation': '2009-03-02'}
+
+
+def test_field_normalization():
+    assert normalize_field('pay_grade', 'O 3') == 'O-3'
+    assert normalize_field('date_entered', '2005 13 01') is None
+    assert normalize_field('sea_service', '0000 00 00') == {'years': 0, 'months': 0, 'days': 0}
+    assert normalize_field('decorations', 'NATO MEDAL //\nARMY GOOD CONDUCT\nMEDAL') == [
+        'NATO MEDAL', 'ARMY GOOD CONDUCT MEDAL'
+    ]
+    assert split_primary_specialty('11B10 INFANTRYMAN -- 4 YRS 1 MOS') == ('11B10', 'INFANTRYMAN')
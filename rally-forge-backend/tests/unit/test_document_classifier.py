@@ -0,0 +1,89 @@
+"""
+Tests for the first-page document classifier
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.services.document_classifier import classify_document, classify_document_sync, classify_text
+from app.services.parsers.dd214_parser import DD214Parser
+from tests.benchmarks.corpus import dd214_pages, rating_decision_pages, str_pages, write_text_pdf
+
+
+@pytest.fixture
+def documents(tmp_path):
+    rng = random.Random(22)
+    paths = {}
+    for index, (document_type, (pages, _)) in enumerate([
+        ('dd214', dd214_pages(rng)),
+        ('str', str_pages(rng, 30)),
+        ('rating', rating_decision_pages(rng)),
+    ]):
+        # File names that say nothing about the type
+        paths[document_type] = tmp_path / f"scan_{index:04d}.pdf"
+        write_text_pdf(paths[document_type], pages)
+    return paths
+
+
+def test_text_layer_documents(documents):
+    for document_type, path in documents.items():
+        classification = classify_document_sync(path)
+        assert (classification.document_type, classification.source) == (document_type, 'text_layer')
+        assert classification.confidence > 0.5
+
+    # Uploaded bytes, before the file is saved anywhere
+    classification = asyncio.run(classify_document(documents['str'].read_bytes(), 'upload.pdf'))
+    assert classification.document_type == 'str'
+
+
+def test_weak_or_ambiguous_text_is_unclassified():
+    assert classify_text("Effective date of the lease: 03/05/2010").document_type is None
+    assert classify_text("Rating decision attached to DD Form 214 copy").document_type is None
+    # A file name alone is only a hint
+    assert classify_text("", filename="DD214.pdf").document_type is None
+    assert classify_text("Certificate of Release", filename="DD214.pdf").document_type is None
+    assert classify_text("DD 214 member copy", filename="DD214.pdf").document_type == 'dd214'
+
+
+def test_unreadable_document_is_unclassified(tmp_path):
+    broken = tmp_path / 'broken.pdf'
+    broken.write_bytes(b'%PDF-1.4 truncated')
+
+    classification = classify_document_sync(broken)
+    assert (classification.document_type, classification.source) == (None, 'none')
+
+
+class NoOCREngine:
+    async def extract_text(self, file_path, page_tracker=None):
+        raise AssertionError("full extraction must not run")
+
+
+def test_dd214_parser_rejects_other_documents_from_page_one(documents):
+    parser = DD214Parser()
+    parser.ocr_engine = NoOCREngine()
+
+    result = asyncio.run(parser.parse_file(str(documents['str'])))
+
+    assert not result['success']
+    assert 'Service Treatment Record' in result['error']
+
+
+def test_dd214_parser_uses_the_callers_classification(documents, monkeypatch):
+    from app.services.parsers import dd214_parser
+
+    async def no_classification(*args, **kwargs):
+        raise AssertionError("page one must not be classified again")
+
+    monkeypatch.setattr(dd214_parser, 'classify_document', no_classification)
+    parser = DD214Parser()
+    parser.ocr_engine = NoOCREngine()
+
+    classification = classify_document_sync(documents['rating'])
+    result = asyncio.run(parser.parse_file(str(documents['rating']), classification=classification))
+    assert 'VA rating decision' in result['error']
+
+    # A caller that chose DD-214 explicitly skips the check
+    result = asyncio.run(parser.parse_file(str(documents['rating']), check_document_type=False))
+    assert 'full extraction must not run' in result['error']
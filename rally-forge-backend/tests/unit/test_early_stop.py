@@ -0,0 +1,154 @@
+"""
+Tests for page-incremental early stop of multi-copy DD-214 scans
+"""
+
+import asyncio
+import random
+
+from PIL import Image
+
+from app.config import settings
+from app.services import ocr_extraction
+from app.services.early_stop import RequiredFieldTracker, starts_dd214_copy
+from app.services.ocr_cache import OCRResultCache
+from app.services.ocr_extraction import OCRExtractionEngine
+from app.services.ocr_layout import OCRPageLayout
+from app.services.ocr_worker_pool import OCRWorkerPool
+from app.services.page_dedup import page_signature
+from app.services.parsers.dd214_parser import DD214Parser
+from tests.benchmarks.corpus import dd214_pages
+
+FORM, CONTINUATION = ('\n'.join(lines) for lines in dd214_pages(random.Random(23))[0])
+
+
+def _fake_layout(page_number, text, confidence):
+    rows = {'level': [], 'block_num': [], 'par_num': [], 'line_num': [], 'text': [],
+            'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+    for line_number, line in enumerate(text.split('\n'), 1):
+        for i, word in enumerate(line.split()):
+            for key, value in zip(rows, [5, 1, 1, line_number, word, confidence, i * 10, line_number * 10, 10, 10]):
+                rows[key].append(value)
+    return OCRPageLayout.from_tesseract_data(rows, page_number=page_number)
+
+
+def _scanned_pdf(monkeypatch, tmp_path, pages):
+    """Engine over an image-only PDF whose pages OCR to (text, confidence)"""
+    ocr_calls = []
+
+    def fake_ocr_pdf_page(task):
+        _, page_number, _, _ = task
+        ocr_calls.append(page_number)
+        return _fake_layout(page_number, *pages[page_number - 1])
+
+    engine = OCRExtractionEngine()
+    monkeypatch.setattr(engine, '_read_pdf_pages', lambda file_path, page_range=None: ([''] * len(pages), [(612.0, 792.0)] * len(pages)))
+    monkeypatch.setattr(ocr_extraction, 'ocr_pdf_page', fake_ocr_pdf_page)
+    monkeypatch.setattr(ocr_extraction, 'get_ocr_worker_pool', lambda: OCRWorkerPool(max_workers=1))
+    monkeypatch.setattr(ocr_extraction, 'get_ocr_cache', lambda: OCRResultCache(tmp_path / 'cache', max_bytes=1024 * 1024))
+
+    pdf_path = tmp_path / 'dd214.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 placeholder')
+    parser = DD214Parser()
+    parser.ocr_engine = engine
+    return parser, pdf_path, ocr_calls
+
+
+def _fields(text):
+    return dict(word.split('=') for word in text.split() if '=' in word)
+
+
+def test_tracker_needs_every_field_from_confident_pages():
+    tracker = RequiredFieldTracker(_fields, ['a', 'b'], min_confidence=0.8, starts_copy=lambda text: 'copy' in text)
+
+    assert not tracker.add_page(1, 'copy a=1', 0.9)
+    assert tracker.missing == ['b']
+    # Too unsure to count
+    assert not tracker.add_page(2, 'copy b=2', 0.5)
+    assert not tracker.add_page(3, 'copy a=1 b=2', 0.9)
+    assert not tracker.missing
+    # Complete, but a continuation of the copy just read
+    assert not tracker.add_page(4, 'remarks', 0.9)
+    # Stops at the next copy, once it is read and agrees
+    assert tracker.add_page(5, 'copy a=1 b=2', 0.9)
+
+
+def test_tracker_keeps_going_on_conflict():
+    tracker = RequiredFieldTracker(lambda text: {'a': text}, ['a'], min_confidence=0.8, starts_copy=lambda text: True)
+
+    assert not tracker.add_page(1, 'Honorable', 0.9)
+    assert not tracker.add_page(2, 'General', 0.9)
+    assert tracker.conflicting == ['a']
+    assert not tracker.add_page(3, 'honorable ', 0.9)
+
+
+def test_dd214_copies_and_continuation_sheets():
+    assert starts_dd214_copy(FORM)
+    assert starts_dd214_copy("DD FORM 214\nMEMBER - 4")
+    assert not starts_dd214_copy(CONTINUATION)
+    assert not starts_dd214_copy("CERTIFICATE OF RELEASE OR DISCHARGE\nDD 214C Block 18 continued")
+
+
+def test_parser_stops_after_first_complete_copy(monkeypatch, tmp_path):
+    parser, pdf_path, ocr_calls = _scanned_pdf(monkeypatch, tmp_path, [(FORM, 92.0)] * 3 + [(CONTINUATION, 92.0)])
+
+    result = asyncio.run(parser.parse_file(str(pdf_path)))
+
+    assert result['success']
+    # Page 2 is read to tell another copy from a continuation sheet
+    assert ocr_calls == [1, 2]
+    assert result['character_of_service'] and result['date_entered'] and result['branch']
+    # Page stats, not word layouts
+    assert [page['page_number'] for page in result['ocr_pages']] == [1, 2]
+    assert 'blocks' not in result['ocr_pages'][0]
+
+
+def test_parser_reads_past_unsure_copies(monkeypatch, tmp_path):
+    parser, pdf_path, ocr_calls = _scanned_pdf(monkeypatch, tmp_path, [(FORM, 40.0)] + [(FORM, 92.0)] * 3)
+
+    assert asyncio.run(parser.parse_file(str(pdf_path)))['success']
+    assert ocr_calls == [1, 2, 3]
+
+
+def test_parser_reads_continuation_sheets(monkeypatch, tmp_path):
+    parser, pdf_path, ocr_calls = _scanned_pdf(monkeypatch, tmp_path, [(FORM, 92.0), (CONTINUATION, 92.0)] * 2)
+
+    result = asyncio.run(parser.parse_file(str(pdf_path)))
+
+    assert result['success']
+    assert ocr_calls == [1, 2, 3]
+    assert result['deployment_history']
+
+
+def test_duplicate_check_signs_only_pages_reached(monkeypatch, tmp_path):
+    signed = []
+
+    def fake_signature(task):
+        signed.append(task[1])
+        return page_signature(Image.new('L', (40, 40), color=task[1] * 40), task[1])
+
+    parser, pdf_path, ocr_calls = _scanned_pdf(monkeypatch, tmp_path, [(FORM, 92.0)] * 5)
+    monkeypatch.setattr(ocr_extraction, 'pdf_page_signature', fake_signature)
+
+    assert asyncio.run(parser.parse_file(str(pdf_path)))['success']
+    assert signed == ocr_calls == [1, 2]
+
+
+def test_parser_reads_every_page_while_copies_conflict(monkeypatch, tmp_path):
+    # A confident but incomplete first copy with a different entry date
+    entry_line = next(line for line in FORM.split('\n') if 'Date Entered' in line)
+    first_copy = '\n'.join(
+        line for line in FORM.replace(entry_line, '12a. Date Entered: 01/02/1990').split('\n')
+        if 'Character of Service' not in line
+    )
+    parser, pdf_path, ocr_calls = _scanned_pdf(monkeypatch, tmp_path, [(first_copy, 92.0)] + [(FORM, 92.0)] * 3)
+
+    assert asyncio.run(parser.parse_file(str(pdf_path)))['success']
+    assert ocr_calls == [1, 2, 3, 4]
+
+
+def test_early_stop_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, 'dd214_early_stop_enabled', False)
+    parser, pdf_path, ocr_calls = _scanned_pdf(monkeypatch, tmp_path, [(FORM, 92.0)] * 3)
+
+    assert asyncio.run(parser.parse_file(str(pdf_path)))['success']
+    assert ocr_calls == [1, 2, 3]
@@ -0,0 +1,105 @@
+"""
+Tests for the compiled field scanner and the parsers built on it
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from app.services.dd214_ocr_scanner import DD214OCRScanner
+from app.services.field_extraction import FieldScanner, compile_field_scanner
+from app.services.ocr_extraction import ExtractionMethod
+from app.services.ocr_layout import join_page_texts
+from app.services.parsers.dd214_parser import DD214Parser
+from app.services.parsers.rating_decision_parser import RatingDecisionParser
+from app.services.parsers.str_parser import STRParser
+
+# Outputs of every parser on fixed texts, captured before the parsers moved to the scanner
+PARITY_CASES = json.loads((Path(__file__).parent / 'data' / 'parser_parity.json').read_text())['cases']
+
+# Lists built from a set(), so their order depends on string hashing
+UNORDERED_FIELDS = {'DD214OCRScanner': ['awards'], 'RatingDecisionParser': ['conditions']}
+
+
+def _extraction(pages):
+    text, offsets = join_page_texts(pages)
+    return {
+        'success': True,
+        'text': text,
+        'page_offsets': offsets,
+        'confidence': 0.9,
+        'method': ExtractionMethod.PDF_TEXT,
+        'character_count': len(text),
+        'error': None
+    }
+
+
+class FakeEngine:
+    def __init__(self, pages):
+        self.pages = pages
+
+    async def extract_text(self, file_path, page_tracker=None):
+        return _extraction(self.pages)
+
+
+def _run_parser(name, pages):
+    if name == 'DD214Parser':
+        parser = DD214Parser()
+        parser.ocr_engine = FakeEngine(pages)
+        return asyncio.run(parser.parse_file('x.pdf'))
+    if name == 'DD214OCRScanner':
+        return DD214OCRScanner()._parse_dd214_text('\n\n'.join(pages))
+    if name == 'STRParser':
+        return STRParser()._parse_text(_extraction(pages))
+    return RatingDecisionParser()._parse_text(_extraction(pages))
+
+
+def _normalized(name, result):
+    result = json.loads(json.dumps(result, default=str))
+    for field in UNORDERED_FIELDS.get(name, []):
+        result[field] = sorted(result[field], key=lambda value: json.dumps(value, sort_keys=True))
+    return result
+
+
+@pytest.mark.parametrize('case', PARITY_CASES, ids=[f"{case['parser']}-{index}" for index, case in enumerate(PARITY_CASES)])
+def test_parser_output_unchanged(case):
+    result = _run_parser(case['parser'], case['pages'])
+    assert _normalized(case['parser'], result) == _normalized(case['parser'], case['expected'])
+
+
+def test_scan_matches_separate_regex_calls():
+    patterns = {
+        'date': r'\d{1,2}/\d{1,2}/\d{4}',
+        'year': (r'\b(\d{4})\b', 0),
+        'grade': r'([EOW])-?(\d)',
+        'pain': r'(\w+)\s+pain',
+        'back': r'back',
+        'word': r'[a-z]{3,}',
+    }
+    text = "Seen 03/05/2010 for back pain. E-4 reports Back Pain and knee pain since 2009; W2 o-3 e5."
+    scanner = FieldScanner(patterns)
+    matches = scanner.scan(text)
+
+    for name, spec in patterns.items():
+        pattern, flags = spec if isinstance(spec, tuple) else (spec, re.IGNORECASE)
+        expected = list(re.finditer(pattern, text, flags))
+        assert [(m.span(), m.groups()) for m in matches.all(name)] == [(m.span(), m.groups()) for m in expected]
+        assert matches.findall(name) == re.findall(pattern, text, flags)
+        first = re.search(pattern, text, flags)
+        assert (matches.first(name).span() if first else None) == (first.span() if first else None)
+
+
+def test_first_only_fields_keep_leftmost_match():
+    scanner = FieldScanner({'code': r'code[:\s]+(\w+)', 'grade': r'grade[:\s]+(\w+)'}, first_only=['code', 'grade'])
+    matches = scanner.scan("grade: E4 code: RE1 grade: E5 code: RE3")
+
+    assert matches.findall('code') == ['RE1']
+    assert matches.first('grade').group(1) == 'E4'
+
+
+def test_compiled_scanner_is_shared():
+    patterns = {'a': r'alpha', 'b': r'beta'}
+    assert compile_field_scanner(patterns) is compile_field_scanner(dict(patterns))
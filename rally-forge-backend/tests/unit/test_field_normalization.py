@@ -0,0 +1,101 @@
+"""
+Tests for the shared field normalizers
+"""
+
+import pytest
+
+from app.services.field_normalization import (
+    in_rating_schedule,
+    normalize_date,
+    normalize_diagnostic_code,
+    normalize_form_date,
+    normalize_grade_rank,
+    normalize_pay_grade,
+    normalize_rank,
+)
+from app.services.parsers.dd214_parser import DD214Parser
+from app.services.parsers.str_parser import STRParser
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('03/05/2010', '2010-03-05'),
+    ('3-5-2010', '2010-03-05'),
+    ('Effective Date: 7/22/11', '2011-07-22'),
+    ('09/24/95', '1995-09-24'),
+    ('2010-03-05', '2010-03-05'),
+    ('2010/3/5', '2010-03-05'),
+    ('15 MAR 2005', '2005-03-15'),
+    ('15-Mar-2005', '2005-03-15'),
+    ('September 24, 1995', '1995-09-24'),
+    ('Sept. 4 1995', '1995-09-04'),
+    ('13/45/2010', None),
+    ('02/30/2010', None),
+    ('31 Feb 2010', None),
+    ('04/31/2010', None),
+    ('02/29/2012', '2012-02-29'),
+    ('02/29/2010', None),
+    ('no date here', None),
+    ('', None),
+    (None, None),
+])
+def test_normalize_date(value, expected):
+    assert normalize_date(value) == expected
+
+
+def test_parsers_keep_unparseable_dates():
+    assert DD214Parser()._normalize_date('unknown') == 'unknown'
+    assert DD214Parser()._normalize_date(None) is None
+    assert STRParser()._normalize_date('06/31/2009') == '06/31/2009'
+    assert STRParser()._normalize_date('00/12/2009') == '00/12/2009'
+
+
+def test_normalize_form_date():
+    assert normalize_form_date('2005 01 15') == '2005-01-15'
+    assert normalize_form_date('2005 13 01') is None
+    assert normalize_form_date('05 01 15') is None
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('E04', 'E-4'),
+    ('e 4', 'E-4'),
+    ('O-10', 'O-10'),
+    ('W5', 'W-5'),
+    ('W-6', None),
+    ('E-10', None),
+    ('CW2', None),
+    ('PO2', None),
+    ('SGT', None),
+])
+def test_normalize_pay_grade(value, expected):
+    assert normalize_pay_grade(value) == expected
+
+
+def test_normalize_rank():
+    assert normalize_rank('SSG') == 'Staff Sergeant'
+    assert normalize_rank('Capt.') == 'Captain'
+    assert normalize_rank('lt col') == 'Lieutenant Colonel'
+    assert normalize_rank('  petty   officer ') == 'Petty Officer'
+    assert normalize_rank('') is None
+
+    assert normalize_grade_rank('E-05') == 'E-5'
+    assert normalize_grade_rank('CW2') == 'Chief Warrant Officer 2'
+    assert normalize_grade_rank('PO2') == 'Petty Officer Second Class'
+
+
+def test_normalize_diagnostic_code():
+    assert normalize_diagnostic_code('DC 5260') == '5260'
+    assert normalize_diagnostic_code('5010 - 5260') == '5010-5260'
+    assert normalize_diagnostic_code('12') is None
+    assert normalize_diagnostic_code('52601') is None
+    assert in_rating_schedule('9411') and in_rating_schedule('5010-5260')
+    assert not in_rating_schedule('2021')
+
+
+def test_repeated_values_are_memoized():
+    normalize_date.cache_clear()
+    for _ in range(100):
+        normalize_date('03/05/2010')
+
+    info = normalize_date.cache_info()
+    assert (info.misses, info.hits) == (1, 99)
+    assert info.maxsize is not None
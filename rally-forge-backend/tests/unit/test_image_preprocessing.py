@@ -0,0 +1,67 @@
+"""
+Tests for the OpenCV preprocessing stage ahead of Tesseract
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from app.services.image_preprocessing import (
+    PIPELINE_ORDER,
+    crop_borders,
+    detect_skew,
+    preprocess_image,
+)
+
+
+def _text_page(skew_degrees=0.0, border=False):
+    """White page with dark 'text lines', optionally rotated and with a scanner edge"""
+    image = Image.new('L', (800, 1000), 235)
+    draw = ImageDraw.Draw(image)
+    for y in range(100, 900, 30):
+        draw.rectangle([100, y, 700, y + 10], fill=20)
+
+    image = image.rotate(skew_degrees, fillcolor=235)
+    if border:
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, 0, 24, 999], fill=0)
+        draw.rectangle([0, 975, 799, 999], fill=0)
+    return image
+
+
+def test_detects_and_corrects_skew():
+    skewed = np.asarray(_text_page(skew_degrees=3))
+    assert abs(abs(detect_skew(skewed)) - 3) < 0.2
+
+    result = preprocess_image(_text_page(skew_degrees=3), ['deskew'])
+
+    assert result.skew_angle is not None and abs(result.skew_angle) > 2.5
+    assert abs(detect_skew(np.asarray(result.image))) < 0.5
+
+
+def test_crop_removes_scanner_border_and_margins():
+    pixels = np.asarray(_text_page(border=True))
+    cropped = crop_borders(pixels)
+
+    assert cropped.shape[0] < pixels.shape[0] and cropped.shape[1] < pixels.shape[1]
+    # No dark band survives along the edges
+    assert (cropped[:, :5] > 128).all() and (cropped[-5:, :] > 128).all()
+
+
+def test_full_pipeline_is_timed_and_binary():
+    result = preprocess_image(_text_page(skew_degrees=2, border=True), PIPELINE_ORDER)
+
+    assert result.steps_applied == PIPELINE_ORDER
+    assert set(result.timings_ms) == set(PIPELINE_ORDER)
+    assert set(np.unique(np.asarray(result.image))) <= {0, 255}
+    assert result.image.size[0] * result.image.size[1] < 800 * 1000
+
+
+def test_steps_are_toggleable():
+    page = _text_page(skew_degrees=2)
+
+    assert preprocess_image(page, []).image is page
+
+    result = preprocess_image(page, ['binarize'])
+    assert result.steps_applied == ['grayscale', 'binarize']
+    assert result.skew_angle is None
+    assert result.image.size == page.size
@@ -0,0 +1,89 @@
+"""
+Tests for the indexed, evicting scanner job store
+"""
+
+import asyncio
+
+from app.services.job_store import JobStore
+from app.services.scanner_orchestrator import JobStatus, ScannerJob, ScannerOrchestrator, ScannerType
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _job(job_id, veteran_id='vet-1'):
+    return ScannerJob(job_id, ScannerType.DD214, f'/tmp/{job_id}.pdf', veteran_id=veteran_id)
+
+
+def test_indexes_follow_status_changes():
+    store = JobStore(ttl_seconds=0, max_finished=0)
+    first, second = _job('a'), _job('b', veteran_id='vet-2')
+    store.put(first)
+    store.put(second)
+
+    first.status = JobStatus.RUNNING
+    assert [job.job_id for job in store.by_status(JobStatus.RUNNING)] == ['a']
+    assert [job.job_id for job in store.by_status(JobStatus.PENDING)] == ['b']
+    assert [job.job_id for job in store.by_veteran('vet-2')] == ['b']
+
+    first.status = JobStatus.COMPLETED
+    assert store.count(JobStatus.RUNNING) == 0
+    assert store.count(JobStatus.COMPLETED) == 1
+
+    store.remove('a')
+    first.status = JobStatus.FAILED
+    assert store.count(JobStatus.FAILED) == 0 and store.by_veteran('vet-1') == []
+
+
+def test_finished_jobs_are_evicted_by_age_and_count():
+    clock = FakeClock()
+    store = JobStore(ttl_seconds=60, max_finished=2, clock=clock)
+    jobs = [_job(str(index)) for index in range(4)]
+    for job in jobs:
+        store.put(job)
+
+    for job in jobs[:3]:
+        job.status = JobStatus.COMPLETED
+        clock.now += 1
+    # Oldest finished job goes once more than two are held; unfinished jobs stay
+    assert '0' not in store and {'1', '2', '3'} <= set(job.job_id for job in store.values())
+
+    clock.now += 60
+    assert store.get('1') is None and store.get('2') is None
+    assert store.get('3') is jobs[3]
+
+    # A retried job is unfinished again and not evicted
+    jobs[3].status = JobStatus.FAILED
+    jobs[3].status = JobStatus.RETRY
+    clock.now += 120
+    assert store.get('3') is jobs[3]
+
+
+def test_evicted_results_reload_from_disk(tmp_path, monkeypatch):
+    orchestrator = ScannerOrchestrator(base_data_dir=str(tmp_path / 'Data'))
+    orchestrator.jobs.max_finished = 1
+
+    async def parse(file_path):
+        return {'success': True, 'branch': 'Navy'}
+
+    monkeypatch.setattr(orchestrator, '_execute_dd214_scanner', parse)
+    for job_id in ('first', 'second'):
+        path = tmp_path / f'{job_id}.pdf'
+        path.write_bytes(b'%PDF dd214')
+        job = ScannerJob(job_id, ScannerType.DD214, str(path), veteran_id='vet-1')
+        orchestrator.jobs[job_id] = job
+        asyncio.run(orchestrator._execute_job(job))
+
+    assert 'first' not in orchestrator.jobs
+    assert [status['job_id'] for status in orchestrator.list_jobs(veteran_id='vet-1')] == ['second']
+
+    result = orchestrator.get_job_result('first')
+    assert result['status'] == 'ready'
+    assert result['result'] == {'success': True, 'branch': 'Navy'}
+    assert orchestrator.get_job_status('first')['veteran_id'] == 'vet-1'
+    assert orchestrator.get_job_status('missing') is None
@@ -0,0 +1,85 @@
+"""
+Tests for the single-pass keyword automaton
+"""
+
+import random
+import re
+
+import pytest
+
+from app.services.keyword_automaton import KeywordAutomaton, KeywordHit
+from app.services.parsers.str_parser import COMMON_CONDITIONS, STRParser
+
+VOCABULARY = {
+    'Iraq': ['iraq', 'operation iraqi freedom', 'oif'],
+    'Kuwait': ['kuwait', 'operation desert storm'],
+    'Gulf War': ['persian gulf', 'operation desert storm', 'desert storm'],
+    'Combat': ['combat', 'combat action ribbon', 'car', 'hf/id'],
+}
+
+
+def _reference_hits(vocabulary, text, whole_words):
+    """Every keyword occurrence found with one regex per keyword"""
+    hits = []
+    for label, keywords in vocabulary.items():
+        for keyword in keywords:
+            body = re.escape(keyword.lower())
+            pattern = rf'(?<!\w)(?=({body})(?!\w))' if whole_words else f'(?=({body}))'
+            for match in re.finditer(pattern, text.lower()):
+                hits.append(KeywordHit(keyword, label, match.start(1), match.end(1)))
+    return sorted(hits, key=lambda hit: (hit.start, hit.end, hit.label, hit.keyword))
+
+
+@pytest.mark.parametrize('whole_words', [True, False])
+def test_find_all_matches_per_keyword_search(whole_words):
+    automaton = KeywordAutomaton(VOCABULARY, whole_words=whole_words)
+    words = ['Operation', 'Desert', 'Storm', 'IRAQ', 'Iraqi', 'Freedom', 'career', 'car', 'HF/ID',
+             'combat', 'action', 'ribbon', 'persian', 'gulf', 'scar', 'oif,', 'Kuwait.', '\n']
+    rng = random.Random(16)
+
+    for _ in range(50):
+        text = ' '.join(rng.choice(words) for _ in range(40))
+        hits = sorted(automaton.find_all(text), key=lambda hit: (hit.start, hit.end, hit.label, hit.keyword))
+        assert hits == _reference_hits(VOCABULARY, text, whole_words)
+
+
+def test_whole_words_and_nested_keywords():
+    automaton = KeywordAutomaton(VOCABULARY)
+    text = "Served in Operation Desert Storm; career notes: Combat Action Ribbon"
+
+    hits = {(hit.keyword, text[hit.start:hit.end]) for hit in automaton.find_all(text)}
+    assert hits == {
+        ('operation desert storm', 'Operation Desert Storm'),
+        ('desert storm', 'Desert Storm'),
+        ('combat', 'Combat'),
+        ('combat action ribbon', 'Combat Action Ribbon'),
+    }
+    # Vocabulary order, not text order
+    assert automaton.matched_labels(text) == ['Kuwait', 'Gulf War', 'Combat']
+    assert automaton.first_label("car wash") == 'Combat'
+    assert not automaton.contains_any("career scarf oifs")
+
+
+def test_offsets_survive_length_changing_lowercase():
+    automaton = KeywordAutomaton(['kuwait'])
+    text = "İstanbul then KUWAIT"
+
+    [hit] = automaton.find_all(text)
+    assert text[hit.start:hit.end] == 'KUWAIT'
+
+
+def test_condition_categories_keep_substring_matching():
+    parser = STRParser()
+
+    assert parser._categorize_condition('Bilateral osteoarthritis of knees') == 'musculoskeletal'
+    assert parser._categorize_condition('Recurrent headaches') == 'neurological'
+    assert parser._categorize_condition('Fractured wrist') == 'other'
+    for category, keywords in COMMON_CONDITIONS.items():
+        assert parser._categorize_condition(f"history of {keywords[-1].upper()}") == category
+
+
+def test_mos_specialties_keep_substring_matching():
+    from app.routers.dd214 import extract_mos_code
+
+    mos = extract_mos_code("MOS: 19K Armored Crewman, Combat Engineering", "Army")
+    assert mos["specialties"] == ['Combat', 'Engineer', 'Armor']
@@ -0,0 +1,132 @@
+"""
+Tests for OCR engine backends and warm engine reuse
+"""
+
+import threading
+from enum import IntEnum
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import app.services.ocr_backends as ocr_backends
+from app.services.ocr_backends import (
+    TesserocrBackend,
+    WarmEnginePool,
+    parse_tesseract_config,
+    parse_tsv,
+)
+
+TSV = (
+    "1\t1\t0\t0\t0\t0\t0\t0\t200\t40\t-1\t\n"
+    "5\t1\t1\t1\t1\t1\t10\t5\t30\t12\t96.5\tPAY\n"
+    "5\t1\t1\t1\t1\t2\t45\t5\t40\t12\t91.0\tGRADE\n"
+    "5\t1\t2\t1\t1\t1\t10\t25\t30\t12\t88.0\tE-4\n"
+)
+
+
+class FakeAPI:
+    instances = 0
+
+    def __init__(self, lang, oem):
+        FakeAPI.instances += 1
+        self.lang, self.oem = lang, oem
+        self.variables = {'tessedit_char_whitelist': ''}
+        self.seen_variables = None
+
+    def GetVariableAsString(self, name):
+        return self.variables.get(name)
+
+    def SetVariable(self, name, value):
+        self.variables[name] = value
+
+    def SetPageSegMode(self, psm):
+        self.psm = psm
+
+    def SetImage(self, image):
+        self.image = image
+
+    def Recognize(self):
+        self.seen_variables = dict(self.variables)
+
+    def GetTSVText(self, page_index):
+        return TSV
+
+    def Clear(self):
+        self.image = None
+
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeAPI.instances = 0
+    module = SimpleNamespace(
+        PyTessBaseAPI=FakeAPI,
+        OEM=IntEnum('OEM', 'TESSERACT_ONLY LSTM_ONLY TESSERACT_LSTM_COMBINED DEFAULT', start=0),
+        PSM=IntEnum('PSM', 'OSD_ONLY AUTO_OSD AUTO_ONLY AUTO SINGLE_COLUMN SINGLE_BLOCK_VERT_TEXT '
+                           'SINGLE_BLOCK SINGLE_LINE', start=0),
+        tesseract_version=lambda: 'tesseract 5.3.0\n leptonica-1.82.0',
+    )
+    monkeypatch.setattr(ocr_backends, 'tesserocr', module, raising=False)
+    monkeypatch.setattr(ocr_backends, 'TESSEROCR_AVAILABLE', True)
+    return module
+
+
+def test_parse_tesseract_config():
+    assert parse_tesseract_config('--oem 1 --psm 7 -c tessedit_char_whitelist=EOW0123456789-') == (
+        7, 1, {'tessedit_char_whitelist': 'EOW0123456789-'}
+    )
+    assert parse_tesseract_config('--dpi 300') == (None, None, {'user_defined_dpi': '300'})
+    assert parse_tesseract_config('') == (None, None, {})
+
+
+def test_tsv_parses_to_same_layout_shape_as_image_to_data():
+    data = parse_tsv(TSV)
+    assert data['text'] == ['', 'PAY', 'GRADE', 'E-4']
+
+    layout = ocr_backends.OCRPageLayout.from_tesseract_data(data, image_size=(200, 40))
+    assert [line.text for line in layout.lines] == ['PAY GRADE', 'E-4']
+    assert layout.mean_confidence == pytest.approx((96.5 + 91.0 + 88.0) / 3)
+
+
+def test_tesserocr_backend_reuses_warm_engines(fake_tesserocr):
+    backend = TesserocrBackend(max_engines=2)
+    image = Image.new('L', (200, 40), 255)
+
+    for _ in range(5):
+        layout = backend.recognize(image, config='--psm 7 -c tessedit_char_whitelist=EOW0123456789-', lang='eng')
+
+    assert layout.text == 'PAY GRADE\n\nE-4'
+    assert FakeAPI.instances == 1  # model loaded once, not per call
+
+    api = backend._pool('eng', 3)._idle[0]
+    assert api.psm == 7
+    assert api.seen_variables['tessedit_char_whitelist'] == 'EOW0123456789-'
+    assert api.variables['tessedit_char_whitelist'] == ''  # restored for the next caller
+
+
+def test_warm_pool_bounds_engines_and_discards_failed_ones():
+    created = []
+    pool = WarmEnginePool(factory=lambda: created.append(object()) or created[-1], max_engines=2)
+    barrier = threading.Barrier(2)
+
+    def hold_engine():
+        with pool.checkout():
+            barrier.wait(timeout=2)
+
+    threads = [threading.Thread(target=hold_engine) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2 and pool.created == 2
+
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            raise RuntimeError('engine failed')
+
+    assert pool.created == 1
+    assert len(pool._idle) == 1
@@ -0,0 +1,72 @@
+"""
+Tests for the content-addressed OCR result cache
+"""
+
+import os
+
+from app.services.ocr_cache import OCRResultCache, hash_file, ocr_fingerprint
+
+
+PAGES = [
+    {'page_number': 1, 'text': 'CERTIFICATE OF RELEASE', 'confidence': 0.91},
+    {'page_number': 2, 'text': 'HONORABLE', 'confidence': 0.88},
+]
+
+
+def test_hash_is_content_addressed(tmp_path):
+    first = tmp_path / 'upload_1.pdf'
+    second = tmp_path / 'dd214_copy.pdf'
+    first.write_bytes(b'%PDF-1.4 same bytes')
+    second.write_bytes(b'%PDF-1.4 same bytes')
+
+    assert hash_file(first) == hash_file(second)
+
+    second.write_bytes(b'%PDF-1.4 other bytes')
+    assert hash_file(first) != hash_file(second)
+
+
+def test_fingerprint_changes_with_options():
+    assert ocr_fingerprint('ocr_extraction', dpi=300) == ocr_fingerprint('ocr_extraction', dpi=300)
+    assert ocr_fingerprint('ocr_extraction', dpi=300) != ocr_fingerprint('ocr_extraction', dpi=200)
+    assert ocr_fingerprint('ocr_extraction', dpi=300) != ocr_fingerprint('dd214_scanner', dpi=300)
+
+
+def test_round_trip_and_miss(tmp_path):
+    cache = OCRResultCache(tmp_path, max_bytes=1024 * 1024)
+
+    assert cache.get('abc123', 'fp') is None
+    cache.put('abc123', 'fp', PAGES)
+
+    assert cache.get('abc123', 'fp') == PAGES
+    assert cache.get('abc123', 'other-fp') is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = OCRResultCache(tmp_path, max_bytes=1024 * 1024, enabled=False)
+    cache.put('abc123', 'fp', PAGES)
+
+    assert cache.get('abc123', 'fp') is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = OCRResultCache(tmp_path, max_bytes=1024 * 1024)
+    cache.put('aa0001', 'fp', PAGES)
+    entry_size = cache.stats()['size_bytes']
+
+    # Room for two entries
+    cache = OCRResultCache(tmp_path, max_bytes=entry_size * 2 + entry_size // 2)
+    cache.put('bb0002', 'fp', PAGES)
+
+    # Age both entries, then read the older one so it becomes most recently used
+    for path in tmp_path.glob('*/*.json'):
+        os.utime(path, (1000, 1000))
+    assert cache.get('aa0001', 'fp') == PAGES
+
+    cache.put('cc0003', 'fp', PAGES)
+
+    assert cache.get('aa0001', 'fp') == PAGES
+    assert cache.get('bb0002', 'fp') is None
+    assert cache.get('cc0003', 'fp') == PAGES
+    assert cache.stats()['size_bytes'] <= cache.max_bytes
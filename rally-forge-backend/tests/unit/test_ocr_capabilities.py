@@ -0,0 +1,81 @@
+"""
+Tests for the cached OCR capability registry
+"""
+
+import threading
+
+from app.utils.ocr_capabilities import OCRCapabilityRegistry
+from app.utils.ocr_diagnostics import OCRDependencyManager, OCRDiagnosticResult
+
+
+def _diagnostics(poppler=True, tesseract=True):
+    return OCRDiagnosticResult(
+        poppler_detected=poppler,
+        pdfinfo_available=poppler,
+        pdftoppm_available=poppler,
+        pdfinfo_version='pdfinfo version 24.02.0' if poppler else None,
+        pdftoppm_version='pdftoppm version 24.02.0' if poppler else None,
+        tesseract_detected=tesseract,
+        tesseract_version='5.3.4' if tesseract else None,
+        google_vision_available=False,
+        errors=[] if poppler else ['pdfinfo not available: pdfinfo not found in PATH'],
+        warnings=[],
+        recommendations=[],
+        ready_for_pdf_ocr=poppler
+    )
+
+
+class CountingProbe:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+        self.probed = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.probed.set()
+        return self.results[min(self.calls, len(self.results)) - 1]
+
+
+def test_snapshot_probes_once_and_is_served_from_memory():
+    probe = CountingProbe(_diagnostics())
+    registry = OCRCapabilityRegistry(probe)
+
+    for _ in range(5):
+        assert registry.tesseract_available
+        assert registry.poppler_available
+
+    assert probe.calls == 1
+    assert registry.checked_at is not None
+
+
+def test_background_refresh_picks_up_changes():
+    probe = CountingProbe(_diagnostics(poppler=False), _diagnostics(poppler=True))
+    registry = OCRCapabilityRegistry(probe, refresh_interval=0.01)
+
+    registry.start()
+    assert probe.calls >= 1
+    probe.probed.clear()
+    assert probe.probed.wait(timeout=2)
+    registry.stop()
+
+    assert registry.poppler_available
+    assert registry._thread is None
+
+
+def test_pdf_validity_is_checked_in_process(tmp_path, monkeypatch):
+    import subprocess
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError('verify_pdf_for_processing must not spawn processes')
+
+    monkeypatch.setattr(subprocess, 'run', no_subprocess)
+    manager = OCRDependencyManager()
+
+    broken = tmp_path / 'broken.pdf'
+    broken.write_bytes(b'not a pdf at all')
+
+    can_process, message = manager.verify_pdf_for_processing(str(broken))
+
+    assert not can_process
+    assert 'Could not parse PDF' in message
@@ -0,0 +1,74 @@
+"""
+Tests for running blocking OCR jobs off the event loop
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.ocr_executor import (
+    OCRJobCancelled,
+    OCRJobTimeout,
+    current_cancel_token,
+    raise_if_cancelled,
+    run_ocr_job,
+)
+
+
+def test_job_runs_off_the_event_loop():
+    loop_thread = threading.get_ident()
+
+    def blocking_job(value):
+        time.sleep(0.2)
+        return value, threading.get_ident()
+
+    async def main():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        result = await run_ocr_job(blocking_job, 'done', timeout=5)
+        beat.cancel()
+        return result, ticks
+
+    (value, job_thread), ticks = asyncio.run(main())
+
+    assert value == 'done'
+    assert job_thread != loop_thread
+    assert ticks > 5  # the loop kept serving other work while OCR ran
+
+
+def test_timeout_cancels_job_between_pages():
+    pages_done = []
+    stopped = threading.Event()
+
+    def page_loop():
+        try:
+            for page in range(100):
+                raise_if_cancelled()
+                time.sleep(0.02)
+                pages_done.append(page)
+        except OCRJobCancelled:
+            stopped.set()
+            raise
+
+    async def main():
+        with pytest.raises(OCRJobTimeout):
+            await run_ocr_job(page_loop, timeout=0.1)
+
+    asyncio.run(main())
+
+    assert stopped.wait(2)
+    assert len(pages_done) < 100
+
+
+def test_cancel_check_is_noop_outside_a_job():
+    assert current_cancel_token() is None
+    raise_if_cancelled()
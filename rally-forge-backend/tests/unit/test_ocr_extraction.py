@@ -0,0 +1,83 @@
+"""
+Tests for per-page hybrid PDF extraction in OCRExtractionEngine
+"""
+
+import asyncio
+
+from app.services import ocr_extraction
+from app.services.ocr_cache import OCRResultCache
+from app.services.ocr_extraction import ExtractionMethod, DocumentType, OCRExtractionEngine
+from app.services.ocr_layout import OCRPageLayout
+from app.services.ocr_worker_pool import OCRWorkerPool
+
+
+TYPED_PAGE = "Cover letter for my disability claim. " * 5
+SCANNED_TEXT = {
+    2: "CERTIFICATE OF RELEASE OR DISCHARGE FROM ACTIVE DUTY " * 3,
+    3: "SERVICE TREATMENT RECORD - CHRONOLOGICAL RECORD OF MEDICAL CARE " * 3,
+}
+
+
+def _fake_layout(page_number, text):
+    rows = {'level': [], 'block_num': [], 'par_num': [], 'line_num': [], 'text': [],
+            'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+    for i, word in enumerate(text.split()):
+        for key, value in zip(rows, [5, 1, 1, 1, word, 80.0, i * 10, 0, 10, 10]):
+            rows[key].append(value)
+    return OCRPageLayout.from_tesseract_data(rows, page_number=page_number)
+
+
+def _patch_engine(monkeypatch, tmp_path, page_texts):
+    ocr_calls = []
+
+    def fake_ocr_pdf_page(task):
+        _, page_number, _, _ = task
+        ocr_calls.append(page_number)
+        return _fake_layout(page_number, SCANNED_TEXT[page_number])
+
+    engine = OCRExtractionEngine()
+    monkeypatch.setattr(engine, '_read_pdf_pages', lambda file_path, page_range=None: (page_texts, [(612.0, 792.0)] * len(page_texts)))
+    monkeypatch.setattr(ocr_extraction, 'ocr_pdf_page', fake_ocr_pdf_page)
+    monkeypatch.setattr(ocr_extraction, 'get_ocr_worker_pool', lambda: OCRWorkerPool(max_workers=1))
+    monkeypatch.setattr(ocr_extraction, 'get_ocr_cache', lambda: OCRResultCache(tmp_path / 'cache', max_bytes=1024 * 1024))
+
+    pdf_path = tmp_path / 'mixed.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 placeholder')
+    return engine, pdf_path, ocr_calls
+
+
+def test_mixed_pdf_only_ocrs_image_pages(monkeypatch, tmp_path):
+    engine, pdf_path, ocr_calls = _patch_engine(monkeypatch, tmp_path, [TYPED_PAGE, '', '  \n'])
+
+    result = asyncio.run(engine.extract_text(str(pdf_path)))
+
+    assert result['success']
+    assert ocr_calls == [2, 3]
+    assert result['method'] == ExtractionMethod.HYBRID
+    assert result['document_type'] == DocumentType.PDF_IMAGE
+    assert result['page_methods'] == [
+        ExtractionMethod.PDF_TEXT,
+        ExtractionMethod.OCR_TESSERACT,
+        ExtractionMethod.OCR_TESSERACT,
+    ]
+    assert [layout.page_number for layout in result['pages']] == [2, 3]
+    assert result['text'].startswith(TYPED_PAGE)
+    assert result['text'][result['page_offsets'][2]:].startswith('SERVICE TREATMENT RECORD')
+
+
+def test_text_pdf_skips_ocr_and_cache_hit_skips_parse(monkeypatch, tmp_path):
+    engine, pdf_path, ocr_calls = _patch_engine(monkeypatch, tmp_path, [TYPED_PAGE, TYPED_PAGE])
+
+    first = asyncio.run(engine.extract_text(str(pdf_path)))
+    assert ocr_calls == []
+    assert first['method'] == ExtractionMethod.PDF_TEXT
+    assert first['document_type'] == DocumentType.PDF_TEXT
+
+    def fail_read(file_path):
+        raise AssertionError('PDF parsed again despite cache hit')
+
+    monkeypatch.setattr(engine, '_read_pdf_pages', fail_read)
+    second = asyncio.run(engine.extract_text(str(pdf_path)))
+
+    assert second['text'] == first['text']
+    assert second['page_methods'] == first['page_methods']
@@ -0,0 +1,70 @@
+"""
+Tests for the single-pass OCR page layout model
+"""
+
+from app.services.ocr_layout import (
+    BoundingBox,
+    OCRPageLayout,
+    join_page_texts,
+    page_number_at,
+)
+
+
+def _tesseract_rows(rows):
+    """Build an image_to_data DICT from (level, block, par, line, text, conf, left, top) rows"""
+    keys = ['level', 'block_num', 'par_num', 'line_num', 'text', 'conf', 'left', 'top', 'width', 'height']
+    data = {key: [] for key in keys}
+    for level, block, par, line, text, conf, left, top in rows:
+        for key, value in zip(keys, [level, block, par, line, text, conf, left, top, 40, 10]):
+            data[key].append(value)
+    return data
+
+
+SAMPLE = _tesseract_rows([
+    (1, 0, 0, 0, '', -1, 0, 0),
+    (2, 1, 0, 0, '', -1, 0, 0),
+    (5, 1, 1, 1, 'CERTIFICATE', 96.0, 10, 10),
+    (5, 1, 1, 1, 'OF', 90.0, 60, 10),
+    (5, 1, 1, 1, 'RELEASE', 94.0, 110, 10),
+    (5, 1, 1, 2, 'DD', 80.0, 10, 30),
+    (5, 1, 1, 2, '214', 80.0, 60, 30),
+    (5, 2, 1, 1, 'HONORABLE', 70.0, 10, 200),
+    (5, 2, 1, 1, ' ', 0.0, 60, 200),
+])
+
+
+def test_layout_derives_text_and_confidence_from_one_pass():
+    layout = OCRPageLayout.from_tesseract_data(SAMPLE, page_number=2, image_size=(850, 1100))
+
+    assert layout.page_number == 2
+    assert layout.text == "CERTIFICATE OF RELEASE\nDD 214\n\nHONORABLE"
+    assert len(layout.words) == 6
+    assert round(layout.mean_confidence, 2) == round((96 + 90 + 94 + 80 + 80 + 70) / 6, 2)
+
+
+def test_layout_positional_queries():
+    layout = OCRPageLayout.from_tesseract_data(SAMPLE)
+
+    assert [line.text for line in layout.lines_matching(r'dd\s*214')] == ['DD 214']
+    assert layout.lines[0].bbox == BoundingBox(left=10, top=10, width=140, height=10)
+
+    bottom = layout.words_in_region(BoundingBox(left=0, top=150, width=850, height=200))
+    assert [word.text for word in bottom] == ['HONORABLE']
+
+
+def test_summary_has_page_stats_only():
+    layout = OCRPageLayout.from_tesseract_data(SAMPLE, page_number=2, image_size=(850, 1100))
+
+    assert layout.summary() == {
+        'page_number': 2, 'width': 850, 'height': 1100, 'dpi': None,
+        'confidence': round(layout.mean_confidence / 100, 4), 'lines': 3, 'words': 6
+    }
+
+
+def test_page_offsets_map_back_to_pages():
+    text, offsets = join_page_texts(['first page', '', 'third page'])
+
+    assert text == 'first page\n\nthird page'
+    assert page_number_at(offsets, 0) == 1
+    assert page_number_at(offsets, text.index('third')) == 3
+    assert page_number_at(None, 5) is None
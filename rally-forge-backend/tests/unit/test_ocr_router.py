@@ -0,0 +1,88 @@
+"""
+Tests for the OCR backend registry and cost-aware routing
+"""
+
+from PIL import Image
+
+from app.services.ocr_backends import OCRBackend
+from app.services.ocr_layout import BoundingBox, OCRBlock, OCRLine, OCRPageLayout, OCRWord
+from app.services.ocr_router import OCRRouter
+
+
+class FakeBackend(OCRBackend):
+    def __init__(self, name, fixed_cost_ms, cost_ms_per_megapixel, capacity=1, confidence=90.0, remote=False, installed=True):
+        self.name = name
+        self.fixed_cost_ms = fixed_cost_ms
+        self.cost_ms_per_megapixel = cost_ms_per_megapixel
+        self.remote = remote
+        self._capacity = capacity
+        self.confidence = confidence
+        self.installed = installed
+        self.calls = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def available(self):
+        return self.installed
+
+    def recognize(self, image, config='', lang=None, page_number=1):
+        self.calls += 1
+        word = OCRWord(text=self.name, confidence=self.confidence, bbox=BoundingBox(0, 0, 10, 10))
+        return OCRPageLayout(page_number=page_number, width=image.width, height=image.height,
+                             blocks=[OCRBlock(lines=[OCRLine(words=[word])])])
+
+
+def _router(*backends, escalation_confidence=60.0, preferred='auto'):
+    router = OCRRouter(preferred_backend=preferred, escalation_confidence=escalation_confidence)
+    for backend in backends:
+        router.register(backend)
+    return router
+
+
+def test_small_pages_route_to_warm_engines_and_busy_engines_spill_over():
+    spawn = FakeBackend('pytesseract', fixed_cost_ms=150, cost_ms_per_megapixel=400, capacity=8)
+    warm = FakeBackend('tesserocr', fixed_cost_ms=5, cost_ms_per_megapixel=400, capacity=2)
+    router = _router(spawn, warm)
+
+    assert router.choose(megapixels=0.1) is warm
+
+    # Both warm engines busy with six callers already waiting: spawning is now cheaper
+    router._stats['tesserocr'].in_flight = 8
+    assert router.choose(megapixels=0.1) is spawn
+
+
+def test_low_confidence_final_attempt_escalates_to_cloud():
+    local = FakeBackend('tesserocr', 5, 400, confidence=40.0)
+    cloud = FakeBackend('google_vision', 600, 50, remote=True, confidence=95.0)
+    router = _router(local, cloud)
+    page = Image.new('L', (300, 300), 255)
+
+    assert router.recognize(page).text == 'tesserocr'  # not a final attempt: stays local
+    assert cloud.calls == 0
+
+    assert router.recognize(page, allow_remote=True).text == 'google_vision'
+    assert router.stats()['tesserocr']['escalations'] == 1
+    assert router.stats()['google_vision']['calls'] == 1
+
+
+def test_confident_pages_never_reach_the_cloud():
+    local = FakeBackend('pytesseract', 150, 400, confidence=92.0)
+    cloud = FakeBackend('google_vision', 600, 50, remote=True)
+    router = _router(local, cloud)
+
+    router.recognize(Image.new('L', (300, 300), 255), allow_remote=True)
+
+    assert cloud.calls == 0
+
+
+def test_pinned_backend_and_unavailable_backends():
+    spawn = FakeBackend('pytesseract', 150, 400)
+    warm = FakeBackend('tesserocr', 5, 400, installed=False)
+    router = _router(spawn, warm, preferred='tesserocr')
+
+    # Pinned backend not installed: route among what is
+    assert router.local_candidates() == [spawn]
+    assert router.choose(megapixels=0.1) is spawn
+    assert not router.has_backend('tesserocr')
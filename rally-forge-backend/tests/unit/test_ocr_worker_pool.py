@@ -0,0 +1,51 @@
+"""
+Tests for the page-parallel OCR worker pool
+"""
+
+import os
+
+from app.services.ocr_worker_pool import OCRWorkerPool, resolve_pool_size
+
+
+def _square(value):
+    return value * value
+
+
+def _omp_thread_limit(_):
+    return os.environ.get('OMP_THREAD_LIMIT')
+
+
+def test_resolve_pool_size_defaults_to_cpu_count():
+    assert resolve_pool_size(0, web_workers=1) == max(1, os.cpu_count() or 1)
+    assert resolve_pool_size(3) == 3
+
+
+def test_default_pool_size_is_shared_between_web_workers(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 16)
+
+    assert resolve_pool_size(0, web_workers=4) == 4
+    assert resolve_pool_size(0, web_workers=32) == 1
+    assert resolve_pool_size(3, web_workers=4) == 3
+
+
+def test_map_ordered_preserves_page_order():
+    pool = OCRWorkerPool(max_workers=2)
+    try:
+        assert pool.map_ordered(_square, range(10)) == [n * n for n in range(10)]
+    finally:
+        pool.shutdown()
+
+
+def test_workers_cap_tesseract_threads():
+    pool = OCRWorkerPool(max_workers=2, tesseract_threads=1)
+    try:
+        assert set(pool.map_ordered(_omp_thread_limit, range(4))) == {'1'}
+    finally:
+        pool.shutdown()
+
+
+def test_single_worker_pool_runs_inline():
+    pool = OCRWorkerPool(max_workers=1)
+    assert not pool.enabled
+    assert pool.map_ordered(_square, [2, 3]) == [4, 9]
+    assert pool._executor is None
@@ -0,0 +1,96 @@
+"""
+Tests for duplicate page elimination ahead of OCR
+"""
+
+import asyncio
+import io
+import random
+
+from PIL import Image, ImageEnhance
+
+from app.services import ocr_extraction
+from app.services.ocr_cache import OCRResultCache
+from app.services.ocr_extraction import OCRExtractionEngine
+from app.services.ocr_layout import OCRPageLayout
+from app.services.ocr_worker_pool import OCRWorkerPool
+from app.services.page_dedup import PAGE_SIGNATURE_DPI, find_duplicate_pages, page_signature
+from tests.benchmarks.corpus import SCAN_DPI, degrade_scan, render_page, str_pages
+
+PAGES, _ = str_pages(random.Random(24), 6)
+
+
+def _scan(lines):
+    return degrade_scan(render_page(lines), random.Random(1), skew_degrees=0.5)
+
+
+def _at_signature_dpi(image):
+    scale = PAGE_SIGNATURE_DPI / SCAN_DPI
+    return image.resize((round(image.width * scale), round(image.height * scale)), Image.BOX)
+
+
+def _reencoded(image):
+    buffer = io.BytesIO()
+    ImageEnhance.Brightness(image).enhance(1.03).save(buffer, 'JPEG', quality=50)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+def _signatures(images):
+    return [page_signature(_at_signature_dpi(image), page_number) for page_number, image in enumerate(images, 1)]
+
+
+def test_copies_match_and_other_pages_of_the_form_do_not():
+    original = _scan(PAGES[0])
+    changed_date = list(PAGES[0])
+    changed_date[3] = '01/01/1999' + changed_date[3][10:]
+
+    duplicates = find_duplicate_pages(_signatures([
+        original,
+        _scan(PAGES[1]),
+        original.copy(),
+        _reencoded(original),
+        _scan(changed_date),
+        _reencoded(_scan(PAGES[1])),
+    ]))
+
+    assert duplicates == {3: 1, 4: 1, 6: 2}
+
+
+def _fake_layout(page_number, text):
+    rows = {'level': [], 'block_num': [], 'par_num': [], 'line_num': [], 'text': [],
+            'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+    for i, word in enumerate(text.split()):
+        for key, value in zip(rows, [5, 1, 1, 1, word, 90.0, i * 10, 0, 10, 10]):
+            rows[key].append(value)
+    return OCRPageLayout.from_tesseract_data(rows, page_number=page_number)
+
+
+def test_engine_reuses_text_of_duplicate_pages(monkeypatch, tmp_path):
+    # Page 3 is page 1 inserted again; page 4 is the same form with other content
+    page_lines = [PAGES[0], PAGES[1], PAGES[0], PAGES[2]]
+    images = [_at_signature_dpi(_scan(lines)) for lines in page_lines]
+    ocr_calls = []
+
+    def fake_ocr_pdf_page(task):
+        _, page_number, _, _ = task
+        ocr_calls.append(page_number)
+        return _fake_layout(page_number, ' '.join(page_lines[page_number - 1]))
+
+    engine = OCRExtractionEngine()
+    monkeypatch.setattr(engine, '_read_pdf_pages', lambda file_path, page_range=None: ([''] * 4, [(612.0, 792.0)] * 4))
+    monkeypatch.setattr(ocr_extraction, 'ocr_pdf_page', fake_ocr_pdf_page)
+    monkeypatch.setattr(ocr_extraction, 'pdf_page_signature', lambda task: page_signature(images[task[1] - 1], task[1]))
+    monkeypatch.setattr(ocr_extraction, 'get_ocr_worker_pool', lambda: OCRWorkerPool(max_workers=1))
+    monkeypatch.setattr(ocr_extraction, 'get_ocr_cache', lambda: OCRResultCache(tmp_path / 'cache', max_bytes=1024 * 1024))
+    pdf_path = tmp_path / 'str.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 placeholder')
+
+    result = asyncio.run(engine.extract_text(str(pdf_path)))
+
+    assert result['success']
+    assert ocr_calls == [1, 2, 4]
+    assert result['duplicate_pages'] == [{'page_number': 3, 'duplicate_of': 1}]
+    page_texts = [result['text'][start:end] for start, end in zip(result['page_offsets'], result['page_offsets'][1:])]
+    assert page_texts[2] == page_texts[0]
+
+    # A cache hit reports the same duplicates
+    assert asyncio.run(engine.extract_text(str(pdf_path)))['duplicate_pages'] == result['duplicate_pages']
@@ -0,0 +1,45 @@
+"""
+Tests for bounded-memory PDF render planning
+"""
+
+import PyPDF2
+
+from app.services.pdf_rasterizer import (
+    dpi_within_limit,
+    estimate_page_bytes,
+    plan_pdf_render,
+)
+
+
+def _write_pdf(path, page_sizes):
+    writer = PyPDF2.PdfWriter()
+    for width, height in page_sizes:
+        writer.add_blank_page(width=width, height=height)
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+
+def test_letter_page_at_300_dpi_estimate():
+    # 8.5 x 11 in at 300 DPI, grayscale
+    assert estimate_page_bytes(612, 792, 300) == 2550 * 3300
+
+
+def test_dpi_is_clamped_to_memory_limit():
+    limit = 4 * 1024 * 1024
+    dpi = dpi_within_limit(612, 792, 300, limit)
+
+    assert dpi < 300
+    assert estimate_page_bytes(612, 792, dpi) <= limit
+    assert estimate_page_bytes(612, 792, dpi + 1) > limit
+
+
+def test_plan_keeps_small_pages_and_shrinks_oversized_ones(tmp_path):
+    pdf_path = tmp_path / "mixed.pdf"
+    _write_pdf(pdf_path, [(612, 792), (612 * 4, 792 * 4), (612, 792)])
+
+    plans = plan_pdf_render(pdf_path, dpi=300, memory_limit_mb=16)
+
+    assert [plan.page_number for plan in plans] == [1, 2, 3]
+    assert plans[0].dpi == 300 and plans[2].dpi == 300
+    assert plans[1].dpi < 300
+    assert all(plan.estimated_bytes <= 16 * 1024 * 1024 for plan in plans)
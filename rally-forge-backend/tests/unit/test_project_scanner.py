@@ -0,0 +1,166 @@
+"""
+Tests for the project (bulk document) scanner
+"""
+
+import asyncio
+import threading
+import zipfile
+
+import pytest
+
+from app.services import project_scanner
+from app.services.project_scanner import ProjectScanner, collect_documents, extract_archive
+from app.services.scanner_orchestrator import JobStatus, ScannerJob, ScannerOrchestrator, ScannerType
+
+FILES = {
+    'DD214_member_copy.pdf': b'%PDF dd214',
+    'records/STR_volume_1.pdf': b'%PDF str',
+    'records/STR_volume_2.pdf': b'%PDF str broken',
+    'va/rating_decision_2019.pdf': b'%PDF 2019',
+    'va/rating_decision_2022.pdf': b'%PDF 2022',
+    'va/cover_letter.pdf': b'%PDF letter',
+    'notes.txt': b'not a document',
+    '.hidden/DD214.pdf': b'%PDF hidden',
+}
+
+RESULTS = {
+    'DD214_member_copy.pdf': {
+        'success': True, 'branch': 'Army', 'date_entered': '2004-01-15',
+        'date_separated': '2009-03-02', 'character_of_service': 'Honorable'
+    },
+    'STR_volume_1.pdf': {
+        'success': True, 'diagnoses': [{'diagnosis': 'lumbar strain'}, {'diagnosis': 'tinnitus'}],
+        'chronic_conditions': ['lumbar strain']
+    },
+    'rating_decision_2019.pdf': {
+        'success': True, 'effective_dates': ['2019-03-01'], 'combined_rating': 30,
+        'conditions': [{'condition': 'Tinnitus', 'percentage': 10}, {'condition': 'Lumbar Strain', 'percentage': 20}]
+    },
+    'rating_decision_2022.pdf': {
+        'success': True, 'effective_dates': ['2022-02-25'], 'combined_rating': 50,
+        'conditions': [{'condition': 'lumbar strain', 'percentage': 40}]
+    },
+}
+
+
+def _write_project(root):
+    for name, content in FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def _fake_parsers(calls, running=None):
+    async def parse(file_path):
+        calls.append(file_path)
+        if running is not None:
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+        await asyncio.sleep(0.01)
+        if running is not None:
+            running['now'] -= 1
+
+        name = file_path.replace('\\', '/').rsplit('/', 1)[-1]
+        if name not in RESULTS:
+            raise RuntimeError("OCR failed")
+        return RESULTS[name]
+
+    return {'dd214': parse, 'str': parse, 'rating': parse}
+
+
+def test_project_report(tmp_path):
+    _write_project(tmp_path)
+    calls, progress = [], []
+
+    report = asyncio.run(ProjectScanner(_fake_parsers(calls), concurrency=2).scan(tmp_path, on_progress=progress.append))
+
+    assert [entry['path'].replace('\\', '/') for entry in report['documents']] == [
+        'DD214_member_copy.pdf',
+        'records/STR_volume_1.pdf',
+        'records/STR_volume_2.pdf',
+        'va/rating_decision_2019.pdf',
+        'va/rating_decision_2022.pdf',
+    ]
+    assert [path.replace('\\', '/') for path in report['unclassified']] == ['va/cover_letter.pdf']
+    assert (report['document_count'], report['documents_scanned'], report['documents_failed']) == (5, 4, 1)
+    assert report['documents'][2]['error'] == 'OCR failed'
+
+    assert progress[0] == {'documents_processed': 0, 'document_count': 5, 'documents_failed': 0}
+    assert progress[-1] == {'documents_processed': 5, 'document_count': 5, 'documents_failed': 1}
+    assert [update['documents_processed'] for update in progress] == list(range(6))
+
+    summary = report['summary']
+    assert summary['documents_by_type'] == {'dd214': 1, 'str': 2, 'rating': 2}
+    assert summary['combined_rating'] == 50
+    assert [(c['condition'], c['percentage']) for c in summary['rated_conditions']] == [
+        ('Tinnitus', 10), ('lumbar strain', 40)
+    ]
+    assert summary['str_diagnoses'] == ['lumbar strain', 'tinnitus']
+    assert summary['service_periods'][0]['branch'] == 'Army'
+
+
+def test_concurrency_is_bounded(tmp_path):
+    _write_project(tmp_path)
+    running = {'now': 0, 'peak': 0}
+
+    asyncio.run(ProjectScanner(_fake_parsers([], running), concurrency=2).scan(tmp_path))
+
+    assert running['peak'] == 2
+
+
+def test_zip_archive(tmp_path):
+    archive_path = tmp_path / 'case_file.zip'
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        for name, content in FILES.items():
+            archive.writestr(name, content)
+
+    root, documents = collect_documents(archive_path)
+
+    assert root == (tmp_path / 'case_file_files').resolve()
+    assert len(documents) == 6
+
+
+def test_archive_is_unpacked_off_the_event_loop(tmp_path, monkeypatch):
+    archive_path = tmp_path / 'case_file.zip'
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        for name, content in FILES.items():
+            archive.writestr(name, content)
+    threads = []
+
+    def recording_collect_documents(project_path):
+        threads.append(threading.current_thread().name)
+        return collect_documents(project_path)
+
+    monkeypatch.setattr(project_scanner, 'collect_documents', recording_collect_documents)
+    report = asyncio.run(ProjectScanner(_fake_parsers([])).scan(archive_path))
+
+    assert threads[0].startswith('ocr-job')
+    assert report['document_count'] == 5
+
+
+def test_zip_member_outside_project_is_refused(tmp_path):
+    archive_path = tmp_path / 'evil.zip'
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr('../outside.pdf', b'%PDF')
+
+    with pytest.raises(ValueError):
+        extract_archive(archive_path, tmp_path / 'evil_files')
+    assert not (tmp_path / 'outside.pdf').exists()
+
+
+def test_orchestrator_runs_project_job(tmp_path, monkeypatch):
+    project = tmp_path / 'project'
+    _write_project(project)
+    orchestrator = ScannerOrchestrator(base_data_dir=str(tmp_path / 'Data'))
+    parsers = _fake_parsers([])
+    monkeypatch.setattr(orchestrator, '_execute_dd214_scanner', parsers['dd214'])
+    monkeypatch.setattr(orchestrator, '_execute_str_scanner', parsers['str'])
+    monkeypatch.setattr(orchestrator, '_execute_rating_scanner', parsers['rating'])
+
+    job = ScannerJob('project-1', ScannerType.PROJECT, str(project))
+    orchestrator.jobs[job.job_id] = job
+    asyncio.run(orchestrator._execute_job(job))
+
+    assert job.status == JobStatus.COMPLETED
+    assert job.progress == {'documents_processed': 5, 'document_count': 5, 'documents_failed': 1}
+    assert orchestrator.get_job_result('project-1')['result']['documents_scanned'] == 4
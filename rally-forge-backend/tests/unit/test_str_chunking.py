@@ -0,0 +1,215 @@
+"""
+Tests for page-range chunked parsing of large STR PDFs
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services import pdf_chunking
+from app.services.ocr_extraction import ExtractionMethod, OCRExtractionEngine
+from app.services.ocr_layout import join_page_texts
+from app.services.ocr_worker_pool import OCRWorkerPool
+from app.services.parsers import str_parser
+from app.services.parsers.str_parser import STRParser
+from app.services.pdf_chunking import PageRange, plan_page_ranges
+
+PADDING = "Vitals within normal limits. Patient ambulatory, alert and oriented times three, no acute distress noted on arrival today."
+
+DATES = ['03/05/2010', '01/10/2009', '07/22/2011', '02/14/2010', '11/30/2008', '05/05/2012']
+
+
+def _page(index):
+    lines = []
+    if index in (2, 4):
+        # Continues the encounter from the previous page (and previous chunk)
+        lines.append("Diagnosed previously, see above")
+    lines += [
+        f"{DATES[index]} Sick Call",
+        PADDING,
+        "Chief Complaint: low back pain after ruck march",
+        "Symptoms: back pain radiating to left leg",
+        "Assessment: lumbar strain",
+        "Plan: Motrin 800mg, light duty",
+        "Deployed to Iraq, exposed to burn pit smoke",
+        "In-service injury: fall from vehicle during convoy",
+        "Chronic pain noted by provider",
+        PADDING,
+    ]
+    return '\n'.join(lines)
+
+
+PAGES = [_page(index) for index in range(len(DATES))]
+
+
+def _extraction(page_texts):
+    text, offsets = join_page_texts(page_texts)
+    return {
+        'success': True,
+        'text': text,
+        'page_offsets': offsets,
+        'confidence': 0.95,
+        'method': ExtractionMethod.PDF_TEXT,
+        'character_count': len(text),
+        'error': None
+    }
+
+
+@pytest.fixture
+def chunked_engine(monkeypatch):
+    requested = []
+
+    def fake_extract_range(self, file_path, first_page, last_page, file_hash=None):
+        requested.append((first_page, last_page))
+        return _extraction(PAGES[first_page - 1:last_page])
+
+    monkeypatch.setattr(OCRExtractionEngine, 'extract_pdf_page_range', fake_extract_range)
+    monkeypatch.setattr(pdf_chunking, 'get_ocr_worker_pool', lambda: OCRWorkerPool(max_workers=1))
+    monkeypatch.setattr(str_parser, 'hash_file', lambda file_path: 'content-hash')
+    return requested
+
+
+def test_plan_page_ranges():
+    assert plan_page_ranges(250, 100) == [PageRange(1, 100), PageRange(101, 200), PageRange(201, 250)]
+    assert plan_page_ranges(0, 100) == []
+
+
+def test_chunked_parse_matches_single_pass(chunked_engine):
+    parser = STRParser()
+
+    single = parser._parse_text(_extraction(PAGES))
+    chunked = parser._parse_chunked('volume.pdf', plan_page_ranges(len(PAGES), 2))
+
+    assert chunked_engine == [(1, 2), (3, 4), (5, 6)]
+    assert chunked.pop('confidence') == pytest.approx(single.pop('confidence'))
+    assert chunked == single
+
+    # Document page numbers, not chunk-relative ones
+    assert [diagnosis['page'] for diagnosis in chunked['diagnoses']] == [1, 2, 3, 4, 5, 6]
+    assert [event['date'] for event in chunked['timeline']][:2] == ['2008-11-30', '2009-01-10']
+
+
+def test_parse_file_chunks_only_large_pdfs(chunked_engine, monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_chunking, 'count_pdf_pages', lambda file_path: len(PAGES))
+    monkeypatch.setattr(str_parser.settings, 'str_chunk_pages', 4)
+
+    pdf_path = tmp_path / 'str.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 placeholder')
+
+    result = asyncio.run(STRParser().parse_file(str(pdf_path)))
+
+    assert result['success']
+    assert chunked_engine == [(1, 4), (5, 6)]
+    assert result['page_count'] == len(PAGES)
+
+
+def test_partial_results_follow_chunk_order(chunked_engine):
+    partials = []
+    final = STRParser()._parse_chunked('volume.pdf', plan_page_ranges(len(PAGES), 2), on_partial=partials.append)
+
+    assert [(p['pages_processed'], p['page_count']) for p in partials] == [(2, 6), (4, 6)]
+    assert all(p['partial'] for p in partials)
+    assert [diagnosis['page'] for diagnosis in partials[0]['diagnoses']] == [1, 2]
+    assert 'partial' not in final and len(final['diagnoses']) == 6
+
+
+def test_orchestrator_keeps_latest_partial_result(tmp_path):
+    from app.services.scanner_orchestrator import JobStatus, ScannerJob, ScannerOrchestrator, ScannerType
+
+    orchestrator = ScannerOrchestrator(base_data_dir=str(tmp_path))
+    job = ScannerJob('job-1', ScannerType.STR, 'volume.pdf')
+    job.status = JobStatus.RUNNING
+    orchestrator.jobs[job.job_id] = job
+
+    orchestrator._record_partial_result(job, {'partial': True, 'pages_processed': 25, 'page_count': 300, 'diagnoses': []})
+
+    result = orchestrator.get_job_result('job-1')
+    assert result['status'] == 'not_ready'
+    assert result['progress'] == {'pages_processed': 25, 'page_count': 300}
+    assert result['partial_result']['pages_processed'] == 25
+    saved = json.loads((tmp_path / 'Results' / 'job-1.partial.json').read_text())
+    assert saved['progress'] == result['progress']
+
+
+def test_chunked_parse_timeout_scales_with_chunks(chunked_engine, monkeypatch, tmp_path):
+    timeouts = []
+    run_ocr_job = str_parser.run_ocr_job
+
+    async def recording_run_ocr_job(fn, *args, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        return await run_ocr_job(fn, *args, timeout=timeout, **kwargs)
+
+    monkeypatch.setattr(str_parser, 'run_ocr_job', recording_run_ocr_job)
+    monkeypatch.setattr(pdf_chunking, 'count_pdf_pages', lambda file_path: len(PAGES))
+    monkeypatch.setattr(str_parser.settings, 'str_chunk_pages', 2)
+    monkeypatch.setattr(str_parser.settings, 'ocr_timeout_seconds', 300)
+
+    pdf_path = tmp_path / 'str.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 placeholder')
+
+    assert asyncio.run(STRParser().parse_file(str(pdf_path)))['success']
+    assert timeouts == [None, 900]
+
+
+def test_failed_chunk_fails_the_parse(chunked_engine, monkeypatch):
+    def fake_extract_range(self, file_path, first_page, last_page, file_hash=None):
+        if first_page == 3:
+            return OCRExtractionEngine()._error_result('PDF extraction failed for pages 3-4: unreadable')
+        return _extraction(PAGES[first_page - 1:last_page])
+
+    monkeypatch.setattr(OCRExtractionEngine, 'extract_pdf_page_range', fake_extract_range)
+
+    result = STRParser()._parse_chunked('volume.pdf', plan_page_ranges(len(PAGES), 2))
+
+    assert not result['success']
+    assert 'pages 3-4: unreadable' in result['error']
+
+
+def test_failed_scan_drops_its_partial_result(tmp_path, monkeypatch):
+    from app.services.scanner_orchestrator import JobStatus, ScannerJob, ScannerOrchestrator, ScannerType
+
+    orchestrator = ScannerOrchestrator(base_data_dir=str(tmp_path))
+    job = ScannerJob('job-1', ScannerType.STR, 'volume.pdf')
+    job.max_retries = 0
+    orchestrator.jobs[job.job_id] = job
+
+    async def failing_scan(file_path, job=None):
+        orchestrator._record_partial_result(job, {'partial': True, 'pages_processed': 25, 'page_count': 300})
+        raise RuntimeError('OCR worker crashed')
+
+    monkeypatch.setattr(orchestrator, '_execute_str_scanner', failing_scan)
+    asyncio.run(orchestrator._execute_job(job))
+
+    assert job.status == JobStatus.FAILED and job.partial_result is None
+    assert not orchestrator._partial_result_path('job-1').exists()
+
+    # Late increments of the failed attempt (its thread outlives a timeout) are dropped
+    orchestrator._record_partial_result(job, {'partial': True, 'pages_processed': 50, 'page_count': 300})
+    assert job.partial_result is None
+    assert not orchestrator._partial_result_path('job-1').exists()
+
+    # A partial result file is never reloaded as a finished job
+    orchestrator._write_partial_result(job, {'partial': True, 'pages_processed': 25, 'page_count': 300})
+    assert orchestrator._load_finished_job('job-1.partial') is None
+
+
+def test_cancelled_parse_stops_before_reporting(chunked_engine):
+    from app.services import ocr_executor
+    from app.services.ocr_executor import CancellationToken, OCRJobCancelled
+
+    token = CancellationToken()
+    partials = []
+
+    def report(partial):
+        partials.append(partial)
+        token.cancel()  # The job times out while the next chunk is in flight
+
+    reset = ocr_executor._current_token.set(token)
+    try:
+        with pytest.raises(OCRJobCancelled):
+            STRParser()._parse_chunked('volume.pdf', plan_page_ranges(len(PAGES), 2), on_partial=report)
+    finally:
+        ocr_executor._current_token.reset(reset)
+
+    assert [partial['pages_processed'] for partial in partials] == [2]
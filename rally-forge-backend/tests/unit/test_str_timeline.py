@@ -0,0 +1,60 @@
+"""
+Tests for the streaming STR timeline builder
+"""
+
+from app.services.ocr_layout import join_page_texts
+from app.services.parsers.str_parser import STRParser
+from app.services.parsers.str_timeline import TimelineBuilder, build_events, classify_line
+
+PAGES = [
+    "CHRONOLOGICAL RECORD OF MEDICAL CARE\nNo entries before intake",
+    "03/05/2010 Sick Call\nSymptoms: low back pain\nAssessment: lumbar strain\nPlan: Motrin, light duty",
+    "",
+    "continued from previous page\n07/22/2011 CLINIC VISIT follow-up\nPatient reports knee pain\nRx: ice",
+]
+
+
+def test_events_are_yielded_at_the_next_date():
+    builder = TimelineBuilder(STRParser()._normalize_date)
+
+    assert list(builder.feed(["intake notes", "03/05/2010 Sick Call", "Symptoms: back pain"])) == []
+    [first] = builder.feed(["Plan: rest", "07/22/2011 Physical Exam"])
+    assert first == {
+        'date': '2010-03-05',
+        'type': 'Sick Call',
+        'content': '03/05/2010 Sick Call Symptoms: back pain Plan: rest',
+        'symptoms': ['Symptoms: back pain'],
+        'diagnoses': [],
+        'treatments': ['Plan: rest'],
+    }
+    [last] = builder.close()
+    assert last['date'] == '2011-07-22' and last['content'] == '07/22/2011 Physical Exam'
+    assert builder.leading_lines == ["intake notes"]
+
+
+def test_feeding_pages_matches_the_joined_text():
+    normalize = STRParser()._normalize_date
+    text, _ = join_page_texts(PAGES)
+
+    builder = TimelineBuilder(normalize)
+    events = list(builder.feed_pages(PAGES))
+    events.extend(builder.close())
+
+    assert (builder.leading_lines, events) == build_events(text, normalize)
+    assert [event['type'] for event in events] == ['Sick Call', 'CLINIC VISIT']
+    assert events[0]['content'].endswith('Plan: Motrin, light duty  continued from previous page')
+
+
+def test_classify_line():
+    assert classify_line("12/01/2009 EMERGENCY dept, reports chest pain; plan: ECG") == (
+        '12/01/2009', 'EMERGENCY', ['symptoms', 'treatments']
+    )
+    assert classify_line("Diagnosis pending") == (None, None, ['diagnoses'])
+
+
+def test_long_encounter_content():
+    lines = ["01/02/2010 Hospitalization"] + [f"Day {day}: vitals stable, plan unchanged" for day in range(5000)]
+    _, [event] = build_events('\n'.join(lines), STRParser()._normalize_date)
+
+    assert event['content'] == ' '.join(lines)
+    assert len(event['treatments']) == 5000